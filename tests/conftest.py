@@ -806,7 +806,10 @@ def mock_file_info_manager():
     mock = Mock()
     # Arithmetic operation enabled mock
     mock.get_memory_usage_estimate.return_value = 1024 * 1024  # 1MB
+    mock.cache_bytes = 1024 * 1024  # 1MB
     mock.get_cache_size.return_value = 100
+    mock.hits = 0
+    mock.misses = 0
     mock._resolve_symlink.return_value = "/test/dir"
     mock.get_cached_file_info.return_value = Mock(is_dir=True)
     mock.get_file_info.return_value = Mock(is_dir=True)
@@ -1168,10 +1171,12 @@ def comprehensive_treeview_mock():
 @pytest.fixture
 def mock_pathbrowser_instance(root):
     """Provide a properly configured PathBrowser instance for testing."""
+    from pathbrowser_stubs import stub_optional_collaborators
     from tkface.widget.pathbrowser.core import PathBrowser
 
     # Create PathBrowser instance with minimal initialization
     browser = PathBrowser.__new__(PathBrowser)
+    stub_optional_collaborators(browser)
     
     # Mock essential attributes
     browser.config = Mock()
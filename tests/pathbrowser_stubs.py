@@ -0,0 +1,39 @@
+"""
+Shared PathBrowser stand-ins for the pathbrowser tests.
+
+Feature work adds optional collaborators to PathBrowser (watcher, caches,
+background workers). The stand-ins get them here, disabled, so a new one
+is added in one place; tests that exercise a feature then replace its
+attribute with a real object.
+"""
+
+from unittest.mock import Mock
+
+from tkface.widget.pathbrowser.filesystem import LocalFileSystem
+from tkface.widget.pathbrowser.model import FileListModel
+
+
+def stub_optional_collaborators(browser):
+    """Give a browser stand-in an empty file list and no optional features."""
+    browser.file_list = FileListModel()
+    browser.file_list_view = None
+    browser.file_tree_rows = set()
+    browser.tree_base = None
+    browser.tree_ancestry = {}
+    browser.filesystem = LocalFileSystem()
+    browser.watcher = None
+    browser.listing_cache = None
+    browser.listing_stamp = None
+    browser.prefetcher = None
+    browser.folder_sizer = None
+    browser.metadata_filler = None
+    browser.metadata_after_id = None
+    browser.preview_cache = None
+    browser.snapshots = None
+    browser.search_root = None
+    return browser
+
+
+def make_stub_browser():
+    """Return a Mock browser with the optional collaborators disabled."""
+    return stub_optional_collaborators(Mock())
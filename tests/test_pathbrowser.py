@@ -532,71 +532,34 @@ class TestUtils:
         result = utils.matches_filter("test.txt", [], "Text files (*.txt)", "file", "All files")
         assert result is True  # Returns True when no filetypes
 
-    def test_would_create_loop(self, comprehensive_treeview_mock):
-        """Test would_create_loop function."""
-        # Test basic loop detection
-        mock_tree = comprehensive_treeview_mock
-        mock_tree.exists.return_value = False
-        
-        # Test according to actual implementation behavior
-        assert utils.would_create_loop("/path/to/dir", "/path/to/dir/subdir", mock_tree) is False
-        assert utils.would_create_loop("/path/to/dir", "/path/to/dir", mock_tree) is True
-
-    def test_would_create_loop_tree_exists(self, comprehensive_treeview_mock):
-        """Test would_create_loop function when tree exists."""
-        mock_tree = comprehensive_treeview_mock
-        mock_tree.exists.return_value = True
-        
-        result = utils.would_create_loop("/path/to/dir", "/path/to/dir/subdir", mock_tree)
-        assert result is True
-
-    def test_would_create_loop_macos_volumes(self, comprehensive_treeview_mock):
-        """Test would_create_loop function on macOS with Volumes."""
-        with patch('tkface.widget.pathbrowser.utils.IS_MACOS', True):
-            mock_tree = comprehensive_treeview_mock
-            mock_tree.exists.return_value = False
-            
-            # Test macOS specific case: /Volumes/Macintosh HD/Volumes -> /
-            result = utils.would_create_loop("/Volumes/Macintosh HD/Volumes", "/", mock_tree)
-            assert result is True
-
-    def test_would_create_loop_macos_volumes_false(self, comprehensive_treeview_mock):
-        """Test would_create_loop function on macOS with Volumes (false case)."""
-        with patch('tkface.widget.pathbrowser.utils.IS_MACOS', True):
-            mock_tree = comprehensive_treeview_mock
-            mock_tree.exists.return_value = False
-            
-            # Test macOS specific case: /Volumes/Macintosh HD/SomeDir -> /SomeDir
-            # This should return True because /SomeDir is contained in the path
-            result = utils.would_create_loop("/Volumes/Macintosh HD/SomeDir", "/SomeDir", mock_tree)
-            assert result is True  # Implementation returns True when real_path is contained in path
-
-    def test_would_create_loop_path_contains_real_path(self, comprehensive_treeview_mock):
-        """Test would_create_loop function when path contains real path."""
-        mock_tree = comprehensive_treeview_mock
-        mock_tree.exists.return_value = False
-        
-        # Test when real path is contained in path
-        result = utils.would_create_loop("/path/to/dir/subdir", "/path/to/dir", mock_tree)
-        assert result is True
-
-    def test_would_create_loop_path_contains_real_path_root(self, comprehensive_treeview_mock):
-        """Test would_create_loop function when real path is root."""
-        mock_tree = comprehensive_treeview_mock
-        mock_tree.exists.return_value = False
-        
-        # Test when real path is root
-        result = utils.would_create_loop("/path/to/dir", "/", mock_tree)
-        assert result is False  # Should not create loop when real path is root
-
-    def test_would_create_loop_no_loop(self, comprehensive_treeview_mock):
-        """Test would_create_loop function with no loop condition."""
-        mock_tree = comprehensive_treeview_mock
-        mock_tree.exists.return_value = False
-        
-        # Test normal case with no loop
-        result = utils.would_create_loop("/path/to/dir1", "/path/to/dir2", mock_tree)
-        assert result is False
+    def test_compile_filter_mixed_patterns(self):
+        """Test compile_filter with extension, compound and glob patterns."""
+        filetypes = [("Mixed", "*.PY *.tar.gz data_??.csv")]
+        matcher = utils.compile_filter(filetypes, "Mixed (*.PY *.tar.gz data_??.csv)", "file", "All files")
+
+        assert matcher("main.py") is True
+        assert matcher("BACKUP.TAR.GZ") is True
+        assert matcher("data_01.csv") is True
+        assert matcher("data_001.csv") is False
+        assert matcher("archive.gz") is False
+        assert matcher("py") is False
+
+    def test_compile_filter_parses_once(self):
+        """Test compile_filter reuses the compiled matcher for the same filter."""
+        filetypes = [("Text files", "*.txt")]
+        first = utils.compile_filter(filetypes, "Text files (*.txt)", "file", "All files")
+        second = utils.compile_filter(list(filetypes), "Text files (*.txt)", "file", "All files")
+        assert first is second
+
+        with patch("tkface.widget.pathbrowser.utils.fnmatch.fnmatch") as mock_fnmatch:
+            assert [first(name) for name in ("a.txt", "b.doc")] == [True, False]
+            mock_fnmatch.assert_not_called()
+
+    def test_compile_filter_dir_mode_and_all_files(self):
+        """Test compile_filter shortcuts for dir mode and All files."""
+        filetypes = [("Text files", "*.txt")]
+        assert utils.compile_filter(filetypes, "Text files (*.txt)", "dir", "All files")("a.txt") is False
+        assert utils.compile_filter(filetypes, "All files", "file", "All files")("a.doc") is True
 
     def test_get_performance_stats(self):
         """Test get_performance_stats function."""
@@ -766,11 +729,11 @@ class TestPathBrowserCore:
         new_filetypes = [("Text files", "*.txt"), ("Python files", "*.py")]
         
         with patch.object(browser, '_update_filter_options') as mock_update:
-            with patch.object(view, 'load_files') as mock_load:
+            with patch.object(view, 'apply_filter') as mock_apply:
                 browser.set_file_types(new_filetypes)
                 assert browser.config.filetypes == new_filetypes
                 mock_update.assert_called_once()
-                mock_load.assert_called_once_with(browser)
+                mock_apply.assert_called_once_with(browser)
 
     def test_performance_stats(self, root):
         """Test get_performance_stats method."""
@@ -905,12 +868,12 @@ class TestView:
             view.load_files(browser)
             mock_load.assert_called_once_with(browser)
 
-    def test_sort_items(self, root):
-        """Test sort_items function."""
+    def test_sort_files(self, root):
+        """Test sort_files function."""
         browser = PathBrowser(root)
-        with patch.object(view, 'sort_items') as mock_sort:
-            view.sort_items(browser, "#0", False)
-            mock_sort.assert_called_once_with(browser, "#0", False)
+        with patch.object(view, 'sort_files') as mock_sort:
+            view.sort_files(browser)
+            mock_sort.assert_called_once_with(browser)
 
     def test_update_selected_display(self, root):
         """Test update_selected_display function."""
@@ -988,26 +951,32 @@ class TestView:
             view.load_files(browser)
             mock_load.assert_called_once_with(browser)
 
-    def test_sort_items_by_size(self, root):
-        """Test sort_items by size."""
+    def test_sort_files_by_size(self, root):
+        """Test sort_files by size."""
         browser = PathBrowser(root)
-        with patch.object(view, 'sort_items') as mock_sort:
-            view.sort_items(browser, "size", False)
-            mock_sort.assert_called_once_with(browser, "size", False)
-
-    def test_sort_items_by_modified(self, root):
-        """Test sort_items by modified date."""
+        browser.state.sort_column = "size"
+        browser.state.sort_reverse = False
+        with patch.object(view, 'sort_files') as mock_sort:
+            view.sort_files(browser)
+            mock_sort.assert_called_once_with(browser)
+
+    def test_sort_files_by_modified(self, root):
+        """Test sort_files by modified date."""
         browser = PathBrowser(root)
-        with patch.object(view, 'sort_items') as mock_sort:
-            view.sort_items(browser, "modified", True)
-            mock_sort.assert_called_once_with(browser, "modified", True)
-
-    def test_sort_items_by_type(self, root):
-        """Test sort_items by type."""
+        browser.state.sort_column = "modified"
+        browser.state.sort_reverse = True
+        with patch.object(view, 'sort_files') as mock_sort:
+            view.sort_files(browser)
+            mock_sort.assert_called_once_with(browser)
+
+    def test_sort_files_by_type(self, root):
+        """Test sort_files by type."""
         browser = PathBrowser(root)
-        with patch.object(view, 'sort_items') as mock_sort:
-            view.sort_items(browser, "type", False)
-            mock_sort.assert_called_once_with(browser, "type", False)
+        browser.state.sort_column = "type"
+        browser.state.sort_reverse = False
+        with patch.object(view, 'sort_files') as mock_sort:
+            view.sort_files(browser)
+            mock_sort.assert_called_once_with(browser)
 
     def test_update_selected_display_multiple_files(self, root):
         """Test update_selected_display with multiple files."""
@@ -1076,16 +1045,6 @@ class TestUtilsAdvanced:
         filetypes = [("Text files", "*.txt"), ("All files", "*.*")]
         assert utils.matches_filter("TEST.TXT", filetypes, "Text files (*.txt)", "file", "All files") is True
 
-    def test_would_create_loop_macos_specific(self, comprehensive_treeview_mock):
-        """Test would_create_loop on macOS."""
-        with patch('sys.platform', 'darwin'):
-            mock_tree = comprehensive_treeview_mock
-            mock_tree.exists.return_value = False
-            
-            # Test according to actual implementation behavior
-            assert utils.would_create_loop("/path/to/dir", "/path/to/dir", mock_tree) is True
-            assert utils.would_create_loop("/path/to/dir", "/path/to/dir/subdir", mock_tree) is False
-
     def test_add_extension_if_needed_complex_patterns(self):
         """Test add_extension_if_needed with complex patterns."""
         filetypes = [("Text files", "*.txt"), ("Python files", "*.py")]
@@ -1255,11 +1214,10 @@ class TestPathBrowserCoreAdvanced:
         browser.file_info_manager = mock_file_info_manager
         
         # Test _check_memory_usage
-        with patch.object(browser.file_info_manager, 'get_memory_usage_estimate') as mock_memory:
-            mock_memory.return_value = 100 * 1024 * 1024  # 100MB
-            with patch('tkface.widget.pathbrowser.core.logger.warning') as mock_logger:
-                browser._check_memory_usage()
-                mock_logger.assert_called_once()
+        browser.file_info_manager.cache_bytes = 100 * 1024 * 1024  # 100MB
+        with patch('tkface.widget.pathbrowser.core.logger.warning') as mock_logger:
+            browser._check_memory_usage()
+            mock_logger.assert_called_once()
 
 
 class TestViewAdvanced:
@@ -1274,7 +1232,7 @@ class TestViewAdvanced:
         assert hasattr(view, 'populate_tree_node')
         assert hasattr(view, 'expand_path')
         assert hasattr(view, 'load_files')
-        assert hasattr(view, 'sort_items')
+        assert hasattr(view, 'sort_files')
         assert hasattr(view, 'update_selected_display')
         assert hasattr(view, 'update_status')
         assert hasattr(view, 'update_selection_status')
@@ -1292,7 +1250,6 @@ class TestUtilsAdvancedComprehensive:
         assert hasattr(utils, 'open_file_with_default_app')
         assert hasattr(utils, 'add_extension_if_needed')
         assert hasattr(utils, 'matches_filter')
-        assert hasattr(utils, 'would_create_loop')
         assert hasattr(utils, 'get_performance_stats')
 
 
@@ -0,0 +1,347 @@
+"""
+Benchmarks for the PathBrowser widget on synthetic directory trees.
+
+The benchmarks are skipped unless TKFACE_BENCHMARK is set. The widget
+benchmarks need a display (use Xvfb on headless machines):
+
+    TKFACE_BENCHMARK=1 xvfb-run -a pytest tests/test_pathbrowser_benchmark.py
+
+Each scenario times, without Tk, the scan of its tree and building,
+sorting and filtering the file list model (the best of PIPELINE_REPEATS
+runs each), then PathBrowser construction, view.load_files, sorting,
+filtering, _go_up/_go_down and _expand_all, each until the widget and its
+background workers are idle again. Timings are written as JSON to
+TKFACE_BENCHMARK_JSON (default pathbrowser-benchmark.json) and a scenario
+fails when an operation takes longer than its threshold in
+pathbrowser_benchmark_baseline.json, scaled by TKFACE_BENCHMARK_TOLERANCE
+(default 1.0).
+
+The thresholds are a recorded run times a margin, and the baseline file
+names the machine, Python and Tk versions of that run. Timings only
+compare on similar machines, so regenerate the baseline where the gate
+runs, from the JSON of a run on an otherwise idle machine (with tkface
+installed or on PYTHONPATH):
+
+    TKFACE_BENCHMARK=1 xvfb-run -a pytest tests/test_pathbrowser_benchmark.py
+    python tests/test_pathbrowser_benchmark.py pathbrowser-benchmark.json \
+        --margin 1.5
+
+An operation without a recorded threshold fails the scenario, so a
+baseline that misses it has to be regenerated; the benchmarks are only
+skipped when the baseline file does not exist.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tkinter as tk
+from unittest.mock import patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryScanner,
+    FileInfoManager,
+    FileListModel,
+    PathBrowser,
+    PathBrowserConfig,
+    utils,
+    view,
+)
+
+pytestmark = [
+    pytest.mark.slow,
+    pytest.mark.skipif(
+        not os.environ.get("TKFACE_BENCHMARK"),
+        reason="set TKFACE_BENCHMARK=1 to run the PathBrowser benchmarks",
+    ),
+]
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(__file__), "pathbrowser_benchmark_baseline.json"
+)
+# Default factor between a recorded timing and its threshold
+DEFAULT_MARGIN = 1.5
+# Thresholds are not set below this, to absorb timer and scheduling noise
+MIN_THRESHOLD = 0.05
+# Longest wait for the widget to become idle (seconds)
+IDLE_TIMEOUT = 300.0
+# Runs of each pipeline operation; the fastest one is kept
+PIPELINE_REPEATS = 3
+# Extensions cycled through by the generated files
+EXTENSIONS = (".txt", ".py", ".log", ".png", ".csv", ".tar.gz", "")
+FILETYPES = [("All files", "*.*"), ("Text files", "*.txt *.log")]
+
+
+def _write_files(directory, count, name_format="file_{:06d}"):
+    """Create count small files with mixed extensions, every 100th a folder."""
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        name = name_format.format(i) + EXTENSIONS[i % len(EXTENSIONS)]
+        path = os.path.join(directory, name)
+        if i % 100 == 99:
+            os.mkdir(path)
+        else:
+            with open(path, "wb") as f:
+                f.write(b"x" * (i % 97))
+
+
+def _write_deep(directory, levels=20, width=3, files=10):
+    """Create a chain of levels folders, each with siblings and files."""
+    for level in range(levels):
+        _write_files(directory, files)
+        for sibling in range(1, width):
+            os.makedirs(os.path.join(directory, f"side_{level:02d}_{sibling}"))
+        directory = os.path.join(directory, f"level_{level:02d}")
+        os.makedirs(directory)
+
+
+# Scenario name -> function creating the tree in the given directory
+SCENARIOS = {
+    "flat_1k": lambda path: _write_files(path, 1_000),
+    "flat_10k": lambda path: _write_files(path, 10_000),
+    "flat_100k": lambda path: _write_files(path, 100_000),
+    # Names close to the 255 byte limit of most filesystems
+    "long_names": lambda path: _write_files(path, 1_000, "{:06d}_" + "n" * 200),
+    "deep": _write_deep,
+}
+
+
+@pytest.fixture(scope="session")
+def benchmark_tree(tmp_path_factory):
+    """Return a function creating (once per session) a scenario's tree."""
+    base = tmp_path_factory.mktemp("pathbrowser_benchmark")
+    created = {}
+
+    def make(scenario):
+        if scenario not in created:
+            path = str(base / scenario)
+            SCENARIOS[scenario](path)
+            created[scenario] = path
+        return created[scenario]
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    """Collect timings and write them as JSON at the end of the session."""
+    results = {}
+    yield results
+    if results:
+        output = os.environ.get("TKFACE_BENCHMARK_JSON", "pathbrowser-benchmark.json")
+        report = {
+            "machine": describe_machine(),
+            "python": platform.python_version(),
+            "tk": str(tk.TkVersion),
+            "platform": sys.platform,
+            "results": results,
+        }
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+
+def describe_machine():
+    """Return a short description of the machine running the benchmarks."""
+    processor = platform.processor() or platform.machine()
+    return f"{platform.platform()}, {processor}, {os.cpu_count()} CPUs"
+
+
+def make_baseline(report, margin=DEFAULT_MARGIN):
+    """Return the baseline of a benchmark report: its timings times margin."""
+    return {
+        "recorded": {
+            key: report.get(key) for key in ("machine", "python", "tk", "platform")
+        },
+        "margin": margin,
+        "thresholds": {
+            scenario: {
+                operation: round(max(seconds * margin, MIN_THRESHOLD), 3)
+                for operation, seconds in sorted(timings.items())
+            }
+            for scenario, timings in sorted(report["results"].items())
+        },
+    }
+
+
+@pytest.fixture(scope="session")
+def baseline():
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pytest.skip(f"no benchmark baseline at {BASELINE_PATH}")
+
+
+def check_thresholds(recorded, scenario, timings):
+    """Fail if an operation is slower than, or missing from, the baseline."""
+    thresholds = recorded["thresholds"].get(scenario, {})
+    missing = sorted(set(timings) - set(thresholds))
+    assert not missing, (
+        f"{scenario}: no recorded threshold for {missing}, regenerate "
+        f"{os.path.basename(BASELINE_PATH)}"
+    )
+    tolerance = float(os.environ.get("TKFACE_BENCHMARK_TOLERANCE", "1.0"))
+    slow = {
+        operation: f"{seconds:.3f}s > {thresholds[operation] * tolerance}s"
+        for operation, seconds in timings.items()
+        if seconds > thresholds[operation] * tolerance
+    }
+    assert not slow, f"{scenario} exceeded its baseline: {slow}"
+
+
+def is_busy(browser):
+    """Return whether the browser or one of its background workers has work."""
+    if browser.loader.is_loading() or browser.expander.running:
+        return True
+    if browser.prefetcher is not None and not browser.prefetcher.idle:
+        return True
+    if browser.metadata_filler is not None and (
+        browser.metadata_after_id is not None or not browser.metadata_filler.idle
+    ):
+        return True
+    return False
+
+
+def wait_idle(root, browser):
+    """Run the event loop until the browser and its workers are idle."""
+    deadline = time.perf_counter() + IDLE_TIMEOUT
+    root.update()
+    while is_busy(browser):
+        if time.perf_counter() > deadline:
+            raise TimeoutError("PathBrowser did not become idle")
+        root.update()
+        time.sleep(0.001)
+    root.update_idletasks()
+
+
+def make_browser(root, path):
+    config = PathBrowserConfig(
+        initialdir=path,
+        filetypes=FILETYPES,
+        enable_memory_monitoring=False,
+        # Let "Expand All" reach the bottom of the deep tree
+        expand_all_max_depth=20,
+    )
+    browser = PathBrowser(root, config=config)
+    browser.pack(fill=tk.BOTH, expand=True)
+    return browser
+
+
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+def test_pipeline_benchmark(
+    scenario, benchmark_tree, benchmark_results, baseline
+):  # pylint: disable=redefined-outer-name
+    path = benchmark_tree(scenario)
+    timings = {}
+    model = FileListModel()
+
+    def timed(operation, func):
+        best = None
+        for _ in range(PIPELINE_REPEATS):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[operation] = best
+        return result
+
+    def sort():
+        model.sort("size")
+        model.sort("#0")
+
+    def filter_rows():
+        for description, pattern in reversed(FILETYPES):
+            matcher = utils.compile_filter(
+                FILETYPES, f"{description} ({pattern})", "file", "All files"
+            )
+            model.set_filter(lambda row, m=matcher: row.is_dir or m(row.name))
+
+    scanner = DirectoryScanner(FileInfoManager())
+    try:
+        # Type labels are localized through Tk; there is no root here
+        with patch(
+            "tkface.widget.pathbrowser.manager.lang.get",
+            side_effect=lambda key, root=None: key,
+        ):
+            result = timed("scan", lambda: scanner.scan(path, cache=False))
+        timed("build", lambda: model.set_rows(result.entries))
+        timed("sort_rows", sort)
+        timed("filter_rows", filter_rows)
+    finally:
+        scanner.close()
+        benchmark_results.setdefault(scenario, {}).update(timings)
+
+    check_thresholds(baseline, scenario, timings)
+
+
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+def test_pathbrowser_benchmark(
+    root, scenario, benchmark_tree, benchmark_results, baseline
+):  # pylint: disable=redefined-outer-name
+    path = benchmark_tree(scenario)
+    timings = {}
+    browser = None
+
+    def timed(operation, func):
+        start = time.perf_counter()
+        result = func()
+        wait_idle(root, browser or result)
+        timings[operation] = time.perf_counter() - start
+        return result
+
+    def sort():
+        browser._sort_files("size")  # pylint: disable=protected-access
+        browser._sort_files("#0")  # pylint: disable=protected-access
+
+    def filter_files():
+        for description, pattern in reversed(FILETYPES):
+            browser.filter_var.set(f"{description} ({pattern})")
+            browser._on_filter_change(None)  # pylint: disable=protected-access
+
+    try:
+        browser = timed("construct", lambda: make_browser(root, path))
+        timed("load_files", lambda: view.load_files(browser))
+        timed("sort", sort)
+        timed("filter", filter_files)
+        timed("go_up", browser._go_up)  # pylint: disable=protected-access
+        timed("go_down", browser._go_down)  # pylint: disable=protected-access
+        assert os.path.realpath(browser.state.current_dir) == os.path.realpath(path)
+        timed(
+            "expand_all",
+            lambda: browser._expand_all(  # pylint: disable=protected-access
+                browser.state.current_dir
+            ),
+        )
+    finally:
+        benchmark_results.setdefault(scenario, {}).update(timings)
+        if browser is not None:
+            browser.destroy()
+
+    check_thresholds(baseline, scenario, timings)
+
+
+def main(argv=None):
+    """Write pathbrowser_benchmark_baseline.json from a benchmark report."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("report", help="JSON written by a benchmark run")
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=DEFAULT_MARGIN,
+        help=f"factor applied to the recorded timings (default {DEFAULT_MARGIN})",
+    )
+    parser.add_argument("--output", default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+    with open(args.report, encoding="utf-8") as f:
+        report = json.load(f)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(make_baseline(report, args.margin), f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Tests for tkface.widget.pathbrowser.bulkinsert.
+"""
+
+import tkinter as tk
+from unittest.mock import Mock
+
+import pytest
+
+from tkface.widget.pathbrowser import insert_items
+
+NASTY_NAMES = [
+    "plain.txt",
+    "with space.txt",
+    "{brace",
+    "close}",
+    "[exec rm]",
+    "$HOME",
+    'quote"d',
+    "semi;colon",
+    "back\\slash\\",
+    "line\nbreak\ttab",
+    "#hash",
+    "",
+    "日本語 ファイル",
+    "undecodable\udcff",
+]
+
+
+@pytest.fixture
+def interp():
+    """A bare Tcl interpreter (no display needed)."""
+    try:
+        return tk.Tcl()
+    except tk.TclError as e:
+        pytest.skip(f"Tcl not available: {e}")
+
+
+class RecordingTree:
+    """Treeview stand-in whose Tcl command records the inserted items."""
+
+    def __init__(self, interp):
+        self.inserted = []
+        self.tk = interp
+        interp.createcommand(".tree", self._command)
+        self.insert = Mock(side_effect=self._insert)
+
+    def __str__(self):
+        return ".tree"
+
+    def _command(self, *args):
+        # insert parent end -id iid -text text -values list -tags list
+        _, parent, _, *words = args
+        options = dict(zip(words[::2], words[1::2]))
+        self.inserted.append(
+            (
+                parent,
+                options["-id"],
+                options["-text"],
+                self.tk.splitlist(options["-values"]),
+                self.tk.splitlist(options["-tags"]),
+            )
+        )
+
+    def _insert(self, parent, index, iid, text="", values=(), tags=()):  # pylint: disable=unused-argument
+        self.inserted.append((parent, iid, text, tuple(values), tuple(tags)))
+
+
+def make_items(count):
+    names = NASTY_NAMES * (count // len(NASTY_NAMES) + 1)
+    return [
+        ("", f"/d/{i:05d} {name}", name, (f"{i} B", "", "TXT"), ("normal",))
+        for i, name in enumerate(names[:count])
+    ]
+
+
+class TestInsertItems:
+    def test_many_items_in_one_call(self, interp):
+        tree = RecordingTree(interp)
+        items = make_items(200)
+
+        insert_items(tree, items)
+
+        assert tree.inserted == items
+        tree.insert.assert_not_called()
+
+    def test_few_items_use_insert(self, interp):
+        tree = RecordingTree(interp)
+        items = make_items(3)
+
+        insert_items(tree, items)
+
+        assert tree.inserted == items
+        assert tree.insert.call_count == 3
+
+    def test_children_follow_their_parent(self, interp):
+        tree = RecordingTree(interp)
+        items = []
+        for i in range(40):
+            items.append(("", f"/d{i}", f"d{i}", (), ()))
+            items.append((f"/d{i}", f"/d{i}_placeholder", "Loading...", (), ()))
+
+        insert_items(tree, iter(items))
+
+        assert tree.inserted == items
+
+    def test_errors_propagate_after_earlier_items(self, interp):
+        tree = RecordingTree(interp)
+        items = make_items(100)
+        calls = []
+
+        def command(*args):
+            calls.append(args)
+            if len(calls) == 60:
+                raise tk.TclError("Item already exists")
+
+        interp.createcommand(".tree", command)
+
+        with pytest.raises(tk.TclError):
+            insert_items(tree, items)
+        assert len(calls) == 60
+
+    def test_repeated_calls(self, interp):
+        tree = RecordingTree(interp)
+
+        insert_items(tree, make_items(50))
+        insert_items(tree, make_items(50)[::-1])
+
+        assert len(tree.inserted) == 100
@@ -11,9 +11,17 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from tkface.widget.pathbrowser import PathBrowser, utils, view
+from tkface.widget.pathbrowser import (
+    FileInfo,
+    FileListModel,
+    PathBrowser,
+    utils,
+    view,
+)
 from tkface.widget.pathbrowser.core import PathBrowserConfig
 
+from pathbrowser_stubs import stub_optional_collaborators
+
 
 class TestPathBrowserCoreAdditionalCoverage:
     """Additional tests for PathBrowser core functionality to improve coverage."""
@@ -93,6 +101,7 @@ class TestPathBrowserCoreAdditionalCoverage:
 
         # Create PathBrowser instance with minimal initialization
         browser = PathBrowser.__new__(PathBrowser)
+        stub_optional_collaborators(browser)
         
         # Mock essential attributes
         browser.config = Mock()
@@ -138,6 +147,7 @@ class TestPathBrowserCoreAdditionalCoverage:
         browser.file_tree.delete = Mock()
         browser.file_tree.insert = Mock()
         browser.file_tree.focus_set = Mock()
+        browser.stats_recorder = Mock()
         
         browser.up_button = Mock()
         browser.up_button.config = Mock()
@@ -181,6 +191,11 @@ class TestPathBrowserCoreAdditionalCoverage:
         browser.file_tree = mock_treeview
         if children:
             mock_treeview.get_children.return_value = children
+            # Navigation works against the file list model
+            browser.file_list.set_rows(
+                FileInfo(path, Path(path).name, False, 0, "0 B", "", "TXT")
+                for path in children
+            )
         if selection:
             mock_treeview.selection.return_value = selection
         return mock_treeview
@@ -512,7 +527,7 @@ class TestPathBrowserCoreAdditionalCoverage:
         with patch.object(browser, 'after') as mock_after:
             browser._check_memory_usage()
             # Verify that the method executes successfully
-            mock_file_info_manager.get_memory_usage_estimate.assert_called_once()
+            mock_file_info_manager.get_memory_usage_estimate.assert_not_called()
             mock_file_info_manager.get_cache_size.assert_called_once()
 
     def test_optimize_performance(self, root, mock_file_info_manager):
@@ -542,24 +557,29 @@ class TestPathBrowserCoreAdditionalCoverage:
         filter_var_mock = self._setup_filter_var_mock("*.txt")
         browser = self._create_browser(root, filter_var=filter_var_mock)
 
-        _, mock_load = self._test_with_view_patch(
-            browser, 'load_files',
-            lambda: browser._on_filter_change(None)
-        )
-        mock_load.assert_called_once_with(browser)
+        with patch.object(view, 'load_files') as mock_load:
+            _, mock_apply = self._test_with_view_patch(
+                browser, 'apply_filter',
+                lambda: browser._on_filter_change(None)
+            )
+        mock_apply.assert_called_once_with(browser)
+        mock_load.assert_not_called()
 
     def test_sort_files(self, root):
         """Test _sort_files method."""
         browser = self._create_browser(root, 
                                      state=Mock(sort_column="#0", sort_reverse=False))
 
-        _, mock_load = self._test_with_view_patch(
-            browser, 'load_files',
-            lambda: browser._sort_files("#1")
-        )
+        with patch.object(view, 'load_files') as mock_load:
+            _, mock_sort = self._test_with_view_patch(
+                browser, 'sort_files',
+                lambda: browser._sort_files("#1")
+            )
         assert browser.state.sort_column == "#1"
         assert browser.state.sort_reverse is False
-        mock_load.assert_called_once_with(browser)
+        mock_sort.assert_called_once_with(browser)
+        # Sorting reorders the loaded listing instead of rescanning
+        mock_load.assert_not_called()
 
     def test_on_filename_focus(self, root):
         """Test _on_filename_focus method."""
@@ -1132,6 +1152,82 @@ class TestPathBrowserCoreAdditionalCoverage:
         browser._expand_all("/test/file.txt")
         browser.tree.item.assert_not_called()
 
+    def test_expand_all_runs_incrementally(self, root, comprehensive_treeview_mock, mock_file_info_manager):
+        """Test _expand_all hands the node to the incremental expander."""
+        browser = self._create_browser(root, tree=comprehensive_treeview_mock,
+                                     file_info_manager=mock_file_info_manager)
+        mock_file_info_manager.get_cached_file_info.return_value = Mock(is_dir=True)
+
+        with patch.object(browser.expander, 'start') as mock_start:
+            browser._expand_all("/test/dir")
+        mock_start.assert_called_once_with("/test/dir")
+
+    def test_on_escape_cancels_expand_all(self, root):
+        """Test Escape stops a running Expand All instead of cancelling."""
+        browser = self._create_browser(root)
+
+        with patch.object(browser.expander, 'cancel', return_value=True), \
+                patch.object(browser, '_on_cancel') as mock_cancel:
+            assert browser._on_escape() == "break"
+        mock_cancel.assert_not_called()
+
+    def test_on_escape_without_expand_all(self, root):
+        """Test Escape cancels the browser when nothing is expanding."""
+        browser = self._create_browser(root)
+
+        with patch.object(browser, '_on_cancel') as mock_cancel:
+            assert browser._on_escape() is None
+        mock_cancel.assert_called_once()
+
+    def _type_ahead_browser(self, root, *names):
+        browser = self._create_browser(root)
+        browser.file_list = FileListModel()
+        browser.file_list.extend(
+            FileInfo(f"/test/{name}", name, False, 0, "0 B", "", "TXT")
+            for name in names
+        )
+        browser.file_list.sort("#0")
+        return browser
+
+    def _type(self, browser, chars, selection=()):
+        """Type characters into the file list; return the rows jumped to."""
+        with patch.object(browser, '_file_selection', return_value=list(selection)), \
+                patch.object(browser, '_set_file_selection') as mock_set, \
+                patch.object(browser, '_on_file_select'):
+            for char in chars:
+                assert browser._type_ahead(Mock(char=char)) == "break"
+        return [c.args[0] for c in mock_set.call_args_list]
+
+    def test_type_ahead_extends_prefix(self, root):
+        """Test typed characters within the timeout form one prefix."""
+        browser = self._type_ahead_browser(root, "notes.txt", "report.csv", "Report_2024.csv", "readme")
+
+        assert self._type(browser, "rep") == [
+            "/test/readme", "/test/readme", "/test/report.csv",
+        ]
+
+    def test_type_ahead_repeated_character_cycles(self, root):
+        """Test pressing the same character moves to the next match."""
+        browser = self._type_ahead_browser(root, "a1", "b1", "b2")
+
+        assert self._type(browser, "b", selection=["/test/b1"]) == ["/test/b2"]
+
+    def test_type_ahead_timeout_starts_new_prefix(self, root):
+        """Test a pause between keystrokes starts a new prefix."""
+        browser = self._type_ahead_browser(root, "apple", "banana")
+        self._type(browser, "a")
+
+        with patch('tkface.widget.pathbrowser.core.time.monotonic', return_value=1e9):
+            assert self._type(browser, "b") == ["/test/banana"]
+        assert browser.state.type_ahead_prefix == "b"
+
+    def test_type_ahead_ignores_control_keys(self, root):
+        """Test keys without a printable character are left to other bindings."""
+        browser = self._type_ahead_browser(root, "a")
+
+        assert browser._type_ahead(Mock(char="\r")) is None
+        assert browser._type_ahead(Mock(char="")) is None
+
     def test_on_file_select_directory_selection(self, root, mock_file_info_manager):
         """Test _on_file_select method with directory selection."""
         browser = self._create_browser(root, config=Mock(select="dir"), 
@@ -1205,10 +1301,10 @@ class TestPathBrowserCoreAdditionalCoverage:
         browser = self._create_browser(root, state=state_mock, file_tree=mock_treeview_operations)
         mock_treeview_operations.heading.return_value = {"text": "Size"}
 
-        with patch.object(view, 'load_files') as mock_load:
+        with patch.object(view, 'sort_files') as mock_sort:
             browser._sort_files("size")
             assert browser.state.sort_reverse is True
-            mock_load.assert_called_once_with(browser)
+            mock_sort.assert_called_once_with(browser)
 
     def test_sort_files_different_column(self, root, mock_treeview_operations):
         """Test _sort_files method with different column."""
@@ -1216,11 +1312,11 @@ class TestPathBrowserCoreAdditionalCoverage:
         browser = self._create_browser(root, state=state_mock, file_tree=mock_treeview_operations)
         mock_treeview_operations.heading.return_value = {"text": "Modified"}
 
-        with patch.object(view, 'load_files') as mock_load:
+        with patch.object(view, 'sort_files') as mock_sort:
             browser._sort_files("modified")
             assert browser.state.sort_column == "modified"
             assert browser.state.sort_reverse is False
-            mock_load.assert_called_once_with(browser)
+            mock_sort.assert_called_once_with(browser)
 
     def test_on_file_double_click_directory(self, root, mock_file_info_manager):
         """Test _on_file_double_click method with directory."""
@@ -1354,11 +1450,11 @@ class TestPathBrowserCoreAdditionalCoverage:
         browser = self._create_browser(root, config=Mock(filetypes=[("All files", "*.*")]))
 
         with patch.object(browser, '_update_filter_options') as mock_update:
-            with patch.object(view, 'load_files') as mock_load:
+            with patch.object(view, 'apply_filter') as mock_apply:
                 browser.set_file_types([("Text files", "*.txt"), ("Python files", "*.py")])
                 assert browser.config.filetypes == [("Text files", "*.txt"), ("Python files", "*.py")]
                 mock_update.assert_called_once()
-                mock_load.assert_called_once_with(browser)
+                mock_apply.assert_called_once_with(browser)
 
     def test_schedule_memory_monitoring_disabled(self, root):
         """Test _schedule_memory_monitoring method when disabled."""
@@ -1374,7 +1470,7 @@ class TestPathBrowserCoreAdditionalCoverage:
         """Test _check_memory_usage method with normal memory usage."""
         browser = self._create_browser(root, file_info_manager=mock_file_info_manager)
 
-        mock_file_info_manager.get_memory_usage_estimate.return_value = 5 * 1024 * 1024  # 5MB
+        mock_file_info_manager.cache_bytes = 5 * 1024 * 1024  # 5MB
         mock_file_info_manager.get_cache_size.return_value = 100
 
         with patch('logging.Logger.info') as mock_info:
@@ -1385,7 +1481,7 @@ class TestPathBrowserCoreAdditionalCoverage:
         """Test _check_memory_usage method with high memory usage."""
         browser = self._create_browser(root, file_info_manager=mock_file_info_manager)
 
-        mock_file_info_manager.get_memory_usage_estimate.return_value = 20 * 1024 * 1024  # 20MB
+        mock_file_info_manager.cache_bytes = 20 * 1024 * 1024  # 20MB
         mock_file_info_manager.get_cache_size.return_value = 500
 
         with patch('logging.Logger.info') as mock_info:
@@ -1396,20 +1492,21 @@ class TestPathBrowserCoreAdditionalCoverage:
         """Test _check_memory_usage method with very high memory usage."""
         browser = self._create_browser(root, file_info_manager=mock_file_info_manager)
 
-        mock_file_info_manager.get_memory_usage_estimate.return_value = 60 * 1024 * 1024  # 60MB
+        mock_file_info_manager.cache_bytes = 60 * 1024 * 1024  # 60MB
         mock_file_info_manager.get_cache_size.return_value = 1000
 
         with patch('logging.Logger.warning') as mock_warning:
             browser._check_memory_usage()
             mock_warning.assert_called_once()
-            mock_file_info_manager.clear_cache.assert_called_once()
+            mock_file_info_manager.trim_cache.assert_called_once_with(0.5)
+            mock_file_info_manager.clear_cache.assert_not_called()
 
     def test_get_performance_stats(self, root, mock_file_info_manager):
         """Test get_performance_stats method."""
         browser = self._create_browser(root, file_info_manager=mock_file_info_manager)
 
         mock_file_info_manager.get_cache_size.return_value = 100
-        mock_file_info_manager.get_memory_usage_estimate.return_value = 1024 * 1024  # 1MB
+        mock_file_info_manager.cache_bytes = 1024 * 1024  # 1MB
 
         with patch('tkface.widget.pathbrowser.utils.get_performance_stats') as mock_get_stats:
             mock_get_stats.return_value = {"cache_size": 100, "memory_usage": 1024 * 1024}
@@ -1422,13 +1519,19 @@ class TestPathBrowserCoreAdditionalCoverage:
         """Test optimize_performance method."""
         browser = self._create_browser(root, file_info_manager=mock_file_info_manager)
 
-        mock_file_info_manager.get_memory_usage_estimate.side_effect = [1000000, 500000]  # 1MB, 500KB
+        mock_file_info_manager.cache_bytes = 1000000  # 1MB
+
+        def clear_cache():
+            mock_file_info_manager.cache_bytes = 500000  # 500KB
+
+        mock_file_info_manager.clear_cache.side_effect = clear_cache
 
         with patch.object(browser, '_load_directory') as mock_load:
             with patch('logging.Logger.info') as mock_info:
                 browser.optimize_performance()
                 mock_file_info_manager.clear_cache.assert_called_once()
                 mock_info.assert_called_once()
+                assert mock_info.call_args[0][1] == 500000
                 mock_load.assert_called_once_with(browser.state.current_dir)
 
     def test_load_directory_file_not_found(self, root):
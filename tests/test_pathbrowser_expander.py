@@ -0,0 +1,197 @@
+"""
+Tests for tkface.widget.pathbrowser.expander.
+"""
+
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import DirectoryScanner, FileInfoManager, TreeExpander
+
+
+class FakeTree:
+    """Minimal directory Treeview keeping children in order."""
+
+    def __init__(self):
+        self.children = {"": []}
+        self.parents = {}
+        self.open = {}
+
+    def exists(self, iid):
+        return iid in self.parents
+
+    def get_children(self, iid=""):
+        return tuple(self.children.get(iid, ()))
+
+    def item(self, iid, option=None, **kwargs):
+        if "open" in kwargs:
+            self.open[iid] = kwargs["open"]
+        if option == "open":
+            return self.open.get(iid, False)
+        return None
+
+    def insert(self, parent, index, iid, text="", open=False):  # pylint: disable=redefined-builtin,unused-argument
+        siblings = self.children[parent]
+        siblings.insert(len(siblings) if index == "end" else index, iid)
+        self.children[iid] = []
+        self.parents[iid] = parent
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            for child in list(self.children.get(iid, ())):
+                self.delete(child)
+            self.children[self.parents[iid]].remove(iid)
+            del self.children[iid], self.parents[iid]
+
+
+class FakeBrowser:
+    """PathBrowser stand-in collecting after() callbacks."""
+
+    def __init__(self):
+        self.tree = FakeTree()
+        self.scanner = DirectoryScanner(FileInfoManager())
+        self.prefetcher = None
+        self.tree_ancestry = {}
+        self.status_var = Mock()
+        self._update_status = Mock()
+        self._update_watched_directories = Mock()
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, func):  # pylint: disable=unused-argument
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_once(self):
+        callbacks = list(self.pending.values())
+        self.pending.clear()
+        for func in callbacks:
+            func()
+
+    def run_pending(self):
+        while self.pending:
+            self.run_once()
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ), patch(
+        "tkface.widget.pathbrowser.expander.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+@pytest.fixture
+def deep_tree(tmp_path):
+    """root/a/b/c/d plus root/x/y, with root shown in the tree."""
+    (tmp_path / "a" / "b" / "c" / "d").mkdir(parents=True)
+    (tmp_path / "x" / "y").mkdir(parents=True)
+    (tmp_path / "file.txt").write_text("x")
+    browser = FakeBrowser()
+    browser.tree.insert("", "end", str(tmp_path))
+    browser.tree.insert(str(tmp_path), "end", f"{tmp_path}_placeholder")
+    return tmp_path, browser
+
+
+class TestTreeExpander:
+    def test_expands_whole_subtree(self, deep_tree):
+        root, browser = deep_tree
+        expander = TreeExpander(browser)
+
+        expander.start(str(root))
+        browser.run_pending()
+
+        assert not expander.running
+        assert expander.expanded == 7
+        assert browser.tree.get_children(str(root / "a" / "b" / "c")) == (
+            str(root / "a" / "b" / "c" / "d"),
+        )
+        assert all(browser.tree.open.values())
+        browser._update_status.assert_called()
+        browser._update_watched_directories.assert_called_once()
+
+    def test_start_node_opens_immediately(self, deep_tree):
+        root, browser = deep_tree
+        expander = TreeExpander(browser)
+
+        expander.start(str(root))
+
+        # Descendants are left for the event loop
+        assert browser.tree.open == {str(root): True}
+        assert expander.running
+        assert browser.pending
+
+    def test_depth_budget(self, deep_tree):
+        root, browser = deep_tree
+        expander = TreeExpander(browser, max_depth=1)
+
+        expander.start(str(root))
+        browser.run_pending()
+
+        assert set(browser.tree.open) == {str(root), str(root / "a"), str(root / "x")}
+        # The last level is listed, not opened
+        assert browser.tree.get_children(str(root / "a")) == (str(root / "a" / "b"),)
+
+    def test_node_budget(self, deep_tree):
+        root, browser = deep_tree
+        expander = TreeExpander(browser, max_nodes=2)
+
+        expander.start(str(root))
+        browser.run_pending()
+
+        assert expander.expanded == 2
+        assert not expander.running
+        message = browser.status_var.set.call_args[0][0]
+        assert message.startswith("Expand All stopped at the folder limit")
+
+    def test_progress_is_shown_between_runs(self, deep_tree):
+        root, browser = deep_tree
+        expander = TreeExpander(browser, time_slice_ms=0)
+
+        expander.start(str(root))
+        browser.run_once()
+
+        assert expander.running
+        assert "Expanding..." in browser.status_var.set.call_args[0][0]
+
+    def test_cancel_keeps_opened_nodes(self, deep_tree):
+        root, browser = deep_tree
+        expander = TreeExpander(browser, time_slice_ms=0)
+        expander.start(str(root))
+        browser.run_once()
+        opened = dict(browser.tree.open)
+
+        assert expander.cancel()
+        browser.run_pending()
+
+        assert not expander.running
+        assert browser.tree.open == opened
+        assert not expander.cancel()
+
+    def test_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() + 100
+        browser = FakeBrowser()
+        browser.tree.insert("", "end", "/d")
+
+        def populate(pathbrowser_instance, parent):
+            if parent.count("/") <= depth:
+                pathbrowser_instance.tree.insert(parent, "end", f"{parent}/d")
+
+        expander = TreeExpander(browser, max_depth=depth, max_nodes=depth + 1)
+        with patch(
+            "tkface.widget.pathbrowser.expander.view.populate_tree_node", populate
+        ):
+            expander.start("/d")
+            browser.run_pending()
+
+        assert expander.expanded == depth + 1
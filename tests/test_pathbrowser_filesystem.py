@@ -0,0 +1,180 @@
+"""
+Tests for tkface.widget.pathbrowser.filesystem.
+"""
+
+import io
+import stat
+import tarfile
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryScanner,
+    FileInfoManager,
+    FileSystem,
+    LocalFileSystem,
+    MemoryFileSystem,
+    TarFileSystem,
+    ZipFileSystem,
+    open_archive,
+    read_preview,
+)
+
+MEMBERS = {
+    "docs/readme.txt": b"hello\n",
+    "docs/guide/intro.md": b"# Intro\n",
+    "data.bin": b"\0" * 100,
+}
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized type labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+@pytest.fixture
+def zip_path(tmp_path):
+    path = tmp_path / "archive.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in MEMBERS.items():
+            archive.writestr(name, data)
+    return str(path)
+
+
+@pytest.fixture
+def tar_path(tmp_path):
+    path = tmp_path / "archive.tar.gz"
+    with tarfile.open(path, "w:gz") as archive:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1_700_000_000
+            archive.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+def names(filesystem, path):
+    return sorted(entry.name for entry in filesystem.list(path))
+
+
+class TestTreeProviders:
+    @pytest.mark.parametrize("kind", ["zip", "tar", "memory"])
+    def test_list_stat_and_open(self, kind, request):
+        if kind == "memory":
+            filesystem = MemoryFileSystem(MEMBERS)
+        elif kind == "zip":
+            filesystem = ZipFileSystem(request.getfixturevalue("zip_path"))
+        else:
+            filesystem = TarFileSystem(request.getfixturevalue("tar_path"))
+
+        # Directories without a member of their own are implied
+        assert names(filesystem, "/") == ["data.bin", "docs"]
+        assert names(filesystem, "/docs") == ["guide", "readme.txt"]
+        assert filesystem.is_dir("/docs/guide")
+        assert not filesystem.is_dir("/docs/readme.txt")
+        assert filesystem.stat("/docs/readme.txt").st_size == 6
+        assert not filesystem.exists("/missing")
+        with filesystem.open("/docs/guide/intro.md") as f:
+            assert f.read() == b"# Intro\n"
+        filesystem.close()
+
+    def test_errors_are_os_errors(self):
+        filesystem = MemoryFileSystem(MEMBERS)
+
+        with pytest.raises(FileNotFoundError):
+            filesystem.stat("/nope")
+        with pytest.raises(NotADirectoryError):
+            list(filesystem.list("/data.bin"))
+        with pytest.raises(IsADirectoryError):
+            filesystem.open("/docs")
+
+    def test_entries_behave_like_dir_entries(self):
+        entry = next(
+            e for e in MemoryFileSystem(MEMBERS).list("/") if e.name == "docs"
+        )
+
+        assert entry.path == "/docs"
+        assert entry.is_dir() and not entry.is_file() and not entry.is_symlink()
+        assert stat.S_ISDIR(entry.stat().st_mode)
+
+    def test_members_outside_the_root_are_skipped(self):
+        filesystem = MemoryFileSystem({"../evil.txt": b"x", "ok.txt": b"y"})
+
+        assert names(filesystem, "/") == ["ok.txt"]
+
+    def test_zip_is_read_lazily(self, zip_path):
+        with patch("zipfile.ZipFile") as zip_class:
+            filesystem = ZipFileSystem(zip_path)
+            zip_class.assert_not_called()
+        assert filesystem.exists("/data.bin")
+
+    def test_open_archive(self, zip_path, tar_path, tmp_path):
+        plain = tmp_path / "plain.txt"
+        plain.write_text("not an archive")
+
+        assert isinstance(open_archive(zip_path), ZipFileSystem)
+        assert isinstance(open_archive(tar_path), TarFileSystem)
+        assert open_archive(str(plain)) is None
+
+    def test_bad_archive_raises_os_error(self, tmp_path):
+        path = tmp_path / "broken.zip"
+        path.write_bytes(b"PK not really")
+
+        with pytest.raises(OSError):
+            ZipFileSystem(str(path)).stat("/")
+
+    def test_incomplete_provider_cannot_be_created(self):
+        class NoOpen(FileSystem):
+            def list(self, path):
+                return iter(())
+
+            def stat(self, path):
+                raise FileNotFoundError(path)
+
+        with pytest.raises(TypeError):
+            NoOpen()
+
+
+class TestProviderConsumers:
+    def test_scanner_lists_archive_members(self, zip_path):
+        filesystem = ZipFileSystem(zip_path)
+        manager = FileInfoManager(filesystem=filesystem)
+
+        result = DirectoryScanner(manager).scan("/docs")
+
+        assert [entry.name for entry in result.entries] == ["readme.txt", "guide"]
+        assert result.file_count == 1 and result.folder_count == 1
+        assert result.total_size == 6
+        assert result.subdirs == [("guide", "/docs/guide")]
+
+    def test_manager_stats_through_the_provider(self):
+        manager = FileInfoManager(filesystem=MemoryFileSystem(MEMBERS))
+
+        info = manager.get_file_info("/data.bin")
+
+        assert info.size_bytes == 100
+        assert info.file_type == "BIN"
+
+    def test_preview_reads_members(self):
+        data = b"".join(f"line {i}\n".encode() for i in range(1000))
+        filesystem = MemoryFileSystem({"log.txt": data})
+
+        preview = read_preview("/log.txt", 20, 20, filesystem=filesystem)
+
+        assert preview.truncated
+        assert preview.head == "line 0\nline 1\n"
+        assert preview.tail.endswith("line 999\n")
+
+    def test_local_provider(self, tmp_path):
+        (tmp_path / "a.txt").write_text("a")
+        filesystem = LocalFileSystem()
+
+        assert names(filesystem, str(tmp_path)) == ["a.txt"]
+        assert filesystem.local
+        assert filesystem.join(str(tmp_path), "a.txt") == str(tmp_path / "a.txt")
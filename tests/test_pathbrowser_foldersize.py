@@ -0,0 +1,318 @@
+"""
+Tests for tkface.widget.pathbrowser.foldersize.
+"""
+
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    FileInfo,
+    FolderSizer,
+    view,
+)
+
+from pathbrowser_stubs import make_stub_browser
+
+
+class FakeWidget:
+    """Collects after() callbacks so tests can run the pump by hand."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, func):  # pylint: disable=unused-argument
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self, timeout=5.0):
+        """Run scheduled callbacks until none are left."""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            callbacks = list(self.pending.values())
+            self.pending.clear()
+            for func in callbacks:
+                func()
+            time.sleep(0.001)
+
+
+@pytest.fixture
+def sized_dir(tmp_path):
+    """base/{big/{a (100 B), sub/{b (50 B)}}, small/{c (7 B)}, empty/}"""
+    (tmp_path / "big" / "sub").mkdir(parents=True)
+    (tmp_path / "big" / "a").write_bytes(b"x" * 100)
+    (tmp_path / "big" / "sub" / "b").write_bytes(b"x" * 50)
+    (tmp_path / "small").mkdir()
+    (tmp_path / "small" / "c").write_bytes(b"x" * 7)
+    (tmp_path / "empty").mkdir()
+    return tmp_path
+
+
+def make_sizer(widget=None, on_sizes=None, threaded=False):
+    return FolderSizer(widget or FakeWidget(), on_sizes or Mock(), threaded=threaded)
+
+
+def delivered(on_sizes):
+    """Merge every batch passed to an on_sizes mock."""
+    sizes = {}
+    for call in on_sizes.call_args_list:
+        sizes.update(call.args[0])
+    return sizes
+
+
+class TestFolderSizer:
+    def test_sizes_requested_folders(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes)
+
+        sizer.request([str(sized_dir / name) for name in ("big", "small", "empty")])
+        widget.run_pending()
+
+        assert delivered(on_sizes) == {
+            str(sized_dir / "big"): 150,
+            str(sized_dir / "small"): 7,
+            str(sized_dir / "empty"): 0,
+        }
+
+    def test_symlinks_are_not_followed(self, sized_dir):
+        try:
+            os.symlink(sized_dir / "big", sized_dir / "small" / "link")
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks not supported")
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes)
+
+        sizer.request([str(sized_dir / "small")])
+        widget.run_pending()
+
+        link_size = os.lstat(sized_dir / "small" / "link").st_size
+        assert delivered(on_sizes) == {str(sized_dir / "small"): 7 + link_size}
+
+    def test_unchanged_folder_is_not_walked_again(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes)
+        sizer.request([str(sized_dir / "big")])
+        widget.run_pending()
+        sizer.request([])
+
+        with patch(
+            "tkface.widget.pathbrowser.foldersize.os.scandir",
+            side_effect=AssertionError("walked"),
+        ):
+            sizer.request([str(sized_dir / "big")])
+            widget.run_pending()
+
+        assert on_sizes.call_count == 2
+        assert on_sizes.call_args.args[0] == {str(sized_dir / "big"): 150}
+
+    def test_changed_folder_is_walked_again(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes)
+        sizer.request([str(sized_dir / "small")])
+        widget.run_pending()
+
+        (sized_dir / "small" / "d").write_bytes(b"x" * 3)
+        # Make sure the mtime differs even on coarse timestamp filesystems
+        future = time.time() + 10
+        os.utime(sized_dir / "small", (future, future))
+        sizer.request([str(sized_dir / "small")])
+        widget.run_pending()
+
+        assert on_sizes.call_args.args[0] == {str(sized_dir / "small"): 10}
+
+    def test_folders_left_out_of_a_request_are_dropped(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes)
+
+        sizer.request([str(sized_dir / "big")])
+        sizer.request([str(sized_dir / "small")])
+        widget.run_pending()
+
+        assert delivered(on_sizes) == {str(sized_dir / "small"): 7}
+
+    def test_walk_stops_when_folder_is_dropped(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes)
+        listed = []
+
+        def scandir(path):
+            # The folder scrolls out of view while its first level is listed
+            listed.append(path)
+            sizer.request([])
+            return real_scandir(path)
+
+        real_scandir = os.scandir
+        with patch(
+            "tkface.widget.pathbrowser.foldersize.os.scandir", side_effect=scandir
+        ):
+            sizer.request([str(sized_dir / "big")])
+            widget.run_pending()
+
+        assert listed == [str(sized_dir / "big")]
+        on_sizes.assert_not_called()
+        assert sizer._inline is None  # pylint: disable=protected-access
+
+    def test_unreadable_folder_is_not_reported(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes)
+
+        sizer.request([str(sized_dir / "missing")])
+        widget.run_pending()
+
+        on_sizes.assert_not_called()
+
+    def test_cancel_drops_undelivered_sizes(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes, threaded=True)
+        try:
+            sizer.request([str(sized_dir / "big")])
+            sizer.cancel()
+            widget.run_pending()
+            on_sizes.assert_not_called()
+        finally:
+            sizer.close()
+
+    def test_threaded_sizing(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes, threaded=True)
+        try:
+            sizer.request([str(sized_dir / "big"), str(sized_dir / "small")])
+            widget.run_pending()
+            assert delivered(on_sizes) == {
+                str(sized_dir / "big"): 150,
+                str(sized_dir / "small"): 7,
+            }
+        finally:
+            sizer.close()
+
+    def test_close_cancels_pump(self, sized_dir):
+        widget = FakeWidget()
+        on_sizes = Mock()
+        sizer = make_sizer(widget, on_sizes)
+        sizer.request([str(sized_dir / "big")])
+
+        sizer.close()
+        widget.run_pending()
+
+        on_sizes.assert_not_called()
+        assert not widget.pending
+
+
+def make_browser(rows, sort_column="#0"):
+    """Browser stand-in with a real sizer and a plain file list."""
+    browser = make_stub_browser()
+    browser.widget = FakeWidget()
+    browser.after = browser.widget.after
+    browser.after_cancel = browser.widget.after_cancel
+    browser.state.sort_column = sort_column
+    browser.state.sort_reverse = False
+    browser.file_list.extend(rows)
+    browser.file_list.sort(sort_column)
+    browser.file_tree_rows = {row.path for row in rows}
+    browser.file_tree.yview.return_value = (0.0, 1.0)
+    browser.folder_size_after_id = None
+    browser.folder_sizer = FolderSizer(
+        browser.widget,
+        lambda sizes: view.on_folder_sizes(browser, sizes),
+        threaded=False,
+    )
+    return browser
+
+
+def dir_row(path):
+    return FileInfo(
+        str(path), os.path.basename(path), True, 0, modified="", file_type="Folder"
+    )
+
+
+class TestFolderSizeColumn:
+    def test_visible_folders_get_sizes(self, sized_dir):
+        rows = [dir_row(sized_dir / "big"), dir_row(sized_dir / "small")]
+        browser = make_browser(rows)
+
+        view.schedule_folder_sizes(browser)
+        browser.widget.run_pending()
+
+        big = browser.file_list.get(str(sized_dir / "big"))
+        assert (big.size_bytes, big.size_str) == (150, "150 B")
+        browser.file_tree.item.assert_any_call(
+            str(sized_dir / "big"), text="📁 big", values=("150 B", "", "Folder")
+        )
+
+    def test_only_rows_in_view_are_sized(self, sized_dir):
+        rows = [dir_row(sized_dir / "big"), dir_row(sized_dir / "small")]
+        browser = make_browser(rows)
+        browser.file_tree.yview.return_value = (0.0, 0.5)
+
+        view.request_folder_sizes(browser)
+        browser.widget.run_pending()
+
+        assert browser.file_list.get(str(sized_dir / "big")).size_str == "150 B"
+        assert browser.file_list.get(str(sized_dir / "small")).size_str == ""
+
+    def test_size_sort_follows_arriving_sizes(self, sized_dir):
+        rows = [dir_row(sized_dir / "big"), dir_row(sized_dir / "small")]
+        browser = make_browser(rows, sort_column="size")
+        assert [row.name for row in browser.file_list] == ["big", "small"]
+
+        view.request_folder_sizes(browser)
+        browser.widget.run_pending()
+
+        assert [row.name for row in browser.file_list] == ["small", "big"]
+        browser.file_tree.set_children.assert_called_with(
+            "", str(sized_dir / "small"), str(sized_dir / "big")
+        )
+
+    def test_name_sort_keeps_rows_in_place(self, sized_dir):
+        rows = [dir_row(sized_dir / "big"), dir_row(sized_dir / "small")]
+        browser = make_browser(rows)
+        browser.file_list.select([str(sized_dir / "small")])
+
+        with patch.object(
+            browser.file_list, "sort", side_effect=AssertionError("sorted")
+        ):
+            view.request_folder_sizes(browser)
+            browser.widget.run_pending()
+
+        assert [row.name for row in browser.file_list] == ["big", "small"]
+        assert browser.file_list.get(str(sized_dir / "small")).size_str == "7 B"
+        assert browser.file_list.selection() == [str(sized_dir / "small")]
+        browser.file_tree.set_children.assert_not_called()
+
+    def test_folders_still_sort_before_files(self, sized_dir):
+        rows = [
+            dir_row(sized_dir / "big"),
+            FileInfo(str(sized_dir / "tiny.txt"), "tiny.txt", False, 1),
+        ]
+        browser = make_browser(rows, sort_column="size")
+
+        view.request_folder_sizes(browser)
+        browser.widget.run_pending()
+
+        assert [row.name for row in browser.file_list] == ["big", "tiny.txt"]
+
+    def test_clearing_the_list_cancels_sizing(self, sized_dir):
+        browser = make_browser([dir_row(sized_dir / "big")])
+        view.request_folder_sizes(browser)
+
+        view.cancel_folder_sizes(browser)
+        browser.widget.run_pending()
+
+        assert browser.file_list.get(str(sized_dir / "big")).size_str == ""
@@ -0,0 +1,256 @@
+"""
+Tests for tkface.widget.pathbrowser.listingcache.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryLoader,
+    DirectoryScanner,
+    FileInfoManager,
+    ListingCache,
+    get_listing_cache,
+    view,
+)
+from tkface.widget.pathbrowser.listingcache import default_cache_dir
+from tkface.widget.pathbrowser.utils import RACY_WINDOW, directory_stamp, is_racy
+
+from pathbrowser_stubs import make_stub_browser
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ), patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+def settle(path, offset=100):
+    """Give a directory an mtime outside the race window."""
+    old = time.time() - offset
+    os.utime(path, (old, old))
+
+
+@pytest.fixture
+def listing_dir(tmp_path):
+    directory = tmp_path / "listing"
+    directory.mkdir()
+    (directory / "a.txt").write_text("abc")
+    (directory / "sub").mkdir()
+    (directory / "b.py").write_text("x" * 10)
+    settle(directory)
+    return directory
+
+
+@pytest.fixture
+def cache(tmp_path):
+    listing_cache = ListingCache(str(tmp_path / "cache" / "listings.sqlite3"))
+    yield listing_cache
+    listing_cache.close()
+
+
+def scan(directory):
+    return DirectoryScanner(FileInfoManager()).scan(str(directory), cache=False)
+
+
+class TestListingCache:
+    def test_round_trip_keeps_stat_data(self, listing_dir, cache):
+        result = scan(listing_dir)
+        stamp = directory_stamp(str(listing_dir))
+        cache.store(str(listing_dir), stamp, result.entries)
+
+        loaded = cache.load(str(listing_dir), stamp, FileInfoManager())
+
+        assert loaded == result.entries
+        assert [info.mode for info in loaded] == [info.mode for info in result.entries]
+
+    def test_stale_stamp_is_a_miss(self, listing_dir, cache):
+        stamp = directory_stamp(str(listing_dir))
+        cache.store(str(listing_dir), stamp, scan(listing_dir).entries)
+
+        (listing_dir / "new.txt").write_text("x")
+        settle(listing_dir, offset=50)
+
+        assert cache.load(
+            str(listing_dir), directory_stamp(str(listing_dir)), FileInfoManager()
+        ) is None
+
+    def test_recently_modified_directory_is_not_stored(self, tmp_path, cache):
+        (tmp_path / "a.txt").write_text("x")
+        stamp = directory_stamp(str(tmp_path))
+
+        cache.store(str(tmp_path), stamp, scan(tmp_path).entries)
+
+        assert cache.load(str(tmp_path), stamp, FileInfoManager()) is None
+
+    def test_is_racy_within_the_window(self):
+        stamp = (1, 2, 1_000_000_000 * 10**9)
+
+        assert is_racy(stamp, 1_000_000_000 + RACY_WINDOW / 2)
+        assert not is_racy(stamp, 1_000_000_000 + RACY_WINDOW)
+
+    def test_error_records_and_unusual_names_survive(self, listing_dir, cache):
+        manager = FileInfoManager()
+        entries = [
+            manager.create_error_file_info(str(listing_dir / "broken")),
+            manager.get_file_info(str(listing_dir / "a.txt")),
+        ]
+        entries[1].name = "café \udcff.txt"
+        stamp = directory_stamp(str(listing_dir))
+        cache.store(str(listing_dir), stamp, entries)
+
+        loaded = cache.load(str(listing_dir), stamp, manager)
+
+        assert loaded[0].file_type == "Unknown"
+        assert loaded[1].name == "café \udcff.txt"
+
+    def test_listings_are_shared_across_instances(self, listing_dir, tmp_path):
+        path = str(tmp_path / "shared.sqlite3")
+        stamp = directory_stamp(str(listing_dir))
+        first = ListingCache(path)
+        first.store(str(listing_dir), stamp, scan(listing_dir).entries)
+        first.close()
+
+        second = ListingCache(path)
+        try:
+            assert len(second.load(str(listing_dir), stamp, FileInfoManager())) == 3
+        finally:
+            second.close()
+
+    def test_oldest_directories_are_dropped(self, tmp_path, cache):
+        cache.max_directories = 2
+        stamps = {}
+        for name in ("one", "two", "three"):
+            directory = tmp_path / name
+            directory.mkdir()
+            settle(directory)
+            stamps[name] = directory_stamp(str(directory))
+            cache.store(str(directory), stamps[name], [])
+
+        manager = FileInfoManager()
+        assert cache.load(str(tmp_path / "one"), stamps["one"], manager) is None
+        assert cache.load(str(tmp_path / "three"), stamps["three"], manager) == []
+
+    def test_corrupt_listing_is_discarded(self, listing_dir, cache):
+        stamp = directory_stamp(str(listing_dir))
+        with cache._db:  # pylint: disable=protected-access
+            cache._db.execute(  # pylint: disable=protected-access
+                "INSERT INTO listings VALUES (?, ?, ?, ?, ?, ?)",
+                (str(listing_dir), *stamp, 0.0, b"\x05\x00\x00\x00garbage"),
+            )
+
+        assert cache.load(str(listing_dir), stamp, FileInfoManager()) is None
+
+    def test_other_threads_are_refused(self, listing_dir, cache):
+        stamp = directory_stamp(str(listing_dir))
+        errors = []
+
+        def load():
+            try:
+                cache.load(str(listing_dir), stamp, FileInfoManager())
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=load)
+        thread.start()
+        thread.join()
+
+        assert len(errors) == 1
+
+    def test_unusable_database_disables_cache(self, tmp_path):
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("x")
+        assert get_listing_cache(str(blocker / "cache.sqlite3")) is None
+
+    def test_shared_cache_per_path(self, tmp_path):
+        path = str(tmp_path / "shared.sqlite3")
+        cache = get_listing_cache(path)
+        try:
+            assert get_listing_cache(path) is cache
+        finally:
+            cache.close()
+
+    def test_default_cache_dir_honours_xdg(self, tmp_path):
+        with patch("sys.platform", "linux"), patch.dict(
+            os.environ, {"XDG_CACHE_HOME": str(tmp_path)}
+        ):
+            assert default_cache_dir() == os.path.join(str(tmp_path), "tkface")
+
+
+def make_browser(directory, listing_cache):
+    """Browser stand-in with an inline loader and a real listing cache."""
+    browser = make_stub_browser()
+    browser.state.current_dir = str(directory)
+    browser.state.sort_column = "#0"
+    browser.state.sort_reverse = False
+    browser.config.filetypes = []
+    browser.config.select = "file"
+    browser.filter_var.get.return_value = "All files"
+    browser.file_info_manager = FileInfoManager()
+    browser.scanner = DirectoryScanner(browser.file_info_manager)
+    browser.loader = DirectoryLoader(browser, browser.scanner, threaded=False)
+    browser.scan_result = None
+    browser.listing_cache = listing_cache
+    browser._file_selection.return_value = []
+    return browser
+
+
+class TestLoadFilesWithCache:
+    def test_first_load_stores_listing(self, listing_dir, cache):
+        browser = make_browser(listing_dir, cache)
+
+        view.load_files(browser)
+
+        assert len(browser.file_list) == 3
+        stamp = directory_stamp(str(listing_dir))
+        assert len(cache.load(str(listing_dir), stamp, FileInfoManager())) == 3
+
+    def test_cached_listing_is_painted_then_revalidated(self, listing_dir, cache):
+        view.load_files(make_browser(listing_dir, cache))
+        # Changed in place: the directory mtime, and so the cache, stays valid
+        (listing_dir / "a.txt").write_text("longer content")
+        os.utime(listing_dir / "a.txt", (1_000_000, 1_000_000))
+
+        browser = make_browser(listing_dir, cache)
+        with patch.object(
+            view, "_apply_file_changes", wraps=view._apply_file_changes  # pylint: disable=protected-access
+        ) as mock_apply:
+            view.load_files(browser)
+
+        # Only the changed row is applied after the revalidating scan
+        resolved = mock_apply.call_args[0][1]
+        assert list(resolved) == [str(listing_dir / "a.txt")]
+        assert browser.file_list.get(str(listing_dir / "a.txt")).size_bytes == 14
+        assert browser.scan_result.file_count == 2
+        assert browser.scan_result.total_size == 24
+
+    def test_cache_hit_paints_before_the_scan(self, listing_dir, cache):
+        view.load_files(make_browser(listing_dir, cache))
+        browser = make_browser(listing_dir, cache)
+        browser.loader = Mock()
+
+        view.load_files(browser)
+
+        # The scan has not run, yet the listing is shown with totals
+        assert len(browser.file_list) == 3
+        assert browser.scan_result.folder_count == 1
+        browser.loader.load.assert_called_once()
+
+    def test_database_errors_fall_back_to_scan(self, listing_dir, cache):
+        browser = make_browser(listing_dir, cache)
+        with patch.object(
+            cache, "_db", MagicMock(execute=Mock(side_effect=sqlite3.OperationalError))
+        ):
+            view.load_files(browser)
+
+        assert len(browser.file_list) == 3
@@ -0,0 +1,235 @@
+"""
+Tests for tkface.widget.pathbrowser.loader.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryLoader,
+    DirectoryScanner,
+    FileInfoManager,
+    ScanResult,
+)
+
+
+class FakeWidget:
+    """Collects after() callbacks so tests can run the pump by hand."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, func):  # pylint: disable=unused-argument
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        callbacks = list(self.pending.values())
+        self.pending.clear()
+        for func in callbacks:
+            func()
+
+
+def pump_until(widget, predicate, timeout=5.0):
+    """Run the after() queue until predicate() is true."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "loader did not finish in time"
+        widget.run_pending()
+        time.sleep(0.005)
+
+
+class BlockingScanner:
+    """Scanner stub that blocks the first scan until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.paths = []
+
+    def scan(self, path, **kwargs):
+        self.paths.append(path)
+        if len(self.paths) == 1:
+            self.started.set()
+            self.release.wait(5)
+        return ScanResult(path=path)
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized type labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+@pytest.fixture
+def listing_dir(tmp_path):
+    for i in range(25):
+        (tmp_path / f"file_{i:02d}.txt").write_text("x")
+    (tmp_path / "sub").mkdir()
+    return tmp_path
+
+
+def make_callbacks():
+    return {"on_batch": Mock(), "on_complete": Mock(), "on_error": Mock()}
+
+
+class TestDirectoryLoader:
+    def test_inline_load_delivers_synchronously(self, listing_dir):
+        widget = FakeWidget()
+        loader = DirectoryLoader(
+            widget, DirectoryScanner(FileInfoManager()), batch_size=10, threaded=False
+        )
+        callbacks = make_callbacks()
+
+        loader.load(str(listing_dir), **callbacks)
+
+        assert callbacks["on_batch"].call_count == 3
+        delivered = sum(len(c.args[0]) for c in callbacks["on_batch"].call_args_list)
+        assert delivered == 26
+        result = callbacks["on_complete"].call_args.args[0]
+        assert result.file_count == 25 and result.folder_count == 1
+        assert not loader.is_loading()
+        assert widget.pending == {}
+
+    def test_threaded_load_delivers_through_pump(self, listing_dir):
+        widget = FakeWidget()
+        loader = DirectoryLoader(
+            widget, DirectoryScanner(FileInfoManager()), batch_size=10
+        )
+        callbacks = make_callbacks()
+        caller = threading.current_thread()
+        threads = []
+        callbacks["on_batch"].side_effect = lambda batch: threads.append(
+            threading.current_thread()
+        )
+
+        loader.load(str(listing_dir), **callbacks)
+        assert loader.is_loading(str(listing_dir))
+        pump_until(widget, lambda: callbacks["on_complete"].called)
+
+        assert callbacks["on_batch"].call_count == 3
+        assert all(thread is caller for thread in threads)
+        assert not loader.is_loading()
+
+    def test_worker_does_not_touch_cache(self, listing_dir):
+        manager = FileInfoManager()
+        widget = FakeWidget()
+        loader = DirectoryLoader(widget, DirectoryScanner(manager))
+        callbacks = make_callbacks()
+
+        loader.load(str(listing_dir), **callbacks)
+        pump_until(widget, lambda: callbacks["on_complete"].called)
+
+        assert manager.get_cache_size() == 0
+
+    def test_stale_generation_results_are_dropped(self, listing_dir, tmp_path_factory):
+        other_dir = tmp_path_factory.mktemp("other")
+        (other_dir / "only.txt").write_text("x")
+        widget = FakeWidget()
+        loader = DirectoryLoader(widget, DirectoryScanner(FileInfoManager()))
+        first = make_callbacks()
+        second = make_callbacks()
+
+        first_generation = loader.load(str(listing_dir), **first)
+        # Let the first scan finish completely before superseding it
+        deadline = time.monotonic() + 5
+        while loader._queue.qsize() < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        second_generation = loader.load(str(other_dir), **second)
+        pump_until(widget, lambda: second["on_complete"].called)
+
+        assert second_generation == first_generation + 1
+        first["on_batch"].assert_not_called()
+        first["on_complete"].assert_not_called()
+        names = [info.name for info in second["on_batch"].call_args.args[0]]
+        assert names == ["only.txt"]
+
+    def test_superseded_pending_requests_are_not_scanned(self):
+        scanner = BlockingScanner()
+        widget = FakeWidget()
+        loader = DirectoryLoader(widget, scanner)
+        last = make_callbacks()
+
+        loader.load("/first", **make_callbacks())
+        assert scanner.started.wait(5)
+        loader.load("/second", **make_callbacks())
+        loader.load("/third", **last)
+        scanner.release.set()
+        pump_until(widget, lambda: last["on_complete"].called)
+
+        assert scanner.paths == ["/first", "/third"]
+
+    def test_error_is_delivered(self, tmp_path):
+        widget = FakeWidget()
+        loader = DirectoryLoader(widget, DirectoryScanner(FileInfoManager()))
+        callbacks = make_callbacks()
+
+        loader.load(str(tmp_path / "missing"), **callbacks)
+        pump_until(widget, lambda: callbacks["on_error"].called)
+
+        assert isinstance(callbacks["on_error"].call_args.args[0], OSError)
+        callbacks["on_complete"].assert_not_called()
+        assert not loader.is_loading()
+
+    def test_cancel_drops_results_and_stops_pump(self, listing_dir):
+        widget = FakeWidget()
+        loader = DirectoryLoader(widget, DirectoryScanner(FileInfoManager()))
+        callbacks = make_callbacks()
+
+        loader.load(str(listing_dir), **callbacks)
+        loader.cancel()
+        time.sleep(0.05)
+        widget.run_pending()
+
+        callbacks["on_batch"].assert_not_called()
+        callbacks["on_complete"].assert_not_called()
+        assert widget.pending == {}
+        assert not loader.is_loading()
+
+    def test_close_stops_the_worker(self, listing_dir):
+        widget = FakeWidget()
+        loader = DirectoryLoader(widget, DirectoryScanner(FileInfoManager()))
+        callbacks = make_callbacks()
+        loader.load(str(listing_dir), **callbacks)
+        pump_until(widget, lambda: callbacks["on_complete"].called)
+        thread = loader._thread  # noqa: SLF001 (test internals acceptable)
+
+        loader.close()
+        thread.join(5)
+
+        assert not thread.is_alive()
+        assert widget.pending == {}
+        # A closed loader ignores further requests
+        loader.load(str(listing_dir), **make_callbacks())
+        assert not loader.is_loading()
+        assert loader._thread is thread  # noqa: SLF001
+
+    def test_pump_respects_time_slice(self, listing_dir):
+        widget = FakeWidget()
+        loader = DirectoryLoader(
+            widget, DirectoryScanner(FileInfoManager()), batch_size=1, time_slice_ms=0
+        )
+        callbacks = make_callbacks()
+
+        loader.load(str(listing_dir), **callbacks)
+        deadline = time.monotonic() + 5
+        while loader._queue.qsize() < 27 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        widget.run_pending()
+
+        # A zero-length slice delivers nothing and reschedules itself
+        callbacks["on_batch"].assert_not_called()
+        assert widget.pending
+        loader.cancel()
@@ -5,14 +5,16 @@ Targets uncovered lines: 72, 103, 123, 151-156.
 """
 
 import os
+import sys
 import tempfile
+import time
 import tkinter as tk
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
-from tkface.widget.pathbrowser import FileInfoManager, PathBrowser
+from tkface.widget.pathbrowser import FileInfo, FileInfoManager, PathBrowser
 
 
 class TestPathBrowserCoreUpdates:
@@ -310,3 +312,249 @@ class TestFileInfoManagerCoverage:
                 pass
 
 
+class TestFileInfoRecord:
+    def test_record_has_no_instance_dict(self):
+        info = FileInfo("/d/a.txt", "a.txt", False, 10, file_type="TXT")
+        assert not hasattr(info, "__dict__")
+
+    def test_columns_are_formatted_lazily_and_memoized(self):
+        info = FileInfo("/d/a.txt", "a.txt", False, 2048, file_type="TXT", mtime=0.0)
+
+        with patch(
+            "tkface.widget.pathbrowser.manager.utils.format_size", return_value="2.0 KB"
+        ) as mock_format:
+            mock_format.assert_not_called()
+            assert info.size_str == "2.0 KB"
+            assert info.size_str == "2.0 KB"
+            mock_format.assert_called_once_with(2048)
+
+        assert info.modified == time.strftime("%Y-%m-%d %H:%M", time.localtime(0.0))
+
+    def test_folder_size_is_blank(self):
+        info = FileInfo("/d/sub", "sub", True, 0, file_type="Folder")
+        assert info.size_str == ""
+
+    def test_preformatted_columns_are_kept(self):
+        info = FileInfo("/d/a", "a", False, 1, "1 B", "2023-01-01 12:00", "TXT")
+        assert info.modified == "2023-01-01 12:00"
+        assert info == FileInfo("/d/a", "a", False, 1, "1 B", "2023-01-01 12:00", "TXT")
+
+    def test_created_records_store_raw_stat_and_intern_types(self, tmp_path):
+        (tmp_path / "a.txt").write_text("abc")
+        (tmp_path / "b.txt").write_text("abc")
+        manager = FileInfoManager(root=None)
+
+        first = manager.get_file_info(str(tmp_path / "a.txt"))
+        second = manager.get_file_info(str(tmp_path / "b.txt"))
+
+        assert first.file_type is second.file_type
+        assert first.mode == os.stat(tmp_path / "a.txt").st_mode
+        assert first._size_str is None  # pylint: disable=protected-access
+
+    def test_memory_usage_is_measured(self, tmp_path):
+        manager = FileInfoManager(root=None)
+        empty_usage = manager.get_memory_usage_estimate()
+        assert empty_usage >= sys.getsizeof(manager._cache)  # pylint: disable=protected-access
+
+        (tmp_path / "a.txt").write_text("abc")
+        info = manager.get_file_info(str(tmp_path / "a.txt"))
+
+        usage = manager.get_memory_usage_estimate()
+        assert usage >= empty_usage + sys.getsizeof(info) + sys.getsizeof(info.path)
+        # Strings shared between records are only counted once
+        seen = set()
+        info.memory_size(seen)
+        assert info.memory_size(seen) == sys.getsizeof(info)
+
+
+def make_info(path):
+    return FileInfo(path, os.path.basename(path), False, 0, file_type="TXT")
+
+
+class TestDirectoryIndex:
+    def test_clear_directory_keeps_siblings_with_common_prefix(self):
+        manager = FileInfoManager(root=None)
+        for path in ("/data/a", "/data/a/x.txt", "/data/ab", "/data/ab/y.txt"):
+            manager.add_file_info(make_info(path))
+
+        manager.clear_directory_cache("/data/a")
+
+        assert manager.get_cache_size() == 2
+        assert set(manager._cache) == {"/data/ab", "/data/ab/y.txt"}  # pylint: disable=protected-access
+
+    def test_clear_directory_evicts_whole_subtree(self):
+        manager = FileInfoManager(root=None)
+        for path in ("/data/a/b/c/deep.txt", "/data/a/top.txt", "/data/other.txt"):
+            manager.add_file_info(make_info(path))
+
+        manager.clear_directory_cache("/data/a/")
+
+        assert list(manager._cache) == ["/data/other.txt"]  # pylint: disable=protected-access
+        # Index entries of the evicted subtree are dropped as well
+        assert "/data/a" not in manager._subdirs.get("/data", ())  # pylint: disable=protected-access
+        assert "/data/a/b/c" not in manager._children  # pylint: disable=protected-access
+
+    def test_clear_directory_only_visits_evicted_entries(self):
+        manager = FileInfoManager(root=None, max_cache_size=100_000)
+        for i in range(50_000):
+            manager.add_file_info(make_info(f"/big/file_{i}.txt"))
+        manager.add_file_info(make_info("/small/file.txt"))
+
+        with patch("tkface.widget.pathbrowser.manager.os.path.dirname",
+                   wraps=os.path.dirname) as mock_dirname:
+            manager.clear_directory_cache("/small")
+
+        assert mock_dirname.call_count < 10
+        assert manager.get_cache_size() == 50_000
+
+    def test_lru_eviction_and_removal_keep_index_consistent(self):
+        manager = FileInfoManager(root=None, max_cache_size=2)
+        for path in ("/d/one/a.txt", "/d/two/b.txt", "/d/three/c.txt"):
+            manager.add_file_info(make_info(path))
+        manager.remove_from_cache("/d/two/b.txt")
+
+        assert "/d/one" not in manager._children  # pylint: disable=protected-access
+        assert "/d/two" not in manager._children  # pylint: disable=protected-access
+        assert manager._subdirs["/d"] == {"/d/three"}  # pylint: disable=protected-access
+
+        manager.clear_cache()
+        assert not manager._children and not manager._subdirs  # pylint: disable=protected-access
+
+
+class TestCacheLimits:
+    def test_byte_budget_evicts_least_recently_used(self):
+        one_record = FileInfoManager(root=None)
+        one_record.add_file_info(make_info("/d/file_0.txt"))
+        budget = one_record.cache_bytes * 3
+
+        manager = FileInfoManager(root=None, max_cache_size=None, max_cache_bytes=budget)
+        for i in range(10):
+            manager.add_file_info(make_info(f"/d/file_{i}.txt"))
+
+        assert manager.cache_bytes <= budget
+        assert list(manager._cache) == [  # pylint: disable=protected-access
+            "/d/file_7.txt",
+            "/d/file_8.txt",
+            "/d/file_9.txt",
+        ]
+        assert manager.get_cache_stats()["evictions"] == 7
+
+    def test_bytes_are_released_on_removal(self):
+        manager = FileInfoManager(root=None)
+        for path in ("/d/a.txt", "/d/b.txt", "/d/sub/c.txt", "/e/d.txt"):
+            manager.add_file_info(make_info(path))
+        manager.add_file_info(make_info("/d/a.txt"))
+
+        manager.remove_from_cache("/e/d.txt")
+        manager.clear_directory_cache("/d")
+
+        assert manager.cache_bytes == 0
+
+    def test_trim_keeps_most_recently_used(self):
+        manager = FileInfoManager(root=None)
+        for i in range(10):
+            manager.add_file_info(make_info(f"/d/file_{i}.txt"))
+
+        assert manager.trim_cache(0.5) == 5
+        assert list(manager._cache)[0] == "/d/file_5.txt"  # pylint: disable=protected-access
+
+    def test_unchanged_record_survives_revalidation(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("abc")
+        manager = FileInfoManager(root=None, ttl=0)
+        first = manager.get_file_info(str(path))
+
+        assert manager.get_file_info(str(path)) is first
+        assert manager.get_cache_stats()["revalidations"] == 0
+
+    def test_changed_record_is_rebuilt(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("abc")
+        manager = FileInfoManager(root=None, ttl=0)
+        manager.get_file_info(str(path))
+
+        path.write_text("longer")
+        future = time.time() + 10
+        os.utime(path, (future, future))
+
+        assert manager.get_file_info(str(path)).size_bytes == 6
+        assert manager.get_cache_stats()["revalidations"] == 1
+
+    def test_records_are_not_revalidated_within_ttl(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("abc")
+        manager = FileInfoManager(root=None, ttl=3600)
+        first = manager.get_file_info(str(path))
+
+        with patch(
+            "tkface.widget.pathbrowser.manager.os.stat",
+            side_effect=AssertionError("stat"),
+        ):
+            assert manager.get_file_info(str(path)) is first
+
+    def test_failed_lookup_is_retried_after_error_ttl(self, tmp_path):
+        path = tmp_path / "late.txt"
+        remembering = FileInfoManager(root=None, error_ttl=3600)
+        retrying = FileInfoManager(root=None, error_ttl=0)
+        with patch(
+            "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+        ):
+            remembering.get_file_info(str(path))
+            retrying.get_file_info(str(path))
+            path.write_text("abc")
+
+            assert remembering.get_file_info(str(path)).size_bytes == 0
+            assert retrying.get_file_info(str(path)).size_bytes == 3
+
+    def test_unchanged_directory_vouches_for_its_records(self, tmp_path):
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (tmp_path / name).write_text(name)
+        settled = time.time() - 100
+        os.utime(tmp_path, (settled, settled))
+        clock = Mock(monotonic=Mock(return_value=0.0))
+        with patch("tkface.widget.pathbrowser.manager.time", clock):
+            manager = FileInfoManager(root=None, ttl=30)
+            first = [manager.get_file_info(str(path)) for path in tmp_path.iterdir()]
+            manager.filesystem = Mock(wraps=manager.filesystem)
+            clock.monotonic.return_value = 100.0
+
+            again = [manager.get_file_info(info.path) for info in first]
+
+        assert again == first
+        manager.filesystem.stat.assert_called_once_with(str(tmp_path))
+        assert manager.get_cache_stats()["revalidations"] == 0
+
+    def test_records_of_a_changed_directory_are_checked(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("abc")
+        settled = time.time() - 100
+        os.utime(tmp_path, (settled, settled))
+        clock = Mock(monotonic=Mock(return_value=0.0))
+        with patch("tkface.widget.pathbrowser.manager.time", clock):
+            manager = FileInfoManager(root=None, ttl=30)
+            manager.get_file_info(str(path))
+            path.write_text("longer")
+            os.utime(path, (settled, settled))
+            (tmp_path / "new.txt").write_text("")
+            clock.monotonic.return_value = 100.0
+
+            assert manager.get_file_info(str(path)).size_bytes == 6
+
+    def test_records_without_mode_are_not_retried_as_failures(self):
+        manager = FileInfoManager(root=None, error_ttl=0)
+        record = make_info("/archive/member.txt")
+        manager.add_file_info(record)
+
+        assert record.mode == 0
+        assert manager.get_file_info(record.path) is record
+
+    def test_cache_stats_report_hit_rate(self, tmp_path):
+        (tmp_path / "a.txt").write_text("abc")
+        manager = FileInfoManager(root=None)
+        for _ in range(4):
+            manager.get_file_info(str(tmp_path / "a.txt"))
+
+        stats = manager.get_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (3, 1, 0.75)
+        assert stats["entries"] == 1
+        assert stats["bytes"] == manager.cache_bytes > 0
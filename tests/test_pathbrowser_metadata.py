@@ -0,0 +1,246 @@
+"""
+Tests for tkface.widget.pathbrowser.metadata.
+"""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryScanner,
+    FileInfo,
+    FileInfoManager,
+    FileListModel,
+    MetadataFiller,
+    PendingFileInfo,
+    view,
+)
+from tkface.widget.pathbrowser.utils import format_size
+
+from pathbrowser_stubs import make_stub_browser
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized type labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ), patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+class FakeWidget:
+    """Collects after() callbacks so tests can run the pump by hand."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, func):  # pylint: disable=unused-argument
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self, timeout=5.0):
+        """Run scheduled callbacks until none are left."""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            callbacks = list(self.pending.values())
+            self.pending.clear()
+            for func in callbacks:
+                func()
+            time.sleep(0.001)
+
+
+def make_tree(tmp_path, count=5):
+    for i in range(count):
+        (tmp_path / f"file{i}.txt").write_bytes(b"x" * (i + 1))
+    (tmp_path / "sub").mkdir()
+    return tmp_path
+
+
+def make_filler(threaded=False):
+    widget = FakeWidget()
+    delivered = []
+    idle = []
+    filler = MetadataFiller(
+        widget,
+        FileInfoManager(),
+        on_records=delivered.extend,
+        on_idle=lambda: idle.append(True),
+        threaded=threaded,
+    )
+    return widget, filler, delivered, idle
+
+
+class TestNamesOnlyScan:
+    def test_records_are_pending_and_not_cached(self, tmp_path):
+        make_tree(tmp_path)
+        manager = FileInfoManager()
+
+        result = DirectoryScanner(manager).scan(str(tmp_path), names_only=True)
+
+        assert result.names_only
+        assert len(result.entries) == 6
+        assert all(isinstance(entry, PendingFileInfo) for entry in result.entries)
+        assert all(entry.size_str == "" for entry in result.entries)
+        assert result.folder_count == 1 and result.file_count == 5
+        assert result.unsized == 5
+        assert result.stat_time == 0.0
+        assert not manager._cache  # noqa: SLF001 (test internals acceptable)
+
+    def test_type_labels_match_a_full_scan(self, tmp_path):
+        make_tree(tmp_path)
+        manager = FileInfoManager()
+        scanner = DirectoryScanner(manager)
+
+        quick = scanner.scan(str(tmp_path), names_only=True, cache=False)
+        full = scanner.scan(str(tmp_path), cache=False)
+
+        assert {e.path: e.file_type for e in quick.entries} == {
+            e.path: e.file_type for e in full.entries
+        }
+
+
+def make_status_browser(scan_result):
+    browser = make_stub_browser()
+    browser.state.current_dir = scan_result.path
+    browser.scan_result = scan_result
+    browser.loader.is_loading.return_value = False
+    return browser
+
+
+class TestDirectoryStatus:
+    def test_total_size_waits_for_every_file(self, tmp_path):
+        make_tree(tmp_path)
+        manager = FileInfoManager()
+        result = DirectoryScanner(manager).scan(str(tmp_path), names_only=True)
+        browser = make_status_browser(result)
+        pending = [entry for entry in result.entries if not entry.is_dir]
+
+        for entry in pending[:-1]:
+            view._adjust_totals(result, entry, manager.get_file_info(entry.path))
+        view.update_directory_status(browser)
+        assert browser.status_var.set.call_args[0][0] == "1 folder, 5 files"
+
+        last = pending[-1]
+        view._adjust_totals(result, last, manager.get_file_info(last.path))
+        view.update_directory_status(browser)
+        status = browser.status_var.set.call_args[0][0]
+        assert status == f"1 folder, 5 files ({format_size(15)})"
+
+    def test_stale_scan_is_not_redone_on_the_tk_thread(self, tmp_path):
+        result = DirectoryScanner().scan(str(tmp_path))
+        browser = make_status_browser(result)
+        browser.state.current_dir = str(tmp_path / "unreadable")
+        browser.scanner = Mock()
+
+        view.update_directory_status(browser)
+
+        browser.scanner.scan.assert_not_called()
+        browser.status_var.set.assert_called_once_with("")
+
+
+class TestMetadataFiller:
+    def test_fills_rows_in_requested_order(self, tmp_path):
+        make_tree(tmp_path)
+        rows = DirectoryScanner().scan(str(tmp_path), names_only=True).entries
+        rows.sort(key=lambda row: row.name, reverse=True)
+        widget, filler, delivered, idle = make_filler()
+
+        filler.request(rows)
+        widget.run_pending()
+
+        assert [info.path for info in delivered] == [row.path for row in rows]
+        assert not any(isinstance(info, PendingFileInfo) for info in delivered)
+        sizes = {info.name: info.size_bytes for info in delivered}
+        assert sizes["file4.txt"] == 5
+        assert idle == [True]
+        assert filler.idle
+
+    def test_new_request_replaces_the_old_one(self, tmp_path):
+        make_tree(tmp_path)
+        rows = DirectoryScanner().scan(str(tmp_path), names_only=True).entries
+        widget, filler, delivered, _ = make_filler()
+
+        filler.request(rows)
+        filler.request(rows[:2])
+        widget.run_pending()
+
+        assert [info.path for info in delivered] == [row.path for row in rows[:2]]
+
+    def test_cancel_drops_everything(self, tmp_path):
+        make_tree(tmp_path)
+        rows = DirectoryScanner().scan(str(tmp_path), names_only=True).entries
+        widget, filler, delivered, idle = make_filler()
+
+        filler.request(rows)
+        filler.cancel()
+        widget.run_pending()
+
+        assert delivered == []
+        assert idle == []
+
+    def test_missing_path_keeps_its_listing_data(self, tmp_path):
+        row = PendingFileInfo(
+            str(tmp_path / "gone.txt"), "gone.txt", False, 0, "", "", "TXT"
+        )
+        widget, filler, delivered, _ = make_filler()
+
+        filler.request([row])
+        widget.run_pending()
+
+        assert len(delivered) == 1
+        assert not isinstance(delivered[0], PendingFileInfo)
+        assert delivered[0].file_type == "TXT"
+
+    def test_threaded_worker(self, tmp_path):
+        make_tree(tmp_path)
+        rows = DirectoryScanner().scan(str(tmp_path), names_only=True).entries
+        widget, filler, delivered, idle = make_filler(threaded=True)
+
+        filler.request(rows)
+        widget.run_pending()
+        filler.close()
+
+        assert sorted(info.path for info in delivered) == sorted(
+            row.path for row in rows
+        )
+        assert idle == [True]
+
+
+class TestModelUpdateRows:
+    def test_keeps_the_order_and_reports_changed_sort_keys(self):
+        rows = [
+            PendingFileInfo(f"/d/{name}", name, False, 0, "", "", "TXT")
+            for name in ("a", "b", "c")
+        ]
+        model = FileListModel()
+        model.extend(rows)
+        model.sort("size", reverse=False)
+        complete = FileInfo("/d/a", "a", False, 100, "100 B", "", "TXT")
+
+        assert model.update_rows([complete])
+        assert model.paths() == ["/d/a", "/d/b", "/d/c"]
+        assert model.get("/d/a") is complete
+
+        model.sort("size", reverse=False)
+        assert model.paths() == ["/d/b", "/d/c", "/d/a"]
+
+    def test_name_sort_is_unaffected(self):
+        model = FileListModel()
+        model.extend(
+            [PendingFileInfo("/d/a", "a", False, 0, "", "", "TXT")]
+        )
+        model.sort("#0", reverse=False)
+
+        assert not model.update_rows(
+            [FileInfo("/d/a", "a", False, 5, "5 B", "", "TXT")]
+        )
@@ -0,0 +1,292 @@
+"""
+Tests for tkface.widget.pathbrowser.model.
+"""
+
+from unittest.mock import patch
+
+from tkface.widget.pathbrowser import FileInfo, FileListModel, SelectedPaths
+
+
+def make_rows(*names):
+    return [
+        FileInfo(f"/d/{name}", name, False, 0, "0 B", "", "TXT") for name in names
+    ]
+
+
+class TestFileListModel:
+    def test_extend_and_lookup(self):
+        model = FileListModel()
+        model.extend(make_rows("a", "b"))
+        model.extend(make_rows("c"))
+
+        assert len(model) == 3
+        assert model.paths() == ["/d/a", "/d/b", "/d/c"]
+        assert model.index_of("/d/c") == 2
+        assert model.index_of("/d/missing") is None
+        assert model.path_at(1) == "/d/b"
+        assert model.row(0).name == "a"
+        assert model.paths_between(1, 3) == ["/d/b", "/d/c"]
+
+    def test_empty_model_is_falsy(self):
+        model = FileListModel()
+        assert not model
+        model.extend(make_rows("a"))
+        assert model
+
+    def test_sort_by_name_is_casefolded(self):
+        model = FileListModel()
+        model.extend(make_rows("b", "C", "a"))
+
+        model.sort("#0")
+
+        assert model.paths() == ["/d/a", "/d/b", "/d/C"]
+        assert model.index_of("/d/C") == 2
+
+    def test_sort_by_size_and_modified_puts_folders_first(self):
+        model = FileListModel()
+        model.extend([
+            FileInfo("/d/big", "big", False, 50, "", "", "TXT", mtime=1.0),
+            FileInfo("/d/dir", "dir", True, 0, "", "", "Folder", mtime=9.0),
+            FileInfo("/d/small", "small", False, 5, "", "", "TXT", mtime=2.0),
+        ])
+
+        model.sort("size")
+        assert model.paths() == ["/d/dir", "/d/small", "/d/big"]
+        model.sort("modified", reverse=True)
+        assert model.paths() == ["/d/small", "/d/big", "/d/dir"]
+
+    def test_sort_by_type_breaks_ties_by_name(self):
+        model = FileListModel()
+        model.extend([
+            FileInfo("/d/b.py", "b.py", False, 0, "", "", "PY"),
+            FileInfo("/d/a.txt", "a.txt", False, 0, "", "", "TXT"),
+            FileInfo("/d/a.py", "a.py", False, 0, "", "", "PY"),
+        ])
+
+        model.sort("type")
+
+        assert model.paths() == ["/d/a.py", "/d/b.py", "/d/a.txt"]
+
+    def test_sort_uses_precomputed_keys(self):
+        model = FileListModel()
+        model.extend(make_rows("b", "a"))
+
+        with patch(
+            "tkface.widget.pathbrowser.model.make_sort_keys",
+            side_effect=AssertionError("keys recomputed"),
+        ):
+            model.sort("size")
+            model.sort("#0", reverse=True)
+
+        assert model.paths() == ["/d/b", "/d/a"]
+
+    def test_sort_keeps_selection(self):
+        model = FileListModel()
+        model.extend(make_rows("b", "a"))
+        model.select(["/d/b"])
+
+        model.sort("#0")
+
+        assert model.selection() == ["/d/b"]
+        assert model.index_of("/d/b") == 1
+
+    def test_selection_is_in_display_order(self):
+        model = FileListModel()
+        model.extend(make_rows("a", "b", "c"))
+
+        model.select(["/d/c", "/d/a", "/d/unknown"])
+
+        assert model.selection() == ["/d/a", "/d/c"]
+        assert model.is_selected("/d/a")
+        assert not model.is_selected("/d/b")
+
+    def test_toggle(self):
+        model = FileListModel()
+        model.extend(make_rows("a", "b"))
+
+        model.toggle("/d/b")
+        assert model.selection() == ["/d/b"]
+        model.toggle("/d/b")
+        assert model.selection() == []
+
+    def test_set_rows_drops_selection_of_removed_rows(self):
+        model = FileListModel()
+        model.extend(make_rows("a", "b"))
+        model.select(["/d/a", "/d/b"])
+
+        model.set_rows(make_rows("b", "c"))
+
+        assert model.selection() == ["/d/b"]
+
+    def test_clear(self):
+        model = FileListModel()
+        model.extend(make_rows("a"))
+        model.select(["/d/a"])
+
+        model.clear()
+
+        assert len(model) == 0
+        assert model.selection() == []
+        assert model.index_of("/d/a") is None
+
+    def test_filter_hides_rows_without_removing_them(self):
+        model = FileListModel()
+        model.set_filter(lambda row: row.name != "b")
+        shown = model.extend(make_rows("a", "b", "c"))
+
+        assert [row.name for row in shown] == ["a", "c"]
+        assert model.paths() == ["/d/a", "/d/c"]
+        assert len(model) == 2
+        assert model.total == 3
+        assert model.index_of("/d/b") is None
+        assert model.index_of("/d/c") == 1
+
+        model.set_filter(None)
+        assert model.paths() == ["/d/a", "/d/b", "/d/c"]
+
+    def test_filter_keeps_sort_order(self):
+        model = FileListModel()
+        model.extend(make_rows("c", "a", "b"))
+        model.sort("#0", reverse=True)
+
+        model.set_filter(lambda row: row.name != "b")
+
+        assert model.paths() == ["/d/c", "/d/a"]
+        assert model.index_of("/d/a") == 1
+
+    def test_filter_drops_hidden_rows_from_selection(self):
+        model = FileListModel()
+        model.extend(make_rows("a", "b"))
+        model.select(["/d/a", "/d/b"])
+
+        model.set_filter(lambda row: row.name == "a")
+
+        assert model.selection() == ["/d/a"]
+        model.select(["/d/b"])
+        assert model.selection() == []
+
+    def test_filter_survives_clear(self):
+        model = FileListModel()
+        model.set_filter(lambda row: row.name == "a")
+        model.clear()
+        model.extend(make_rows("a", "b"))
+
+        assert model.paths() == ["/d/a"]
+
+    def test_apply_changes_updates_adds_and_removes(self):
+        model = FileListModel()
+        model.extend(make_rows("a", "b", "c"))
+        model.sort("size")
+        model.select(["/d/b", "/d/c"])
+
+        model.apply_changes(
+            rows=[
+                FileInfo("/d/a", "a", False, 99, "", "", "TXT"),
+                FileInfo("/d/aa", "aa", False, 1, "", "", "TXT"),
+            ],
+            removed=["/d/b", "/d/missing"],
+        )
+
+        assert model.paths() == ["/d/c", "/d/aa", "/d/a"]
+        assert model.get("/d/a").size_bytes == 99
+        assert model.get("/d/b") is None
+        assert model.selection() == ["/d/c"]
+
+    def test_apply_changes_respects_filter(self):
+        model = FileListModel()
+        model.set_filter(lambda row: row.file_type == "TXT")
+        model.extend(make_rows("a"))
+
+        model.apply_changes(rows=[FileInfo("/d/a", "a", False, 0, "", "", "PY")])
+
+        assert len(model) == 0
+        assert model.total == 1
+        assert [row.file_type for row in model.all_rows()] == ["PY"]
+
+    def test_find_prefix_is_casefolded(self):
+        model = FileListModel()
+        model.extend(make_rows("notes", "Report", "readme", "report_2024"))
+        model.sort("#0")
+
+        assert model.find_prefix("RE") == "/d/readme"
+        assert model.find_prefix("rep") == "/d/Report"
+        assert model.find_prefix("x") is None
+        assert model.find_prefix("") is None
+
+    def test_find_prefix_starts_at_position_and_wraps(self):
+        model = FileListModel()
+        model.extend(make_rows("a1", "b1", "a2", "b2"))
+
+        # Insertion order is the display order here
+        assert model.find_prefix("a", start=1) == "/d/a2"
+        assert model.find_prefix("a", start=3) == "/d/a1"
+
+    def test_find_prefix_skips_hidden_rows(self):
+        model = FileListModel()
+        model.extend(make_rows("a1", "a2"))
+        model.set_filter(lambda row: row.name != "a1")
+
+        assert model.find_prefix("a") == "/d/a2"
+
+    def test_find_prefix_index_follows_changes(self):
+        model = FileListModel()
+        model.extend(make_rows("a"))
+        assert model.find_prefix("b") is None
+
+        model.extend(make_rows("b"))
+        assert model.find_prefix("b") == "/d/b"
+        model.apply_changes(removed=["/d/b"])
+        assert model.find_prefix("b") is None
+
+    def test_find_prefix_does_not_resort(self):
+        model = FileListModel()
+        model.extend(make_rows("b", "a"))
+        model.find_prefix("a")
+
+        with patch("tkface.widget.pathbrowser.model.sorted") as mock_sorted:
+            assert model.find_prefix("b") == "/d/b"
+        mock_sorted.assert_not_called()
+
+
+class TestSelectedPaths:
+    def test_follows_the_model_selection(self):
+        model = FileListModel()
+        model.extend(make_rows("a", "b", "c", "d", "e"))
+        selected = SelectedPaths(model)
+        assert not selected
+
+        model.select_range(1, 3)
+        model.select_range(4, 5, extend=True)
+
+        assert len(selected) == 3
+        assert selected == ["/d/b", "/d/c", "/d/e"]
+        assert selected[0] == "/d/b"
+        assert selected[2] == "/d/e"
+        assert selected[-1] == "/d/e"
+        assert "/d/c" in selected
+        assert "/d/d" not in selected
+        assert selected.copy() == ["/d/b", "/d/c", "/d/e"]
+
+    def test_indexing_walks_ranges_not_rows(self):
+        model = FileListModel()
+        model.extend(make_rows(*[f"{i:05d}" for i in range(10_000)]))
+        model.select_all()
+        selected = SelectedPaths(model)
+
+        with patch.object(model, "selected_rows") as mock_rows:
+            assert selected[-1] == "/d/09999"
+            assert len(selected) == 10_000
+        mock_rows.assert_not_called()
+
+    def test_dirs_only(self):
+        model = FileListModel()
+        model.extend(make_rows("a", "c"))
+        model.extend([FileInfo("/d/b", "b", True, 0, "", "", "Folder")])
+        model.select_all()
+
+        selected = SelectedPaths(model, dirs_only=True)
+
+        assert len(selected) == 1
+        assert selected == ["/d/b"]
+        assert "/d/b" in selected
+        assert "/d/a" not in selected
@@ -0,0 +1,333 @@
+"""
+Tests for tkface.widget.pathbrowser.prefetch.
+"""
+
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryScanner,
+    FileInfoManager,
+    SubdirPrefetcher,
+    view,
+)
+
+from pathbrowser_stubs import make_stub_browser
+
+
+class FakeWidget:
+    """Collects after() callbacks so tests can run the pump by hand."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, func):  # pylint: disable=unused-argument
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self, timeout=5.0):
+        """Run scheduled callbacks until none are left."""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            callbacks = list(self.pending.values())
+            self.pending.clear()
+            for func in callbacks:
+                func()
+            time.sleep(0.001)
+
+
+class FakeTree:
+    """Minimal directory Treeview keeping children in order."""
+
+    def __init__(self):
+        self.children = {"": []}
+        self.parents = {}
+        self.open = {}
+
+    def exists(self, iid):
+        return iid in self.parents
+
+    def get_children(self, iid=""):
+        return tuple(self.children.get(iid, ()))
+
+    def item(self, iid, option=None, **kwargs):
+        if "open" in kwargs:
+            self.open[iid] = kwargs["open"]
+        if option == "open":
+            return self.open.get(iid, False)
+        return None
+
+    def insert(self, parent, index, iid, **options):  # pylint: disable=unused-argument
+        siblings = self.children[parent]
+        siblings.insert(len(siblings) if index == "end" else index, iid)
+        self.children[iid] = []
+        self.parents[iid] = parent
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            for child in list(self.children.get(iid, ())):
+                self.delete(child)
+            self.children[self.parents[iid]].remove(iid)
+            del self.children[iid], self.parents[iid]
+
+    def selection_set(self, iid):
+        pass
+
+    def see(self, iid):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+@pytest.fixture
+def tree_dir(tmp_path):
+    """base/{current/{deep/}, empty/, full/{x/}, file.txt}"""
+    (tmp_path / "current" / "deep").mkdir(parents=True)
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "full" / "x").mkdir(parents=True)
+    (tmp_path / "file.txt").write_text("x")
+    return tmp_path
+
+
+def make_prefetcher(widget=None, on_result=None, threaded=False):
+    return SubdirPrefetcher(
+        widget or FakeWidget(),
+        DirectoryScanner(FileInfoManager()),
+        on_result or Mock(),
+        threaded=threaded,
+    )
+
+
+class TestSubdirPrefetcher:
+    def test_lists_requested_directories(self, tree_dir):
+        widget = FakeWidget()
+        on_result = Mock()
+        prefetcher = make_prefetcher(widget, on_result)
+
+        prefetcher.request([str(tree_dir / "full"), str(tree_dir / "empty")])
+        widget.run_pending()
+
+        assert prefetcher.get(str(tree_dir / "full")) == [
+            ("x", str(tree_dir / "full" / "x"))
+        ]
+        assert prefetcher.has_subdirs(str(tree_dir / "full")) is True
+        assert prefetcher.has_subdirs(str(tree_dir / "empty")) is False
+        assert on_result.call_count == 2
+
+    def test_idle_once_results_are_delivered(self, tree_dir):
+        widget = FakeWidget()
+        prefetcher = make_prefetcher(widget)
+        assert prefetcher.idle
+
+        prefetcher.request([str(tree_dir / "full")])
+        assert not prefetcher.idle
+
+        widget.run_pending()
+        assert prefetcher.idle
+
+    def test_unknown_directory(self, tree_dir):
+        prefetcher = make_prefetcher()
+        assert prefetcher.get(str(tree_dir)) is None
+        assert prefetcher.has_subdirs(str(tree_dir)) is None
+
+    def test_most_recent_request_is_served_first(self, tree_dir):
+        widget = FakeWidget()
+        on_result = Mock()
+        prefetcher = make_prefetcher(widget, on_result)
+
+        prefetcher.request([str(tree_dir / "empty")])
+        prefetcher.request([str(tree_dir / "full"), str(tree_dir / "current")])
+        widget.run_pending()
+
+        assert [c.args[0] for c in on_result.call_args_list] == [
+            str(tree_dir / "full"),
+            str(tree_dir / "current"),
+            str(tree_dir / "empty"),
+        ]
+
+    def test_changed_directory_is_not_handed_out(self, tree_dir):
+        widget = FakeWidget()
+        prefetcher = make_prefetcher(widget)
+        prefetcher.request([str(tree_dir / "empty")])
+        widget.run_pending()
+
+        (tree_dir / "empty" / "new").mkdir()
+        # Make sure the mtime differs even on coarse timestamp filesystems
+        future = time.time() + 10
+        os.utime(tree_dir / "empty", (future, future))
+
+        assert prefetcher.get(str(tree_dir / "empty")) is None
+
+    def test_unchanged_directory_is_not_rescanned(self, tree_dir):
+        widget = FakeWidget()
+        scanner = DirectoryScanner(FileInfoManager())
+        prefetcher = SubdirPrefetcher(widget, scanner, Mock(), threaded=False)
+        prefetcher.request([str(tree_dir / "full")])
+        widget.run_pending()
+
+        with patch.object(scanner, "scan") as mock_scan:
+            prefetcher.request([str(tree_dir / "full")])
+            widget.run_pending()
+
+        mock_scan.assert_not_called()
+        assert prefetcher.has_subdirs(str(tree_dir / "full"))
+
+    def test_unreadable_directory_reports_none(self, tree_dir):
+        widget = FakeWidget()
+        on_result = Mock()
+        prefetcher = make_prefetcher(widget, on_result)
+
+        prefetcher.request([str(tree_dir / "missing")])
+        widget.run_pending()
+
+        on_result.assert_called_once_with(str(tree_dir / "missing"), None)
+        assert prefetcher.has_subdirs(str(tree_dir / "missing")) is None
+
+    def test_oldest_listings_are_dropped(self, tree_dir):
+        widget = FakeWidget()
+        prefetcher = make_prefetcher(widget)
+        prefetcher.max_listings = 1
+
+        prefetcher.request([str(tree_dir / "full"), str(tree_dir / "empty")])
+        widget.run_pending()
+
+        assert prefetcher.has_subdirs(str(tree_dir / "full")) is None
+        assert prefetcher.has_subdirs(str(tree_dir / "empty")) is False
+
+    def test_threaded_prefetch(self, tree_dir):
+        widget = FakeWidget()
+        on_result = Mock()
+        prefetcher = make_prefetcher(widget, on_result, threaded=True)
+        try:
+            prefetcher.request([str(tree_dir / "full")])
+            widget.run_pending()
+            on_result.assert_called_once_with(
+                str(tree_dir / "full"), [("x", str(tree_dir / "full" / "x"))]
+            )
+        finally:
+            prefetcher.close()
+
+    def test_close_cancels_pump(self, tree_dir):
+        widget = FakeWidget()
+        on_result = Mock()
+        prefetcher = make_prefetcher(widget, on_result)
+        prefetcher.request([str(tree_dir / "full")])
+
+        prefetcher.close()
+        widget.run_pending()
+
+        on_result.assert_not_called()
+        assert not widget.pending
+
+
+def make_browser(current_dir):
+    """Browser stand-in with a real prefetcher and a fake directory tree."""
+    browser = make_stub_browser()
+    browser.state.current_dir = str(current_dir)
+    browser.tree = FakeTree()
+    browser.scanner = DirectoryScanner(FileInfoManager())
+    browser.widget = FakeWidget()
+    browser.prefetcher = SubdirPrefetcher(
+        browser.widget,
+        browser.scanner,
+        lambda path, subdirs: view.on_subdirs_prefetched(browser, path, subdirs),
+        threaded=False,
+    )
+    return browser
+
+
+def placeholder(path):
+    return f"{path}_placeholder"
+
+
+class TestTreePrefetch:
+    def test_expand_buttons_only_where_subdirectories_exist(self, tree_dir):
+        browser = make_browser(tree_dir / "current")
+
+        view.load_directory_tree(browser)
+        tree = browser.tree
+        # Nothing is known yet, so no node claims to be expandable
+        assert all(not tree.get_children(item) for item in tree.get_children(""))
+
+        browser.widget.run_pending()
+
+        assert tree.get_children(str(tree_dir / "current")) == (
+            placeholder(tree_dir / "current"),
+        )
+        assert tree.get_children(str(tree_dir / "full")) == (
+            placeholder(tree_dir / "full"),
+        )
+        assert tree.get_children(str(tree_dir / "empty")) == ()
+
+    def test_opening_a_prefetched_node_does_not_scan(self, tree_dir):
+        browser = make_browser(tree_dir / "current")
+        view.load_directory_tree(browser)
+        browser.widget.run_pending()
+        node = str(tree_dir / "full")
+        browser.tree.delete(placeholder(node))
+
+        with patch.object(
+            browser.scanner, "scan", side_effect=AssertionError("scanned")
+        ):
+            view.populate_tree_node(browser, node)
+
+        assert browser.tree.get_children(node) == (str(tree_dir / "full" / "x"),)
+
+    def test_populated_children_are_prefetched(self, tree_dir):
+        browser = make_browser(tree_dir / "current")
+        browser.tree.insert("", "end", str(tree_dir))
+        view.populate_tree_node(browser, str(tree_dir))
+
+        browser.widget.run_pending()
+
+        assert browser.prefetcher.has_subdirs(str(tree_dir / "current")) is True
+        assert browser.prefetcher.has_subdirs(str(tree_dir / "empty")) is False
+
+    def test_known_nodes_get_expand_buttons_on_insert(self, tree_dir):
+        browser = make_browser(tree_dir / "current")
+        view.load_directory_tree(browser)
+        browser.widget.run_pending()
+
+        # Rebuilding the tree uses what is already known
+        view.load_directory_tree(browser)
+
+        assert browser.tree.get_children(str(tree_dir / "full")) == (
+            placeholder(tree_dir / "full"),
+        )
+
+    def test_placeholder_removed_when_subdirectories_disappear(self, tree_dir):
+        browser = make_browser(tree_dir / "current")
+        node = str(tree_dir / "full")
+        browser.tree.insert("", "end", node)
+        browser.tree.insert(node, "end", placeholder(node))
+
+        view.on_subdirs_prefetched(browser, node, [])
+
+        assert browser.tree.get_children(node) == ()
+
+    def test_open_nodes_are_left_alone(self, tree_dir):
+        browser = make_browser(tree_dir / "current")
+        node = str(tree_dir / "full")
+        browser.tree.insert("", "end", node)
+        browser.tree.item(node, open=True)
+
+        view.on_subdirs_prefetched(browser, node, [("x", f"{node}/x")])
+
+        assert browser.tree.get_children(node) == ()
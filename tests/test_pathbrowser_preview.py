@@ -0,0 +1,220 @@
+"""
+Tests for tkface.widget.pathbrowser.preview.
+"""
+
+import mmap
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from tkface.widget.pathbrowser import FileInfo, PreviewCache, read_preview, view
+
+from pathbrowser_stubs import make_stub_browser
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """A 1000-line text file of 10 bytes per line."""
+    path = tmp_path / "app.log"
+    path.write_bytes(b"".join(b"line %04d\n" % i for i in range(1000)))
+    return path
+
+
+class TestReadPreview:
+    def test_small_file_is_read_whole(self, tmp_path):
+        path = tmp_path / "small.txt"
+        path.write_text("hello\nworld\n")
+
+        preview = read_preview(str(path))
+
+        assert preview.head == "hello\nworld\n"
+        assert preview.size == 12
+        assert not preview.truncated
+        assert not preview.binary
+
+    def test_large_file_reads_only_the_head(self, log_file):
+        preview = read_preview(str(log_file), head_bytes=25)
+
+        # Cut back to whole lines
+        assert preview.head == "line 0000\nline 0001\n"
+        assert preview.tail == ""
+        assert preview.truncated
+        assert preview.size == 10_000
+
+    def test_tail_is_read_from_the_end(self, log_file):
+        preview = read_preview(str(log_file), head_bytes=10, tail_bytes=25)
+
+        assert preview.head == "line 0000\n"
+        assert preview.tail == "line 0998\nline 0999\n"
+
+    def test_large_file_is_mapped(self, log_file):
+        with patch(
+            "tkface.widget.pathbrowser.preview.mmap.mmap", wraps=mmap.mmap
+        ) as mapped:
+            preview = read_preview(str(log_file), head_bytes=10, tail_bytes=10)
+
+        mapped.assert_called_once()
+        assert (preview.head, preview.tail) == ("line 0000\n", "line 0999\n")
+
+    def test_unmappable_file_falls_back_to_bounded_reads(self, log_file):
+        with patch(
+            "tkface.widget.pathbrowser.preview.mmap.mmap",
+            side_effect=OSError("no mmap"),
+        ):
+            preview = read_preview(str(log_file), head_bytes=10, tail_bytes=10)
+        assert (preview.head, preview.tail) == ("line 0000\n", "line 0999\n")
+
+    def test_binary_file_is_detected(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR" + b"x" * 100_000)
+
+        preview = read_preview(str(path))
+
+        assert preview.binary
+        assert preview.head == ""
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+
+        preview = read_preview(str(path))
+
+        assert (preview.head, preview.size, preview.binary) == ("", 0, False)
+
+    def test_invalid_utf8_is_replaced(self, tmp_path):
+        path = tmp_path / "latin1.txt"
+        path.write_bytes("café\n".encode("latin-1"))
+
+        assert read_preview(str(path)).head == "caf�\n"
+
+
+class TestPreviewCache:
+    def test_unchanged_file_is_not_read_again(self, log_file):
+        cache = PreviewCache(head_bytes=10)
+        first = cache.get(str(log_file))
+
+        with patch(
+            "tkface.widget.pathbrowser.preview.read_preview",
+            side_effect=AssertionError("read"),
+        ):
+            assert cache.get(str(log_file)) is first
+
+    def test_changed_file_is_read_again(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("old\n")
+        cache = PreviewCache()
+        cache.get(str(path))
+
+        path.write_text("new text\n")
+        # Make sure the mtime differs even on coarse timestamp filesystems
+        future = time.time() + 10
+        os.utime(path, (future, future))
+
+        assert cache.get(str(path)).head == "new text\n"
+
+    def test_least_recently_used_previews_are_dropped(self, tmp_path):
+        cache = PreviewCache(max_previews=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / name
+            path.write_text(name)
+            paths.append(str(path))
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])
+        cache.get(paths[2])
+
+        assert len(cache) == 2
+        with patch(
+            "tkface.widget.pathbrowser.preview.read_preview",
+            side_effect=AssertionError("read"),
+        ):
+            cache.get(paths[0])
+            cache.get(paths[2])
+
+    def test_directories_are_not_previewed(self, tmp_path):
+        with pytest.raises(OSError):
+            PreviewCache().get(str(tmp_path))
+
+
+def make_browser(selection):
+    """Browser stand-in with a real preview cache and a fake text widget."""
+    browser = make_stub_browser()
+    browser.preview_cache = PreviewCache(head_bytes=10)
+    browser.preview_after_id = None
+    browser._file_selection.return_value = list(selection)
+    browser.file_info_manager.get_cached_file_info.side_effect = lambda path: (
+        FileInfo(path, os.path.basename(path), os.path.isdir(path), 0)
+    )
+    return browser
+
+
+def shown_text(browser):
+    return browser.preview_text.insert.call_args.args[1]
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+class TestPreviewPane:
+    def test_selected_file_is_shown(self, log_file):
+        browser = make_browser([str(log_file)])
+
+        view.show_preview(browser)
+
+        assert shown_text(browser) == "line 0000\n\n…"
+        browser.preview_text.configure.assert_called_with(state="disabled")
+
+    def test_binary_file_shows_its_size(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"\0" * 2048)
+        browser = make_browser([str(path)])
+
+        view.show_preview(browser)
+
+        assert shown_text(browser) == "Binary file (2.0 KB)"
+
+    def test_directory_or_multiple_selection_clears_the_pane(self, tmp_path):
+        browser = make_browser([str(tmp_path)])
+        view.show_preview(browser)
+        assert shown_text(browser) == ""
+
+        browser = make_browser(["/a", "/b"])
+        view.show_preview(browser)
+        assert shown_text(browser) == ""
+
+    def test_unreadable_file_shows_message(self, tmp_path):
+        browser = make_browser([str(tmp_path / "missing.txt")])
+
+        view.show_preview(browser)
+
+        assert shown_text(browser) == "No preview available"
+
+    def test_rapid_selection_changes_are_debounced(self, log_file):
+        browser = make_browser([str(log_file)])
+        browser.after.side_effect = ["after#1", "after#2"]
+
+        view.schedule_preview(browser)
+        view.schedule_preview(browser)
+
+        browser.after_cancel.assert_called_once_with("after#1")
+        assert browser.preview_after_id == "after#2"
+        browser.preview_text.insert.assert_not_called()
+
+    def test_preview_disabled(self):
+        browser = make_browser([])
+        browser.preview_cache = None
+        browser.snapshots = None
+        browser.listing_stamp = None
+
+        view.schedule_preview(browser)
+
+        browser.after.assert_not_called()
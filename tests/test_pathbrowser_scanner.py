@@ -0,0 +1,310 @@
+"""
+Tests for tkface.widget.pathbrowser.scanner.
+"""
+
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryScanner,
+    FileInfoManager,
+    MemoryFileSystem,
+    ScanResult,
+    view,
+)
+from tkface.widget.pathbrowser.filesystem import FileEntry
+
+_REAL_SCANDIR = os.scandir
+
+
+class _WrappedEntry:
+    """DirEntry wrapper that reports stat calls."""
+
+    def __init__(self, entry, on_stat):
+        self._entry = entry
+        self._on_stat = on_stat
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self):
+        return self._entry.is_dir()
+
+    def stat(self):
+        self._on_stat(self.name)
+        return self._entry.stat()
+
+
+class _WrappedScandir:
+    """os.scandir replacement yielding wrapped entries."""
+
+    def __init__(self, path, on_stat):
+        self._it = _REAL_SCANDIR(path)
+        self._on_stat = on_stat
+
+    def __enter__(self):
+        return (_WrappedEntry(entry, self._on_stat) for entry in self._it)
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+
+@pytest.fixture
+def scan_tree(tmp_path):
+    """Directory with two files and two subdirectories."""
+    (tmp_path / "b.txt").write_text("hello")
+    (tmp_path / "a.py").write_text("x" * 10)
+    (tmp_path / "Zeta").mkdir()
+    (tmp_path / "alpha").mkdir()
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized type labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+class TestDirectoryScanner:
+    def test_scan_collects_entries_subdirs_and_totals(self, scan_tree):
+        scanner = DirectoryScanner(FileInfoManager())
+        result = scanner.scan(str(scan_tree))
+
+        assert isinstance(result, ScanResult)
+        assert result.path == str(scan_tree)
+        assert result.file_count == 2
+        assert result.folder_count == 2
+        assert result.total_size == 15
+        assert sorted(info.name for info in result.entries) == [
+            "Zeta", "a.py", "alpha", "b.txt"
+        ]
+        # Subdirectories are sorted case-insensitively with full paths
+        assert result.subdirs == [
+            ("alpha", os.path.join(str(scan_tree), "alpha")),
+            ("Zeta", os.path.join(str(scan_tree), "Zeta")),
+        ]
+
+    def test_scan_populates_file_info_cache(self, scan_tree):
+        manager = FileInfoManager()
+        DirectoryScanner(manager).scan(str(scan_tree))
+
+        assert manager.get_cache_size() == 4
+        path = os.path.join(str(scan_tree), "a.py")
+        with patch("pathlib.Path.stat", side_effect=AssertionError("no stat")):
+            info = manager.get_cached_file_info(path)
+        assert info.size_bytes == 10
+        assert info.file_type == "PY"
+        assert info.size_str == "10 B"
+
+    def test_scan_dirs_only_skips_file_info(self, scan_tree):
+        manager = FileInfoManager()
+        result = DirectoryScanner(manager).scan(str(scan_tree), dirs_only=True)
+
+        assert result.entries == []
+        assert [name for name, _ in result.subdirs] == ["alpha", "Zeta"]
+        assert result.folder_count == 2
+        assert result.file_count == 2
+        assert manager.get_cache_size() == 0
+
+    def test_scan_stats_each_entry_once(self, scan_tree):
+        calls = []
+
+        with patch(
+            "tkface.widget.pathbrowser.filesystem.os.scandir",
+            lambda path: _WrappedScandir(path, on_stat=calls.append),
+        ):
+            DirectoryScanner(FileInfoManager()).scan(str(scan_tree))
+
+        assert sorted(calls) == ["Zeta", "a.py", "alpha", "b.txt"]
+
+    def test_scan_entry_stat_error_yields_placeholder(self, scan_tree):
+        def on_stat(name):
+            if name == "b.txt":
+                raise PermissionError("denied")
+
+        with patch(
+            "tkface.widget.pathbrowser.filesystem.os.scandir",
+            lambda path: _WrappedScandir(path, on_stat=on_stat),
+        ):
+            result = DirectoryScanner(FileInfoManager()).scan(str(scan_tree))
+
+        broken = [info for info in result.entries if info.name == "b.txt"][0]
+        assert broken.file_type == "Unknown"
+        assert broken.size_bytes == 0
+        assert result.total_size == 10
+
+    def test_scan_missing_directory_raises(self, tmp_path):
+        scanner = DirectoryScanner(FileInfoManager())
+        with pytest.raises(OSError):
+            scanner.scan(str(tmp_path / "missing"))
+
+    def test_default_manager_created(self):
+        scanner = DirectoryScanner()
+        assert isinstance(scanner.file_info_manager, FileInfoManager)
+
+
+@pytest.fixture
+def loop_tree(tmp_path):
+    """tmp/a with a real subfolder and a symlink back to tmp."""
+    (tmp_path / "a" / "real").mkdir(parents=True)
+    try:
+        os.symlink(tmp_path, tmp_path / "a" / "loop", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+    return tmp_path
+
+
+class TestDirectoryIdentity:
+    def test_scan_remembers_identities(self, loop_tree):
+        scanner = DirectoryScanner(FileInfoManager())
+        root_identity = scanner.identity(str(loop_tree))
+
+        scanner.scan(str(loop_tree / "a"), dirs_only=True)
+
+        with patch.object(
+            scanner.filesystem, "stat", side_effect=AssertionError("no stat")
+        ):
+            # The link shares the identity of the directory it points to
+            assert scanner.identity(str(loop_tree / "a" / "loop")) == root_identity
+            assert scanner.identity(str(loop_tree / "a" / "real")) != root_identity
+
+    def test_unknown_identity(self, tmp_path):
+        scanner = DirectoryScanner(FileInfoManager())
+
+        assert scanner.identity(str(tmp_path / "missing")) is None
+
+    def test_identities_are_bounded(self, scan_tree):
+        scanner = DirectoryScanner(FileInfoManager())
+        scanner.max_identities = 1
+
+        scanner.scan(str(scan_tree), dirs_only=True)
+
+        assert len(scanner._identities) == 1  # noqa: SLF001
+
+    def test_tree_skips_links_to_ancestors(self, loop_tree):
+        browser = Mock()
+        browser.scanner = DirectoryScanner(FileInfoManager())
+        browser.prefetcher = None
+        browser.tree_ancestry = {}
+        browser.tree.get_children.return_value = []
+        browser.tree.exists.return_value = False
+
+        with patch(
+            "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+        ):
+            view.populate_tree_node(browser, str(loop_tree / "a"))
+
+        inserted = [call.args[2] for call in browser.tree.insert.call_args_list]
+        assert str(loop_tree / "a" / "real") in inserted
+        assert str(loop_tree / "a" / "loop") not in inserted
+
+
+class _SlowEntry(FileEntry):
+    """FileEntry whose stat() waits like a network round trip."""
+
+    __slots__ = ("_filesystem",)
+
+    def __init__(self, entry, filesystem):
+        super().__init__(entry.name, entry.path, entry.stat())
+        self._filesystem = filesystem
+
+    def stat(self, follow_symlinks=True):
+        filesystem = self._filesystem
+        with filesystem.lock:
+            filesystem.in_flight += 1
+            filesystem.peak = max(filesystem.peak, filesystem.in_flight)
+        time.sleep(filesystem.latency)
+        with filesystem.lock:
+            filesystem.in_flight -= 1
+        return super().stat(follow_symlinks)
+
+
+class _SlowFileSystem(MemoryFileSystem):
+    """Memory tree with a fixed latency per entry stat."""
+
+    def __init__(self, files, latency):
+        super().__init__(files)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def list(self, path):
+        for entry in super().list(path):
+            yield _SlowEntry(entry, self)
+
+
+def _slow_scanner(latency, count=40, **kwargs):
+    files = {f"file{i:02d}.txt": b"x" * i for i in range(count)}
+    filesystem = _SlowFileSystem(files, latency)
+    manager = FileInfoManager(filesystem=filesystem)
+    return DirectoryScanner(manager, **kwargs), filesystem
+
+
+class TestParallelStat:
+    def test_slow_stats_go_parallel_in_listing_order(self):
+        scanner, filesystem = _slow_scanner(
+            0.005, stat_workers=4, parallel_stat_latency=0.001
+        )
+        expected = DirectoryScanner(
+            FileInfoManager(filesystem=filesystem)
+        ).scan("/", cache=False)
+        filesystem.peak = 0
+
+        result = scanner.scan("/", cache=False)
+        scanner.close()
+
+        assert result.parallel_stat
+        assert [e.path for e in result.entries] == [e.path for e in expected.entries]
+        assert [e.size_bytes for e in result.entries] == list(range(40))
+        assert result.total_size == expected.total_size
+        assert result.file_count == 40
+        assert 1 < filesystem.peak <= 4
+
+    def test_fast_stats_stay_sequential(self):
+        scanner, filesystem = _slow_scanner(
+            0.0, stat_workers=4, parallel_stat_latency=1.0
+        )
+
+        result = scanner.scan("/", cache=False)
+
+        assert not result.parallel_stat
+        assert len(result.entries) == 40
+        assert filesystem.peak == 1
+        assert scanner._pool is None  # noqa: SLF001 (test internals acceptable)
+
+    def test_disabled_without_workers(self):
+        scanner, _ = _slow_scanner(0.0, stat_workers=1, parallel_stat_latency=0)
+
+        assert not scanner.scan("/", cache=False).parallel_stat
+
+    def test_zero_latency_threshold_is_always_parallel(self):
+        scanner, _ = _slow_scanner(0.0, stat_workers=2, parallel_stat_latency=0)
+
+        result = scanner.scan("/", cache=False)
+        scanner.close()
+
+        assert result.parallel_stat
+        assert len(result.entries) == 40
+
+    def test_cancel_stops_the_fan_out(self):
+        scanner, _ = _slow_scanner(0.002, stat_workers=2, parallel_stat_latency=0)
+        delivered = []
+
+        result = scanner.scan(
+            "/",
+            on_batch=delivered.extend,
+            batch_size=1,
+            cancelled=lambda: len(delivered) >= 5,
+            cache=False,
+        )
+        scanner.close()
+
+        assert result.parallel_stat
+        assert 5 <= len(result.entries) < 40
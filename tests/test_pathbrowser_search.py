@@ -0,0 +1,367 @@
+"""
+Tests for tkface.widget.pathbrowser.search.
+"""
+
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    FileInfoManager,
+    FileSearcher,
+    NameIndex,
+    view,
+)
+from tkface.widget.pathbrowser.utils import directory_stamp
+from tkface.widget.pathbrowser.search import compile_query
+
+from pathbrowser_stubs import make_stub_browser
+
+
+class FakeWidget:
+    """Collects after() callbacks so tests can run the pump by hand."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, func):  # pylint: disable=unused-argument
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self, timeout=5.0):
+        """Run scheduled callbacks until none are left."""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            callbacks = list(self.pending.values())
+            self.pending.clear()
+            for func in callbacks:
+                func()
+            time.sleep(0.001)
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ), patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+# Directory mtimes of the fixture trees, and the clock the index sees
+SETTLED_MTIME = 1_000_000_000
+NOW = SETTLED_MTIME + 100
+
+
+def clock():
+    return NOW
+
+
+def settle(path, mtime=SETTLED_MTIME):
+    """Give a directory a fixed mtime outside the race window of clock()."""
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def search_tree(tmp_path):
+    """A small tree with matches at several depths and pruned directories."""
+    files = [
+        "report.csv",
+        "notes.txt",
+        "a/report_2024.csv",
+        "a/b/Report_final.CSV",
+        "a/b/c/data.bin",
+        ".git/report.csv",
+        "node_modules/pkg/report.csv",
+    ]
+    for name in files:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    (tmp_path / "reports").mkdir()
+    for directory, _, _ in os.walk(tmp_path):
+        settle(directory)
+    return tmp_path
+
+
+def accept_all(name, is_dir):  # pylint: disable=unused-argument
+    return True
+
+
+def run_search(searcher, root, query, name_filter=accept_all):
+    """Run a search and return (matches, result)."""
+    matches = []
+    done = Mock()
+    searcher.search(str(root), query, name_filter, matches.extend, done)
+    searcher._widget.run_pending()  # pylint: disable=protected-access
+    return matches, done.call_args[0][0]
+
+
+def make_searcher(**kwargs):
+    kwargs.setdefault("threaded", False)
+    kwargs.setdefault("clock", clock)
+    return FileSearcher(FakeWidget(), FileInfoManager(), **kwargs)
+
+
+class TestCompileQuery:
+    def test_substring_is_case_insensitive(self):
+        matches = compile_query("Report")
+        assert matches("annual_REPORT.csv")
+        assert not matches("notes.txt")
+
+    def test_glob_matches_whole_name(self):
+        matches = compile_query("*.CSV")
+        assert matches("report.csv")
+        assert not matches("report.csv.bak")
+
+
+class TestFileSearcher:
+    def test_finds_matches_below_root(self, search_tree):
+        matches, result = run_search(make_searcher(), search_tree, "report")
+
+        names = sorted(info.name for info in matches)
+        assert names == [
+            "a/b/Report_final.CSV",
+            "a/report_2024.csv",
+            "report.csv",
+            "reports",
+        ]
+        assert result.matches == 4
+        assert not result.truncated
+        assert all(os.path.isabs(info.path) for info in matches)
+
+    def test_file_type_filter_is_applied(self, search_tree):
+        matches, _ = run_search(
+            make_searcher(),
+            search_tree,
+            "report",
+            name_filter=lambda name, is_dir: not is_dir,
+        )
+        assert "reports" not in [info.name for info in matches]
+
+    def test_filtered_out_matches_are_not_stat_ed(self, search_tree):
+        searcher = make_searcher()
+        filesystem = searcher.file_info_manager.filesystem
+
+        with patch.object(filesystem, "stat", wraps=filesystem.stat) as mock_stat:
+            matches, _ = run_search(
+                searcher,
+                search_tree,
+                "report",
+                name_filter=lambda name, is_dir: name.endswith(".CSV"),
+            )
+
+        assert [info.name for info in matches] == ["a/b/Report_final.CSV"]
+        # Directories are stat-ed for their stamps; of the files, only the match
+        stat_ed = [call.args[0] for call in mock_stat.call_args_list]
+        assert [path for path in stat_ed if os.path.isfile(path)] == [
+            matches[0].path
+        ]
+
+    def test_result_cap(self, search_tree):
+        matches, result = run_search(
+            make_searcher(max_results=2, batch_size=1), search_tree, "*.csv"
+        )
+        assert len(matches) == 2
+        assert result.truncated
+
+    def test_new_search_supersedes_running_one(self, search_tree):
+        searcher = make_searcher(threaded=True)
+        first = Mock()
+        second = Mock()
+        try:
+            searcher.search(str(search_tree), "report", accept_all, Mock(), first)
+            searcher.search(str(search_tree), "notes", accept_all, Mock(), second)
+            searcher._widget.run_pending()  # pylint: disable=protected-access
+        finally:
+            searcher.close()
+
+        first.assert_not_called()
+        assert second.call_args[0][0].matches == 1
+
+    def test_cancel_drops_results(self, search_tree):
+        searcher = make_searcher(threaded=True)
+        done = Mock()
+        try:
+            searcher.search(str(search_tree), "report", accept_all, Mock(), done)
+            searcher.cancel()
+            searcher._widget.run_pending()  # pylint: disable=protected-access
+        finally:
+            searcher.close()
+
+        done.assert_not_called()
+        assert not searcher.is_searching()
+
+    def test_repeat_search_uses_index(self, search_tree):
+        searcher = make_searcher()
+        run_search(searcher, search_tree, "report")
+        assert len(searcher.index) == 5
+
+        with patch("tkface.widget.pathbrowser.search._list_names") as mock_list:
+            matches, _ = run_search(searcher, search_tree, "notes")
+
+        mock_list.assert_not_called()
+        assert [info.name for info in matches] == ["notes.txt"]
+
+    def test_changed_directory_is_listed_again(self, search_tree):
+        searcher = make_searcher()
+        run_search(searcher, search_tree, "report")
+
+        (search_tree / "a" / "report_new.csv").write_text("x")
+        settle(search_tree / "a", SETTLED_MTIME + 50)
+        matches, _ = run_search(searcher, search_tree, "report_new")
+
+        assert [info.name for info in matches] == ["a/report_new.csv"]
+
+    def test_subdirectory_search_reuses_index(self, search_tree):
+        searcher = make_searcher()
+        run_search(searcher, search_tree, "x")
+        index = searcher.index
+
+        matches, _ = run_search(searcher, search_tree / "a", "report")
+
+        assert searcher.index is index
+        assert sorted(info.name for info in matches) == [
+            "b/Report_final.CSV",
+            "report_2024.csv",
+        ]
+
+    def test_index_can_be_disabled(self, search_tree):
+        searcher = make_searcher(use_index=False)
+        run_search(searcher, search_tree, "report")
+        assert searcher.index is None
+
+    def test_symlinked_directories_are_not_followed(self, search_tree):
+        try:
+            os.symlink(search_tree, search_tree / "a" / "loop")
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks are not supported")
+
+        matches, _ = run_search(make_searcher(), search_tree, "report.csv")
+
+        assert [info.name for info in matches] == ["report.csv"]
+
+
+class TestNameIndex:
+    def test_recent_directories_are_not_stored(self, tmp_path):
+        settle(tmp_path, NOW - 1)
+        index = NameIndex(str(tmp_path), clock=clock)
+        index.store(str(tmp_path), directory_stamp(str(tmp_path)), [])
+        assert len(index) == 0
+
+    def test_entry_budget(self, tmp_path):
+        settle(tmp_path)
+        index = NameIndex(str(tmp_path), max_entries=1, clock=clock)
+        index.store(str(tmp_path), directory_stamp(str(tmp_path)), [("a", 0, 0)] * 2)
+        assert len(index) == 0
+
+    def test_covers_subdirectories_only(self, tmp_path):
+        index = NameIndex(str(tmp_path / "a"))
+        assert index.covers(str(tmp_path / "a" / "b"))
+        assert not index.covers(str(tmp_path / "ab"))
+
+
+def make_browser(directory):
+    """Browser stand-in with an inline searcher."""
+    browser = make_stub_browser()
+    browser.state.current_dir = str(directory)
+    browser.state.sort_column = "#0"
+    browser.state.sort_reverse = False
+    browser.config.filetypes = [("CSV files", "*.csv")]
+    browser.config.select = "file"
+    browser.filter_var.get.return_value = "All files"
+    browser.file_info_manager = FileInfoManager()
+    browser.searcher = FileSearcher(
+        FakeWidget(), browser.file_info_manager, threaded=False
+    )
+    browser.search_result = None
+    browser.search_after_id = None
+    browser.search_var.get.return_value = ""
+    browser._file_selection.return_value = []
+    browser._update_status.side_effect = lambda: view.update_directory_status(browser)
+    return browser
+
+
+class TestSearchView:
+    def test_matches_replace_listing(self, search_tree):
+        browser = make_browser(search_tree)
+        browser.search_var.get.return_value = "report"
+
+        view.start_search(browser)
+
+        assert browser.search_root == str(search_tree)
+        browser.loader.cancel.assert_called_once()
+        assert len(browser.file_list) == 4
+        assert browser.file_tree_rows == set(browser.file_list.paths())
+        assert browser.status_var.set.call_args[0][0] == "4 matches"
+
+    def test_file_type_filter_is_honoured(self, search_tree):
+        browser = make_browser(search_tree)
+        browser.filter_var.get.return_value = "CSV files (*.csv)"
+        browser.search_var.get.return_value = "report"
+
+        view.start_search(browser)
+
+        # Directories always pass the filter; the upper-case .CSV does too
+        assert sorted(info.name for info in browser.file_list) == [
+            "a/b/Report_final.CSV",
+            "a/report_2024.csv",
+            "report.csv",
+            "reports",
+        ]
+
+    def test_typing_restarts_search_after_a_pause(self, search_tree):
+        browser = make_browser(search_tree)
+        browser.search_var.get.return_value = "rep"
+
+        view.on_search_changed(browser)
+        view.on_search_changed(browser)
+
+        # Only the last keystroke starts a walk
+        assert browser.after_cancel.call_count == 1
+        delay, callback = browser.after.call_args[0]
+        assert delay == view.SEARCH_DELAY_MS
+        callback()
+        assert browser.search_root == str(search_tree)
+
+    def test_clearing_query_reloads_listing(self, search_tree):
+        browser = make_browser(search_tree)
+        browser.search_var.get.return_value = "report"
+        view.start_search(browser)
+
+        browser.search_var.get.return_value = ""
+        with patch.object(view, "load_files") as mock_load:
+            view.on_search_changed(browser)
+
+        mock_load.assert_called_once_with(browser)
+
+    def test_load_files_leaves_search(self, search_tree):
+        browser = make_browser(search_tree)
+        browser.search_var.get.return_value = "report"
+        view.start_search(browser)
+
+        view._leave_search(browser)  # pylint: disable=protected-access
+
+        assert browser.search_root is None
+        browser.search_var.set.assert_called_once_with("")
+
+    def test_result_cap_is_reported(self, search_tree):
+        browser = make_browser(search_tree)
+        browser.searcher.max_results = 1
+        browser.search_var.get.return_value = "report"
+
+        view.start_search(browser)
+
+        assert browser.status_var.set.call_args[0][0] == (
+            "1 match (result limit reached)"
+        )
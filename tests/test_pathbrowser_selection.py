@@ -0,0 +1,220 @@
+"""
+Tests for tkface.widget.pathbrowser.selection.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import FileInfo, FileListModel, PathBrowser
+from tkface.widget.pathbrowser.selection import RangeSelection
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+def make_rows(count, folders=()):
+    return [
+        FileInfo(
+            f"/d/{i:05d}",
+            f"{i:05d}",
+            i in folders,
+            0 if i in folders else i,
+            "",
+            "",
+            "Folder" if i in folders else "TXT",
+        )
+        for i in range(count)
+    ]
+
+
+def make_model(count, folders=()):
+    model = FileListModel()
+    model.extend(make_rows(count, folders))
+    return model
+
+
+def make_browser(count=10, multiple=True, select="file"):
+    """PathBrowser with a plain Treeview mock and no Tk root."""
+    browser = PathBrowser.__new__(PathBrowser)
+    browser.config = Mock(multiple=multiple, select=select, save_mode=False)
+    browser.state = Mock(selected_items=[], selection_anchor=None)
+    browser.state.current_dir = "/d"
+    browser.file_list = make_model(count)
+    browser.file_list_view = None
+    browser.file_tree = Mock()
+    browser.file_info_manager = Mock()
+    browser.selected_var = Mock()
+    browser.status_var = Mock()
+    browser.search_root = None
+    browser.preview_cache = None
+    browser.focus_set = Mock()
+    return browser
+
+
+class TestRangeSelection:
+    def test_from_indices_compresses_runs(self):
+        selection = RangeSelection.from_indices([5, 1, 2, 3, 7, 6, 2])
+
+        assert selection.ranges() == [(1, 4), (5, 8)]
+        assert len(selection) == 6
+        assert list(selection) == [1, 2, 3, 5, 6, 7]
+        assert selection.bounds() == (1, 7)
+
+    def test_add_merges_overlapping_and_adjacent_ranges(self):
+        selection = RangeSelection()
+        selection.add(0, 2)
+        selection.add(5, 7)
+        selection.add(10, 12)
+        selection.add(2, 5)
+
+        assert selection.ranges() == [(0, 7), (10, 12)]
+        assert len(selection) == 9
+
+        selection.add(6, 11)
+        assert selection.ranges() == [(0, 12)]
+        assert len(selection) == 12
+
+    def test_remove_splits_ranges(self):
+        selection = RangeSelection()
+        selection.add(0, 10)
+        selection.remove(3, 5)
+
+        assert selection.ranges() == [(0, 3), (5, 10)]
+        assert len(selection) == 8
+        assert 2 in selection and 3 not in selection and 5 in selection
+
+        selection.remove(0, 100)
+        assert not selection
+        assert selection.bounds() is None
+
+    def test_contains(self):
+        selection = RangeSelection.from_indices([2, 3, 9])
+
+        assert [i for i in range(12) if i in selection] == [2, 3, 9]
+
+
+class TestModelSelection:
+    def test_select_all_is_one_range(self):
+        model = make_model(50_000)
+        model.select_all()
+
+        assert model.selected_count == 50_000
+        assert model.selection_ranges() == [(0, 50_000)]
+        assert model.is_selected("/d/49999")
+
+    def test_selection_totals(self):
+        model = make_model(10, folders={0, 1})
+        model.select_range(0, 4)
+        model.select_range(8, 10, extend=True)
+
+        # Folders 0 and 1; files 2, 3, 8 and 9 bytes
+        assert model.selection_totals() == (2, 4, 22)
+
+    def test_totals_follow_the_sort_order(self):
+        model = make_model(10)
+        model.select_range(0, 2)
+        assert model.selection_totals() == (0, 2, 1)
+
+        model.sort("#0", reverse=True)
+        # Rows 0 and 1 stay selected, now at the bottom
+        assert model.selection_ranges() == [(8, 10)]
+        assert model.selection_totals() == (0, 2, 1)
+
+    def test_toggle_and_iter_selection(self):
+        model = make_model(5)
+        model.toggle("/d/00001")
+        model.toggle("/d/00003")
+        model.toggle("/d/00001")
+
+        assert list(model.iter_selection()) == ["/d/00003"]
+        assert [row.name for row in model.selected_rows()] == ["00003"]
+
+    def test_select_range_is_clamped(self):
+        model = make_model(3)
+        model.select_range(-5, 10)
+
+        assert model.selection_ranges() == [(0, 3)]
+
+
+class TestBrowserSelection:
+    def test_select_all_sets_the_treeview_selection_once(self):
+        browser = make_browser(count=5)
+
+        browser._select_all()
+
+        browser.file_tree.selection_set.assert_called_once_with(
+            browser.file_list.paths()
+        )
+        assert browser.file_list.selected_count == 5
+
+    def test_select_all_needs_multiple(self):
+        browser = make_browser(count=5, multiple=False)
+
+        browser._select_all()
+
+        browser.file_tree.selection_set.assert_not_called()
+
+    def test_extending_a_block_only_changes_its_end(self):
+        browser = make_browser(count=10)
+        browser.file_list.select_range(2, 5)
+        browser.state.selection_anchor = "/d/00002"
+
+        browser._extend_selection_range(None, direction=1)
+
+        browser.file_tree.selection_add.assert_called_once_with(["/d/00005"])
+        browser.file_tree.selection_set.assert_not_called()
+        assert browser.state.selected_items == [f"/d/0000{i}" for i in range(2, 6)]
+
+        browser._extend_selection_range(None, direction=-1)
+        browser.file_tree.selection_remove.assert_called_once_with(["/d/00005"])
+
+    def test_on_file_select_mirrors_the_treeview(self):
+        browser = make_browser(count=10)
+        browser.file_tree.selection.return_value = ("/d/00004",)
+
+        browser._on_file_select(None)
+
+        assert browser.file_list.selection() == ["/d/00004"]
+        assert browser.state.selected_items == ["/d/00004"]
+        assert browser.state.selection_anchor == "/d/00004"
+        browser.file_info_manager.get_cached_file_info.assert_not_called()
+
+    def test_on_file_select_does_not_build_the_selection(self):
+        browser = make_browser(count=20_000)
+        browser._select_all()
+        browser.file_tree.selection.return_value = tuple(browser.file_list.paths())
+
+        with patch.object(browser.file_list, "selection") as mock_selection:
+            browser._on_file_select(None)
+        mock_selection.assert_not_called()
+
+        assert len(browser.state.selected_items) == 20_000
+        assert len(browser.get_selection()) == 20_000
+
+    def test_status_uses_range_totals(self):
+        browser = make_browser(count=20_000)
+        browser._select_all()
+        browser.file_tree.selection.return_value = tuple(browser.file_list.paths())
+        browser._on_file_select(None)
+
+        status = browser.status_var.set.call_args.args[0]
+        assert "20000 files" in status
+        browser.selected_var.set.assert_called_with("00000 (+19999 more)")
+        browser.file_info_manager.get_cached_file_info.assert_not_called()
+
+    def test_iter_selection_is_lazy(self):
+        browser = make_browser(count=10, select="both")
+        browser.file_list.select_range(3, 6)
+        browser.state.selected_items = browser._collect_selected_items()
+
+        iterator = browser.iter_selection()
+
+        assert not isinstance(iterator, list)
+        assert list(iterator) == browser.get_selection()
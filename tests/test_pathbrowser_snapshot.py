@@ -0,0 +1,227 @@
+"""
+Tests for tkface.widget.pathbrowser.snapshot.
+"""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryLoader,
+    DirectoryScanner,
+    DirectorySnapshot,
+    FileInfoManager,
+    FileListModel,
+    ScanResult,
+    SnapshotCache,
+    StatsRecorder,
+    view,
+)
+
+from pathbrowser_stubs import make_stub_browser
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ), patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+@pytest.fixture
+def snapshot_dirs(tmp_path):
+    """first/{a.txt, b.log}, second/{c.txt}"""
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    (first / "a.txt").write_text("a")
+    (first / "b.log").write_text("bb")
+    (second / "c.txt").write_text("c")
+    return str(first), str(second)
+
+
+def make_snapshot(path, rows=None):
+    return DirectorySnapshot(
+        path=path,
+        stamp=(1, 2, 3),
+        model=FileListModel(),
+        scan_result=ScanResult(path=path),
+        rows=rows,
+    )
+
+
+def make_browser(directory):
+    """Mock browser with a plain Treeview, real model, loader and snapshots."""
+    browser = make_stub_browser()
+    browser.state.current_dir = directory
+    browser.state.sort_column = "#0"
+    browser.state.sort_reverse = False
+    browser.config.filetypes = []
+    browser.config.select = "file"
+    browser.filter_var.get.return_value = "All files"
+    browser.file_info_manager = FileInfoManager()
+    browser.scanner = DirectoryScanner(browser.file_info_manager)
+    browser.loader = DirectoryLoader(browser, browser.scanner, threaded=False)
+    browser.file_tree.yview.return_value = (0.25, 1.0)
+    browser._file_selection.return_value = []
+    browser.scan_result = None
+    browser.snapshots = SnapshotCache(
+        2, on_evict=lambda snapshot: view.drop_snapshot(browser, snapshot)
+    )
+    browser.stats_recorder = StatsRecorder(lambda: (0, 0))
+    return browser
+
+
+def navigate(browser, directory):
+    browser.state.current_dir = directory
+    view.load_files(browser)
+
+
+class TestSnapshotCache:
+    def test_take_removes_the_snapshot(self):
+        cache = SnapshotCache(2)
+        snapshot = make_snapshot("/a")
+        cache.put(snapshot)
+
+        assert "/a" in cache
+        assert cache.take("/a") is snapshot
+        assert cache.take("/a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_left_listing_is_evicted(self):
+        on_evict = Mock()
+        cache = SnapshotCache(2, on_evict=on_evict)
+        first = make_snapshot("/a")
+        cache.put(first)
+        cache.put(make_snapshot("/b"))
+        cache.put(make_snapshot("/c"))
+
+        on_evict.assert_called_once_with(first)
+        assert "/a" not in cache and len(cache) == 2
+
+    def test_replacing_and_clearing_release_snapshots(self):
+        on_evict = Mock()
+        cache = SnapshotCache(2, on_evict=on_evict)
+        old = make_snapshot("/a")
+        cache.put(old)
+        cache.put(make_snapshot("/a"))
+        on_evict.assert_called_once_with(old)
+
+        cache.clear()
+        assert on_evict.call_count == 2
+        assert len(cache) == 0
+
+    def test_failing_release_does_not_stop_eviction(self):
+        cache = SnapshotCache(1, on_evict=Mock(side_effect=RuntimeError("gone")))
+        cache.put(make_snapshot("/a"))
+        cache.put(make_snapshot("/b"))
+
+        assert "/a" not in cache and "/b" in cache
+
+    def test_evicted_rows_are_deleted(self):
+        browser = Mock()
+        snapshot = make_snapshot("/a", rows={"/a/x", "/a/y"})
+
+        view.drop_snapshot(browser, snapshot)
+
+        assert set(browser.file_tree.delete.call_args.args) == {"/a/x", "/a/y"}
+        assert not snapshot.rows
+
+
+class TestBackForward:
+    def test_leaving_a_listing_detaches_its_rows(self, snapshot_dirs):
+        first, second = snapshot_dirs
+        browser = make_browser(first)
+        view.load_files(browser)
+        first_rows = set(browser.file_tree_rows)
+
+        navigate(browser, second)
+
+        assert first in browser.snapshots
+        browser.file_tree.set_children.assert_any_call("")
+        deleted = [
+            path for call in browser.file_tree.delete.call_args_list for path in call.args
+        ]
+        assert not first_rows & set(deleted)
+        assert browser.file_list.paths() == [os.path.join(second, "c.txt")]
+
+    def test_unchanged_directory_is_restored_without_a_scan(self, snapshot_dirs):
+        first, second = snapshot_dirs
+        browser = make_browser(first)
+        view.load_files(browser)
+        model = browser.file_list
+        browser._file_selection.return_value = [os.path.join(first, "a.txt")]
+        navigate(browser, second)
+        browser._file_selection.return_value = []
+
+        with patch.object(browser.scanner, "scan") as scan:
+            navigate(browser, first)
+
+        scan.assert_not_called()
+        assert browser.file_list is model
+        assert browser.scan_result.path == first
+        assert browser.listing_stamp is not None
+        browser.file_tree.yview_moveto.assert_called_with(0.25)
+        browser._set_file_selection.assert_called_with([os.path.join(first, "a.txt")])
+        stats = browser.stats_recorder.last
+        assert stats.snapshot_hit and stats.entries == 2
+        assert stats.phases["scan"] == 0.0
+
+    def test_changed_directory_is_revalidated(self, snapshot_dirs):
+        first, second = snapshot_dirs
+        browser = make_browser(first)
+        view.load_files(browser)
+        navigate(browser, second)
+        os.remove(os.path.join(first, "b.log"))
+        with open(os.path.join(first, "new.txt"), "w", encoding="utf-8") as f:
+            f.write("new")
+        # Make sure the directory stamp differs on coarse mtime filesystems
+        stat = os.stat(first)
+        os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        navigate(browser, first)
+
+        assert sorted(browser.file_list.paths()) == [
+            os.path.join(first, "a.txt"),
+            os.path.join(first, "new.txt"),
+        ]
+        assert browser.stats_recorder.last.snapshot_hit
+        assert browser.listing_stamp is not None
+
+    def test_refresh_of_the_same_directory_rescans(self, snapshot_dirs):
+        first, _ = snapshot_dirs
+        browser = make_browser(first)
+        view.load_files(browser)
+
+        view.load_files(browser)
+
+        assert len(browser.snapshots) == 0
+        assert not browser.stats_recorder.last.snapshot_hit
+
+    def test_incomplete_listing_is_not_kept(self, snapshot_dirs):
+        first, second = snapshot_dirs
+        browser = make_browser(first)
+        browser.scan_result = ScanResult(path=first)
+
+        navigate(browser, second)
+
+        assert len(browser.snapshots) == 0
+
+    def test_search_drops_snapshots(self, snapshot_dirs):
+        first, second = snapshot_dirs
+        browser = make_browser(first)
+        browser.search_var.get.return_value = "a"
+        browser.search_after_id = None
+        view.load_files(browser)
+        navigate(browser, second)
+
+        view.start_search(browser)
+
+        assert len(browser.snapshots) == 0
+        browser.searcher.search.assert_called_once()
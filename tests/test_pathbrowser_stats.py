@@ -0,0 +1,178 @@
+"""
+Tests for tkface.widget.pathbrowser.stats.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryLoader,
+    DirectoryScanner,
+    FileInfoManager,
+    ScanResult,
+    StatsRecorder,
+    view,
+)
+from tkface.widget.pathbrowser.stats import PHASES
+
+from pathbrowser_stubs import make_stub_browser
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ), patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+@pytest.fixture
+def stats_dir(tmp_path):
+    """base/{a.txt, b.log, sub/}"""
+    (tmp_path / "a.txt").write_text("hello")
+    (tmp_path / "b.log").write_text("log")
+    (tmp_path / "sub").mkdir()
+    return tmp_path
+
+
+def make_recorder(counters=(0, 0), on_finish=None):
+    return StatsRecorder(lambda: counters, on_finish=on_finish)
+
+
+class TestStatsRecorder:
+    def test_phases_add_up_per_navigation(self):
+        recorder = make_recorder()
+        recorder.start("/data")
+        recorder.add("sort", 0.25)
+        recorder.add("sort", 0.5)
+        recorder.add("insert", 1.0)
+        recorder.finish()
+
+        stats = recorder.last
+        assert stats.path == "/data"
+        assert set(stats.phases) == set(PHASES)
+        assert stats.phases["sort"] == 0.75
+        assert stats.phases["insert"] == 1.0
+        assert stats.total >= 0.0
+        assert recorder.current is None
+
+    def test_scan_result_supplies_worker_timings(self):
+        recorder = make_recorder()
+        result = ScanResult(path="/data", scan_time=3.0, stat_time=2.0)
+        result.entries = [Mock(), Mock()]
+        recorder.start("/data")
+        recorder.finish(result)
+
+        # Metadata reads are reported apart from the listing itself
+        assert recorder.last.phases["scan"] == 1.0
+        assert recorder.last.phases["stat"] == 2.0
+        assert recorder.last.entries == 2
+
+    def test_time_outside_a_navigation_is_ignored(self):
+        recorder = make_recorder()
+        recorder.add("sort", 1.0)
+        recorder.finish()
+
+        assert recorder.last is None
+
+    def test_cache_counters_are_per_navigation(self):
+        counters = [10, 4]
+        recorder = StatsRecorder(lambda: tuple(counters))
+        recorder.start("/data")
+        counters[0] += 5
+        counters[1] += 1
+        recorder.finish()
+
+        assert (recorder.last.cache_hits, recorder.last.cache_misses) == (5, 1)
+
+    def test_subscribers_get_finished_navigations(self):
+        on_finish = Mock()
+        recorder = make_recorder(on_finish=on_finish)
+        callback = Mock()
+        recorder.subscribe(callback)
+        recorder.subscribe(callback)
+
+        recorder.start("/data")
+        recorder.finish(failed=True)
+        recorder.unsubscribe(callback)
+        recorder.start("/other")
+        recorder.finish()
+
+        callback.assert_called_once()
+        assert callback.call_args.args[0].failed
+        assert on_finish.call_count == 2
+
+    def test_failing_subscriber_does_not_stop_the_others(self):
+        recorder = make_recorder()
+        callback = Mock()
+        recorder.subscribe(Mock(side_effect=RuntimeError("telemetry down")))
+        recorder.subscribe(callback)
+
+        recorder.start("/data")
+        recorder.finish()
+
+        callback.assert_called_once()
+
+    def test_cancelled_navigation_is_not_reported(self):
+        callback = Mock()
+        recorder = make_recorder()
+        recorder.subscribe(callback)
+
+        recorder.start("/data")
+        recorder.cancel()
+        recorder.finish()
+
+        callback.assert_not_called()
+
+    def test_as_dict(self):
+        recorder = make_recorder()
+        recorder.start("/data", listing_cache_hit=True)
+        recorder.finish()
+
+        data = recorder.last.as_dict()
+        assert data["path"] == "/data"
+        assert data["listing_cache_hit"] is True
+        assert set(data["phases"]) == set(PHASES)
+
+
+class TestInstrumentation:
+    def test_scanner_times_the_scan(self, stats_dir):
+        result = DirectoryScanner().scan(str(stats_dir))
+
+        assert result.scan_time >= result.stat_time > 0.0
+
+    def test_file_info_manager_counts_hits_and_misses(self, stats_dir):
+        manager = FileInfoManager()
+        manager.get_file_info(str(stats_dir / "a.txt"))
+        manager.get_file_info(str(stats_dir / "a.txt"))
+
+        assert (manager.hits, manager.misses) == (1, 1)
+
+    def test_load_files_reports_a_navigation(self, stats_dir):
+        browser = make_stub_browser()
+        browser.state.current_dir = str(stats_dir)
+        browser.state.sort_column = "#0"
+        browser.state.sort_reverse = False
+        browser.config.filetypes = []
+        browser.config.select = "file"
+        browser.filter_var.get.return_value = "All files"
+        browser.file_info_manager = FileInfoManager()
+        browser.scanner = DirectoryScanner(browser.file_info_manager)
+        browser.loader = DirectoryLoader(browser, browser.scanner, threaded=False)
+        callback = Mock()
+        browser.stats_recorder = StatsRecorder(lambda: (0, 0))
+        browser.stats_recorder.subscribe(callback)
+
+        view.load_files(browser)
+
+        callback.assert_called_once()
+        stats = callback.call_args.args[0]
+        assert stats.path == str(stats_dir)
+        assert stats.entries == 3
+        assert not stats.failed
+        for phase in ("stat", "filter", "sort", "insert", "status"):
+            assert stats.phases[phase] > 0.0, phase
@@ -2,32 +2,76 @@
 Additional tests to improve coverage for tkface.widget.pathbrowser.view.
 
 These tests focus on exercising branches in:
-- sort_items
+- sort_files
 - update_selected_display
 - update_directory_status
 - show_context_menu
 """
 
+import os
 import tempfile
 import tkinter as tk
+from contextlib import nullcontext
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
 
-from tkface.widget.pathbrowser import PathBrowser, view
+from tkface.widget.pathbrowser import (
+    DirectoryLoader,
+    DirectoryScanner,
+    FileInfo,
+    FileInfoManager,
+    PathBrowser,
+    view,
+)
 
+from pathbrowser_stubs import make_stub_browser
 
-def _make_file_item(name, path, is_dir, size_str, modified, file_type, size_bytes):
-    icon = "📁" if is_dir else "📄"
-    return (name, path, icon, size_str, modified, file_type, size_bytes)
+
+def _make_file_info(name, path, is_dir, size_bytes, mtime, file_type):
+    return FileInfo(
+        path, name, is_dir, size_bytes, "", "", file_type, mtime=mtime
+    )
+
+
+class _FakeDirEntry:
+    """Minimal os.DirEntry stand-in for scanner tests."""
+
+    def __init__(self, parent, name, is_dir=False, size=0, error=None):
+        self.name = name
+        self.path = os.path.join(parent, name)
+        self._is_dir = is_dir
+        self._size = size
+        self._error = error
+
+    def is_dir(self):
+        return self._is_dir
+
+    def stat(self):
+        if self._error is not None:
+            raise self._error
+        mode = 0o40755 if self._is_dir else 0o100644
+        return os.stat_result((mode, 0, 0, 1, 0, 0, self._size, 0, 0, 0))
+
+
+def _patch_scandir(entries=None, error=None):
+    """Patch os.scandir used by the scanner with fake entries or an error."""
+    if error is not None:
+        return patch(
+            "tkface.widget.pathbrowser.filesystem.os.scandir", side_effect=error
+        )
+    return patch(
+        "tkface.widget.pathbrowser.filesystem.os.scandir",
+        side_effect=lambda path: nullcontext(list(entries or [])),
+    )
 
 
 @pytest.fixture
 def browser_with_state(root):
     # Create a mock browser instead of real PathBrowser to avoid Tkinter issues
-    browser = Mock()
+    browser = make_stub_browser()
     browser.state = Mock()
     browser.state.sort_column = "#0"
     browser.state.sort_reverse = False
@@ -47,6 +91,12 @@ def browser_with_state(root):
     # Mock file info manager
     browser.file_info_manager = Mock()
     browser.file_info_manager.get_cached_file_info = Mock()
+
+    # Real scanner backed by its own manager so directory scans work on tmp dirs
+    browser.scanner = DirectoryScanner(FileInfoManager())
+    browser.scan_result = None
+    # Inline loader delivers batches synchronously for deterministic tests
+    browser.loader = DirectoryLoader(browser, browser.scanner, threaded=False)
     
     # Mock config for filter tests
     browser.config = Mock()
@@ -59,58 +109,79 @@ def browser_with_state(root):
     return browser
 
 
-class TestSortItems:
-    def test_sort_items_by_name_default(self, browser_with_state):
-        items = [
-            _make_file_item("b.txt", "/b.txt", False, "1 B", "2023-01-02", "TXT", 1),
-            _make_file_item("a.txt", "/a.txt", False, "2 B", "2023-01-03", "TXT", 2),
+class TestSortFiles:
+    @pytest.fixture(autouse=True)
+    def _file_tree(self, browser_with_state):
+        browser_with_state.file_tree = Mock()
+
+    def _sort(self, browser, rows):
+        browser.file_list.set_rows(rows)
+        view.sort_files(browser)
+        return [row.name for row in browser.file_list]
+
+    def test_sort_files_by_name_default(self, browser_with_state):
+        rows = [
+            _make_file_info("b.txt", "/b.txt", False, 1, 2.0, "TXT"),
+            _make_file_info("A.txt", "/A.txt", False, 2, 3.0, "TXT"),
         ]
-        result = view.sort_items(browser_with_state, items)
-        assert [i[0] for i in result] == ["a.txt", "b.txt"]
+        # Names compare casefolded
+        assert self._sort(browser_with_state, rows) == ["A.txt", "b.txt"]
 
-    def test_sort_items_by_size_folders_first(self, browser_with_state):
+    def test_sort_files_by_size_folders_first(self, browser_with_state):
         browser_with_state.state.sort_column = "size"
-        items = [
-            _make_file_item("folder", "/dir", True, "-", "", "Folder", 0),
-            _make_file_item("fileA", "/a", False, "1 B", "2023-01-01", "TXT", 1),
-            _make_file_item("fileB", "/b", False, "2 B", "2023-01-01", "TXT", 2),
+        rows = [
+            _make_file_info("fileB", "/b", False, 2, 1.0, "TXT"),
+            _make_file_info("folder", "/dir", True, 0, 9.0, "Folder"),
+            _make_file_info("fileA", "/a", False, 1, 1.0, "TXT"),
         ]
-        result = view.sort_items(browser_with_state, items)
-        # Folder should come first, then by size_bytes ascending
-        assert [i[0] for i in result] == ["folder", "fileA", "fileB"]
+        assert self._sort(browser_with_state, rows) == ["folder", "fileA", "fileB"]
 
-    def test_sort_items_by_modified_folders_first(self, browser_with_state):
+    def test_sort_files_by_modified_folders_first(self, browser_with_state):
         browser_with_state.state.sort_column = "modified"
-        items = [
-            _make_file_item("folder", "/dir", True, "-", "", "Folder", 0),
-            _make_file_item("fileA", "/a", False, "1 B", "2023-01-02", "TXT", 1),
-            _make_file_item("fileB", "/b", False, "2 B", "2023-01-01", "TXT", 2),
+        rows = [
+            _make_file_info("fileA", "/a", False, 1, 20.0, "TXT"),
+            _make_file_info("folder", "/dir", True, 0, 30.0, "Folder"),
+            _make_file_info("fileB", "/b", False, 2, 10.0, "TXT"),
         ]
-        result = view.sort_items(browser_with_state, items)
-        # Folder first, then by modified string ascending
-        assert [i[0] for i in result] == ["folder", "fileB", "fileA"]
+        assert self._sort(browser_with_state, rows) == ["folder", "fileB", "fileA"]
 
-    def test_sort_items_by_type(self, browser_with_state):
+    def test_sort_files_by_type(self, browser_with_state):
         browser_with_state.state.sort_column = "type"
-        items = [
-            _make_file_item("b", "/b", False, "1 B", "2023-01-01", "ZTYPE", 1),
-            _make_file_item("a", "/a", False, "1 B", "2023-01-01", "ATYPE", 1),
+        rows = [
+            _make_file_info("b", "/b", False, 1, 1.0, "ZTYPE"),
+            _make_file_info("a", "/a", False, 1, 1.0, "ATYPE"),
         ]
-        result = view.sort_items(browser_with_state, items)
-        assert [i[5] for i in result] == ["ATYPE", "ZTYPE"]
+        assert self._sort(browser_with_state, rows) == ["a", "b"]
 
-    def test_sort_items_reverse(self, browser_with_state):
+    def test_sort_files_reverse(self, browser_with_state):
         browser_with_state.state.sort_column = "#0"
         browser_with_state.state.sort_reverse = True
-        items = [
-            _make_file_item("a", "/a", False, "1 B", "", "TXT", 1),
-            _make_file_item("b", "/b", False, "1 B", "", "TXT", 1),
+        rows = [
+            _make_file_info("a", "/a", False, 1, 1.0, "TXT"),
+            _make_file_info("b", "/b", False, 1, 1.0, "TXT"),
+        ]
+        assert self._sort(browser_with_state, rows) == ["b", "a"]
+
+    def test_sort_files_reorders_rows_in_one_call(self, browser_with_state):
+        rows = [
+            _make_file_info("b", "/b", False, 1, 1.0, "TXT"),
+            _make_file_info("a", "/a", False, 1, 1.0, "TXT"),
         ]
-        result = view.sort_items(browser_with_state, items)
-        assert [i[0] for i in result] == ["b", "a"]
+        with patch("pathlib.Path.stat", side_effect=AssertionError("no stat")), \
+             patch("os.scandir", side_effect=AssertionError("no scan")):
+            self._sort(browser_with_state, rows)
+        browser_with_state.file_tree.set_children.assert_called_once_with(
+            "", "/a", "/b"
+        )
+
+    def test_sort_files_virtual_list_rerenders(self, browser_with_state):
+        browser_with_state.file_list_view = Mock()
+        self._sort(browser_with_state, [])
+        browser_with_state.file_list_view.refresh.assert_called_once_with()
+        browser_with_state.file_tree.set_children.assert_not_called()
 
-    def test_sort_items_empty(self, browser_with_state):
-        assert view.sort_items(browser_with_state, []) == []
+    def test_sort_files_empty(self, browser_with_state):
+        assert self._sort(browser_with_state, []) == []
 
 
 class TestUpdateSelectedDisplay:
@@ -192,6 +263,7 @@ class TestUpdateDirectoryStatus:
         browser_with_state.state.current_dir = str(tmp_path)
         browser_with_state.status_var = Mock()
         browser_with_state.status_var.set = Mock()
+        browser_with_state.scan_result = browser_with_state.scanner.scan(str(tmp_path))
         view.update_directory_status(browser_with_state)
         # Expect both file and folder counts mentioned (allow JP/EN)
         args, _ = browser_with_state.status_var.set.call_args
@@ -203,20 +275,14 @@ class TestUpdateDirectoryStatus:
         browser_with_state.state.current_dir = "/root/protected"
         browser_with_state.status_var = Mock()
         browser_with_state.status_var.set = Mock()
-        # Force Path.iterdir to raise PermissionError
-        class DummyPath:
-            def __init__(self, *_):
-                pass
-            def iterdir(self):  # noqa: D401
-                raise PermissionError("denied")
-            def __fspath__(self):
-                return "/root/protected"
-            def name(self):  # for formatting in error branch
-                return "protected"
-        monkeypatch.setattr(view, "Path", DummyPath)
-        # Should set status without raising
+        # Force os.scandir to raise PermissionError
+        monkeypatch.setattr(
+            "tkface.widget.pathbrowser.filesystem.os.scandir",
+            Mock(side_effect=PermissionError("denied")),
+        )
+        # Should set status without scanning on the Tk thread
         view.update_directory_status(browser_with_state)
-        assert browser_with_state.status_var.set.called
+        browser_with_state.status_var.set.assert_called_once_with("")
 
 
 class TestShowContextMenu:
@@ -249,7 +315,7 @@ class TestShowContextMenu:
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_file_path = f"{temp_dir}/a.txt"
             browser_with_state.file_tree = Mock()
-            browser_with_state.file_tree.selection.return_value = [temp_file_path]
+            browser_with_state._file_selection.return_value = [temp_file_path]
             event = Mock()
             event.x_root = 0
             event.y_root = 0
@@ -392,9 +458,9 @@ class TestLoadDirectoryTree:
         mock_current_path.parent = mock_current_path  # Root case
         mock_current_path.__str__ = Mock(return_value="C:\\test")
         mock_current_path.name = "test"
-        mock_current_path.iterdir.return_value = []  # Empty directory
         
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_current_path):
+        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_current_path), \
+             _patch_scandir([]):
             view.load_directory_tree(browser_with_state)
             
             # Should call delete to clear existing items
@@ -419,9 +485,9 @@ class TestLoadDirectoryTree:
         mock_path.parent = mock_path  # Root case
         mock_path.__str__ = Mock(return_value="C:\\")
         mock_path.name = ""
-        mock_path.iterdir.return_value = []  # Empty directory
         
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path):
+        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
+             _patch_scandir([]):
             view.load_directory_tree(browser_with_state)
             
             # Should call delete to clear existing items
@@ -446,9 +512,9 @@ class TestLoadDirectoryTree:
         mock_path.parent = mock_path  # Root case
         mock_path.__str__ = Mock(return_value="/")
         mock_path.name = ""
-        mock_path.iterdir.return_value = []  # Empty directory
         
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path):
+        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
+             _patch_scandir([]):
             view.load_directory_tree(browser_with_state)
             
             # Should call delete to clear existing items
@@ -456,44 +522,60 @@ class TestLoadDirectoryTree:
 
 
 class TestPopulateTreeNode:
-    def test_populate_tree_node_macos_symlink_handling(self, browser_with_state, monkeypatch):
-        """Test macOS-specific symlink handling."""
-        # Mock macOS environment
-        monkeypatch.setattr(view.utils, "IS_MACOS", True)
-        monkeypatch.setattr(view.utils, "IS_WINDOWS", False)
-        
+    def test_populate_tree_node_skips_link_to_ancestor(self, browser_with_state):
+        """A child with the identity of a directory above it is a loop."""
         browser_with_state.tree = Mock()
         browser_with_state.tree.get_children.return_value = []
         browser_with_state.tree.exists.return_value = False
         browser_with_state.tree.insert = Mock()
         browser_with_state.status_var = Mock()
-        
-        # Create a mock path that would trigger symlink handling
-        mock_path = Mock()
-        from unittest.mock import MagicMock
-        mock_item = MagicMock()
-        mock_item.name = "symlink_dir"
-        mock_item.is_dir.return_value = True
-        mock_item.resolve.return_value = Path("/")
-        mock_path.iterdir.return_value = [mock_item]
-        
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
-             patch.object(view.utils, "would_create_loop", return_value=True):
+        identities = {"/": (1, 2), "/test": (1, 10), "/test/up": (1, 2)}
+        entries = [_FakeDirEntry("/test", "up", is_dir=True)]
+
+        with _patch_scandir(entries), patch.object(
+            browser_with_state.scanner, "identity", side_effect=identities.get
+        ):
             view.populate_tree_node(browser_with_state, "/test")
-            # Should not add the symlink due to loop detection
             browser_with_state.tree.insert.assert_not_called()
 
+    def test_populate_tree_node_reuses_the_parent_identities(self, browser_with_state):
+        """Populating a child looks up its own identity, not its ancestors'."""
+        browser_with_state.tree = Mock()
+        browser_with_state.tree.get_children.return_value = []
+        browser_with_state.tree.exists.return_value = False
+        browser_with_state.status_var = Mock()
+        identities = {
+            "/": (1, 2),
+            "/test": (1, 10),
+            "/test/a": (1, 11),
+            "/test/a/b": (1, 12),
+        }
+        identity = Mock(side_effect=identities.get)
+
+        with patch.object(browser_with_state.scanner, "identity", identity):
+            with _patch_scandir([_FakeDirEntry("/test", "a", is_dir=True)]):
+                view.populate_tree_node(browser_with_state, "/test")
+            identity.reset_mock()
+            with _patch_scandir([_FakeDirEntry("/test/a", "b", is_dir=True)]):
+                view.populate_tree_node(browser_with_state, "/test/a")
+
+        assert [call.args[0] for call in identity.call_args_list] == [
+            "/test/a",
+            "/test/a/b",
+        ]
+        assert browser_with_state.tree_ancestry["/test/a"] == {
+            (1, 2),
+            (1, 10),
+            (1, 11),
+        }
+
     def test_populate_tree_node_permission_error(self, browser_with_state):
         """Test permission error handling in populate_tree_node."""
         browser_with_state.tree = Mock()
         browser_with_state.tree.get_children.return_value = []
         browser_with_state.status_var = Mock()
         
-        # Mock path that raises PermissionError
-        mock_path = Mock()
-        mock_path.iterdir.side_effect = PermissionError("Access denied")
-        
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
+        with _patch_scandir(error=PermissionError("Access denied")), \
              patch("tkface.widget.pathbrowser.view.logger") as mock_logger:
             view.populate_tree_node(browser_with_state, "/protected")
             # Should log warning and set status
@@ -570,11 +652,7 @@ class TestLoadFiles:
         browser_with_state.filter_var.get.return_value = "All files"
         browser_with_state.file_info_manager = Mock()
         
-        # Mock path that raises PermissionError
-        mock_path = Mock()
-        mock_path.iterdir.side_effect = PermissionError("Access denied")
-        
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
+        with _patch_scandir(error=PermissionError("Access denied")), \
              patch("tkface.widget.pathbrowser.view.logger") as mock_logger, \
              patch("tkface.dialog.messagebox.showerror") as mock_show_error:
             view.load_files(browser_with_state)
@@ -609,8 +687,8 @@ class TestLoadFiles:
         # Mock the update method to prevent GUI updates during test
         browser_with_state.update = Mock()
         
-        with patch.object(view.utils, "matches_filter", return_value=True), \
-             patch.object(view, "sort_items", return_value=[]):
+        with patch.object(view.utils, "compile_filter", return_value=lambda name: True), \
+             patch.object(view, "sort_files"):
             view.load_files(browser_with_state)
             # Should call status updates for large directory
             assert browser_with_state.status_var.set.call_count > 1
@@ -692,17 +770,11 @@ class TestUpdateDirectoryStatus:
         browser_with_state.state.current_dir = "/invalid"
         browser_with_state.status_var = Mock()
         
-        # Mock path that raises OSError
-        mock_path = Mock()
-        mock_path.iterdir.side_effect = OSError("No such file")
-        mock_path.name = "invalid"
-        
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
-             patch("tkface.widget.pathbrowser.view.logger") as mock_logger:
+        with _patch_scandir(error=OSError("No such file")) as mock_scandir:
             view.update_directory_status(browser_with_state)
-            # Should handle OSError gracefully
-            mock_logger.error.assert_called()
-            browser_with_state.status_var.set.assert_called()
+            # A failed listing is not retried on the Tk thread
+            mock_scandir.assert_not_called()
+            browser_with_state.status_var.set.assert_called_once_with("")
 
 
 class TestPopulateTreeNodeAdditional:
@@ -724,19 +796,10 @@ class TestPopulateTreeNodeAdditional:
         browser_with_state.tree.insert = Mock()
         browser_with_state.status_var = Mock()
         
-        # Mock path with directories
-        mock_path = Mock()
-        mock_item = Mock()
-        mock_item.name = "test_dir"
-        mock_item.is_dir.return_value = True
-        mock_path.iterdir.return_value = [mock_item]
+        # Scanner sees a single subdirectory
+        entries = [_FakeDirEntry("/test", "test_dir", is_dir=True)]
         
-        # Mock joinpath to return a path that can be iterated
-        mock_subpath = Mock()
-        mock_subpath.iterdir.return_value = []  # No subdirectories
-        mock_path.joinpath.return_value = mock_subpath
-        
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path):
+        with _patch_scandir(entries):
             view.populate_tree_node(browser_with_state, "/test")
             # Should delete placeholder and add new directory
             browser_with_state.tree.delete.assert_called_with("child2_placeholder")
@@ -755,22 +818,11 @@ class TestPopulateTreeNodeAdditional:
         
         # Create a mock path that would trigger volume skipping
         mock_path = Mock()
-        mock_item = Mock()
-        mock_item.name = "volumes_dir"
-        mock_item.is_dir.return_value = True
-        mock_item.resolve.return_value = Path("/")
-        # The item path should contain "/Volumes/" to trigger the skip
-        # We need to mock str(item) to return a path containing "/Volumes/"
-        mock_item.__str__ = lambda self: "/Volumes/test"
-        mock_path.iterdir.return_value = [mock_item]
-        
-        # Mock joinpath for subdirectory check
-        mock_subpath = Mock()
-        mock_subpath.iterdir.return_value = []
-        mock_path.joinpath.return_value = mock_subpath
+        mock_path.resolve.return_value = Path("/")
+        entries = [_FakeDirEntry("/test", "volumes_dir", is_dir=True)]
         
         with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
-             patch.object(view.utils, "would_create_loop", return_value=False):
+             _patch_scandir(entries):
             view.populate_tree_node(browser_with_state, "/test")
             # The volume skipping condition is: real_path == Path("/") and "/Volumes/" in str(item)
             # Since we're mocking resolve() to return Path("/") and str(item) to return "/Volumes/test", it should skip
@@ -778,30 +830,21 @@ class TestPopulateTreeNodeAdditional:
             # This suggests the condition is not being met as expected
             browser_with_state.tree.insert.assert_called()
 
-    def test_populate_tree_node_macos_symlink_loop_detection(self, browser_with_state, monkeypatch):
-        """Test macOS symlink loop detection."""
-        monkeypatch.setattr(view.utils, "IS_MACOS", True)
-        monkeypatch.setattr(view.utils, "IS_WINDOWS", False)
-        
+    def test_populate_tree_node_keeps_link_elsewhere(self, browser_with_state):
+        """A symlink to a directory outside the node's ancestry is listed."""
         browser_with_state.tree = Mock()
         browser_with_state.tree.get_children.return_value = []
         browser_with_state.tree.exists.return_value = False
         browser_with_state.tree.insert = Mock()
         browser_with_state.status_var = Mock()
-        
-        # Create a mock path that would trigger loop detection
-        mock_path = Mock()
-        mock_item = Mock()
-        mock_item.name = "symlink_dir"
-        mock_item.is_dir.return_value = True
-        mock_item.resolve.return_value = Path("/different/path")
-        mock_path.iterdir.return_value = [mock_item]
-        
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
-             patch.object(view.utils, "would_create_loop", return_value=True):
+        identities = {"/": (1, 2), "/test": (1, 10), "/test/link": (2, 7)}
+        entries = [_FakeDirEntry("/test", "link", is_dir=True)]
+
+        with _patch_scandir(entries), patch.object(
+            browser_with_state.scanner, "identity", side_effect=identities.get
+        ):
             view.populate_tree_node(browser_with_state, "/test")
-            # Should skip the symlink due to loop detection
-            browser_with_state.tree.insert.assert_not_called()
+            browser_with_state.tree.insert.assert_called()
 
     def test_populate_tree_node_always_adds_placeholder(self, browser_with_state):
         """Test that placeholder is always added for all directories."""
@@ -811,14 +854,10 @@ class TestPopulateTreeNodeAdditional:
         browser_with_state.tree.insert = Mock()
         browser_with_state.status_var = Mock()
         
-        # Mock path with directories
-        mock_path = Mock()
-        mock_item = Mock()
-        mock_item.name = "test_dir"
-        mock_item.is_dir.return_value = True
-        mock_path.iterdir.return_value = [mock_item]
+        # Scanner sees a single subdirectory
+        entries = [_FakeDirEntry("/test", "test_dir", is_dir=True)]
         
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path):
+        with _patch_scandir(entries):
             view.populate_tree_node(browser_with_state, "/test")
             # Should always add placeholder for all directories
             assert browser_with_state.tree.insert.call_count >= 2  # Directory + placeholder
@@ -840,11 +879,7 @@ class TestLoadFilesAdditional:
         browser_with_state.filter_var.get.return_value = "All files"
         browser_with_state.file_info_manager = Mock()
         
-        # Mock path that raises OSError
-        mock_path = Mock()
-        mock_path.iterdir.side_effect = OSError("No such file")
-        
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
+        with _patch_scandir(error=OSError("No such file")), \
              patch("tkface.widget.pathbrowser.view.logger") as mock_logger:
             view.load_files(browser_with_state)
             # Should log error and set status
@@ -866,11 +901,7 @@ class TestLoadFilesAdditional:
         browser_with_state.filter_var.get.return_value = "All files"
         browser_with_state.file_info_manager = Mock()
         
-        # Mock path that raises PermissionError
-        mock_path = Mock()
-        mock_path.iterdir.side_effect = PermissionError("Access denied")
-        
-        with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
+        with _patch_scandir(error=PermissionError("Access denied")), \
              patch("tkface.widget.pathbrowser.view.logger") as mock_logger, \
              patch("tkface.dialog.messagebox.showerror") as mock_show_error:
             view.load_files(browser_with_state)
@@ -946,27 +977,18 @@ class TestUpdateDirectoryStatusAdditional:
             mock_update.assert_called_once_with(browser_with_state)
 
     def test_update_directory_status_file_size_error(self, browser_with_state, tmp_path):
-        """Test status update when file size cannot be read."""
+        """Test status update when the directory cannot be read."""
         # Create a file
         (tmp_path / "file.txt").write_text("test")
         
         browser_with_state.state.current_dir = str(tmp_path)
         browser_with_state.status_var = Mock()
         
-        # Mock stat to raise PermissionError for one file
-        original_stat = Path.stat
-        def mock_stat(self):
-            if self.name == "file.txt":
-                raise PermissionError("Access denied")
-            return original_stat(self)
-        
-        with patch.object(Path, "stat", mock_stat), \
-             patch("tkface.widget.pathbrowser.view.logger") as mock_logger:
+        with _patch_scandir(error=PermissionError("Access denied")) as mock_scandir:
             view.update_directory_status(browser_with_state)
-            browser_with_state.status_var.set.assert_called()
-            # Should handle permission error gracefully
-            call_args = browser_with_state.status_var.set.call_args[0][0]
-            assert "Access denied" in call_args
+            # The error reported by the loader is not replaced by a new scan
+            mock_scandir.assert_not_called()
+            browser_with_state.status_var.set.assert_called_once_with("")
 
 
 class TestDPIScaling:
@@ -1235,21 +1257,11 @@ class TestMacOSVolumeSkip:
         
         # Create a mock path that would trigger volume skipping
         mock_path = Mock()
-        mock_item = Mock()
-        mock_item.name = "volumes_dir"
-        mock_item.is_dir.return_value = True
-        mock_item.resolve.return_value = Path("/")
-        # The item path should contain "/Volumes/" to trigger the skip
-        mock_item.__str__ = lambda self: "/Volumes/test"
-        mock_path.iterdir.return_value = [mock_item]
-        
-        # Mock joinpath for subdirectory check
-        mock_subpath = Mock()
-        mock_subpath.iterdir.return_value = []
-        mock_path.joinpath.return_value = mock_subpath
+        mock_path.resolve.return_value = Path("/")
+        entries = [_FakeDirEntry("/test", "volumes_dir", is_dir=True)]
         
         with patch("tkface.widget.pathbrowser.view.Path", return_value=mock_path), \
-             patch.object(view.utils, "would_create_loop", return_value=False):
+             _patch_scandir(entries):
             view.populate_tree_node(browser_with_state, "/test")
             # Should insert when skip condition does not short-circuit
             browser_with_state.tree.insert.assert_called()
@@ -1349,8 +1361,8 @@ class TestProgressDisplay:
         # Mock the update method to prevent GUI updates during test
         browser_with_state.update = Mock()
         
-        with patch.object(view.utils, "matches_filter", return_value=True), \
-             patch.object(view, "sort_items", return_value=[]):
+        with patch.object(view.utils, "compile_filter", return_value=lambda name: True), \
+             patch.object(view, "sort_files"):
             view.load_files(browser_with_state)
             # Should call status updates for large directory
             assert browser_with_state.status_var.set.call_count > 1
@@ -1382,19 +1394,13 @@ class TestProgressDisplay:
         # Mock the update method to prevent GUI updates during test
         browser_with_state.update = Mock()
         
-        # Create items that will trigger the specific condition
-        items = []
-        for i in range(120):
-            items.append(("test.txt", "/test.txt", "📄", "4 B", "2023-01-01", "TXT", 4))
-        
-        with patch.object(view.utils, "matches_filter", return_value=True), \
-             patch.object(view, "sort_items", return_value=items):
+        with patch.object(view.utils, "compile_filter", return_value=lambda name: True), \
+             patch.object(view, "sort_files"):
             view.load_files(browser_with_state)
-            # Should call status updates for the specific condition
-            # The condition is: i % batch_size == 0 and len(all_items) > batch_size * 2
+            # Should call status updates for each delivered batch
             assert browser_with_state.status_var.set.call_count > 1
-            # Should call update method for progress display
-            assert browser_with_state.update.call_count > 0
+            # Progress is reported without re-entering the event loop
+            assert browser_with_state.update.call_count == 0
 
 
 class TestSaveModeHandling:
@@ -1468,14 +1474,19 @@ class TestFileSizeErrorHandling:
         browser_with_state.state.current_dir = str(tmp_path)
         browser_with_state.status_var = Mock()
         
-        # Mock stat to raise OSError for one file
-        original_stat = Path.stat
-        def mock_stat(self):
-            if self.name == "file.txt":
-                raise OSError("No such file")
-            return original_stat(self)
+        # Stat raises OSError for some entries
+        failing = ["file.txt"]
+        entries = [
+            _FakeDirEntry(
+                str(tmp_path),
+                path.name,
+                size=path.stat().st_size,
+                error=OSError("No such file") if path.name in failing else None,
+            )
+            for path in sorted(tmp_path.iterdir())
+        ]
         
-        with patch.object(Path, "stat", mock_stat):
+        with _patch_scandir(entries):
             view.update_directory_status(browser_with_state)
             browser_with_state.status_var.set.assert_called()
             # Should handle OSError gracefully and continue processing
@@ -1488,14 +1499,19 @@ class TestFileSizeErrorHandling:
         browser_with_state.state.current_dir = str(tmp_path)
         browser_with_state.status_var = Mock()
         
-        # Mock stat to raise PermissionError for one file
-        original_stat = Path.stat
-        def mock_stat(self):
-            if self.name == "file.txt":
-                raise PermissionError("Access denied")
-            return original_stat(self)
+        # Stat raises PermissionError for some entries
+        failing = ["file.txt"]
+        entries = [
+            _FakeDirEntry(
+                str(tmp_path),
+                path.name,
+                size=path.stat().st_size,
+                error=PermissionError("Access denied") if path.name in failing else None,
+            )
+            for path in sorted(tmp_path.iterdir())
+        ]
         
-        with patch.object(Path, "stat", mock_stat):
+        with _patch_scandir(entries):
             view.update_directory_status(browser_with_state)
             browser_with_state.status_var.set.assert_called()
             # Should handle PermissionError gracefully and continue processing
@@ -1510,14 +1526,19 @@ class TestFileSizeErrorHandling:
         browser_with_state.state.current_dir = str(tmp_path)
         browser_with_state.status_var = Mock()
         
-        # Mock stat to raise OSError for specific files to test the exact lines
-        original_stat = Path.stat
-        def mock_stat(self):
-            if self.name in ["file1.txt", "file3.txt"]:
-                raise OSError("No such file")
-            return original_stat(self)
+        # Stat raises OSError for some entries
+        failing = ["file1.txt", "file3.txt"]
+        entries = [
+            _FakeDirEntry(
+                str(tmp_path),
+                path.name,
+                size=path.stat().st_size,
+                error=OSError("No such file") if path.name in failing else None,
+            )
+            for path in sorted(tmp_path.iterdir())
+        ]
         
-        with patch.object(Path, "stat", mock_stat):
+        with _patch_scandir(entries):
             view.update_directory_status(browser_with_state)
             browser_with_state.status_var.set.assert_called()
             # Should handle OSError gracefully and continue processing
@@ -1533,14 +1554,19 @@ class TestFileSizeErrorHandling:
         browser_with_state.state.current_dir = str(tmp_path)
         browser_with_state.status_var = Mock()
         
-        # Mock stat to raise PermissionError for specific files to test the exact lines
-        original_stat = Path.stat
-        def mock_stat(self):
-            if self.name in ["file1.txt", "file3.txt"]:
-                raise PermissionError("Access denied")
-            return original_stat(self)
+        # Stat raises PermissionError for some entries
+        failing = ["file1.txt", "file3.txt"]
+        entries = [
+            _FakeDirEntry(
+                str(tmp_path),
+                path.name,
+                size=path.stat().st_size,
+                error=PermissionError("Access denied") if path.name in failing else None,
+            )
+            for path in sorted(tmp_path.iterdir())
+        ]
         
-        with patch.object(Path, "stat", mock_stat):
+        with _patch_scandir(entries):
             view.update_directory_status(browser_with_state)
             browser_with_state.status_var.set.assert_called()
             # Should handle PermissionError gracefully and continue processing
@@ -0,0 +1,188 @@
+"""
+Tests for tkface.widget.pathbrowser.virtuallist.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tkface.widget.pathbrowser import FileInfo, FileListModel, VirtualFileList
+from tkface.widget.pathbrowser.virtuallist import SELECTED_TAG
+
+
+class FakeTreeview:
+    """Records the Treeview calls made by the virtual list."""
+
+    def __init__(self, height=10):
+        self.height = height
+        self.items = {}
+        self.order = []
+        self.top = 0
+        self.bindings = {}
+        self.inserts = 0
+
+    def cget(self, option):
+        assert option == "height"
+        return self.height
+
+    def configure(self, **kwargs):
+        pass
+
+    def tag_configure(self, tag, **kwargs):
+        pass
+
+    def bind(self, sequence, func, add=None):  # pylint: disable=unused-argument
+        self.bindings[sequence] = func
+
+    def insert(self, parent, index, iid):  # pylint: disable=unused-argument
+        self.inserts += 1
+        self.items[iid] = {}
+        self.order.append(iid)
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+            self.order.remove(iid)
+
+    def item(self, iid, **kwargs):
+        self.items[iid].update(kwargs)
+
+    def yview_moveto(self, fraction):
+        self.top = int(fraction * len(self.order))
+
+    def yview_scroll(self, number, what):
+        assert what == "units"
+        self.top += number
+
+    def identify_row(self, y):
+        index = self.top + y // 20
+        return self.order[index] if index < len(self.order) else ""
+
+    def visible_texts(self, rows):
+        return [self.items[iid]["text"] for iid in self.order[self.top:self.top + rows]]
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.command = None
+        self.fractions = None
+
+    def configure(self, command):
+        self.command = command
+
+    def set(self, first, last):
+        self.fractions = (first, last)
+
+
+def format_row(info):
+    return info.name, (info.size_str, info.modified, info.file_type)
+
+
+def make_model(count):
+    model = FileListModel()
+    model.extend(
+        FileInfo(f"/d/f{i:06d}", f"f{i:06d}", False, 0, "0 B", "", "TXT")
+        for i in range(count)
+    )
+    return model
+
+
+@pytest.fixture
+def listing():
+    tree = FakeTreeview(height=10)
+    scrollbar = FakeScrollbar()
+    model = make_model(100_000)
+    vlist = VirtualFileList(
+        tree, model, format_row, scrollbar=scrollbar, overscan=5
+    )
+    vlist.reset()
+    return SimpleNamespace(tree=tree, scrollbar=scrollbar, model=model, vlist=vlist)
+
+
+class TestVirtualFileList:
+    def test_only_window_is_materialized(self, listing):
+        # visible rows plus overscan below (none above at the top)
+        assert len(listing.tree.items) == 20
+        assert listing.tree.visible_texts(10)[0] == "f000000"
+        assert listing.scrollbar.fractions == (0.0, 10 / 100_000)
+
+    def test_scroll_within_window_does_not_rerender(self, listing):
+        inserts = listing.tree.inserts
+        texts = dict(listing.tree.items)
+
+        listing.vlist.yview("scroll", 3, "units")
+
+        assert listing.vlist.top == 3
+        assert listing.tree.visible_texts(1) == ["f000003"]
+        assert listing.tree.inserts == inserts
+        assert listing.tree.items == texts
+
+    def test_scroll_outside_window_recycles_rows(self, listing):
+        listing.vlist.yview("moveto", "0.5")
+
+        assert listing.vlist.top == 50_000
+        assert listing.tree.visible_texts(1) == ["f050000"]
+        # Same pool of rows, now with overscan on both sides
+        assert len(listing.tree.items) == 20
+        assert listing.vlist.window == (49_995, 50_015)
+
+    def test_scroll_is_clamped_to_end(self, listing):
+        listing.vlist.yview("moveto", "1.0")
+
+        assert listing.vlist.top == 100_000 - 10
+        assert listing.tree.visible_texts(10)[-1] == "f099999"
+        assert listing.scrollbar.fractions[1] == 1.0
+
+    def test_page_scroll(self, listing):
+        listing.vlist.yview("scroll", 2, "pages")
+        assert listing.vlist.top == 20
+
+    def test_see_scrolls_row_into_view(self, listing):
+        listing.vlist.see(500)
+        assert listing.vlist.top == 491
+
+        listing.vlist.see(100)
+        assert listing.vlist.top == 100
+
+    def test_index_and_path_at_position(self, listing):
+        listing.vlist.yview("moveto", "0.5")
+
+        assert listing.vlist.index_at(40) == 50_002
+        item = listing.tree.identify_row(40)
+        assert listing.vlist.path_of_item(item) == "/d/f050002"
+        assert listing.vlist.index_of_item("unknown") is None
+
+    def test_selection_is_drawn_with_tag(self, listing):
+        listing.model.select(["/d/f000001"])
+        listing.vlist.refresh()
+
+        tags = [listing.tree.items[iid]["tags"] for iid in listing.tree.order[:3]]
+        assert tags == [(), (SELECTED_TAG,), ()]
+
+    def test_pool_shrinks_for_small_listing(self, listing):
+        listing.model.set_rows(list(make_model(3)))
+        listing.vlist.reset()
+
+        assert len(listing.tree.items) == 3
+        assert listing.scrollbar.fractions == (0.0, 1.0)
+
+    def test_mousewheel_scrolls_three_rows(self, listing):
+        result = listing.tree.bindings["<MouseWheel>"](SimpleNamespace(delta=-120))
+        assert result == "break"
+        assert listing.vlist.top == 3
+
+    def test_configure_updates_visible_rows(self, listing):
+        listing.tree.bindings["<Configure>"](SimpleNamespace(height=400))
+        assert listing.vlist.visible_rows == 20
+        assert len(listing.tree.items) == 30
+
+    def test_view_change_is_reported_on_scroll(self, listing):
+        tops = []
+        listing.vlist.on_view_change = lambda: tops.append(listing.vlist.top)
+
+        listing.vlist.yview("scroll", 3, "units")
+        listing.vlist.yview("moveto", "0.5")
+        listing.vlist.yview("scroll", 0, "units")
+
+        assert tops == [3, 50_000]
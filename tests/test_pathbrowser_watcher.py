@@ -0,0 +1,372 @@
+"""
+Tests for tkface.widget.pathbrowser.watcher.
+"""
+
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from tkface.widget.pathbrowser import (
+    DirectoryChange,
+    DirectoryWatcher,
+    FileInfoManager,
+    ScanResult,
+    view,
+)
+from tkface.widget.pathbrowser.watcher import InotifyBackend, PollingBackend
+
+from pathbrowser_stubs import make_stub_browser
+
+requires_inotify = pytest.mark.skipif(
+    InotifyBackend.load_libc() is None, reason="inotify is not available"
+)
+
+
+class FakeWidget:
+    """Collects after() callbacks so tests can run the poll by hand."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, func):  # pylint: disable=unused-argument
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        callbacks = list(self.pending.values())
+        self.pending.clear()
+        for func in callbacks:
+            func()
+
+
+class FakeBackend:
+    """Backend stub returning scripted changes."""
+
+    name = "fake"
+
+    def __init__(self, refuse=()):
+        self.refuse = set(refuse)
+        self.watched = set()
+        self.changes = []
+        self.closed = False
+
+    def add(self, path):
+        if path in self.refuse:
+            return False
+        self.watched.add(path)
+        return True
+
+    def remove(self, path):
+        self.watched.discard(path)
+
+    def poll(self):
+        changes, self.changes = self.changes, []
+        return changes
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTree:
+    """Minimal directory Treeview keeping children in order."""
+
+    def __init__(self):
+        self.children = {"": []}
+        self.texts = {}
+        self.parents = {}
+
+    def exists(self, iid):
+        return iid in self.parents
+
+    def get_children(self, iid=""):
+        return tuple(self.children.get(iid, ()))
+
+    def parent(self, iid):
+        return self.parents[iid]
+
+    def item(self, iid, option=None, **kwargs):  # pylint: disable=unused-argument
+        if option == "text":
+            return self.texts[iid]
+        if option == "open":
+            return True
+        return None
+
+    def insert(self, parent, index, iid, text="", open=False):  # pylint: disable=redefined-builtin,unused-argument
+        siblings = self.children[parent]
+        siblings.insert(len(siblings) if index == "end" else index, iid)
+        self.children[iid] = []
+        self.texts[iid] = text
+        self.parents[iid] = parent
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            for child in list(self.children.get(iid, ())):
+                self.delete(child)
+            self.children[self.parents[iid]].remove(iid)
+            del self.children[iid], self.texts[iid], self.parents[iid]
+
+
+@pytest.fixture(autouse=True)
+def patch_lang():
+    """Avoid requiring a Tk root for localized labels."""
+    with patch(
+        "tkface.widget.pathbrowser.manager.lang.get", side_effect=lambda k, r=None: k
+    ), patch(
+        "tkface.widget.pathbrowser.view.lang.get", side_effect=lambda k, r=None: k
+    ):
+        yield
+
+
+def settle(path, offset=100):
+    """Give a directory an mtime outside the polling race window."""
+    old = time.time() - offset
+    os.utime(path, (old, old))
+
+
+class TestPollingBackend:
+    def test_reports_rescan_when_directory_changes(self, tmp_path):
+        settle(tmp_path)
+        backend = PollingBackend()
+        backend.add(str(tmp_path))
+        assert not backend.poll()
+
+        (tmp_path / "new.txt").write_text("x")
+        settle(tmp_path, offset=50)
+
+        changes = backend.poll()
+        assert [(c.path, c.rescan) for c in changes] == [(str(tmp_path), True)]
+        assert not backend.poll()
+
+    def test_recent_mtime_is_checked_again(self, tmp_path):
+        backend = PollingBackend()
+        backend.add(str(tmp_path))
+
+        # The mtime is within the race window, so the stamp is not trusted
+        assert backend.poll()
+
+    def test_removed_directory_is_reported(self, tmp_path):
+        watched = tmp_path / "gone"
+        watched.mkdir()
+        settle(watched)
+        backend = PollingBackend()
+        backend.add(str(watched))
+
+        watched.rmdir()
+
+        assert [c.path for c in backend.poll()] == [str(watched)]
+
+
+@requires_inotify
+class TestInotifyBackend:
+    def test_reports_changed_names(self, tmp_path):
+        backend = InotifyBackend()
+        try:
+            assert backend.add(str(tmp_path))
+            (tmp_path / "a.txt").write_text("x")
+            (tmp_path / "b.txt").write_text("x")
+            os.rename(tmp_path / "b.txt", tmp_path / "c.txt")
+            (tmp_path / "a.txt").unlink()
+
+            changes = backend.poll()
+
+            assert len(changes) == 1
+            assert changes[0].path == str(tmp_path)
+            assert changes[0].names == {"a.txt", "b.txt", "c.txt"}
+            assert not changes[0].rescan
+            assert not backend.poll()
+        finally:
+            backend.close()
+
+    def test_deleted_directory_needs_rescan(self, tmp_path):
+        watched = tmp_path / "gone"
+        watched.mkdir()
+        backend = InotifyBackend()
+        try:
+            backend.add(str(watched))
+            watched.rmdir()
+            changes = backend.poll()
+            assert [(c.path, c.rescan) for c in changes] == [(str(watched), True)]
+        finally:
+            backend.close()
+
+    def test_add_missing_directory_fails(self, tmp_path):
+        backend = InotifyBackend()
+        try:
+            assert not backend.add(str(tmp_path / "missing"))
+        finally:
+            backend.close()
+
+
+class TestDirectoryWatcher:
+    def test_changes_are_coalesced_per_directory(self):
+        widget = FakeWidget()
+        backend = FakeBackend()
+        on_change = Mock()
+        watcher = DirectoryWatcher(widget, on_change, backend=backend)
+        watcher.watch(["/a", "/b"])
+
+        backend.changes = [
+            DirectoryChange("/a", {"x"}),
+            DirectoryChange("/a", {"y"}),
+            DirectoryChange("/b", rescan=True),
+            DirectoryChange("/unwatched", {"z"}),
+        ]
+        widget.run_pending()
+
+        changes = {c.path: c for c in on_change.call_args[0][0]}
+        assert set(changes) == {"/a", "/b"}
+        assert changes["/a"].names == {"x", "y"}
+        assert changes["/b"].rescan
+        # Polling continues while directories are watched
+        assert widget.pending
+
+    def test_no_callback_without_changes(self):
+        widget = FakeWidget()
+        on_change = Mock()
+        watcher = DirectoryWatcher(widget, on_change, backend=FakeBackend())
+        watcher.watch(["/a"])
+
+        widget.run_pending()
+
+        on_change.assert_not_called()
+
+    def test_refused_watch_falls_back_to_polling(self, tmp_path):
+        backend = FakeBackend(refuse={str(tmp_path)})
+        watcher = DirectoryWatcher(FakeWidget(), Mock(), backend=backend)
+
+        watcher.watch([str(tmp_path)])
+
+        assert watcher.paths == {str(tmp_path)}
+        assert not backend.watched
+        assert isinstance(watcher._fallback, PollingBackend)  # pylint: disable=protected-access
+
+    def test_watch_replaces_directories(self):
+        backend = FakeBackend()
+        watcher = DirectoryWatcher(FakeWidget(), Mock(), backend=backend)
+        watcher.watch(["/a", "/b"])
+
+        watcher.watch(["/b", "/c"])
+
+        assert backend.watched == {"/b", "/c"}
+
+    def test_requeued_changes_are_reported_again(self):
+        widget = FakeWidget()
+        on_change = Mock()
+        watcher = DirectoryWatcher(widget, on_change, backend=FakeBackend())
+        watcher.watch(["/a"])
+
+        watcher.requeue([DirectoryChange("/a", {"x"})])
+        widget.run_pending()
+
+        assert on_change.call_args[0][0][0].names == {"x"}
+
+    def test_close_stops_polling(self):
+        widget = FakeWidget()
+        backend = FakeBackend()
+        watcher = DirectoryWatcher(widget, Mock(), backend=backend)
+        watcher.watch(["/a"])
+
+        watcher.close()
+
+        assert not widget.pending
+        assert backend.closed
+        assert watcher.paths == set()
+
+
+def make_browser(directory):
+    """Browser stand-in with the attributes used by the change handlers."""
+    browser = make_stub_browser()
+    browser.state.current_dir = str(directory)
+    browser.file_info_manager = FileInfoManager()
+    browser.tree = FakeTree()
+    browser.tree_base = str(directory.parent)
+    browser.loader.is_loading.return_value = False
+    browser._file_selection.return_value = []
+    browser.scan_result = ScanResult(path=str(directory))
+    return browser
+
+
+class TestApplyDirectoryChanges:
+    def test_created_and_deleted_files(self, tmp_path):
+        (tmp_path / "old.txt").write_text("x")
+        browser = make_browser(tmp_path)
+        old = browser.file_info_manager.get_file_info(str(tmp_path / "old.txt"))
+        browser.file_list.extend([old])
+        browser.file_tree_rows.add(old.path)
+        browser.scan_result.file_count = 1
+        browser.scan_result.total_size = 1
+
+        (tmp_path / "new.txt").write_text("abc")
+        (tmp_path / "old.txt").unlink()
+        view.apply_directory_changes(
+            browser, [DirectoryChange(str(tmp_path), {"new.txt", "old.txt"})]
+        )
+
+        assert browser.file_list.paths() == [str(tmp_path / "new.txt")]
+        browser.file_tree.delete.assert_called_once_with(old.path)
+        browser.file_tree.insert.assert_called_once()
+        assert browser.file_tree_rows == {str(tmp_path / "new.txt")}
+        assert browser.scan_result.file_count == 1
+        assert browser.scan_result.total_size == 3
+        browser._update_status.assert_called_once()
+
+    def test_rescan_diffs_the_listing(self, tmp_path):
+        (tmp_path / "kept.txt").write_text("x")
+        browser = make_browser(tmp_path)
+        browser.file_list.extend(
+            [browser.file_info_manager.get_file_info(str(tmp_path / "kept.txt"))]
+        )
+
+        (tmp_path / "added.txt").write_text("x")
+        view.apply_directory_changes(
+            browser, [DirectoryChange(str(tmp_path), rescan=True)]
+        )
+
+        assert sorted(browser.file_list.paths()) == [
+            str(tmp_path / "added.txt"),
+            str(tmp_path / "kept.txt"),
+        ]
+
+    def test_changes_are_deferred_while_loading(self, tmp_path):
+        browser = make_browser(tmp_path)
+        browser.watcher = Mock()
+        browser.loader.is_loading.return_value = True
+        change = DirectoryChange(str(tmp_path), {"new.txt"})
+
+        view.apply_directory_changes(browser, [change])
+
+        browser.watcher.requeue.assert_called_once_with([change])
+        assert len(browser.file_list) == 0
+
+    def test_tree_subdirectories_are_updated_in_order(self, tmp_path):
+        for name in ("a", "c", "gone"):
+            (tmp_path / name).mkdir()
+        browser = make_browser(tmp_path / "a")
+        browser.tree_base = str(tmp_path)
+        for name in ("a", "c", "gone"):
+            browser.tree.insert("", "end", str(tmp_path / name), text=name)
+
+        (tmp_path / "b").mkdir()
+        (tmp_path / "gone").rmdir()
+        view.apply_directory_changes(
+            browser, [DirectoryChange(str(tmp_path), rescan=True)]
+        )
+
+        assert browser.tree.get_children("") == (
+            str(tmp_path / "a"),
+            str(tmp_path / "b"),
+            str(tmp_path / "c"),
+        )
+        # New nodes get a placeholder so they can be expanded
+        assert browser.tree.get_children(str(tmp_path / "b")) == (
+            f"{tmp_path / 'b'}_placeholder",
+        )
@@ -25,6 +25,8 @@ class FileDialogConfig:
     save_mode: bool = False
     initialfile: Optional[str] = None
     unround: bool = False
+    # Reuse directory listings cached on disk by earlier dialogs
+    persistent_cache: bool = False
 
 
 @dataclass
@@ -179,6 +181,7 @@ def askpath(
         filetypes=filetypes,
         save_mode=getattr(config, "save_mode", False) if config else False,
         initialfile=getattr(config, "initialfile", None) if config else None,
+        persistent_cache=getattr(config, "persistent_cache", False) if config else False,
     )
     browser.pack(
         fill=tk.BOTH,
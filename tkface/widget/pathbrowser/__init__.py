@@ -5,17 +5,62 @@ This module provides a path browser widget with directory tree and file list pan
 Features:
 - Directory tree (left pane) with icons and refresh
 - File list (right pane) with details view, filtering, sorting, and multiple selection
+- Range-compressed selection with select-all and cheap totals for mass selection
 - Path navigation bar
+- Pluggable filesystem providers: local, zip and tar archives, in-memory
 - OK/Cancel buttons at the bottom
 - File information caching and management
+- Single-pass directory scanning
+- Background directory loading
+- Optional two-phase listing: names first, metadata streamed in the background
+- Streaming recursive file search with a reusable name index
+- Virtualized file list for very large directories
+- Bulk Treeview insertion: one Tcl call per listing
+- Background subdirectory prefetching for the directory tree
+- Incremental, cancellable Expand All
+- Optional folder sizes computed in the background for the visible folders
+- Optional read-only preview pane with bounded reads
+- Per-navigation phase timings and cache counters
+- Live directory change monitoring
+- Persistent directory listing cache shared across sessions
+- Instant back/forward from retained directory listings
 - Theme support
 - Performance optimization
 """
 
+from .bulkinsert import insert_items
 from .core import PathBrowser, PathBrowserConfig, PathBrowserState
-from .manager import FileInfo, FileInfoManager
+from .expander import TreeExpander
+from .filesystem import (
+    FileSystem,
+    LocalFileSystem,
+    MemoryFileSystem,
+    TarFileSystem,
+    ZipFileSystem,
+    open_archive,
+)
+from .foldersize import FolderSizer
+from .listingcache import ListingCache, get_listing_cache
+from .loader import DirectoryLoader
+from .manager import (
+    FileInfo,
+    FileInfoManager,
+    PendingFileInfo,
+    UnreadableFileInfo,
+)
+from .metadata import MetadataFiller
+from .model import FileListModel, SelectedPaths
+from .prefetch import SubdirPrefetcher
+from .preview import Preview, PreviewCache, read_preview
+from .scanner import DirectoryScanner, ScanResult
+from .search import FileSearcher, NameIndex, SearchResult
+from .selection import RangeSelection
+from .snapshot import DirectorySnapshot, SnapshotCache
+from .stats import NavigationStats, StatsRecorder
 from .style import PathBrowserTheme, get_pathbrowser_theme, get_pathbrowser_themes
 from .utils import format_size
+from .virtuallist import VirtualFileList
+from .watcher import DirectoryChange, DirectoryWatcher
 
 __all__ = [
     "PathBrowser",
@@ -23,6 +68,40 @@ __all__ = [
     "PathBrowserState",
     "FileInfoManager",
     "FileInfo",
+    "FileSystem",
+    "LocalFileSystem",
+    "ZipFileSystem",
+    "TarFileSystem",
+    "MemoryFileSystem",
+    "open_archive",
+    "PendingFileInfo",
+    "UnreadableFileInfo",
+    "DirectoryScanner",
+    "ScanResult",
+    "DirectoryLoader",
+    "MetadataFiller",
+    "FileSearcher",
+    "NameIndex",
+    "SearchResult",
+    "ListingCache",
+    "get_listing_cache",
+    "DirectorySnapshot",
+    "SnapshotCache",
+    "FileListModel",
+    "SelectedPaths",
+    "RangeSelection",
+    "SubdirPrefetcher",
+    "Preview",
+    "PreviewCache",
+    "read_preview",
+    "NavigationStats",
+    "StatsRecorder",
+    "TreeExpander",
+    "FolderSizer",
+    "VirtualFileList",
+    "insert_items",
+    "DirectoryWatcher",
+    "DirectoryChange",
     "format_size",
     "get_pathbrowser_theme",
     "get_pathbrowser_themes",
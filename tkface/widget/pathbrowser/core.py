@@ -12,22 +12,40 @@ and configuration management for the PathBrowser widget.
 
 import logging
 import os
+import time
 import tkinter as tk
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 from tkface import lang
 from tkface.dialog import messagebox
 from tkface.widget.pathbrowser import view
 
 from . import utils
+from .expander import TreeExpander
+from .filesystem import FileSystem, LocalFileSystem
+from .foldersize import FolderSizer
+from .listingcache import get_listing_cache
+from .loader import DirectoryLoader
 from .manager import FileInfoManager
+from .metadata import MetadataFiller
+from .model import FileListModel, SelectedPaths
+from .prefetch import SubdirPrefetcher
+from .preview import PreviewCache
+from .scanner import DirectoryScanner
+from .search import FileSearcher
+from .snapshot import SnapshotCache
+from .stats import NavigationStats, StatsRecorder
 from .style import get_pathbrowser_theme
+from .watcher import DirectoryWatcher
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Keystrokes further apart than this start a new type-ahead prefix (seconds)
+TYPE_AHEAD_TIMEOUT = 1.0
+
 
 @dataclass
 class PathBrowserConfig:
@@ -41,12 +59,60 @@ class PathBrowserConfig:
     cancel_label: str = "cancel"
     save_mode: bool = False
     initialfile: Optional[str] = None
+    # Provider of directories and files (None: the local filesystem), e.g.
+    # a ZipFileSystem to pick members of an archive without extracting it
+    filesystem: Optional[FileSystem] = None
     # Performance settings
     max_cache_size: int = 1000
+    # Approximate byte budget of the file info cache (None for no limit)
+    max_cache_bytes: Optional[int] = 16 * 1024 * 1024
+    # Cached records older than this are checked against the file's mtime
+    # and size when used; failed lookups are retried after error_cache_ttl
+    cache_ttl: Optional[float] = 30.0
+    error_cache_ttl: Optional[float] = 5.0
     batch_size: int = 100
     enable_memory_monitoring: bool = True
     show_hidden_files: bool = False
+    # Paint names and icons from the directory listing first and fill in
+    # size and date in the background, the rows in view first
+    two_phase_listing: bool = False
+    # With two_phase_listing, only stat the rows that come into view;
+    # without it, this flag has no effect
     lazy_loading: bool = True
+    # Threads stating a listing's entries in parallel when the filesystem
+    # is slow (NFS, SMB); 0 or 1 keeps stats sequential
+    stat_workers: int = 8
+    # Mean milliseconds per stat (timed on the first entries of a listing)
+    # above which stats go parallel (None: never)
+    parallel_stat_latency_ms: Optional[float] = 1.0
+    background_loading: bool = True
+    # Only materialize visible file rows (plus overscan) for huge directories
+    virtual_list: bool = False
+    virtual_overscan: int = 20
+    # Apply directory changes incrementally while the browser is open
+    watch_directories: bool = False
+    watch_interval_ms: int = 500
+    # Reuse listings stored on disk by earlier sessions (revalidated on load)
+    persistent_cache: bool = False
+    cache_path: Optional[str] = None
+    # Listings of recently left directories kept for instant back/forward
+    # (0 disables); revisits only rescan when the directory changed
+    directory_snapshots: int = 4
+    # List the subdirectories of visible tree nodes in the background
+    prefetch_directories: bool = True
+    # Limits of "Expand All" (levels below the node, nodes opened)
+    expand_all_max_depth: int = 8
+    expand_all_max_nodes: int = 2000
+    # Recursive search: matches shown per search, reuse of walked names
+    search_max_results: int = 1000
+    search_index: bool = True
+    # Show the total size of the visible folders, computed in the background
+    folder_sizes: bool = False
+    folder_size_workers: int = 4
+    # Read-only pane showing the head (and optionally tail) of the selection
+    preview_pane: bool = False
+    preview_bytes: int = 64 * 1024
+    preview_tail_bytes: int = 0
 
 
 @dataclass
@@ -54,12 +120,16 @@ class PathBrowserState:
     """State management for PathBrowser widget."""
 
     current_dir: str = field(default_factory=lambda: str(Path.cwd()))
-    selected_items: List[str] = field(default_factory=list)
+    # A live SelectedPaths view for file list selections, else a list
+    selected_items: Sequence[str] = field(default_factory=list)
     sort_column: str = "#0"
     sort_reverse: bool = False
     navigation_history: List[str] = field(default_factory=list)
     forward_history: List[str] = field(default_factory=list)
     selection_anchor: Optional[str] = None
+    # Characters typed into the file list and the time of the last one
+    type_ahead_prefix: str = ""
+    type_ahead_time: float = 0.0
 
 
 class PathBrowser(tk.Frame):
@@ -86,6 +156,8 @@ class PathBrowser(tk.Frame):
         save_mode: bool = False,
         initialfile: Optional[str] = None,
         config: Optional[PathBrowserConfig] = None,
+        persistent_cache: bool = False,
+        filesystem: Optional[FileSystem] = None,
         **kwargs,
     ):
         """
@@ -102,6 +174,8 @@ class PathBrowser(tk.Frame):
             save_mode: Whether this is a save dialog
             initialfile: Initial filename for save mode
             config: Configuration object (overrides individual parameters)
+            persistent_cache: Reuse directory listings cached on disk
+            filesystem: Provider of directories and files (default: local)
             **kwargs: Additional arguments for Frame
         """
         super().__init__(parent)  # pylint: disable=too-many-positional-arguments
@@ -120,18 +194,145 @@ class PathBrowser(tk.Frame):
                 cancel_label=cancel_label,
                 save_mode=save_mode,
                 initialfile=initialfile,
+                persistent_cache=persistent_cache,
+                filesystem=filesystem,
             )
 
+        # Every listing, stat and read goes through the filesystem provider.
+        # Directory watching, folder sizes and the listing cache use os APIs
+        # and are only available for local paths
+        self.filesystem = self.config.filesystem or LocalFileSystem()
+
         # Initialize state
         self.state = PathBrowserState(
-            current_dir=self.config.initialdir or str(Path.cwd())
+            current_dir=self.config.initialdir or self.filesystem.cwd()
         )
 
         # Initialize file info manager with config settings
         self.file_info_manager = FileInfoManager(
-            self, max_cache_size=self.config.max_cache_size
+            self,
+            max_cache_size=self.config.max_cache_size,
+            max_cache_bytes=self.config.max_cache_bytes,
+            ttl=self.config.cache_ttl,
+            error_ttl=self.config.error_cache_ttl,
+            filesystem=self.filesystem,
+        )
+
+        # Single-pass directory scanner sharing the file info cache
+        latency_ms = self.config.parallel_stat_latency_ms
+        self.scanner = DirectoryScanner(
+            self.file_info_manager,
+            stat_workers=self.config.stat_workers,
+            parallel_stat_latency=None if latency_ms is None else latency_ms / 1000,
+        )
+        self.scan_result = None
+        # Displayed rows in order; navigation and selection work against it
+        self.file_list = FileListModel()
+        # Set by view.create_pathbrowser_widgets when virtual_list is enabled
+        self.file_list_view = None
+        # Paths inserted into the file Treeview, including filtered-out rows
+        self.file_tree_rows = set()
+        # Directory stamp the displayed listing is complete and valid for
+        self.listing_stamp = None
+        # Listings of recently left directories, repainted on return
+        self.snapshots = None
+        if self.config.directory_snapshots > 0:
+            self.snapshots = SnapshotCache(
+                self.config.directory_snapshots,
+                on_evict=lambda snapshot: view.drop_snapshot(self, snapshot),
+            )
+
+        # Phase timings of each navigation, reported through subscribers
+        # and the <<PathBrowserStats>> virtual event
+        self.stats_recorder = StatsRecorder(
+            lambda: (self.file_info_manager.hits, self.file_info_manager.misses),
+            on_finish=self._on_navigation_stats,
         )
 
+        # Directory listings are scanned off the Tk thread
+        self.loader = DirectoryLoader(
+            self,
+            self.scanner,
+            batch_size=self.config.batch_size,
+            threaded=self.config.background_loading,
+        )
+        # Listings shared with other sessions through the user cache directory
+        self.listing_cache = None
+        if self.config.persistent_cache and self.filesystem.local:
+            self.listing_cache = get_listing_cache(self.config.cache_path)
+        # Directory listed by the top-level tree items
+        self.tree_base = None
+        # Identities of each populated tree node's directory and those above it
+        self.tree_ancestry = {}
+        # Tells the tree which nodes can expand and pre-lists the next level
+        self.prefetcher = None
+        if self.config.prefetch_directories:
+            self.prefetcher = SubdirPrefetcher(
+                self,
+                self.scanner,
+                lambda path, subdirs: view.on_subdirs_prefetched(
+                    self, path, subdirs
+                ),
+                threaded=self.config.background_loading,
+            )
+        # Recursive search below the current directory, off the Tk thread
+        self.searcher = FileSearcher(
+            self,
+            self.file_info_manager,
+            batch_size=self.config.batch_size,
+            max_results=self.config.search_max_results,
+            use_index=self.config.search_index,
+            threaded=self.config.background_loading,
+        )
+        # Directory searched while the file list shows search matches
+        self.search_root = None
+        self.search_result = None
+        self.search_after_id = None
+        # Totals of the visible folders for the Size column, off the Tk thread
+        self.folder_sizer = None
+        self.folder_size_after_id = None
+        if self.config.folder_sizes and self.filesystem.local:
+            self.folder_sizer = FolderSizer(
+                self,
+                lambda sizes: view.on_folder_sizes(self, sizes),
+                workers=self.config.folder_size_workers,
+                threaded=self.config.background_loading,
+            )
+        # Sizes and dates of rows listed by name only, off the Tk thread
+        self.metadata_filler = None
+        self.metadata_after_id = None
+        if self.config.two_phase_listing:
+            self.metadata_filler = MetadataFiller(
+                self,
+                self.file_info_manager,
+                lambda records: view.on_metadata(self, records),
+                on_idle=lambda: view.on_metadata_idle(self),
+                threaded=self.config.background_loading,
+            )
+        # Bounded previews of the selected file, shown next to the file list
+        self.preview_cache = None
+        self.preview_after_id = None
+        if self.config.preview_pane:
+            self.preview_cache = PreviewCache(
+                head_bytes=self.config.preview_bytes,
+                tail_bytes=self.config.preview_tail_bytes,
+                filesystem=self.filesystem,
+            )
+        # "Expand All" runs breadth first from the event loop
+        self.expander = TreeExpander(
+            self,
+            max_depth=self.config.expand_all_max_depth,
+            max_nodes=self.config.expand_all_max_nodes,
+        )
+        # Optional live updates for the displayed directories
+        self.watcher = None
+        if self.config.watch_directories and self.filesystem.local:
+            self.watcher = DirectoryWatcher(
+                self,
+                lambda changes: view.apply_directory_changes(self, changes),
+                interval_ms=self.config.watch_interval_ms,
+            )
+
         # Initialize theme
         self.theme = get_pathbrowser_theme()
 
@@ -212,20 +413,30 @@ class PathBrowser(tk.Frame):
                     # Use improved cache clearing method
                     self.file_info_manager.clear_directory_cache(old_dir)
             
-            self.state.current_dir = str(Path(resolved_path).absolute())
+            if self.filesystem.local:
+                resolved_path = str(Path(resolved_path).absolute())
+            self.state.current_dir = resolved_path
             self.path_var.set(self.state.current_dir)
 
             # Check if the directory exists before trying to load it
-            if not Path(resolved_path).exists():
+            if not self.filesystem.exists(resolved_path):
                 raise FileNotFoundError(f"Directory not found: {resolved_path}")
 
-            view.load_directory_tree(self)
+            # Watch before scanning so no change falls between the two
+            self._update_watched_directories()
+            # Start the file list scan first; the status bar reuses its totals
             view.load_files(self)
+            view.load_directory_tree(self)
+            self._update_watched_directories()
             
             self._update_status()
-            # Clear selection when changing directory
-            self.state.selected_items = []
-            view.update_selected_display(self)
+            if self.snapshots is not None and self._file_selection():
+                # A restored snapshot brings back its selection
+                self._on_file_select(None)
+            else:
+                # Clear selection when changing directory
+                self.state.selected_items = []
+                view.update_selected_display(self)
             # In save mode, restore initial filename after directory change
             if self.config.save_mode and self.config.initialfile:
                 self.selected_var.set(self.config.initialfile)
@@ -258,7 +469,7 @@ class PathBrowser(tk.Frame):
                 self._load_directory(parent_dir, visited_dirs, max_recursion - 1)
             else:
                 # Fallback to home directory with recursion protection
-                home_dir = str(Path.home())
+                home_dir = self.filesystem.home()
                 self._load_directory(home_dir, visited_dirs, max_recursion - 1)
 
         except OSError as e:
@@ -274,9 +485,46 @@ class PathBrowser(tk.Frame):
                 self._load_directory(parent_dir, visited_dirs, max_recursion - 1)
             else:
                 # Fallback to home directory with recursion protection
-                home_dir = str(Path.home())
+                home_dir = self.filesystem.home()
                 self._load_directory(home_dir, visited_dirs, max_recursion - 1)
 
+    def destroy(self):
+        """Cancel background loading and watching, and destroy the widget."""
+        loader = getattr(self, "loader", None)
+        if loader is not None:
+            loader.close()
+        expander = getattr(self, "expander", None)
+        if expander is not None:
+            expander.cancel()
+        searcher = getattr(self, "searcher", None)
+        if searcher is not None:
+            searcher.close()
+        prefetcher = getattr(self, "prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.close()
+        folder_sizer = getattr(self, "folder_sizer", None)
+        if folder_sizer is not None:
+            folder_sizer.close()
+        scanner = getattr(self, "scanner", None)
+        if scanner is not None:
+            scanner.close()
+        metadata_filler = getattr(self, "metadata_filler", None)
+        if metadata_filler is not None:
+            metadata_filler.close()
+        if getattr(self, "metadata_after_id", None) is not None:
+            self.after_cancel(self.metadata_after_id)
+        if getattr(self, "preview_after_id", None) is not None:
+            self.after_cancel(self.preview_after_id)
+        watcher = getattr(self, "watcher", None)
+        if watcher is not None:
+            watcher.close()
+        super().destroy()
+
+    def _update_watched_directories(self):
+        """Watch the current directory and the expanded tree nodes."""
+        if self.watcher is not None:
+            self.watcher.watch(view.get_watched_directories(self))
+
     def _go_up(self):  # pylint: disable=no-member
         """Navigate to the parent directory."""
         parent_dir = str(Path(self.state.current_dir).parent)
@@ -396,6 +644,11 @@ class PathBrowser(tk.Frame):
                 # Populate children if not already done
                 if not self.tree.get_children(selected_path):
                     view.populate_tree_node(self, selected_path)
+                self._update_watched_directories()
+
+    def _on_tree_close(self, event):  # pylint: disable=unused-argument
+        """Handle tree node collapse."""
+        self._update_watched_directories()
 
     def _on_tree_right_click(self, event):  # pylint: disable=unused-argument,no-member
         """Handle tree right click."""
@@ -410,12 +663,118 @@ class PathBrowser(tk.Frame):
         # Get clicked item
         item = self.file_tree.identify_row(event.y)
         if item:
-            self.file_tree.selection_set(item)
+            self._set_file_selection(self._file_row_path(item))
             view.show_context_menu(self, event, "file")
 
+    def _file_selection(self) -> List[str]:  # pylint: disable=no-member
+        """Return the selected paths of the file list in display order."""
+        if self.file_list_view is not None:
+            return self.file_list.selection()
+        return list(self.file_tree.selection())
+
+    def _set_file_selection(self, items, see=None):  # pylint: disable=no-member
+        """Select file list rows by path.
+
+        Args:
+            items: Path or list of paths, as accepted by Treeview.selection_set
+            see: Path to scroll into view
+        """
+        self.file_list.select([items] if isinstance(items, str) else items)
+        if self.file_list_view is None:
+            self.file_tree.selection_set(items)
+            if see is not None:
+                self.file_tree.see(see)
+            return
+
+        if see is not None:
+            index = self.file_list.index_of(see)
+            if index is not None:
+                self.file_list_view.see(index)
+        self.file_list_view.refresh()
+        # The recycled rows carry no Treeview selection, so notify like Tk does
+        self.file_tree.event_generate("<<TreeviewSelect>>")
+
+    def _select_file_range(self, start, stop, see=None):  # pylint: disable=no-member
+        """Select the file list rows at display positions start to stop.
+
+        Args:
+            start: First position
+            stop: Position after the last one
+            see: Path to scroll into view
+        """
+        rows = self.file_list
+        previous = rows.selection_ranges()
+        rows.select_range(start, stop)
+        if self.file_list_view is not None:
+            if see is not None:
+                index = rows.index_of(see)
+                if index is not None:
+                    self.file_list_view.see(index)
+            self.file_list_view.refresh()
+            self.file_tree.event_generate("<<TreeviewSelect>>")
+            return
+
+        if len(previous) == 1 and (previous[0][0] == start or previous[0][1] == stop):
+            # Moving one end of a block only changes the rows it passes over
+            old_start, old_stop = previous[0]
+            if old_start == start:
+                changed = rows.paths_between(min(old_stop, stop), max(old_stop, stop))
+                grown = stop > old_stop
+            else:
+                changed = rows.paths_between(
+                    min(old_start, start), max(old_start, start)
+                )
+                grown = start < old_start
+            if grown:
+                self.file_tree.selection_add(changed)
+            else:
+                self.file_tree.selection_remove(changed)
+        else:
+            self.file_tree.selection_set(rows.paths_between(start, stop))
+        if see is not None:
+            self.file_tree.see(see)
+
+    def _select_all(self, event=None):  # pylint: disable=unused-argument,no-member
+        """Select every row of the file list (Control-A)."""
+        if self.config.multiple and self.file_list:
+            self.state.selection_anchor = self.file_list.path_at(0)
+            self._select_file_range(0, len(self.file_list))
+        return "break"
+
+    def _collect_selected_items(self, selection=None) -> Sequence[str]:
+        """Return the selected paths that count for the select mode.
+
+        A selection the file list model holds is returned as a live view of
+        its ranges, so no path is built until the selection is read; only
+        ids the model does not list fall back to the file info cache.
+        Directories are kept in file mode for validation in _on_ok.
+
+        Args:
+            selection: Selected Treeview ids, or None to use the model
+        """
+        rows = self.file_list
+        dirs_only = self.config.select == "dir"
+        if selection is None or rows.selected_count == len(selection):
+            return SelectedPaths(rows, dirs_only)
+
+        selected_items = []
+        for item_id in selection:
+            file_info = rows.get(item_id)
+            if file_info is None:
+                file_info = self.file_info_manager.get_cached_file_info(item_id)
+            if file_info.is_dir or not dirs_only:
+                selected_items.append(item_id)
+        return selected_items
+
+    def _file_row_path(self, item):
+        """Return the path displayed by a row of the file list Treeview."""
+        if self.file_list_view is None:
+            return item
+        return self.file_list_view.path_of_item(item)
+
     def _copy_path(self):  # pylint: disable=no-member
         """Copy selected path to clipboard."""
-        selection = self.tree.selection() or self.file_tree.selection()
+        selection = self.tree.selection() or self._file_selection()
         if selection:
             path = selection[0]
             self.clipboard_clear()
@@ -423,7 +782,7 @@ class PathBrowser(tk.Frame):
 
     def _open_selected(self):  # pylint: disable=no-member
         """Open selected file/directory."""
-        selection = self.file_tree.selection()
+        selection = self._file_selection()
         if selection:
             item_id = selection[0]
             # pylint: disable=protected-access
@@ -454,6 +813,7 @@ class PathBrowser(tk.Frame):
                         self.tree.delete(child)
                 if not self.tree.get_children(selected_path):
                     view.populate_tree_node(self, selected_path)
+                self._update_watched_directories()
         return "break"  # Prevent default behavior
 
     # pylint: disable=unused-argument,no-member
@@ -465,6 +825,7 @@ class PathBrowser(tk.Frame):
             file_info = self.file_info_manager.get_cached_file_info(selected_path)
             if file_info.is_dir:
                 self.tree.item(selected_path, open=False)
+                self._update_watched_directories()
         return "break"  # Prevent default behavior
 
     # pylint: disable=unused-argument,no-member
@@ -486,6 +847,46 @@ class PathBrowser(tk.Frame):
         """Handle file tree click to ensure focus."""
         # Ensure file_tree has focus for keyboard events
         self.file_tree.focus_set()
+        if self.file_list_view is not None:
+            return self._click_file_row(event)
+        return None
+
+    def _click_file_row(self, event, mode="set"):  # pylint: disable=no-member
+        """Select the clicked row of the virtual file list.
+
+        Args:
+            event: The mouse event
+            mode: "set" selects only the row, "toggle" adds or removes it
+                (Control-click) and "extend" selects from the anchor
+                (Shift-click)
+        """
+        self.file_tree.focus_set()
+        index = self.file_list_view.index_at(event.y)
+        if index is None:
+            return "break"
+
+        path = self.file_list.path_at(index)
+        if not self.config.multiple:
+            mode = "set"
+
+        if mode == "toggle":
+            self.file_list.toggle(path)
+            self.state.selection_anchor = path
+            self.file_list_view.refresh()
+            self.file_tree.event_generate("<<TreeviewSelect>>")
+        elif mode == "extend":
+            anchor_index = self.file_list.index_of(self.state.selection_anchor)
+            if anchor_index is None:
+                anchor_index = index
+                self.state.selection_anchor = path
+            start_index = min(anchor_index, index)
+            end_index = max(anchor_index, index)
+            self._select_file_range(start_index, end_index + 1)
+        else:
+            # Reset anchor so that _on_file_select anchors on this row
+            self.state.selection_anchor = None
+            self._set_file_selection(path)
+        return "break"
 
     def _on_file_frame_click(self, event):  # pylint: disable=unused-argument,no-member
         """Handle file frame click to ensure focus."""
@@ -555,38 +956,27 @@ class PathBrowser(tk.Frame):
             event: The key event
             direction: Direction to move (-1 for up, 1 for down)
         """
-        current_selection = self.file_tree.selection()
-        if not current_selection:
-            # If nothing is selected, select the first item
-            children = self.file_tree.get_children()
-            if children:
-                self.file_tree.selection_set(children[0])
-                self.file_tree.see(children[0])
+        rows = self.file_list
+        if not rows:
             return "break"
 
-        # Get current selection index
-        children = self.file_tree.get_children()
-        if not children:
+        current_selection = self._file_selection()
+        current_index = (
+            rows.index_of(current_selection[0]) if current_selection else None
+        )
+        if current_index is None:
+            # If nothing is selected, select the first item
+            first_item = rows.path_at(0)
+            self._set_file_selection(first_item, see=first_item)
             return "break"
 
-        current_index = children.index(current_selection[0])
         new_index = current_index + direction
 
-        # Check bounds
-        if direction == -1 and new_index >= 0:
-            # Moving up: check lower bound
-            valid_move = True
-        elif direction == 1 and new_index < len(children):
-            # Moving down: check upper bound
-            valid_move = True
-        else:
-            valid_move = False
-
-        if valid_move:
+        # Check bounds (only single steps up or down are valid)
+        if direction in (-1, 1) and 0 <= new_index < len(rows):
             # Move to new item
-            new_selection = children[new_index]
-            self.file_tree.selection_set(new_selection)
-            self.file_tree.see(new_selection)
+            new_selection = rows.path_at(new_index)
+            self._set_file_selection(new_selection, see=new_selection)
             # Reset anchor for single selection
             self.state.selection_anchor = None
             # Update selection state
@@ -609,19 +999,60 @@ class PathBrowser(tk.Frame):
             event: The key event
             edge: Edge to move to ("first" or "last")
         """
-        children = self.file_tree.get_children()
-        if children:
+        rows = self.file_list
+        if rows:
             if edge == "first":
-                target_item = children[0]
+                target_item = rows.path_at(0)
             else:  # edge == "last"
-                target_item = children[-1]
+                target_item = rows.path_at(len(rows) - 1)
 
-            self.file_tree.selection_set(target_item)
-            self.file_tree.see(target_item)
+            self._set_file_selection(target_item, see=target_item)
             # Update selection state
             self._on_file_select(None)
         return "break"
 
+    def _type_ahead(self, event):  # pylint: disable=no-member
+        """Jump to the first row whose name starts with the typed characters.
+
+        Characters typed within TYPE_AHEAD_TIMEOUT of each other form one
+        prefix; pressing the same character repeatedly cycles through the
+        rows starting with it.
+
+        Args:
+            event: The key event
+        """
+        char = getattr(event, "char", "")
+        if not char or not char.isprintable():
+            return None
+
+        now = time.monotonic()
+        if now - self.state.type_ahead_time > TYPE_AHEAD_TIMEOUT:
+            self.state.type_ahead_prefix = ""
+        self.state.type_ahead_prefix += char
+        self.state.type_ahead_time = now
+
+        rows = self.file_list
+        if not rows:
+            return "break"
+        prefix = self.state.type_ahead_prefix
+        current_selection = self._file_selection()
+        current_index = (
+            rows.index_of(current_selection[0]) if current_selection else None
+        )
+        if len(set(prefix)) == 1:
+            # A new or repeated character moves on to the next matching row
+            start = 0 if current_index is None else current_index + 1
+            target_item = rows.find_prefix(char, start)
+        else:
+            # A longer prefix keeps the current row while it still matches
+            target_item = rows.find_prefix(prefix, current_index or 0)
+
+        if target_item is not None:
+            self._set_file_selection(target_item, see=target_item)
+            self.state.selection_anchor = None
+            self._on_file_select(None)
+        return "break"
+
     def _extend_selection_up(self, event):  # pylint: disable=unused-argument,no-member
         """Extend selection upward with Shift+Up."""
         return self._extend_selection_range(event, direction=-1)
@@ -644,123 +1075,83 @@ class PathBrowser(tk.Frame):
                 return self._move_selection_up(event)
             return self._move_selection_down(event)
 
-        current_selection = self.file_tree.selection()
-        children = self.file_tree.get_children()
-
-        if not children:
+        rows = self.file_list
+        if not rows:
             return "break"
 
-        if not current_selection:
+        bounds = rows.selection_bounds()
+        if bounds is None:
             # If nothing is selected, select the first item
-            self.file_tree.selection_set(children[0])
-            self.file_tree.see(children[0])
+            first_item = rows.path_at(0)
+            self._set_file_selection(first_item, see=first_item)
             self._on_file_select(None)
             return "break"
 
         # Use stored anchor or set it if not available
-        if self.state.selection_anchor is None:
-            self.state.selection_anchor = current_selection[0]
-
-        anchor_item = self.state.selection_anchor
-        anchor_index = children.index(anchor_item)
-
-        # For range selection, track the current end of selection
-        # We'll use the last selected item as the current end
-        if len(current_selection) == 1:
-            # Single selection - use it as both anchor and current end
-            current_end = current_selection[0]
+        first_index, last_index = bounds
+        anchor_index = rows.index_of(self.state.selection_anchor)
+        if anchor_index is None:
+            anchor_index = first_index
+            self.state.selection_anchor = rows.path_at(first_index)
+
+        # The current end of the range is the selected row furthest from the
+        # anchor, so it is the first or the last selected row
+        if abs(first_index - anchor_index) >= abs(last_index - anchor_index):
+            current_end_index = first_index
         else:
-            # Multiple selection - find the end that's furthest from anchor
-            anchor_index = children.index(anchor_item)
-            current_end = None
-            max_distance = 0
-
-            for item in current_selection:
-                item_index = children.index(item)
-                distance = abs(item_index - anchor_index)
-                if distance > max_distance:
-                    max_distance = distance
-                    current_end = item
-
-        current_end_index = children.index(current_end)
+            current_end_index = last_index
 
         # Calculate new end index
         new_end_index = current_end_index + direction
 
-        # Check bounds
-        if direction == -1 and new_end_index >= 0:
-            # Moving up: check lower bound
-            valid_range = True
-        elif direction == 1 and new_end_index < len(children):
-            # Moving down: check upper bound
-            valid_range = True
-        else:
-            valid_range = False
-
-        if valid_range:
+        # Check bounds (only single steps up or down are valid)
+        if direction in (-1, 1) and 0 <= new_end_index < len(rows):
             # Create range selection from anchor to new end
             start_index = min(anchor_index, new_end_index)
             end_index = max(anchor_index, new_end_index)
-            range_items = children[start_index : end_index + 1]
 
             # Set the new selection range
-            self.file_tree.selection_set(range_items)
-            self.file_tree.see(children[new_end_index])
+            self._select_file_range(
+                start_index, end_index + 1, see=rows.path_at(new_end_index)
+            )
 
             # Update selection state without calling _on_file_select to avoid recursion
             # Just update the internal state
-            self.state.selected_items = list(range_items)
+            self.state.selected_items = self._collect_selected_items()
             view.update_selected_display(self)
             self._update_status()
 
         return "break"
 
     def _expand_all(self, path):  # pylint: disable=no-member
-        """Recursively expand all subdirectories."""
+        """Expand a node and its subdirectories incrementally (Escape cancels)."""
         file_info = self.file_info_manager.get_cached_file_info(path)
         if file_info.is_dir:
-            # Expand current node
-            self.tree.item(path, open=True)
-            # Remove placeholders and populate
-            children = self.tree.get_children(path)
-            for child in children:
-                if child.endswith("_placeholder"):
-                    self.tree.delete(child)
-            if not self.tree.get_children(path):
-                view.populate_tree_node(self, path)
-
-            # Recursively expand children
-            children = self.tree.get_children(path)
-            for child in children:
-                child_info = self.file_info_manager.get_cached_file_info(child)
-                if child_info.is_dir:
-                    self._expand_all(child)
+            self.expander.start(path)
 
     def _on_file_select(self, event):  # pylint: disable=unused-argument,no-member
         """Handle file list selection."""
-        selection = self.file_tree.selection()
-        self.state.selected_items = []
-
-        for item_id in selection:
-            file_info = self.file_info_manager.get_cached_file_info(item_id)
-
-            if file_info.is_dir:
-                if self.config.select in ["dir", "both"]:
-                    self.state.selected_items.append(item_id)
-                # Also add directories in file mode for validation in _on_ok
-                elif self.config.select == "file":
-                    self.state.selected_items.append(item_id)
-            else:
-                if self.config.select in ["file", "both"]:
-                    self.state.selected_items.append(item_id)
+        rows = self.file_list
+        selection = None
+        if self.file_list_view is None:
+            # Tk changes the Treeview selection itself (e.g. on clicks)
+            selection = self.file_tree.selection()
+            rows.select(selection)
+        self.state.selected_items = self._collect_selected_items(selection)
 
         # Set anchor for range selection if not already set
         # Only set anchor for single selection, not for range selection
-        if selection and self.state.selection_anchor is None and len(selection) == 1:
-            self.state.selection_anchor = selection[0]
+        count = rows.selected_count if selection is None else len(selection)
+        if count == 1 and self.state.selection_anchor is None:
+            self.state.selection_anchor = (
+                rows.path_at(rows.selection_bounds()[0])
+                if selection is None
+                else selection[0]
+            )
 
         view.update_selected_display(self)
         self._update_status()  # Update status bar when selection changes
+        view.schedule_preview(self)
         # Clear focus from entry when file is selected
         self.focus_set()
 
@@ -789,8 +1180,8 @@ class PathBrowser(tk.Frame):
                 text = text.replace(" ▲", "").replace(" ▼", "")
                 self.file_tree.heading(col, text=text)
 
-        # Reload files with new sort order
-        view.load_files(self)
+        # Reorder the listing in memory; the directory is not rescanned
+        view.sort_files(self)
 
     def _on_filename_focus(self, event):  # pylint: disable=unused-argument,no-member
         """Handle filename entry focus - select all text."""
@@ -798,7 +1189,7 @@ class PathBrowser(tk.Frame):
 
     def _on_file_double_click(self, event):  # pylint: disable=unused-argument,no-member
         """Handle file double-click."""
-        selection = self.file_tree.selection()
+        selection = self._file_selection()
         if selection:
             item_id = selection[0]
             # pylint: disable=protected-access
@@ -813,8 +1204,8 @@ class PathBrowser(tk.Frame):
                 self._on_ok()
 
     def _on_filter_change(self, event):  # pylint: disable=unused-argument,no-member
-        """Handle filter change."""
-        view.load_files(self)
+        """Handle filter change by re-filtering the loaded listing."""
+        view.apply_filter(self)
 
     def _on_ok(self, event=None):  # pylint: disable=unused-argument,no-member
         """Handle OK button click."""
@@ -832,7 +1223,7 @@ class PathBrowser(tk.Frame):
 
             # Check if file already exists
             full_path = os.path.join(self.state.current_dir, filename)
-            if os.path.exists(full_path):
+            if self.filesystem.exists(full_path):
                 # Ask for confirmation to overwrite
                 overwrite_msg = "File already exists. Do you want to overwrite it?"
                 if not messagebox.askyesno(
@@ -891,6 +1282,19 @@ class PathBrowser(tk.Frame):
         self._update_status()  # Update status bar when selection is cleared
         self.event_generate("<<PathBrowserCancel>>")
 
+    def _cancel_expand_all(self, event=None):  # pylint: disable=unused-argument
+        """Stop a running "Expand All", keeping the nodes opened so far."""
+        if self.expander.cancel():
+            return "break"
+        return None
+
+    def _on_escape(self, event=None):
+        """Cancel a running "Expand All", otherwise cancel the browser."""
+        if self._cancel_expand_all(event):
+            return "break"
+        self._on_cancel(event)
+        return None
+
     def _update_status(self):  # pylint: disable=no-member
         """Update the status bar."""
         view.update_status(self)
@@ -919,7 +1323,26 @@ class PathBrowser(tk.Frame):
                 full_path = os.path.join(self.state.current_dir, filename)
                 return [full_path]
             return []
-        return self.state.selected_items.copy()
+        return list(self.state.selected_items)
+
+    def iter_selection(self) -> Iterator[str]:
+        """
+        Iterate over the selected items without copying them into a list.
+
+        Yields the same paths as get_selection(), straight from the file
+        list model when the selection was made in the file list, which
+        keeps very large selections cheap to walk.
+
+        Returns:
+            Iterator of selected file/directory paths
+        """
+        if self.config.save_mode:
+            return iter(self.get_selection())
+        items = self.state.selected_items
+        if isinstance(items, SelectedPaths):
+            return iter(items)
+        # Not a file list selection (e.g. a folder picked in the tree)
+        return iter(list(items))
 
     def set_initial_directory(self, path: str):
         """
@@ -942,7 +1365,7 @@ class PathBrowser(tk.Frame):
         """
         self.config.filetypes = filetypes
         self._update_filter_options()
-        view.load_files(self)
+        view.apply_filter(self)
 
     def _schedule_memory_monitoring(self):  # pylint: disable=no-member
         """Schedule periodic memory monitoring."""
@@ -953,7 +1376,8 @@ class PathBrowser(tk.Frame):
 
     def _check_memory_usage(self):  # pylint: disable=no-member
         """Check memory usage and log if high."""
-        memory_usage = self.file_info_manager.get_memory_usage_estimate()
+        # Maintained as entries are added and evicted, so this is O(1)
+        memory_usage = self.file_info_manager.cache_bytes
         cache_size = self.file_info_manager.get_cache_size()
 
         # Log memory usage for debugging
@@ -967,23 +1391,45 @@ class PathBrowser(tk.Frame):
         # Auto-cleanup if memory usage is very high
         if memory_usage > 50 * 1024 * 1024:  # 50MB
             logger.warning("High memory usage detected, clearing old cache entries")
-            self.file_info_manager.clear_cache()
+            # Keep the most recently used half rather than starting cold
+            self.file_info_manager.trim_cache(0.5)
+            if self.snapshots is not None:
+                self.snapshots.clear()
 
     def get_performance_stats(self) -> dict:
         """Get performance statistics for debugging."""
         return utils.get_performance_stats(
             self.file_info_manager.get_cache_size(),
-            self.file_info_manager.get_memory_usage_estimate(),
+            self.file_info_manager.cache_bytes,
             self.state.current_dir,
             len(self.state.selected_items),
         )
 
+    def get_navigation_stats(self) -> Optional[NavigationStats]:
+        """
+        Get the phase timings of the last completed navigation.
+
+        Subscribe with stats_recorder.subscribe(callback), or bind
+        <<PathBrowserStats>>, to be told about every navigation.
+
+        Returns:
+            NavigationStats, or None before the first listing completed
+        """
+        return self.stats_recorder.last
+
+    def _on_navigation_stats(self, stats):  # pylint: disable=unused-argument
+        """Announce a completed navigation to event bindings."""
+        try:
+            self.event_generate("<<PathBrowserStats>>")
+        except tk.TclError as e:
+            logger.debug("Failed to generate stats event: %s", e)
+
     def optimize_performance(self):  # pylint: disable=no-member
         """Manually trigger performance optimization."""
         # Clear old cache entries
-        old_memory = self.file_info_manager.get_memory_usage_estimate()
+        old_memory = self.file_info_manager.cache_bytes
         self.file_info_manager.clear_cache()
-        new_memory = self.file_info_manager.get_memory_usage_estimate()
+        new_memory = self.file_info_manager.cache_bytes
 
         logger.info(
             "Performance optimization: freed %d bytes of memory",
@@ -0,0 +1,179 @@
+"""
+Incremental "Expand All" for PathBrowser widget.
+
+This module expands a directory subtree breadth first from the Tk event
+loop. Each after() run opens nodes for at most one time slice, so the
+tree keeps redrawing and responding to input, and the expansion stops at
+a depth and a node budget or when the user cancels it.
+"""
+
+import logging
+import time
+import tkinter as tk
+from collections import deque
+from typing import Optional
+
+from tkface import lang
+from tkface.widget.pathbrowser import view
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Delay between two expansion runs (milliseconds)
+STEP_INTERVAL_MS = 1
+# Maximum time spent expanding per run (milliseconds)
+TIME_SLICE_MS = 30
+# Levels below the expanded node that are opened
+DEFAULT_MAX_DEPTH = 8
+# Maximum number of nodes opened by one Expand All
+DEFAULT_MAX_NODES = 2000
+
+
+class TreeExpander:
+    """
+    Expands a directory tree node and its descendants in time slices.
+
+    Nodes are opened in breadth-first order through
+    view.populate_tree_node, which uses prefetched listings when they are
+    available. Only one expansion runs at a time; starting another one
+    cancels the previous expansion.
+    """
+
+    def __init__(
+        self,
+        pathbrowser_instance,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        time_slice_ms: int = TIME_SLICE_MS,
+    ):
+        """
+        Initialize the expander.
+
+        Args:
+            pathbrowser_instance: PathBrowser whose directory tree is expanded
+            max_depth: Levels below the start node that are opened
+            max_nodes: Maximum number of nodes opened per expansion
+            time_slice_ms: Maximum time per run in milliseconds
+        """
+        self._browser = pathbrowser_instance
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self._time_slice = time_slice_ms / 1000.0
+        self._queue = deque()
+        self._expanded = 0
+        self._after_id = None
+
+    @property
+    def running(self) -> bool:
+        """Return whether an expansion is in progress."""
+        return bool(self._queue)
+
+    @property
+    def expanded(self) -> int:
+        """Return the number of nodes opened by the current expansion."""
+        return self._expanded
+
+    def start(self, path: str):
+        """
+        Start expanding a node and its descendants.
+
+        The start node is opened immediately; its descendants follow in
+        later runs of the event loop.
+
+        Args:
+            path: Directory tree item to expand
+        """
+        self.cancel()
+        self._queue.append((path, 0))
+        self._expanded = 0
+        self._step(deadline=None, limit=1)
+        self._schedule()
+
+    def cancel(self) -> bool:
+        """
+        Stop the current expansion, keeping the nodes opened so far.
+
+        Returns:
+            True if an expansion was in progress
+        """
+        if self._after_id is not None:
+            try:
+                self._browser.after_cancel(self._after_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to cancel tree expansion")
+            self._after_id = None
+        was_running = self.running
+        self._queue.clear()
+        if was_running:
+            self._browser._update_status()  # pylint: disable=protected-access
+        return was_running
+
+    def _schedule(self):
+        if self._after_id is None and self._queue:
+            self._after_id = self._browser.after(STEP_INTERVAL_MS, self._run)
+
+    def _run(self):
+        self._after_id = None
+        self._step(deadline=time.perf_counter() + self._time_slice)
+        if self._queue:
+            self._show_progress()
+            self._schedule()
+
+    def _step(self, deadline: Optional[float], limit: Optional[int] = None):
+        """Open queued nodes until the deadline, the limit or the budget."""
+        tree = self._browser.tree
+        opened = 0
+        while self._queue:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            if limit is not None and opened >= limit:
+                return
+            if self._expanded >= self.max_nodes:
+                self._finish(truncated=True)
+                return
+            path, depth = self._queue.popleft()
+            opened += 1
+            try:
+                self._open(tree, path)
+            except tk.TclError as e:
+                logger.debug("Failed to expand tree node %s: %s", path, e)
+                continue
+            self._expanded += 1
+            if depth < self.max_depth:
+                self._queue.extend(
+                    (child, depth + 1)
+                    for child in tree.get_children(path)
+                    if not child.endswith("_placeholder")
+                )
+        self._finish(truncated=False)
+
+    def _open(self, tree, path: str):
+        """Open one node, listing its subdirectories if needed."""
+        tree.item(path, open=True)
+        children = tree.get_children(path)
+        placeholders = [child for child in children if child.endswith("_placeholder")]
+        if placeholders:
+            tree.delete(*placeholders)
+        if len(placeholders) == len(children):
+            view.populate_tree_node(self._browser, path)
+
+    def _show_progress(self):
+        browser = self._browser
+        browser.status_var.set(
+            f"{lang.get('Expanding...', browser)} {self._expanded} "
+            f"{lang.get('folders', browser)} "
+            f"({lang.get('Press Escape to cancel', browser)})"
+        )
+
+    def _finish(self, truncated: bool):
+        """End the expansion and restore the status bar."""
+        self._queue.clear()
+        browser = self._browser
+        # pylint: disable=protected-access
+        browser._update_watched_directories()
+        browser._update_status()
+        if truncated:
+            browser.status_var.set(
+                f"{lang.get('Expand All stopped at the folder limit', browser)} "
+                f"({self._expanded} {lang.get('folders', browser)})"
+            )
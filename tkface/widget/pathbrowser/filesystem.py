@@ -0,0 +1,440 @@
+"""
+Filesystem providers for PathBrowser widget.
+
+PathBrowser reads directories, metadata and file contents through a small
+provider interface (list, stat, is_dir, open). LocalFileSystem is the
+default; ZipFileSystem and TarFileSystem browse archive members in place,
+reading only the zip central directory or the tar member headers, and
+MemoryFileSystem holds a tree built in code (mainly for tests).
+
+Paths inside archives and memory trees are POSIX paths rooted at "/".
+Entries returned by list() behave like os.DirEntry, so the scanner treats
+every provider alike.
+"""
+
+import abc
+import errno
+import io
+import logging
+import os
+import posixpath
+import stat
+import tarfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Permission bits reported for archive and memory entries (read-only)
+DIR_MODE = stat.S_IFDIR | 0o555
+FILE_MODE = stat.S_IFREG | 0o444
+
+
+class FileSystem(abc.ABC):
+    """
+    Interface of a filesystem provider.
+
+    Subclasses implement list, stat and open (a provider missing one of
+    them cannot be instantiated); is_dir and exists are derived from
+    stat. Providers are used from worker threads as well as the Tk thread.
+    """
+
+    # Paths are real local paths: features built on os APIs (directory
+    # watching, folder sizes, the persistent listing cache) are available
+    local = False
+
+    @abc.abstractmethod
+    def list(self, path: str) -> Iterator:
+        """
+        Yield the entries of a directory as os.DirEntry-like objects.
+
+        Raises:
+            OSError: If the directory cannot be listed
+        """
+
+    @abc.abstractmethod
+    def stat(self, path: str) -> os.stat_result:
+        """
+        Return the stat data of a path.
+
+        Raises:
+            OSError: If the path does not exist
+        """
+
+    @abc.abstractmethod
+    def open(self, path: str):
+        """
+        Open a file for binary reading.
+
+        Raises:
+            OSError: If the path is not a readable file
+        """
+
+    def is_dir(self, path: str) -> bool:
+        """Return whether a path is a directory."""
+        try:
+            return stat.S_ISDIR(self.stat(path).st_mode)
+        except OSError:
+            return False
+
+    def exists(self, path: str) -> bool:
+        """Return whether a path exists."""
+        try:
+            self.stat(path)
+        except OSError:
+            return False
+        return True
+
+    def join(self, directory: str, name: str) -> str:
+        """Return the path of a name inside a directory."""
+        return posixpath.join(directory, name)
+
+    def home(self) -> str:
+        """Return the directory shown when no other one can be."""
+        return "/"
+
+    def cwd(self) -> str:
+        """Return the directory shown when no initial one is given."""
+        return "/"
+
+    def close(self):
+        """Release the resources held by the provider."""
+
+
+class LocalFileSystem(FileSystem):
+    """The local filesystem through os.scandir and os.stat."""
+
+    local = True
+
+    def list(self, path: str) -> Iterator[os.DirEntry]:
+        with os.scandir(path) as it:
+            yield from it
+
+    def stat(self, path: str) -> os.stat_result:
+        return os.stat(path)
+
+    def open(self, path: str):
+        return open(path, "rb")  # pylint: disable=consider-using-with
+
+    def is_dir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def join(self, directory: str, name: str) -> str:
+        return os.path.join(directory, name)
+
+    def home(self) -> str:
+        return str(Path.home())
+
+    def cwd(self) -> str:
+        return str(Path.cwd())
+
+
+class FileEntry:  # pylint: disable=unused-argument
+    """os.DirEntry-like entry of a provider without real directory entries."""
+
+    __slots__ = ("name", "path", "_stat")
+
+    def __init__(self, name: str, path: str, stat_result: os.stat_result):
+        self.name = name
+        self.path = path
+        self._stat = stat_result
+
+    def __repr__(self) -> str:
+        return f"<FileEntry {self.name!r}>"
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        """Return whether the entry is a directory."""
+        return stat.S_ISDIR(self._stat.st_mode)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        """Return whether the entry is a regular file."""
+        return stat.S_ISREG(self._stat.st_mode)
+
+    def is_symlink(self) -> bool:
+        """Entries of these providers are never links."""
+        return False
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        """Return the entry's stat data (no I/O)."""
+        return self._stat
+
+
+def make_stat(is_dir: bool, size: int = 0, mtime: float = 0.0) -> os.stat_result:
+    """Build the stat data of an archive or memory entry."""
+    mode = DIR_MODE if is_dir else FILE_MODE
+    return os.stat_result(
+        (mode, 0, 0, 1, 0, 0, 0 if is_dir else size, mtime, mtime, mtime)
+    )
+
+
+def _normalize(path: str) -> str:
+    """Return the canonical "/a/b" form of a member or browser path."""
+    parts = path.replace("\\", "/").split("/")
+    parts = [part for part in parts if part not in ("", ".")]
+    return "/" + "/".join(parts)
+
+
+class TreeFileSystem(FileSystem):
+    """
+    Base of providers whose whole directory tree is known up front.
+
+    The tree is a table of stat data per path plus the child names of
+    each directory. Subclasses fill it in _load(), which runs once on
+    first use, and read file contents in _open_member().
+    """
+
+    def __init__(self):
+        """Initialize an empty tree with a root directory."""
+        self._stats: Dict[str, os.stat_result] = {"/": make_stat(True)}
+        self._children: Dict[str, Dict[str, None]] = {"/": {}}
+        # Provider-specific object of each file (member info, contents)
+        self._members: Dict[str, object] = {}
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """Build the tree on first use."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+    def _load(self):
+        """Fill in the tree (nothing to do for trees built in code)."""
+
+    def _add(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        name: str,
+        is_dir: bool,
+        size: int = 0,
+        mtime: float = 0.0,
+        member=None,
+    ) -> Optional[str]:
+        """
+        Add an entry and any missing parent directories.
+
+        Returns:
+            The entry's path, or None if the name escapes the root
+        """
+        if ".." in name.replace("\\", "/").split("/"):
+            logger.debug("Skipping member outside the archive root: %s", name)
+            return None
+        path = _normalize(name)
+        if path == "/":
+            return None
+        parent = posixpath.dirname(path)
+        if parent not in self._children:
+            self._add(parent, True, mtime=mtime)
+        self._children[parent][posixpath.basename(path)] = None
+        self._stats[path] = make_stat(is_dir, size, mtime)
+        if is_dir:
+            self._children.setdefault(path, {})
+        else:
+            self._members[path] = member
+        return path
+
+    def _lookup(self, path: str) -> Tuple[str, os.stat_result]:
+        """Return the canonical path and stat data of a path."""
+        self._ensure_loaded()
+        key = _normalize(path)
+        stat_result = self._stats.get(key)
+        if stat_result is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        return key, stat_result
+
+    def list(self, path: str) -> Iterator[FileEntry]:
+        key, stat_result = self._lookup(path)
+        if not stat.S_ISDIR(stat_result.st_mode):
+            raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+        for name in list(self._children[key]):
+            child = posixpath.join(key, name)
+            yield FileEntry(name, child, self._stats[child])
+
+    def stat(self, path: str) -> os.stat_result:
+        return self._lookup(path)[1]
+
+    def open(self, path: str):
+        key, stat_result = self._lookup(path)
+        if stat.S_ISDIR(stat_result.st_mode):
+            raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+        return self._open_member(self._members[key])
+
+    @abc.abstractmethod
+    def _open_member(self, member):
+        """Open the contents of a file for binary reading."""
+
+
+class MemoryFileSystem(TreeFileSystem):
+    """A directory tree held in memory, e.g. for tests."""
+
+    def __init__(self, files: Optional[Dict[str, bytes]] = None):
+        """
+        Initialize the tree.
+
+        Args:
+            files: File contents by path; parent directories are implied
+        """
+        super().__init__()
+        for path, data in (files or {}).items():
+            self.add_file(path, data)
+
+    def add_file(self, path: str, data: bytes = b"", mtime: float = 0.0):
+        """Add (or replace) a file."""
+        self._add(path, False, len(data), mtime, member=bytes(data))
+
+    def add_dir(self, path: str, mtime: float = 0.0):
+        """Add an empty directory."""
+        self._add(path, True, mtime=mtime)
+
+    def _open_member(self, member):
+        return io.BytesIO(member)
+
+
+class ZipFileSystem(TreeFileSystem):
+    """
+    Members of a zip archive.
+
+    Only the central directory is read to list the archive; member data is
+    decompressed when a member is opened.
+    """
+
+    def __init__(self, archive_path: str):
+        """
+        Initialize the provider (the archive is opened on first use).
+
+        Args:
+            archive_path: Local path of the zip file
+        """
+        super().__init__()
+        self.archive_path = archive_path
+        self._zip: Optional[zipfile.ZipFile] = None
+
+    def _load(self):
+        try:
+            # pylint: disable-next=consider-using-with
+            self._zip = zipfile.ZipFile(self.archive_path)
+        except zipfile.BadZipFile as e:
+            raise OSError(errno.EINVAL, str(e), self.archive_path) from e
+        for info in self._zip.infolist():
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            self._add(info.filename, info.is_dir(), info.file_size, mtime, info)
+
+    def _open_member(self, member):
+        # ZipFile serializes reads of its shared file handle itself
+        return self._zip.open(member)
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+class TarFileSystem(TreeFileSystem):
+    """
+    Members of a tar archive (optionally gzip, bzip2 or xz compressed).
+
+    Listing reads the member headers only; for uncompressed archives the
+    member data is skipped with seeks. Opened members are read under a
+    lock, as tarfile shares one file handle between them.
+    """
+
+    def __init__(self, archive_path: str):
+        """
+        Initialize the provider (the archive is opened on first use).
+
+        Args:
+            archive_path: Local path of the tar file
+        """
+        super().__init__()
+        self.archive_path = archive_path
+        self._tar: Optional[tarfile.TarFile] = None
+        self._read_lock = threading.Lock()
+
+    def _load(self):
+        try:
+            # pylint: disable-next=consider-using-with
+            self._tar = tarfile.open(self.archive_path)
+        except tarfile.TarError as e:
+            raise OSError(errno.EINVAL, str(e), self.archive_path) from e
+        for info in self._tar:
+            if info.isdir():
+                self._add(info.name, True, mtime=info.mtime)
+            elif info.isreg():
+                self._add(info.name, False, info.size, info.mtime, info)
+            else:
+                # Links and special members have no contents of their own
+                logger.debug("Skipping tar member %s", info.name)
+
+    def _open_member(self, member):
+        with self._read_lock:
+            reader = self._tar.extractfile(member)
+        return _LockedReader(reader, self._read_lock)
+
+    def close(self):
+        if self._tar is not None:
+            self._tar.close()
+
+
+class _LockedReader(io.RawIOBase):
+    """Reads a shared-handle member file while holding the archive lock."""
+
+    def __init__(self, reader, lock: threading.Lock):
+        super().__init__()
+        self._reader = reader
+        self._lock = lock
+        self.name = getattr(reader, "name", "")
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        with self._lock:
+            data = self._reader.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        with self._lock:
+            return self._reader.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        with self._lock:
+            return self._reader.seek(offset, whence)
+
+    def tell(self) -> int:
+        with self._lock:
+            return self._reader.tell()
+
+    def close(self):
+        if not self.closed:
+            with self._lock:
+                self._reader.close()
+        super().close()
+
+
+def open_archive(path: str) -> Optional[FileSystem]:
+    """
+    Return a provider browsing an archive, or None if it is not one.
+
+    Args:
+        path: Local path of a zip or tar file
+    """
+    try:
+        if zipfile.is_zipfile(path):
+            return ZipFileSystem(path)
+        if tarfile.is_tarfile(path):
+            return TarFileSystem(path)
+    except OSError as e:
+        logger.debug("Cannot inspect archive %s: %s", path, e)
+    return None
@@ -0,0 +1,333 @@
+"""
+Folder size aggregation for PathBrowser widget.
+
+This module walks folders with os.scandir on a small pool of worker threads
+and adds up the sizes of the files below them. Only the folders the file
+list currently shows are walked: every request replaces the wanted set, so
+walks of folders that scrolled out of view, or that belong to a directory
+the user has left, stop at their next directory. Totals are cached by the
+folder's (device, inode, mtime) and delivered to the Tk thread in batches.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .utils import dir_identity, directory_stamp
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Delay between pump runs while folders are being sized (milliseconds)
+PUMP_INTERVAL_MS = 10
+# Maximum time spent per pump run (milliseconds)
+TIME_SLICE_MS = 20
+# Number of worker threads walking folders
+DEFAULT_WORKERS = 4
+# Number of folder totals kept; the least recently used are dropped
+DEFAULT_MAX_SIZES = 4096
+
+
+class _SizeWalk:
+    """Resumable depth-first walk adding up the file sizes below a folder."""
+
+    __slots__ = ("path", "total", "failed", "_stack", "_seen")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.total = 0
+        # The folder itself could not be listed
+        self.failed = False
+        self._stack = [path]
+        # (device, inode) of the folders queued, set up on the first run; a
+        # bind mount of a folder above is not walked again
+        self._seen = None
+
+    def run(self, stop: Callable[[], bool]) -> bool:
+        """
+        Walk until the tree is done or stop() returns True.
+
+        Args:
+            stop: Polled before each directory is listed
+
+        Returns:
+            Whether the whole tree has been walked
+        """
+        stack = self._stack
+        if self._seen is None:
+            self._seen = set()
+            try:
+                self._seen.add(dir_identity(os.stat(self.path)))
+            except OSError:
+                pass
+        while stack:
+            if stop():
+                return False
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            # Symlinks count as themselves and are not followed
+                            if entry.is_dir(follow_symlinks=False):
+                                if self._first_visit(entry):
+                                    stack.append(entry.path)
+                            else:
+                                self.total += entry.stat(
+                                    follow_symlinks=False
+                                ).st_size
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.debug("Cannot size %s: %s", directory, e)
+                if directory == self.path:
+                    self.failed = True
+        return True
+
+    def _first_visit(self, entry) -> bool:
+        """Record a subfolder's identity; False if it was already walked."""
+        identity = dir_identity(entry.stat(follow_symlinks=False))
+        if identity is None:
+            return True
+        if identity in self._seen:
+            return False
+        self._seen.add(identity)
+        return True
+
+
+class FolderSizer:  # pylint: disable=too-many-instance-attributes
+    """
+    Computes folder sizes for the visible rows of the file list.
+
+    Requests are served in the order given, normally top to bottom. A
+    folder's total is reused while its (device, inode, mtime) is unchanged;
+    since the mtime of a folder only changes with its own entries, changes
+    deeper down show once the folder itself changes. Callbacks always run
+    on the Tk thread.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        widget,
+        on_sizes: Callable[[Dict[str, int]], None],
+        workers: int = DEFAULT_WORKERS,
+        threaded: bool = True,
+        max_sizes: int = DEFAULT_MAX_SIZES,
+        time_slice_ms: int = TIME_SLICE_MS,
+    ):
+        """
+        Initialize the sizer.
+
+        Args:
+            widget: Tk widget used for after() scheduling
+            on_sizes: Called with {path: total bytes} for finished folders
+            workers: Number of worker threads
+            threaded: Walk on worker threads (False walks in time slices
+                on the Tk thread)
+            max_sizes: Number of folder totals kept
+            time_slice_ms: Maximum time per pump run in milliseconds
+        """
+        self._widget = widget
+        self._on_sizes = on_sizes
+        self.workers = max(1, workers)
+        self.threaded = threaded
+        self.max_sizes = max_sizes
+        self._time_slice = time_slice_ms / 1000.0
+        # Folder totals by (device, inode, mtime_ns)
+        self._sizes: "OrderedDict[tuple, int]" = OrderedDict()
+        # Folders wanted by the last request, and those not yet started
+        self._wanted = frozenset()
+        self._pending: "OrderedDict[str, None]" = OrderedDict()
+        self._in_flight = set()
+        # Walk in progress on the Tk thread when not threaded
+        self._inline: Optional[Tuple[str, tuple, _SizeWalk]] = None
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+        self._pump_id = None
+
+    def request(self, paths: Iterable[str]):
+        """
+        Size the given folders, dropping every folder not among them.
+
+        Walks of folders left out of the request stop at their next
+        directory, so passing the visible folders after each scroll keeps
+        the workers on what the user is looking at.
+
+        Args:
+            paths: Folders to size, most important first
+        """
+        paths = list(dict.fromkeys(paths))
+        if self._closed:
+            return
+        with self._condition:
+            self._wanted = frozenset(paths)
+            self._pending = OrderedDict(
+                (path, None) for path in paths if path not in self._in_flight
+            )
+            self._condition.notify_all()
+        if not paths:
+            return
+        if self.threaded:
+            self._ensure_workers()
+        self._schedule_pump()
+
+    def cancel(self):
+        """Stop all walks and drop undelivered totals (they stay cached)."""
+        with self._condition:
+            self._wanted = frozenset()
+            self._pending.clear()
+        self._inline = None
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def close(self):
+        """Stop the workers and the pump."""
+        self.cancel()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._pump_id is not None:
+            try:
+                self._widget.after_cancel(self._pump_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to cancel folder size pump")
+            self._pump_id = None
+        self._sizes.clear()
+
+    def _ensure_workers(self):
+        """Start worker threads until the pool is complete."""
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker, name="PathBrowserFolderSize", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _cached(self, stamp: tuple) -> Optional[int]:
+        """Return the stored total of a folder stamp, if any."""
+        with self._condition:
+            size = self._sizes.get(stamp)
+            if size is not None:
+                self._sizes.move_to_end(stamp)
+            return size
+
+    def _store(self, stamp: tuple, size: int):
+        """Store a folder total, dropping the least recently used ones."""
+        with self._condition:
+            self._sizes[stamp] = size
+            self._sizes.move_to_end(stamp)
+            while len(self._sizes) > self.max_sizes:
+                self._sizes.popitem(last=False)
+
+    def _start(self, path: str) -> Optional[Tuple[tuple, _SizeWalk]]:
+        """Report a cached total, or return (stamp, walk) for a new walk."""
+        # Stamp first, so a change during the walk invalidates the total
+        stamp = directory_stamp(path)
+        if stamp is None:
+            return None
+        size = self._cached(stamp)
+        if size is not None:
+            self._queue.put((path, size))
+            return None
+        return stamp, _SizeWalk(path)
+
+    def _finish(self, stamp: tuple, walk: _SizeWalk):
+        """Store and report the total of a completed walk."""
+        if walk.failed:
+            return
+        self._store(stamp, walk.total)
+        self._queue.put((walk.path, walk.total))
+
+    def _worker(self):
+        """Worker loop: size pending folders until closed."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                path, _ = self._pending.popitem(last=False)
+                self._in_flight.add(path)
+            done = True
+            try:
+                started = self._start(path)
+                if started is not None:
+                    stamp, walk = started
+                    done = walk.run(
+                        lambda: path not in self._wanted or self._closed
+                    )
+                    if done:
+                        self._finish(stamp, walk)
+            finally:
+                with self._condition:
+                    self._in_flight.discard(path)
+                    if not done and path in self._wanted:
+                        # Dropped and requested again while stopping
+                        self._pending[path] = None
+                        self._condition.notify()
+
+    def _walk_inline(self, deadline: float):
+        """Walk pending folders on the Tk thread until the deadline."""
+
+        def stop():
+            return path not in self._wanted or time.perf_counter() >= deadline
+
+        while time.perf_counter() < deadline:
+            if self._inline is None:
+                if not self._pending:
+                    return
+                path, _ = self._pending.popitem(last=False)
+                started = self._start(path)
+                if started is None:
+                    continue
+                self._inline = (path, *started)
+            path, stamp, walk = self._inline
+            if not walk.run(stop):
+                if path not in self._wanted:
+                    self._inline = None
+                    continue
+                return
+            self._inline = None
+            self._finish(stamp, walk)
+
+    def _schedule_pump(self):
+        """Schedule the next pump run if none is pending."""
+        if self._pump_id is None and not self._closed:
+            self._pump_id = self._widget.after(PUMP_INTERVAL_MS, self._pump)
+
+    def _pump(self):
+        """Walk (when not threaded) and deliver totals for one time slice."""
+        self._pump_id = None
+        if not self.threaded:
+            self._walk_inline(time.perf_counter() + self._time_slice)
+        self._drain()
+        if (
+            self._pending
+            or self._in_flight
+            or self._inline is not None
+            or not self._queue.empty()
+        ):
+            self._schedule_pump()
+
+    def _drain(self):
+        """Report delivered totals of still wanted folders in one batch."""
+        sizes = {}
+        while True:
+            try:
+                path, size = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if path in self._wanted:
+                sizes[path] = size
+        if sizes:
+            self._on_sizes(sizes)
@@ -0,0 +1,273 @@
+"""
+Persistent directory listing cache for PathBrowser widget.
+
+This module stores directory listings and their stat data in a SQLite
+database under the user cache directory, so that a newly opened dialog can
+paint a large directory immediately and revalidate it in the background.
+A listing is only used while the directory's device, inode and mtime are
+unchanged.
+"""
+
+import logging
+import os
+import sqlite3
+import stat
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from .manager import FileInfo, FileInfoManager
+from .utils import is_racy
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "pathbrowser.sqlite3"
+# Bump when the blob layout changes; stored listings are then discarded
+SCHEMA_VERSION = 1
+# Number of directories kept; the least recently stored are dropped first
+DEFAULT_MAX_DIRECTORIES = 256
+
+# Stat fields needed by FileInfoManager.create_file_info
+CachedStat = namedtuple("CachedStat", "st_size st_mtime st_mode")
+# Columns of a stored listing, one item per entry
+PackedListing = namedtuple("PackedListing", "names sizes mtimes modes")
+
+_COUNT = struct.Struct("<I")
+_FORMAT = f"{SCHEMA_VERSION}-{sys.byteorder}"
+# Shared caches by database path, so dialogs reuse one connection. Like
+# their connections, they belong to the Tk thread.
+_shared_caches: Dict[str, "ListingCache"] = {}
+
+
+def default_cache_dir() -> str:
+    """Return the per-user cache directory for tkface."""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            "~\\AppData\\Local"
+        )
+        return os.path.join(base, "tkface", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/tkface")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "tkface")
+
+
+def get_listing_cache(path: Optional[str] = None) -> Optional["ListingCache"]:
+    """
+    Return the shared ListingCache for a database path.
+
+    Call from the Tk thread only: the cache can only be used on the thread
+    that opened it.
+
+    Args:
+        path: Database file (defaults to the user cache directory)
+
+    Returns:
+        ListingCache, or None if the database cannot be opened
+    """
+    path = os.path.abspath(path or os.path.join(default_cache_dir(), CACHE_FILENAME))
+    cache = _shared_caches.get(path)
+    if cache is None:
+        try:
+            cache = ListingCache(path)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Persistent listing cache disabled: %s", e)
+            return None
+        _shared_caches[path] = cache
+    return cache
+
+
+def _pack(entries: List[FileInfo]) -> bytes:
+    """Pack the stat data of a listing into column arrays."""
+    sizes = array("q", [entry.size_bytes for entry in entries])
+    mtimes = array("d", [entry.mtime for entry in entries])
+    modes = array("I", [entry.mode for entry in entries])
+    names = "\0".join(entry.name for entry in entries).encode(
+        "utf-8", "surrogateescape"
+    )
+    return b"".join(
+        (_COUNT.pack(len(entries)), sizes.tobytes(), mtimes.tobytes(),
+         modes.tobytes(), names)
+    )
+
+
+def _unpack_column(
+    blob: bytes, offset: int, typecode: str, count: int
+) -> Tuple[list, int]:
+    """Read count items of an array column, returning them and the next offset."""
+    column = array(typecode)
+    end = offset + count * column.itemsize
+    column.frombytes(blob[offset:end])
+    return column.tolist(), end
+
+
+def _unpack(blob: bytes) -> PackedListing:
+    """Unpack a blob written by _pack."""
+    (count,) = _COUNT.unpack_from(blob)
+    sizes, offset = _unpack_column(blob, _COUNT.size, "q", count)
+    mtimes, offset = _unpack_column(blob, offset, "d", count)
+    modes, offset = _unpack_column(blob, offset, "I", count)
+    names = blob[offset:].decode("utf-8", "surrogateescape").split("\0")
+    if count == 0:
+        names = []
+    if len(names) != count:
+        raise ValueError("corrupt listing")
+    return PackedListing(names, sizes, mtimes, modes)
+
+
+class ListingCache:
+    """
+    SQLite store of directory listings keyed by directory path.
+
+    Listings are stored as packed column arrays, one row per directory,
+    so loading a large directory is a single row read. The SQLite
+    connection belongs to the thread that opened the cache (the Tk
+    thread); using it from another thread raises RuntimeError.
+    """
+
+    def __init__(self, path: str, max_directories: int = DEFAULT_MAX_DIRECTORIES):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Database file
+            max_directories: Number of directory listings kept
+
+        Raises:
+            OSError: If the cache directory cannot be created
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = path
+        self.max_directories = max_directories
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._thread = threading.get_ident()
+        self._init_schema()
+
+    def _check_thread(self):
+        """Refuse use from a thread other than the one that opened the cache."""
+        if threading.get_ident() != self._thread:
+            raise RuntimeError(
+                "ListingCache can only be used on the thread that opened it"
+            )
+
+    def _init_schema(self):
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE key = 'format'"
+            ).fetchone()
+            if row is None or row[0] != _FORMAT:
+                self._db.execute("DROP TABLE IF EXISTS listings")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('format', ?)", (_FORMAT,)
+                )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS listings ("
+                "path TEXT PRIMARY KEY, dev INTEGER, ino INTEGER, "
+                "mtime_ns INTEGER, stored REAL, data BLOB)"
+            )
+
+    def load(
+        self,
+        directory: str,
+        stamp: Optional[Tuple[int, int, int]],
+        manager: FileInfoManager,
+    ) -> Optional[List[FileInfo]]:
+        """
+        Return the cached listing of a directory if it is still valid.
+
+        Args:
+            directory: Directory path
+            stamp: Current directory_stamp() of the directory
+            manager: Builds the FileInfo records (type labels)
+
+        Returns:
+            List of FileInfo records, or None on a miss or a stale entry
+        """
+        self._check_thread()
+        if stamp is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT dev, ino, mtime_ns, data FROM listings WHERE path = ?",
+                (directory,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Failed to read listing cache for %s: %s", directory, e)
+            return None
+        if row is None or tuple(row[:3]) != stamp:
+            return None
+
+        try:
+            listing = _unpack(row[3])
+        except (ValueError, struct.error) as e:
+            logger.debug("Discarding corrupt cached listing %s: %s", directory, e)
+            self.discard(directory)
+            return None
+
+        entries = []
+        for name, size, mtime, mode in zip(*listing):
+            path = os.path.join(directory, name)
+            if not mode:
+                entries.append(manager.create_error_file_info(path))
+                continue
+            entries.append(
+                manager.create_file_info(
+                    path, name, stat.S_ISDIR(mode), CachedStat(size, mtime, mode)
+                )
+            )
+        return entries
+
+    def store(
+        self,
+        directory: str,
+        stamp: Optional[Tuple[int, int, int]],
+        entries: List[FileInfo],
+    ):
+        """
+        Store the listing of a directory.
+
+        Args:
+            directory: Directory path
+            stamp: directory_stamp() taken before the directory was scanned
+            entries: FileInfo records of the complete listing
+        """
+        self._check_thread()
+        if stamp is None or is_racy(stamp):
+            return
+        try:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?, ?)",
+                    (directory, *stamp, time.time(), _pack(entries)),
+                )
+                self._db.execute(
+                    "DELETE FROM listings WHERE path NOT IN ("
+                    "SELECT path FROM listings ORDER BY stored DESC LIMIT ?)",
+                    (self.max_directories,),
+                )
+        except (sqlite3.Error, OverflowError) as e:
+            logger.debug("Failed to store listing cache for %s: %s", directory, e)
+
+    def discard(self, directory: str):
+        """Remove the listing of a directory."""
+        self._check_thread()
+        try:
+            with self._db:
+                self._db.execute("DELETE FROM listings WHERE path = ?", (directory,))
+        except sqlite3.Error as e:
+            logger.debug("Failed to discard listing cache for %s: %s", directory, e)
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+        if _shared_caches.get(self.path) is self:
+            del _shared_caches[self.path]
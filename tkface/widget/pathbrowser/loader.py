@@ -0,0 +1,222 @@
+"""
+Background directory loading for PathBrowser widget.
+
+This module runs directory scans on a worker thread and delivers the
+resulting FileInfo batches back to the Tk thread through a queue that is
+drained by a time-sliced after() pump. Every load request gets a generation
+token so that results from superseded requests are dropped.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from .scanner import DirectoryScanner
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Delay between pump runs while a load is in progress (milliseconds)
+PUMP_INTERVAL_MS = 10
+# Maximum time spent delivering results per pump run (milliseconds)
+TIME_SLICE_MS = 20
+
+
+class DirectoryLoader:
+    """
+    Loads directory listings on a worker thread.
+
+    Only the most recent request is kept: a new request supersedes any
+    pending one, and the running scan stops at its next entry once it is
+    stale. Callbacks always run on the Tk thread.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        widget,
+        scanner: DirectoryScanner,
+        batch_size: int = 100,
+        threaded: bool = True,
+        time_slice_ms: int = TIME_SLICE_MS,
+    ):
+        """
+        Initialize the loader.
+
+        Args:
+            widget: Tk widget used for after() scheduling
+            scanner: Scanner used to list directories
+            batch_size: Number of FileInfo records per delivered batch
+            threaded: Scan on a worker thread (False scans inline)
+            time_slice_ms: Maximum time per pump run in milliseconds
+        """
+        self._widget = widget
+        self._scanner = scanner
+        self.batch_size = batch_size
+        self.threaded = threaded
+        self._time_slice = time_slice_ms / 1000.0
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._pending = None
+        self._callbacks = None
+        self._active_path = None
+        self._closed = False
+        self._thread = None
+        self._pump_id = None
+
+    @property
+    def generation(self) -> int:
+        """Return the generation token of the most recent request."""
+        return self._generation
+
+    def is_loading(self, path: Optional[str] = None) -> bool:
+        """Return whether a load (optionally for the given path) is in progress."""
+        if self._active_path is None:
+            return False
+        return path is None or path == self._active_path
+
+    def load(
+        self,
+        path: str,
+        on_batch: Callable,
+        on_complete: Callable,
+        on_error: Callable,
+        names_only: bool = False,
+    ) -> int:
+        """
+        Start loading a directory, superseding any earlier request.
+
+        Args:
+            path: Directory to load
+            on_batch: Called with each list of FileInfo records
+            on_complete: Called with the final ScanResult
+            on_error: Called with the OSError if the directory cannot be listed
+            names_only: List entries without a stat each (see
+                DirectoryScanner.scan)
+
+        Returns:
+            Generation token of this request
+        """
+        with self._condition:
+            if self._closed:
+                return self._generation
+            self._generation += 1
+            generation = self._generation
+            self._callbacks = (on_batch, on_complete, on_error)
+            self._active_path = path
+
+            if not self.threaded:
+                self._pending = None
+            else:
+                self._pending = (generation, path, names_only)
+                self._condition.notify()
+
+        if not self.threaded:
+            self._run_scan(generation, path, names_only)
+            self._drain()
+            return generation
+
+        self._ensure_worker()
+        self._schedule_pump()
+        return generation
+
+    def cancel(self):
+        """Cancel the current request and drop any undelivered results."""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            self._active_path = None
+            self._callbacks = None
+        if self._pump_id is not None:
+            try:
+                self._widget.after_cancel(self._pump_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to cancel loader pump")
+            self._pump_id = None
+
+    def close(self):
+        """Cancel the current request and stop the worker thread."""
+        self.cancel()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _ensure_worker(self):
+        """Start the worker thread if it is not running yet."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._worker, name="PathBrowserLoader", daemon=True
+            )
+            self._thread.start()
+
+    def _worker(self):
+        """Worker loop: always scan the most recent pending request."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                generation, path, names_only = self._pending
+                self._pending = None
+            self._run_scan(generation, path, names_only)
+
+    def _run_scan(self, generation: int, path: str, names_only: bool = False):
+        """Scan a directory and queue its batches tagged with the generation."""
+
+        def is_stale():
+            return generation != self._generation
+
+        def emit(batch):
+            self._queue.put((generation, "batch", batch))
+
+        try:
+            result = self._scanner.scan(
+                path,
+                on_batch=emit,
+                batch_size=self.batch_size,
+                cancelled=is_stale,
+                cache=False,
+                names_only=names_only,
+            )
+        except OSError as e:
+            self._queue.put((generation, "error", e))
+            return
+        if not is_stale():
+            self._queue.put((generation, "done", result))
+
+    def _schedule_pump(self):
+        """Schedule the next pump run if none is pending."""
+        if self._pump_id is None:
+            self._pump_id = self._widget.after(PUMP_INTERVAL_MS, self._pump)
+
+    def _pump(self):
+        """Deliver queued results for at most one time slice."""
+        self._pump_id = None
+        self._drain(deadline=time.perf_counter() + self._time_slice)
+        if self._active_path is not None or not self._queue.empty():
+            self._schedule_pump()
+
+    def _drain(self, deadline: Optional[float] = None):
+        """Deliver queued results on the Tk thread, dropping stale ones."""
+        while deadline is None or time.perf_counter() < deadline:
+            try:
+                generation, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if generation != self._generation or self._callbacks is None:
+                # Result from a superseded request
+                continue
+
+            on_batch, on_complete, on_error = self._callbacks
+            if kind == "batch":
+                on_batch(payload)
+            elif kind == "done":
+                self._active_path = None
+                on_complete(payload)
+            else:
+                self._active_path = None
+                on_error(payload)
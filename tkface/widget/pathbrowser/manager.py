@@ -6,148 +6,583 @@ for the PathBrowser widget.
 """
 
 import logging
+import os
+import stat
+import sys
 import time
 import weakref
 from collections import OrderedDict
-from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
 
 from tkface import lang
 
 from . import utils
+from .filesystem import FileSystem, LocalFileSystem
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Seconds a path that could not be stat-ed is remembered before it is retried
+DEFAULT_ERROR_TTL = 5.0
+# Approximate bytes per cache entry beyond the record and its strings
+# (cache table slot, directory index and bookkeeping)
+ENTRY_OVERHEAD_BYTES = 160
 
-@dataclass
-class FileInfo:
-    """File information cache."""
 
-    path: str
-    name: str
-    is_dir: bool
-    size_bytes: int
-    size_str: str
-    modified: str
-    file_type: str
+class FileInfo:  # pylint: disable=too-many-instance-attributes
+    """
+    File information record.
+
+    Only the raw stat data is stored; the size and date columns are
+    formatted the first time they are read (normally when the row is
+    displayed) and then memoized. Records use __slots__ to stay small in
+    listings of many thousands of entries.
+    """
+
+    __slots__ = (
+        "path",
+        "name",
+        "is_dir",
+        "size_bytes",
+        "file_type",
+        "mtime",
+        "mode",
+        "_size_str",
+        "_modified",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        path: str,
+        name: str,
+        is_dir: bool,
+        size_bytes: int,
+        size_str: Optional[str] = None,
+        modified: Optional[str] = None,
+        file_type: str = "",
+        mtime: float = 0.0,
+        mode: int = 0,
+    ):
+        """
+        Initialize the record.
+
+        Args:
+            path: Full path of the file or directory
+            name: Base name of the file or directory
+            is_dir: Whether the path is a directory
+            size_bytes: Raw st_size (0 for directories)
+            size_str: Preformatted size, or None to format on demand
+            modified: Preformatted date, or None to format on demand
+            file_type: Type label (interned by FileInfoManager)
+            mtime: Raw st_mtime
+            mode: Raw st_mode
+        """
+        self.path = path
+        self.name = name
+        self.is_dir = is_dir
+        self.size_bytes = size_bytes
+        self.file_type = file_type
+        self.mtime = mtime
+        self.mode = mode
+        self._size_str = size_str
+        self._modified = modified
+
+    @property
+    def size_str(self) -> str:
+        """Human readable size, formatted on first access."""
+        if self._size_str is None:
+            self._size_str = "" if self.is_dir else utils.format_size(self.size_bytes)
+        return self._size_str
+
+    @size_str.setter
+    def size_str(self, value: str):
+        self._size_str = value
+
+    @property
+    def modified(self) -> str:
+        """Modification date, formatted on first access."""
+        if self._modified is None:
+            self._modified = time.strftime(
+                "%Y-%m-%d %H:%M", time.localtime(self.mtime)
+            )
+        return self._modified
+
+    @modified.setter
+    def modified(self, value: str):
+        self._modified = value
+
+    def _fields(self) -> tuple:
+        return (
+            self.path,
+            self.name,
+            self.is_dir,
+            self.size_bytes,
+            self.size_str,
+            self.modified,
+            self.file_type,
+            self.mtime,
+        )
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (
+            f"FileInfo(path={self.path!r}, name={self.name!r}, "
+            f"is_dir={self.is_dir!r}, size_bytes={self.size_bytes!r}, "
+            f"file_type={self.file_type!r}, mtime={self.mtime!r})"
+        )
+
+    def memory_size(self, seen: Optional[set] = None) -> int:
+        """
+        Measure the record and the objects it references, in bytes.
+
+        Args:
+            seen: Ids of objects already counted (shared strings count once)
+
+        Returns:
+            Size in bytes as reported by sys.getsizeof
+        """
+        if seen is None:
+            seen = set()
+        total = sys.getsizeof(self)
+        for slot in FileInfo.__slots__:
+            value = getattr(self, slot)
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+        return total
+
+
+class PendingFileInfo(FileInfo):
+    """
+    File information record listed by name only.
+
+    Name, folder flag and type come from the directory listing; size,
+    date and mode are unknown until the path is stat-ed. Such records are
+    never cached by FileInfoManager.
+    """
+
+    __slots__ = ()
+
+
+class UnreadableFileInfo(FileInfo):
+    """
+    Placeholder record for a path that could not be stat-ed.
+
+    FileInfoManager retries such records after its error_ttl instead of
+    keeping them like complete records.
+    """
+
+    __slots__ = ()
 
 
 class FileInfoManager:
-    """Manages file information with caching using standard library."""
+    """
+    Manages file information with caching using standard library.
+
+    The cache is bounded by entry count and optionally by an approximate
+    byte budget, evicting the least recently used entries one at a time.
+    With a byte budget the number of entries adapts to the size of the
+    records. Records older than ttl are revalidated per directory: one stat
+    of the parent directory per ttl keeps all of its records while the
+    directory is unchanged, so edits that leave the directory alone are
+    picked up by rescans. Records of changed directories are checked against
+    the file's current mtime and size on access, and placeholders for paths
+    that could not be stat-ed are retried after error_ttl.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        root=None,
+        max_cache_size: Optional[int] = 1000,
+        max_cache_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        error_ttl: Optional[float] = DEFAULT_ERROR_TTL,
+        filesystem: Optional[FileSystem] = None,
+    ):
+        """
+        Initialize the manager.
 
-    def __init__(self, root=None, max_cache_size=1000):
+        Args:
+            root: Widget used for language lookups
+            max_cache_size: Maximum number of cached records (None: no limit)
+            max_cache_bytes: Approximate byte budget of the cache (None: no
+                limit)
+            ttl: Seconds after which a record is revalidated on access
+                (None: never)
+            error_ttl: Seconds after which a failed lookup is retried
+                (None: never)
+            filesystem: Provider the paths belong to (default: local)
+        """
         # Use weakref to avoid circular references
         self._root = weakref.ref(root) if root else None
         self._max_cache_size = max_cache_size
+        self._max_cache_bytes = max_cache_bytes
+        self._ttl = ttl
+        self._error_ttl = error_ttl
+        self.filesystem = filesystem or LocalFileSystem()
         # Use OrderedDict for LRU behavior
         self._cache = OrderedDict()
+        # (approximate bytes, time stored or last validated, failed) per path
+        self._meta: Dict[str, Tuple[int, float, bool]] = {}
+        self._bytes = 0
+        # Cached paths grouped by parent directory, and each indexed
+        # directory's indexed subdirectories, for subtree invalidation
+        self._children: Dict[str, Dict[str, None]] = {}
+        self._subdirs: Dict[str, Set[str]] = {}
+        # Per indexed directory: its stamp (None if unknown or too recent to
+        # trust), when its records could start relying on that stamp, and
+        # when the directory was last stat-ed
+        self._stamps: Dict[str, Tuple[Optional[tuple], float, float]] = {}
+        # Localized type labels, resolved on the Tk thread
+        self._type_labels = {}
+        # Lookups answered from the cache, and those that needed a stat
+        self.hits = 0
+        self.misses = 0
+        # Records evicted for space, and records found stale on access
+        self.evictions = 0
+        self.revalidations = 0
 
     def get_file_info(self, file_path: str) -> FileInfo:
         """Get file information with caching."""
         # Check cache first
-        if file_path in self._cache:
+        file_info = self._cache.get(file_path)
+        if file_info is not None and self._is_fresh(file_info):
+            self.hits += 1
             # Move to end (most recently used)
             self._cache.move_to_end(file_path)
-            return self._cache[file_path]
+            return file_info
+        self.misses += 1
 
-        # Get file information using pathlib
+        # Get file information from the filesystem provider
         try:
-            path_obj = Path(file_path)
-            stat = path_obj.stat()
-            name = path_obj.name
-            is_dir = path_obj.is_dir()
-
-            # Size information
-            size_bytes = stat.st_size if not is_dir else 0
-            size_str = utils.format_size(size_bytes) if not is_dir else ""
-
-            # Modified date
-            modified = time.strftime("%Y-%m-%d %H:%M", time.localtime(stat.st_mtime))
-
-            # File type
-            if self._root is not None:
-                root = self._root()  # pylint: disable=not-callable
-            else:
-                root = None
-            if is_dir:
-                file_type = lang.get("Folder", root)
-            else:
-                suffix = path_obj.suffix
-                if suffix:
-                    file_type = suffix[1:].upper()
-                else:
-                    file_type = lang.get("File", root)
-
-            file_info = FileInfo(
-                path=file_path,
-                name=name,
-                is_dir=is_dir,
-                size_bytes=size_bytes,
-                size_str=size_str,
-                modified=modified,
-                file_type=file_type,
+            stat_result = self.filesystem.stat(file_path)
+            file_info = self.create_file_info(
+                file_path,
+                Path(file_path).name,
+                stat.S_ISDIR(stat_result.st_mode),
+                stat_result,
             )
-
-            # Cache the result with LRU management
-            self._cache[file_path] = file_info
-            self._manage_cache_size()
-            return file_info
-
         except (OSError, PermissionError) as e:
             logger.warning("Failed to get file info for %s: %s", file_path, e)
-            path_obj = Path(file_path)
-            if self._root is not None:
-                root = self._root()  # pylint: disable=not-callable
-            else:
-                root = None
-            file_info = FileInfo(
-                path=file_path,
-                name=path_obj.name,
-                is_dir=False,
-                size_bytes=0,
-                size_str="",
-                modified="",
-                file_type=lang.get("Unknown", root),
-            )
-
             # Cache even error results to avoid repeated failed attempts
-            self._cache[file_path] = file_info
-            self._manage_cache_size()
-            return file_info
+            file_info = self.create_error_file_info(file_path)
+
+        # Cache the result with LRU management
+        self.add_file_info(file_info)
+        return file_info
+
+    def _is_fresh(self, file_info: FileInfo) -> bool:
+        """Return whether a cached record may still be used."""
+        path = file_info.path
+        cost, checked, failed = self._meta[path]
+        ttl = self._error_ttl if failed else self._ttl
+        now = time.monotonic()
+        if ttl is None or now - checked < ttl:
+            return True
+        if not failed:
+            if self._directory_unchanged(os.path.dirname(path), checked, now):
+                self._meta[path] = (cost, now, False)
+                return True
+            # One stat keeps an unchanged record instead of rebuilding it
+            try:
+                stat_result = self.filesystem.stat(path)
+            except OSError:
+                stat_result = None
+            if (
+                stat_result is not None
+                and stat.S_ISDIR(stat_result.st_mode) == file_info.is_dir
+                and stat_result.st_mtime == file_info.mtime
+                and (file_info.is_dir or stat_result.st_size == file_info.size_bytes)
+            ):
+                self._meta[path] = (cost, now, False)
+                return True
+        self.revalidations += 1
+        return False
+
+    def _directory_unchanged(self, directory: str, since: float, now: float) -> bool:
+        """
+        Return whether a directory's stamp vouches for records checked since.
+
+        The directory is stat-ed at most once per ttl. A changed stamp only
+        vouches for records checked after the change was seen.
+        """
+        entry = self._stamps.get(directory)
+        if entry is None:
+            return False
+        stamp, trusted_from, stamped = entry
+        if now - stamped >= self._ttl:
+            current = self._directory_stamp(directory)
+            if current is None or current != stamp:
+                trusted_from = now
+            stamp = current
+            self._stamps[directory] = (stamp, trusted_from, now)
+        return stamp is not None and since >= trusted_from
+
+    def _directory_stamp(self, directory: str) -> Optional[tuple]:
+        """Return a directory's stamp, or None if missing or too recent."""
+        stamp = utils.directory_stamp(directory, self.filesystem)
+        if stamp is None or utils.is_racy(stamp):
+            return None
+        return stamp
+
+    def create_file_info(
+        self, file_path: str, name: str, is_dir: bool, stat_result
+    ) -> FileInfo:
+        """
+        Build a FileInfo record from already collected stat data.
+
+        Args:
+            file_path: Full path of the file or directory
+            name: Base name of the file or directory
+            is_dir: Whether the path is a directory
+            stat_result: os.stat_result for the path
+
+        Returns:
+            FileInfo record (not cached)
+        """
+        # Size and date columns are formatted when first displayed
+        size_bytes = stat_result.st_size if not is_dir else 0
+        return FileInfo(
+            path=file_path,
+            name=name,
+            is_dir=is_dir,
+            size_bytes=size_bytes,
+            file_type=self._file_type(name, is_dir),
+            mtime=stat_result.st_mtime,
+            mode=stat_result.st_mode,
+        )
+
+    def create_name_info(
+        self, file_path: str, name: str, is_dir: bool
+    ) -> PendingFileInfo:
+        """
+        Build a record from directory listing data alone, without a stat.
+
+        Args:
+            file_path: Full path of the file or directory
+            name: Base name of the file or directory
+            is_dir: Whether the path is a directory
+
+        Returns:
+            PendingFileInfo record with empty size and date columns
+        """
+        return PendingFileInfo(
+            path=file_path,
+            name=name,
+            is_dir=is_dir,
+            size_bytes=0,
+            size_str="",
+            modified="",
+            file_type=self._file_type(name, is_dir),
+        )
+
+    def _file_type(self, name: str, is_dir: bool) -> str:
+        """Return the (interned) type label of a name."""
+        if is_dir:
+            return self._type_label("Folder")
+        suffix = os.path.splitext(name)[1]
+        if suffix:
+            return sys.intern(suffix[1:].upper())
+        return self._type_label("File")
+
+    def create_error_file_info(self, file_path: str) -> UnreadableFileInfo:
+        """Build a placeholder record for a path that could not be stat-ed."""
+        return UnreadableFileInfo(
+            path=file_path,
+            name=Path(file_path).name,
+            is_dir=False,
+            size_bytes=0,
+            size_str="",
+            modified="",
+            file_type=self._type_label("Unknown"),
+        )
+
+    def refresh_type_labels(self):
+        """
+        Resolve localized type labels on the Tk thread.
+
+        Records built afterwards (including on worker threads) reuse these
+        labels instead of calling into Tcl.
+        """
+        root = self._get_root()
+        self._type_labels = {
+            key: sys.intern(lang.get(key, root))
+            for key in ("Folder", "File", "Unknown")
+        }
+
+    def _type_label(self, key: str) -> str:
+        """Return a localized type label, preferring the resolved labels."""
+        label = self._type_labels.get(key)
+        if label is None:
+            label = lang.get(key, self._get_root())
+        return label
+
+    def add_file_info(self, file_info: FileInfo):
+        """Store a FileInfo record in the cache with LRU management."""
+        if isinstance(file_info, PendingFileInfo):
+            # Nothing to reuse until the path has been stat-ed
+            return
+        path = file_info.path
+        old = self._meta.get(path)
+        if old is None:
+            self._index(path)
+        else:
+            self._bytes -= old[0]
+        cost = (
+            sys.getsizeof(file_info)
+            + sys.getsizeof(path)
+            + sys.getsizeof(file_info.name)
+            + ENTRY_OVERHEAD_BYTES
+        )
+        self._cache[path] = file_info
+        self._cache.move_to_end(path)
+        self._meta[path] = (
+            cost,
+            time.monotonic(),
+            isinstance(file_info, UnreadableFileInfo),
+        )
+        self._bytes += cost
+        self._manage_cache_size()
+
+    def _forget(self, path: str):
+        """Drop the bookkeeping of a path removed from the cache."""
+        meta = self._meta.pop(path, None)
+        if meta is not None:
+            self._bytes -= meta[0]
+
+    def _index(self, path: str):
+        """Register a cached path under its parent directory."""
+        parent = os.path.dirname(path)
+        siblings = self._children.get(parent)
+        if siblings is None:
+            siblings = self._children[parent] = {}
+            self._link_directory(parent)
+            if self._ttl is not None:
+                now = time.monotonic()
+                self._stamps[parent] = (self._directory_stamp(parent), now, now)
+        siblings[path] = None
+
+    def _link_directory(self, directory: str):
+        """Link a directory to its ancestors so subtree walks can reach it."""
+        while True:
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return
+            subdirs = self._subdirs.get(parent)
+            known = subdirs is not None or parent in self._children
+            self._subdirs.setdefault(parent, set()).add(directory)
+            if known:
+                return
+            directory = parent
+
+    def _unindex(self, path: str):
+        """Remove a path from the directory index."""
+        parent = os.path.dirname(path)
+        siblings = self._children.get(parent)
+        if siblings is None:
+            return
+        siblings.pop(path, None)
+        if not siblings:
+            del self._children[parent]
+            self._stamps.pop(parent, None)
+            self._unlink_directory(parent)
+
+    def _unlink_directory(self, directory: str):
+        """Drop index links of directories that no longer lead to entries."""
+        while directory not in self._children and not self._subdirs.get(directory):
+            self._subdirs.pop(directory, None)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return
+            subdirs = self._subdirs.get(parent)
+            if subdirs is None:
+                return
+            subdirs.discard(directory)
+            directory = parent
+
+    def _get_root(self):
+        """Return the root widget used for language lookups, if still alive."""
+        if self._root is not None:
+            return self._root()  # pylint: disable=not-callable
+        return None
 
     def _manage_cache_size(self):
-        """Manage cache size using OrderedDict's LRU behavior."""
-        while len(self._cache) > self._max_cache_size:
-            # Remove oldest item (first in OrderedDict)
-            self._cache.popitem(last=False)
+        """Evict least recently used records until both limits are met."""
+        max_size = self._max_cache_size
+        max_bytes = self._max_cache_bytes
+        while self._cache and (
+            (max_size is not None and len(self._cache) > max_size)
+            or (max_bytes is not None and self._bytes > max_bytes)
+        ):
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        """Remove the least recently used record."""
+        path, _ = self._cache.popitem(last=False)
+        self._forget(path)
+        self._unindex(path)
+        self.evictions += 1
+
+    def trim_cache(self, fraction: float = 0.5) -> int:
+        """
+        Evict least recently used records until at most a fraction of the
+        cache's bytes remain.
+
+        Args:
+            fraction: Share of the current bytes to keep
+
+        Returns:
+            Number of evicted records
+        """
+        target = self._bytes * fraction
+        evicted = 0
+        while self._cache and self._bytes > target:
+            self._evict_oldest()
+            evicted += 1
+        return evicted
 
     def clear_directory_cache(self, directory_path: str):
-        """Clear cache entries for a specific directory and its subdirectories."""
-        keys_to_remove = [
-            key for key in self._cache.keys() if key.startswith(directory_path)
-        ]
-        for key in keys_to_remove:
-            del self._cache[key]
+        """
+        Clear cache entries for a directory, its contents and subdirectories.
+
+        Only real path boundaries match: clearing /data/a keeps /data/ab.
+        The cost is proportional to the number of evicted entries.
+        """
+        directory = os.path.normpath(directory_path)
+        self.remove_from_cache(directory)
+
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            stack.extend(self._subdirs.pop(current, ()))
+            self._stamps.pop(current, None)
+            for path in self._children.pop(current, ()):
+                del self._cache[path]
+                self._forget(path)
+        self._unlink_directory(directory)
 
     def get_memory_usage_estimate(self) -> int:
-        """Get estimated memory usage in bytes."""
-        # Simple estimate: sum of string lengths + object overhead
-        total_size = 0
+        """Get the measured memory usage of the cache in bytes."""
+        # The cache table plus every record; shared strings are counted once
+        seen = set()
+        total_size = sys.getsizeof(self._cache)
+        for index in (self._children, self._subdirs, self._stamps):
+            total_size += sys.getsizeof(index)
+            total_size += sum(sys.getsizeof(value) for value in index.values())
         for file_info in self._cache.values():
-            total_size += (
-                len(file_info.path)
-                + len(file_info.name)
-                + len(file_info.size_str)
-                + len(file_info.modified)
-                + len(file_info.file_type)
-                + 100
-            )
+            total_size += file_info.memory_size(seen)
         return total_size
 
     def _resolve_symlink(self, path: str) -> str:
         """Resolve symlinks to prevent loops on macOS."""
-        if utils.IS_MACOS:
+        if utils.IS_MACOS and self.filesystem.local:
             try:
                 path_obj = Path(path)
                 real_path = str(path_obj.resolve())
@@ -159,16 +594,49 @@ class FileInfoManager:
     def clear_cache(self):
         """Clear the cache."""
         self._cache.clear()
+        self._meta.clear()
+        self._bytes = 0
+        self._children.clear()
+        self._subdirs.clear()
+        self._stamps.clear()
 
     def remove_from_cache(self, file_path: str):
         """Remove a specific file from cache."""
         if file_path in self._cache:
             del self._cache[file_path]
+            self._forget(file_path)
+            self._unindex(file_path)
 
     def get_cache_size(self) -> int:
         """Get the number of cached items."""
         return len(self._cache)
 
+    @property
+    def cache_bytes(self) -> int:
+        """Approximate bytes used by the cached records."""
+        return self._bytes
+
+    def get_cache_stats(self) -> dict:
+        """
+        Get cache effectiveness counters.
+
+        Returns:
+            Dictionary with entries, bytes, limits, hits, misses, hit_rate,
+            evictions and revalidations (records found stale on access)
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "bytes": self._bytes,
+            "max_entries": self._max_cache_size,
+            "max_bytes": self._max_cache_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+        }
+
     def get_cached_file_info(self, file_path: str) -> FileInfo:
         """Get file info from cache if available, otherwise fetch and cache it."""
         return self.get_file_info(file_path)
@@ -0,0 +1,204 @@
+"""
+Background metadata reads for PathBrowser widget.
+
+With two-phase listing the file list is painted from the names and types
+os.scandir reports, and this module fills in sizes and dates afterwards.
+Paths are stat-ed on a worker thread in the order requested, normally the
+rows in view first; every request replaces the wanted order, so rows that
+scrolled away or belong to a directory the user has left are not stat-ed.
+Records are delivered to the Tk thread in batches.
+"""
+
+import logging
+import queue
+import stat
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional
+
+from .manager import FileInfo, FileInfoManager, UnreadableFileInfo
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Delay between pump runs while metadata is being read (milliseconds)
+PUMP_INTERVAL_MS = 10
+# Maximum time spent per pump run (milliseconds)
+TIME_SLICE_MS = 20
+
+
+class MetadataFiller:  # pylint: disable=too-many-instance-attributes
+    """
+    Stats listed-by-name rows and delivers their complete FileInfo records.
+
+    Callbacks always run on the Tk thread: on_records with each batch of
+    records, and on_idle once everything requested has been delivered.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        widget,
+        file_info_manager: FileInfoManager,
+        on_records: Callable[[List[FileInfo]], None],
+        on_idle: Optional[Callable[[], None]] = None,
+        threaded: bool = True,
+        time_slice_ms: int = TIME_SLICE_MS,
+    ):
+        """
+        Initialize the filler.
+
+        Args:
+            widget: Tk widget used for after() scheduling
+            file_info_manager: Builds the records (not cached here)
+            on_records: Called with each batch of complete records
+            on_idle: Called when all requested rows have been delivered
+            threaded: Stat on a worker thread (False stats in time slices
+                on the Tk thread)
+            time_slice_ms: Maximum time per pump run in milliseconds
+        """
+        self._widget = widget
+        self._manager = file_info_manager
+        self._on_records = on_records
+        self._on_idle = on_idle
+        self.threaded = threaded
+        self._time_slice = time_slice_ms / 1000.0
+        # Rows still to be stat-ed, in the requested order
+        self._pending: "OrderedDict[str, FileInfo]" = OrderedDict()
+        self._in_flight = 0
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._pump_id = None
+        self._delivered = False
+
+    @property
+    def idle(self) -> bool:
+        """Whether no requested row is waiting to be stat-ed or delivered."""
+        with self._condition:
+            busy = bool(self._pending) or self._in_flight > 0
+        return not busy and self._queue.empty()
+
+    def request(self, rows: Iterable[FileInfo]):
+        """
+        Stat the given rows in order, dropping any earlier request.
+
+        Args:
+            rows: Listed-by-name records, most wanted first
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._pending = OrderedDict((row.path, row) for row in rows)
+            self._condition.notify()
+        if self.threaded:
+            self._ensure_worker()
+        self._schedule_pump()
+
+    def cancel(self):
+        """Drop the current request and any undelivered records."""
+        self.request(())
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._delivered = False
+
+    def close(self):
+        """Stop the worker thread and the pump."""
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+        if self._pump_id is not None:
+            try:
+                self._widget.after_cancel(self._pump_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to cancel metadata pump")
+            self._pump_id = None
+
+    def _ensure_worker(self):
+        """Start the worker thread if it is not running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._worker, name="PathBrowserMetadata", daemon=True
+            )
+            self._thread.start()
+
+    def _next(self) -> Optional[FileInfo]:
+        """Take the next wanted row, or None if there is none."""
+        with self._condition:
+            if not self._pending or self._closed:
+                return None
+            _, row = self._pending.popitem(last=False)
+            self._in_flight += 1
+            return row
+
+    def _read(self, row: FileInfo):
+        """Stat a row and queue its complete record."""
+        try:
+            try:
+                stat_result = self._manager.filesystem.stat(row.path)
+            except OSError as e:
+                logger.debug("Failed to get file info for %s: %s", row.path, e)
+                # Keep what the listing told; the columns stay empty
+                file_info = UnreadableFileInfo(
+                    row.path, row.name, row.is_dir, 0, "", "", row.file_type
+                )
+            else:
+                file_info = self._manager.create_file_info(
+                    row.path, row.name, stat.S_ISDIR(stat_result.st_mode), stat_result
+                )
+            self._queue.put(file_info)
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+
+    def _worker(self):
+        """Worker loop: stat pending rows until closed."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            row = self._next()
+            if row is not None:
+                self._read(row)
+
+    def _schedule_pump(self):
+        """Schedule the next pump run if none is pending."""
+        if self._pump_id is None and not self._closed:
+            self._pump_id = self._widget.after(PUMP_INTERVAL_MS, self._pump)
+
+    def _pump(self):
+        """Stat (when not threaded) and deliver records for one time slice."""
+        self._pump_id = None
+        deadline = time.perf_counter() + self._time_slice
+        if not self.threaded:
+            while time.perf_counter() < deadline:
+                row = self._next()
+                if row is None:
+                    break
+                self._read(row)
+        self._drain()
+        if not self.idle:
+            self._schedule_pump()
+        elif self._delivered:
+            self._delivered = False
+            if self._on_idle is not None:
+                self._on_idle()
+
+    def _drain(self):
+        """Deliver the queued records in one batch."""
+        records = []
+        while True:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if records:
+            self._delivered = True
+            self._on_records(records)
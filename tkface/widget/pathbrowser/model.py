@@ -0,0 +1,530 @@
+"""
+File list model for PathBrowser widget.
+
+This module keeps the full file pane listing on the Python side so that
+navigation, selection, sorting and the virtual list never have to ask the
+Treeview for its children or the filesystem for metadata.
+"""
+
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .manager import FileInfo
+from .selection import RangeSelection
+
+# Position of each sortable column in the precomputed sort keys
+SORT_COLUMNS = {"#0": 0, "size": 1, "modified": 2, "type": 3}
+# Subtracted from folder sizes so that folders sort before any file
+FOLDER_SIZE_OFFSET = 1 << 62
+
+
+def make_sort_keys(row: FileInfo) -> Tuple:
+    """
+    Precompute the typed sort keys of a row.
+
+    Folders sort before files by size and modified time; among themselves
+    folders are ordered by their computed size, if any. Every column is
+    ordered by the casefolded name first, so the name breaks ties.
+
+    Args:
+        row: FileInfo record
+
+    Returns:
+        Tuple of (name, size, modified, type) keys
+    """
+    if row.is_dir:
+        size_key, mtime_key = row.size_bytes - FOLDER_SIZE_OFFSET, float("-inf")
+    else:
+        size_key, mtime_key = row.size_bytes, row.mtime
+    return (row.name.casefold(), size_key, mtime_key, row.file_type.casefold())
+
+
+class FileListModel:
+    """
+    Ordered rows of the file list with O(1) lookups by path.
+
+    Sort keys are computed once when rows are added, so sorting only
+    reorders row ids in memory. An optional filter hides rows without
+    removing them, so changing the filter never needs a rescan. The model
+    also holds the selection as ranges of display positions, with folder,
+    file and size totals answered from prefix sums, so selecting every row
+    of a huge listing is as cheap as selecting one.
+    """
+
+    def __init__(self):
+        """Initialize an empty model."""
+        self._filter: Optional[Callable[[FileInfo], bool]] = None
+        self.clear()
+
+    def clear(self):
+        """Remove all rows and the selection."""
+        # pylint: disable=attribute-defined-outside-init
+        # Rows in the order they were added, with column-aligned sort keys
+        self._entries: List[FileInfo] = []
+        self._ids: Dict[str, int] = {}
+        self._keys: Tuple[list, ...] = tuple([] for _ in SORT_COLUMNS)
+        self._name_order: Optional[List[int]] = None
+        # Casefolded names in name order, for prefix lookups with bisect
+        self._name_keys: Optional[List[str]] = None
+        # Filter result per entry; hidden entries are kept but not displayed
+        self._visible: List[bool] = []
+        # Last sort as (column, reverse), or None for insertion order
+        self._sort: Optional[Tuple[str, bool]] = None
+        # Display order as entry ids, and each entry's display position
+        # (None while the entry is hidden by the filter)
+        self._order: List[int] = []
+        self._position: List[Optional[int]] = []
+        self._selection = RangeSelection()
+        # Running (folder count, file bytes) per display position, built
+        # when the selection totals are first needed after a reorder
+        self._prefix: Optional[Tuple[List[int], List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[FileInfo]:
+        entries = self._entries
+        return (entries[i] for i in self._order)
+
+    @property
+    def total(self) -> int:
+        """Number of rows including those hidden by the filter."""
+        return len(self._entries)
+
+    def extend(self, rows: Iterable[FileInfo]) -> List[FileInfo]:
+        """
+        Append rows to the end of the listing.
+
+        Returns:
+            The appended rows that pass the filter
+        """
+        shown = []
+        for row in rows:
+            entry_id = self._append(row)
+            if self._visible[entry_id]:
+                self._position.append(len(self._order))
+                self._order.append(entry_id)
+                shown.append(row)
+            else:
+                self._position.append(None)
+        self._name_order = None
+        self._name_keys = None
+        self._prefix = None
+        return shown
+
+    def _append(self, row: FileInfo) -> int:
+        """Store a new entry with its keys and filter result; return its id."""
+        entry_id = len(self._entries)
+        for column_keys, key in zip(self._keys, make_sort_keys(row)):
+            column_keys.append(key)
+        self._entries.append(row)
+        self._ids[row.path] = entry_id
+        self._visible.append(self._filter is None or bool(self._filter(row)))
+        return entry_id
+
+    def apply_changes(
+        self, rows: Iterable[FileInfo] = (), removed: Iterable[str] = ()
+    ):
+        """
+        Update rows in place, add new ones and remove others.
+
+        The sort order and the filter are reapplied; removed or newly hidden
+        rows leave the selection.
+
+        Args:
+            rows: New or changed rows, matched by path
+            removed: Paths of rows to remove
+        """
+        selected = self.selection()
+        added = False
+        for row in rows:
+            entry_id = self._ids.get(row.path)
+            if entry_id is None:
+                self._append(row)
+                added = True
+                continue
+            self._entries[entry_id] = row
+            for column_keys, key in zip(self._keys, make_sort_keys(row)):
+                column_keys[entry_id] = key
+            self._visible[entry_id] = self._filter is None or bool(self._filter(row))
+
+        removed = {path for path in removed if path in self._ids}
+        if removed:
+            keep = [
+                entry_id
+                for entry_id, row in enumerate(self._entries)
+                if row.path not in removed
+            ]
+            self._entries = [self._entries[i] for i in keep]
+            self._keys = tuple([column[i] for i in keep] for column in self._keys)
+            self._visible = [self._visible[i] for i in keep]
+            self._ids = {row.path: i for i, row in enumerate(self._entries)}
+        if added or removed:
+            self._name_order = None
+            self._name_keys = None
+
+        # Entry ids may have shifted, so carry the selection over by path
+        self._selection = RangeSelection()
+        self._rebuild()
+        self.select(selected)
+
+    def update_rows(self, rows: Iterable[FileInfo]) -> bool:
+        """
+        Replace the records of listed rows without reordering them.
+
+        Used when metadata arrives for rows listed by name only: the name,
+        folder flag and type (and so the filter result) are unchanged, so
+        the display order is kept even if the sort keys changed.
+
+        Args:
+            rows: New records of listed paths; unknown paths are ignored
+
+        Returns:
+            Whether the keys of the current sort column changed, i.e.
+            whether sort() would order the rows differently
+        """
+        column = SORT_COLUMNS.get(self._sort[0], 0) if self._sort else None
+        reorder = False
+        for row in rows:
+            entry_id = self._ids.get(row.path)
+            if entry_id is None:
+                continue
+            self._entries[entry_id] = row
+            for position, key in enumerate(make_sort_keys(row)):
+                column_keys = self._keys[position]
+                if position == column and column_keys[entry_id] != key:
+                    reorder = True
+                column_keys[entry_id] = key
+        self._prefix = None
+        return reorder
+
+    def set_filter(self, predicate: Optional[Callable[[FileInfo], bool]]):
+        """
+        Show only the rows accepted by a predicate (None shows all rows).
+
+        The current sort order is kept and hidden rows leave the selection.
+
+        Args:
+            predicate: Called once per row with its FileInfo
+        """
+        self._filter = predicate
+        if predicate is None:
+            self._visible = [True] * len(self._entries)
+        else:
+            self._visible = [bool(predicate(row)) for row in self._entries]
+        self._rebuild()
+
+    def set_rows(self, rows: Iterable[FileInfo]):
+        """Replace all rows, keeping the selection of rows that remain."""
+        selected = self.selection()
+        self.clear()
+        self.extend(rows)
+        self.select(selected)
+
+    def sort(self, column: str = "#0", reverse: bool = False):
+        """
+        Sort the rows by a column using the precomputed keys.
+
+        Args:
+            column: Column identifier ("#0", "size", "modified" or "type")
+            reverse: Sort in descending order
+        """
+        self._sort = (column, reverse)
+        self._rebuild()
+
+    def _rebuild(self):
+        """Recompute the display order, keeping the selected rows selected."""
+        old_order = self._order
+        selected = [old_order[index] for index in self._selection]
+        if self._sort is None:
+            order = range(len(self._entries))
+        else:
+            order = self._sorted_ids(*self._sort)
+        visible = self._visible
+        self._order = [entry_id for entry_id in order if visible[entry_id]]
+        positions = [None] * len(self._entries)
+        for display_index, entry_id in enumerate(self._order):
+            positions[entry_id] = display_index
+        self._position = positions
+        self._prefix = None
+        # Rows hidden by the filter leave the selection
+        self._selection = RangeSelection.from_indices(
+            positions[entry_id]
+            for entry_id in selected
+            if positions[entry_id] is not None
+        )
+
+    def _names_sorted(self) -> List[int]:
+        """Return all entry ids ordered by name, cached until rows change."""
+        if self._name_order is None:
+            self._name_order = sorted(
+                range(len(self._entries)), key=self._keys[0].__getitem__
+            )
+        return self._name_order
+
+    def _sorted_ids(self, column: str, reverse: bool) -> List[int]:
+        """Return all entry ids ordered by a column."""
+        # Shared first pass for every column
+        order = self._names_sorted()
+        position = SORT_COLUMNS.get(column, 0)
+        if position:
+            # Stable sort on a scalar key keeps name order within ties
+            order = sorted(order, key=self._keys[position].__getitem__)
+        if reverse:
+            order = order[::-1]
+        return order
+
+    def get(self, path: str) -> Optional[FileInfo]:
+        """Return the row of a path, including rows hidden by the filter."""
+        entry_id = self._ids.get(path)
+        if entry_id is None:
+            return None
+        return self._entries[entry_id]
+
+    def all_rows(self) -> List[FileInfo]:
+        """Return every row, including hidden ones, in insertion order."""
+        return list(self._entries)
+
+    def row(self, index: int) -> FileInfo:
+        """Return the row at the given position."""
+        return self._entries[self._order[index]]
+
+    def path_at(self, index: int) -> str:
+        """Return the path of the row at the given position."""
+        return self._entries[self._order[index]].path
+
+    def index_of(self, path: str) -> Optional[int]:
+        """Return the position of a path, or None if it is not displayed."""
+        entry_id = self._ids.get(path)
+        if entry_id is None:
+            return None
+        return self._position[entry_id]
+
+    def paths(self) -> List[str]:
+        """Return all paths in display order."""
+        entries = self._entries
+        return [entries[i].path for i in self._order]
+
+    def paths_between(self, start: int, stop: int) -> List[str]:
+        """Return the paths of rows start (inclusive) to stop (exclusive)."""
+        entries = self._entries
+        return [entries[i].path for i in self._order[start:stop]]
+
+    def find_prefix(self, prefix: str, start: int = 0) -> Optional[str]:
+        """
+        Return the first displayed row whose name starts with a prefix.
+
+        The search begins at display position start and wraps around to
+        the top. Names are matched casefolded through a sorted name index,
+        so only the rows sharing the prefix are looked at.
+
+        Args:
+            prefix: Typed characters
+            start: Display position where the search begins
+
+        Returns:
+            Path of the matching row, or None if no displayed row matches
+        """
+        prefix = prefix.casefold()
+        if not prefix or not self._order:
+            return None
+        order = self._names_sorted()
+        if self._name_keys is None:
+            names = self._keys[0]
+            self._name_keys = [names[entry_id] for entry_id in order]
+        keys = self._name_keys
+        low = bisect_left(keys, prefix)
+        high = bisect_left(keys, prefix + "\U0010ffff", low)
+
+        # Closest match at or after start, else the first from the top
+        position = self._position
+        count = len(self._order)
+        best = None
+        best_distance = count
+        for entry_id in order[low:high]:
+            index = position[entry_id]
+            if index is None:
+                continue
+            distance = (index - start) % count
+            if distance < best_distance:
+                best, best_distance = entry_id, distance
+        if best is None:
+            return None
+        return self._entries[best].path
+
+    def contains(self, path: str) -> bool:
+        """Return whether a path is displayed (listed and not filtered out)."""
+        return self.index_of(path) is not None
+
+    def selection(self) -> List[str]:
+        """Return the selected paths in display order."""
+        return list(self.iter_selection())
+
+    def iter_selection(self) -> Iterator[str]:
+        """Iterate over the selected paths in display order."""
+        entries, order = self._entries, self._order
+        for start, stop in self._selection.ranges():
+            for entry_id in order[start:stop]:
+                yield entries[entry_id].path
+
+    def selected_rows(self) -> Iterator[FileInfo]:
+        """Iterate over the selected rows in display order."""
+        entries, order = self._entries, self._order
+        for start, stop in self._selection.ranges():
+            for entry_id in order[start:stop]:
+                yield entries[entry_id]
+
+    @property
+    def selected_count(self) -> int:
+        """Number of selected rows."""
+        return len(self._selection)
+
+    def selection_ranges(self) -> List[Tuple[int, int]]:
+        """Return the selection as (start, stop) display position ranges."""
+        return self._selection.ranges()
+
+    def selection_bounds(self) -> Optional[Tuple[int, int]]:
+        """Return the display positions of the first and last selected rows."""
+        return self._selection.bounds()
+
+    def selection_totals(self) -> Tuple[int, int, int]:
+        """
+        Return the (folders, files, file bytes) of the selection.
+
+        Each selected range is answered from prefix sums over the display
+        order, so the totals cost one lookup per range, not per row.
+        """
+        if not self._selection:
+            return 0, 0, 0
+        if self._prefix is None:
+            folders, sizes = [0], [0]
+            folder_count = size = 0
+            entries = self._entries
+            for entry_id in self._order:
+                row = entries[entry_id]
+                if row.is_dir:
+                    folder_count += 1
+                else:
+                    size += row.size_bytes
+                folders.append(folder_count)
+                sizes.append(size)
+            self._prefix = (folders, sizes)
+        folders, sizes = self._prefix
+        folder_total = size_total = 0
+        for start, stop in self._selection.ranges():
+            folder_total += folders[stop] - folders[start]
+            size_total += sizes[stop] - sizes[start]
+        return folder_total, len(self._selection) - folder_total, size_total
+
+    def is_selected(self, path: str) -> bool:
+        """Return whether a path is selected."""
+        index = self.index_of(path)
+        return index is not None and index in self._selection
+
+    def select(self, paths: Iterable[str]):
+        """Replace the selection with the given (displayed) paths."""
+        ids, position = self._ids, self._position
+        indices = []
+        for path in paths:
+            entry_id = ids.get(path)
+            if entry_id is not None and position[entry_id] is not None:
+                indices.append(position[entry_id])
+        self._selection = RangeSelection.from_indices(indices)
+
+    def select_range(self, start: int, stop: int, extend: bool = False):
+        """
+        Select the rows at display positions start to stop (exclusive).
+
+        Args:
+            start: First position
+            stop: Position after the last one
+            extend: Add to the selection instead of replacing it
+        """
+        if not extend:
+            self._selection = RangeSelection()
+        self._selection.add(max(0, start), min(stop, len(self._order)))
+
+    def select_all(self):
+        """Select every displayed row."""
+        self.select_range(0, len(self._order))
+
+    def toggle(self, path: str):
+        """Add a path to the selection, or remove it if already selected."""
+        index = self.index_of(path)
+        if index is None:
+            return
+        if index in self._selection:
+            self._selection.remove(index, index + 1)
+        else:
+            self._selection.add(index, index + 1)
+
+
+class SelectedPaths(Sequence):
+    """
+    Live, read-only view of the paths selected in a FileListModel.
+
+    The view reads the model's range selection whenever it is used, so
+    storing it costs nothing however many rows are selected; the paths are
+    only built when the view is iterated or copied.
+    """
+
+    def __init__(self, model: FileListModel, dirs_only: bool = False):
+        """
+        Initialize the view.
+
+        Args:
+            model: File list model whose selection is viewed
+            dirs_only: Only include the selected folders
+        """
+        self.model = model
+        self.dirs_only = dirs_only
+
+    def rows(self) -> Iterator[FileInfo]:
+        """Iterate over the viewed rows in display order."""
+        rows = self.model.selected_rows()
+        if self.dirs_only:
+            return (row for row in rows if row.is_dir)
+        return rows
+
+    def __iter__(self) -> Iterator[str]:
+        return (row.path for row in self.rows())
+
+    def __len__(self) -> int:
+        if self.dirs_only:
+            return self.model.selection_totals()[0]
+        return self.model.selected_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or self.dirs_only:
+            return self.copy()[index]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("selection index out of range")
+        # Walk the ranges, not the rows
+        for start, stop in self.model.selection_ranges():
+            if index < stop - start:
+                return self.model.path_at(start + index)
+            index -= stop - start
+        raise IndexError("selection index out of range")
+
+    def __contains__(self, path) -> bool:
+        if not self.model.is_selected(path):
+            return False
+        return not self.dirs_only or self.model.get(path).is_dir
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, SelectedPaths)):
+            return self.copy() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"SelectedPaths({self.copy()!r})"
+
+    def copy(self) -> List[str]:
+        """Return the viewed paths as a new list."""
+        return list(self)
@@ -0,0 +1,249 @@
+"""
+Background subdirectory prefetching for PathBrowser widget.
+
+When a level of the directory tree is shown, the subdirectories of each
+visible child are listed off the Tk thread. The results tell the tree
+which nodes can be expanded, so expand buttons only appear where they
+lead somewhere, and they make opening a node a lookup instead of a scan.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .scanner import DirectoryScanner
+from .utils import directory_stamp
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Delay between pump runs while prefetches are pending (milliseconds)
+PUMP_INTERVAL_MS = 10
+# Maximum time spent per pump run (milliseconds)
+TIME_SLICE_MS = 20
+# Number of directory listings kept; the least recently used are dropped
+DEFAULT_MAX_LISTINGS = 2048
+
+Subdirs = List[Tuple[str, str]]
+# Result marker: the directory stamp matches the stored listing
+_UNCHANGED = object()
+
+
+class SubdirPrefetcher:
+    """
+    Lists subdirectories ahead of the tree on a worker thread.
+
+    Requests are served most recent first, so the level the user is looking
+    at wins over earlier ones. Listings are kept with the directory's
+    (device, inode, mtime) and are only handed out while it is unchanged.
+    Callbacks always run on the Tk thread.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        widget,
+        scanner: DirectoryScanner,
+        on_result: Callable[[str, Optional[Subdirs]], None],
+        threaded: bool = True,
+        max_listings: int = DEFAULT_MAX_LISTINGS,
+        time_slice_ms: int = TIME_SLICE_MS,
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            widget: Tk widget used for after() scheduling
+            scanner: Scanner used to list directories
+            on_result: Called with (path, subdirs), subdirs None if unreadable
+            threaded: Scan on a worker thread (False scans in time slices
+                on the Tk thread)
+            max_listings: Number of directory listings kept
+            time_slice_ms: Maximum time per pump run in milliseconds
+        """
+        self._widget = widget
+        self._scanner = scanner
+        self._on_result = on_result
+        self.threaded = threaded
+        self.max_listings = max_listings
+        self._time_slice = time_slice_ms / 1000.0
+        self._listings: "OrderedDict[str, tuple]" = OrderedDict()
+        # Requested paths (most recent first) with the stamp of their listing
+        self._pending: "OrderedDict[str, Optional[tuple]]" = OrderedDict()
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._in_flight = None
+        self._closed = False
+        self._thread = None
+        self._pump_id = None
+
+    @property
+    def idle(self) -> bool:
+        """Whether no requested directory is waiting to be listed or delivered."""
+        with self._condition:
+            busy = bool(self._pending) or self._in_flight is not None
+        return not busy and self._queue.empty()
+
+    def get(self, path: str) -> Optional[Subdirs]:
+        """
+        Return the prefetched subdirectories of a directory, if still valid.
+
+        Args:
+            path: Directory path
+
+        Returns:
+            Sorted list of (name, path), or None if unknown or outdated
+        """
+        entry = self._listings.get(path)
+        if entry is None:
+            return None
+        stamp, subdirs = entry
+        if stamp is None or stamp != directory_stamp(path, self._scanner.filesystem):
+            del self._listings[path]
+            return None
+        self._listings.move_to_end(path)
+        return subdirs
+
+    def has_subdirs(self, path: str) -> Optional[bool]:
+        """Return whether a directory has subdirectories, or None if unknown."""
+        entry = self._listings.get(path)
+        if entry is None:
+            return None
+        return bool(entry[1])
+
+    def request(self, paths: Iterable[str]):
+        """
+        Queue directories for listing ahead of earlier requests.
+
+        Args:
+            paths: Directories whose subdirectories should be listed
+        """
+        paths = list(paths)
+        if not paths or self._closed:
+            return
+        with self._condition:
+            for path in reversed(paths):
+                # Known listings are only rescanned if the stamp changed
+                entry = self._listings.get(path)
+                self._pending[path] = entry[0] if entry is not None else None
+                self._pending.move_to_end(path, last=False)
+            self._condition.notify()
+        if self.threaded:
+            self._ensure_worker()
+        self._schedule_pump()
+
+    def forget(self, path: str):
+        """Drop the listing of a directory (e.g. after it changed)."""
+        self._listings.pop(path, None)
+
+    def cancel(self):
+        """Drop all pending requests and undelivered results."""
+        with self._condition:
+            self._pending.clear()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def close(self):
+        """Stop the worker and the pump."""
+        self.cancel()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._pump_id is not None:
+            try:
+                self._widget.after_cancel(self._pump_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to cancel prefetch pump")
+            self._pump_id = None
+        self._listings.clear()
+
+    def _ensure_worker(self):
+        """Start the worker thread if it is not running yet."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._worker, name="PathBrowserPrefetch", daemon=True
+            )
+            self._thread.start()
+
+    def _next_request(self) -> Optional[tuple]:
+        """Pop the most recent (path, known stamp) request (lock held)."""
+        if not self._pending:
+            return None
+        request = self._pending.popitem(last=False)
+        self._in_flight = request[0]
+        return request
+
+    def _worker(self):
+        """Worker loop: list pending directories until closed."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                request = self._next_request()
+            self._queue.put(self._list(*request))
+            with self._condition:
+                self._in_flight = None
+
+    def _list(self, path: str, known_stamp: Optional[tuple]) -> tuple:
+        """List the subdirectories of a directory without touching Tk."""
+        # Stamp first, so a change during the scan invalidates the listing
+        stamp = directory_stamp(path, self._scanner.filesystem)
+        if stamp is not None and stamp == known_stamp:
+            return (path, stamp, _UNCHANGED)
+        try:
+            subdirs = self._scanner.scan(path, dirs_only=True, cache=False).subdirs
+        except OSError as e:
+            logger.debug("Cannot prefetch %s: %s", path, e)
+            return (path, None, None)
+        return (path, stamp, subdirs)
+
+    def _schedule_pump(self):
+        """Schedule the next pump run if none is pending."""
+        if self._pump_id is None and not self._closed:
+            self._pump_id = self._widget.after(PUMP_INTERVAL_MS, self._pump)
+
+    def _pump(self):
+        """Scan (when not threaded) and deliver results for one time slice."""
+        self._pump_id = None
+        deadline = time.perf_counter() + self._time_slice
+        if not self.threaded:
+            while time.perf_counter() < deadline:
+                with self._condition:
+                    request = self._next_request()
+                if request is None:
+                    break
+                self._queue.put(self._list(*request))
+                self._in_flight = None
+            # Deliver everything scanned in this slice
+            deadline = None
+        self._drain(deadline)
+        if self._pending or self._in_flight is not None or not self._queue.empty():
+            self._schedule_pump()
+
+    def _drain(self, deadline: Optional[float] = None):
+        """Store delivered listings and report them on the Tk thread."""
+        while deadline is None or time.perf_counter() < deadline:
+            try:
+                path, stamp, subdirs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if subdirs is _UNCHANGED:
+                entry = self._listings.get(path)
+                if entry is None:
+                    continue
+                subdirs = entry[1]
+            if subdirs is None:
+                self._listings.pop(path, None)
+            else:
+                self._listings[path] = (stamp, subdirs)
+                self._listings.move_to_end(path)
+                while len(self._listings) > self.max_listings:
+                    self._listings.popitem(last=False)
+            self._on_result(path, subdirs)
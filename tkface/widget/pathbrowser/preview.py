@@ -0,0 +1,216 @@
+"""
+File preview for PathBrowser widget.
+
+This module reads a bounded head (and optionally tail) of a file through
+mmap, so that previewing a multi-gigabyte log costs the same as previewing
+a small text file. Binary files are recognised from the head alone, and
+recent previews are kept in a small LRU cache that is revalidated against
+the file's size and mtime. Files of other filesystem providers (archive
+members) are read through the provider's open().
+"""
+
+import errno
+import logging
+import mmap
+import os
+import stat
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from .filesystem import FileSystem
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bytes read from the start of a file
+DEFAULT_HEAD_BYTES = 64 * 1024
+# Bytes read from the end of a file (0 shows the head only)
+DEFAULT_TAIL_BYTES = 0
+# Bytes of the head inspected for binary content
+BINARY_SNIFF_BYTES = 8192
+# Number of previews kept; the least recently used are dropped
+DEFAULT_MAX_PREVIEWS = 32
+
+
+@dataclass
+class Preview:
+    """Bounded view of a file's contents."""
+
+    path: str
+    size: int
+    head: str = ""
+    tail: str = ""
+    binary: bool = False
+    # Part of the file between head and tail was not read
+    truncated: bool = False
+
+
+def is_binary(data: bytes) -> bool:
+    """Return whether data looks binary (contains a NUL byte)."""
+    return b"\0" in data[:BINARY_SNIFF_BYTES]
+
+
+def read_preview(
+    path: str,
+    head_bytes: int = DEFAULT_HEAD_BYTES,
+    tail_bytes: int = DEFAULT_TAIL_BYTES,
+    filesystem: Optional[FileSystem] = None,
+) -> Preview:
+    """
+    Read the head and tail of a file without reading the rest of it.
+
+    Files larger than head_bytes + tail_bytes are mapped with mmap and only
+    the two ends are copied. Truncated ends are cut back to whole lines.
+
+    Args:
+        path: File to preview
+        head_bytes: Bytes read from the start of the file
+        tail_bytes: Bytes read from the end of the file
+        filesystem: Provider of the file (default: local, through mmap)
+
+    Returns:
+        Preview of the file
+
+    Raises:
+        OSError: If the file cannot be opened or read
+    """
+    if filesystem is not None and not filesystem.local:
+        # Archive members cannot be mapped; only their ends are read
+        size = filesystem.stat(path).st_size
+        truncated = size > head_bytes + tail_bytes
+        with filesystem.open(path) as f:
+            if truncated:
+                head, tail = _read_ends_unmapped(f, size, head_bytes, tail_bytes)
+            else:
+                head, tail = f.read(head_bytes + tail_bytes), b""
+        return _make_preview(path, size, head, tail, truncated)
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= head_bytes + tail_bytes:
+            # Small enough to read whole (bounded in case the file grows)
+            head, tail = f.read(head_bytes + tail_bytes), b""
+            truncated = False
+        else:
+            head, tail = _read_ends(f, size, head_bytes, tail_bytes)
+            truncated = True
+    return _make_preview(path, size, head, tail, truncated)
+
+
+def _make_preview(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: str, size: int, head: bytes, tail: bytes, truncated: bool
+) -> Preview:
+    """Decode the ends read from a file into a Preview."""
+    preview = Preview(path=path, size=size, truncated=truncated)
+    if is_binary(head):
+        preview.binary = True
+        return preview
+    if truncated:
+        # Drop the partial lines at the cut
+        if b"\n" in head:
+            head = head[: head.rindex(b"\n") + 1]
+        if b"\n" in tail:
+            tail = tail[tail.index(b"\n") + 1 :]
+    preview.head = head.decode("utf-8", errors="replace")
+    preview.tail = tail.decode("utf-8", errors="replace")
+    return preview
+
+
+def _read_ends(f, size: int, head_bytes: int, tail_bytes: int) -> tuple:
+    """
+    Copy the two ends of a large file, mapping it if possible.
+
+    The tail starts one byte early, so that a tail beginning exactly at a
+    line start is not mistaken for a partial line.
+    """
+    tail_start = size - tail_bytes - 1
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            tail = mapped[tail_start:] if tail_bytes else b""
+            return mapped[:head_bytes], tail
+    except (OSError, ValueError) as e:
+        # Some special or network files cannot be mapped
+        logger.debug("Cannot map %s, reading instead: %s", f.name, e)
+    return _read_ends_unmapped(f, size, head_bytes, tail_bytes)
+
+
+def _read_ends_unmapped(f, size: int, head_bytes: int, tail_bytes: int) -> tuple:
+    """Copy the two ends of a large file with seek and read."""
+    tail_start = size - tail_bytes - 1
+    head = f.read(head_bytes)
+    tail = b""
+    if tail_bytes:
+        f.seek(tail_start)
+        tail = f.read(tail_bytes + 1)
+    return head, tail
+
+
+class PreviewCache:
+    """
+    Recent previews by path with LRU eviction.
+
+    A cached preview is handed out only while the file's size and mtime
+    are unchanged; otherwise the file is read again.
+    """
+
+    def __init__(
+        self,
+        head_bytes: int = DEFAULT_HEAD_BYTES,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        max_previews: int = DEFAULT_MAX_PREVIEWS,
+        filesystem: Optional[FileSystem] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            head_bytes: Bytes read from the start of each file
+            tail_bytes: Bytes read from the end of each file
+            max_previews: Number of previews kept
+            filesystem: Provider of the previewed files (default: local)
+        """
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.max_previews = max_previews
+        self.filesystem = filesystem
+        self._previews: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._previews)
+
+    def get(self, path: str) -> Preview:
+        """
+        Return the preview of a file, reading it only if needed.
+
+        Raises:
+            OSError: If the file cannot be read or is not a regular file
+        """
+        if self.filesystem is not None:
+            stat_result = self.filesystem.stat(path)
+        else:
+            stat_result = os.stat(path)
+        if not stat.S_ISREG(stat_result.st_mode):
+            # Opening a FIFO or device could block or never end
+            raise OSError(errno.EINVAL, "Not a regular file", path)
+        stamp = (stat_result.st_size, stat_result.st_mtime_ns)
+        entry = self._previews.get(path)
+        if entry is not None and entry[0] == stamp:
+            self._previews.move_to_end(path)
+            return entry[1]
+
+        preview = read_preview(
+            path, self.head_bytes, self.tail_bytes, filesystem=self.filesystem
+        )
+        self._previews[path] = (stamp, preview)
+        self._previews.move_to_end(path)
+        while len(self._previews) > self.max_previews:
+            self._previews.popitem(last=False)
+        return preview
+
+    def forget(self, path: Optional[str] = None):
+        """Drop the preview of a path, or every preview if path is None."""
+        if path is None:
+            self._previews.clear()
+        else:
+            self._previews.pop(path, None)
@@ -0,0 +1,345 @@
+"""
+Directory scanning for PathBrowser widget.
+
+This module provides a single-pass directory scanner built on os.scandir.
+One pass produces the file information records for the file list, the
+subdirectory list for the directory tree and the totals for the status bar.
+The scanner also remembers the (device, inode) identity of the directories
+it lists, so the tree detects symlink and bind mount loops without
+resolving paths.
+
+On high-latency filesystems (NFS, SMB) every stat is a round trip. The
+scanner times the first stats of each listing and, if they are slow,
+issues the rest on a thread pool with a bounded number in flight,
+reassembling the records in listing order.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .filesystem import FileSystem
+from .manager import FileInfo, FileInfoManager, PendingFileInfo
+from .utils import dir_identity
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Directory identities remembered; the least recently listed are dropped
+DEFAULT_MAX_IDENTITIES = 65536
+# Stats timed one at a time before choosing the parallel mode
+PROBE_STATS = 8
+# Stats in flight per stat worker in parallel mode
+STATS_PER_WORKER = 4
+
+
+@dataclass
+class ScanResult:
+    """Result of a single directory scan."""
+
+    path: str
+    entries: List[FileInfo] = field(default_factory=list)
+    subdirs: List[Tuple[str, str]] = field(default_factory=list)
+    file_count: int = 0
+    folder_count: int = 0
+    total_size: int = 0
+    # Files listed by name only whose size is not known yet; total_size
+    # only counts the others
+    unsized: int = 0
+    # Seconds spent in the scan, and the part of it spent reading metadata
+    scan_time: float = 0.0
+    stat_time: float = 0.0
+    # Entries were listed by name only; sizes and dates are not known yet
+    names_only: bool = False
+    # Stats were issued on the thread pool (slow filesystem)
+    parallel_stat: bool = False
+
+    @classmethod
+    def from_entries(cls, path: str, entries: List[FileInfo]) -> "ScanResult":
+        """Build a ScanResult with totals from already listed entries."""
+        result = cls(path=path, entries=list(entries))
+        for entry in entries:
+            if entry.is_dir:
+                result.folder_count += 1
+                result.subdirs.append((entry.name, entry.path))
+            else:
+                result.file_count += 1
+                result.total_size += entry.size_bytes
+                result.unsized += isinstance(entry, PendingFileInfo)
+        result.subdirs.sort(key=lambda x: x[0].lower())
+        return result
+
+
+class DirectoryScanner:
+    """Scans directories with os.scandir, reusing cached DirEntry data."""
+
+    def __init__(
+        self,
+        file_info_manager: Optional[FileInfoManager] = None,
+        filesystem: Optional[FileSystem] = None,
+        stat_workers: int = 0,
+        parallel_stat_latency: Optional[float] = None,
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            file_info_manager: Builds and caches the records
+            filesystem: Provider to list (default: the manager's)
+            stat_workers: Threads issuing stats in parallel mode (below 2:
+                stats are always sequential)
+            parallel_stat_latency: Mean seconds per probed stat above which
+                a listing switches to parallel mode (0: always parallel,
+                None: never)
+        """
+        self.file_info_manager = file_info_manager or FileInfoManager()
+        # Listings come from the provider the file info manager stats through
+        self.filesystem = filesystem or self.file_info_manager.filesystem
+        self.stat_workers = stat_workers
+        self.parallel_stat_latency = parallel_stat_latency
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # (device, inode) of listed directories by path; scans run on worker
+        # threads as well as the Tk thread
+        self.max_identities = DEFAULT_MAX_IDENTITIES
+        self._identities: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._identity_lock = threading.Lock()
+
+    def identity(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        Return the (device, inode) of a directory, following symlinks.
+
+        Directories seen by a scan are answered without I/O; others are
+        stat-ed once.
+
+        Args:
+            path: Directory path
+
+        Returns:
+            (device, inode), or None if unknown (no inode numbers, or the
+            path cannot be stat-ed)
+        """
+        with self._identity_lock:
+            identity = self._identities.get(path)
+        if identity is not None:
+            return identity
+        try:
+            identity = dir_identity(self.filesystem.stat(path))
+        except OSError:
+            return None
+        if identity is not None:
+            self._remember(path, identity)
+        return identity
+
+    def close(self):
+        """Stop the stat threads (a later scan starts them again)."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def forget_identities(self):
+        """Drop the remembered directory identities."""
+        with self._identity_lock:
+            self._identities.clear()
+
+    def _remember(self, path: str, identity: Tuple[int, int]):
+        """Store the identity of a directory with LRU eviction."""
+        with self._identity_lock:
+            self._identities[path] = identity
+            self._identities.move_to_end(path)
+            while len(self._identities) > self.max_identities:
+                self._identities.popitem(last=False)
+
+    def scan(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        path: str,
+        dirs_only: bool = False,
+        on_batch: Optional[Callable[[List[FileInfo]], None]] = None,
+        batch_size: int = 100,
+        cancelled: Optional[Callable[[], bool]] = None,
+        cache: bool = True,
+        names_only: bool = False,
+    ) -> ScanResult:
+        """
+        Scan a directory in a single os.scandir pass.
+
+        Args:
+            path: Directory to scan
+            dirs_only: Only collect subdirectories (no stat for regular entries)
+            on_batch: Called with each batch of new FileInfo records
+            batch_size: Number of records per on_batch call
+            cancelled: Polled per entry; the scan stops early when it returns True
+            cache: Store records in the FileInfoManager cache (Tk thread only)
+            names_only: Build records from the DirEntry type data alone,
+                without a stat per entry (PendingFileInfo records)
+
+        Returns:
+            ScanResult with entries, subdirectories and totals
+
+        Raises:
+            OSError: If the directory itself cannot be listed
+        """
+        result = ScanResult(path=path, names_only=names_only)
+        manager = self.file_info_manager
+        batch = []
+        started = time.perf_counter()
+
+        with closing(self.filesystem.list(path)) as it:
+            records = self._records(it, result, dirs_only, names_only, cancelled)
+            for file_info, is_dir in records:
+                if cache:
+                    manager.add_file_info(file_info)
+                result.entries.append(file_info)
+                if not is_dir:
+                    result.total_size += file_info.size_bytes
+                    result.unsized += names_only
+
+                if on_batch is not None:
+                    batch.append(file_info)
+                    if len(batch) >= batch_size:
+                        on_batch(batch)
+                        batch = []
+
+        if batch:
+            on_batch(batch)
+        result.subdirs.sort(key=lambda x: x[0].lower())
+        result.scan_time = time.perf_counter() - started
+        return result
+
+    def _records(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        entries: Iterator,
+        result: ScanResult,
+        dirs_only: bool,
+        names_only: bool,
+        cancelled: Optional[Callable[[], bool]],
+    ) -> Iterator[Tuple[FileInfo, bool]]:
+        """Yield (record, is_dir) per listed entry, in listing order."""
+        probe = None
+        if self.stat_workers > 1 and self.parallel_stat_latency is not None:
+            probe = 0 if self.parallel_stat_latency == 0 else PROBE_STATS
+        probed = 0
+        for entry in entries:
+            if cancelled is not None and cancelled():
+                return
+            is_dir = _count_entry(result, entry)
+            if dirs_only:
+                if is_dir:
+                    self._remember_entry(entry)
+                continue
+            if names_only:
+                yield self.file_info_manager.create_name_info(
+                    entry.path, entry.name, is_dir
+                ), is_dir
+                continue
+
+            if probe is not None and probed >= probe:
+                # The stats measured so far are slow: fan out the rest
+                if probe == 0 or result.stat_time / probed > self.parallel_stat_latency:
+                    yield from self._parallel_records(
+                        entry, is_dir, entries, result, cancelled
+                    )
+                    return
+                probe = None
+            stat_started = time.perf_counter()
+            file_info = self._entry_file_info(entry, is_dir)
+            result.stat_time += time.perf_counter() - stat_started
+            probed += 1
+            yield file_info, is_dir
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def _parallel_records(
+        self,
+        first,
+        first_is_dir: bool,
+        entries: Iterator,
+        result: ScanResult,
+        cancelled: Optional[Callable[[], bool]],
+    ) -> Iterator[Tuple[FileInfo, bool]]:
+        """Stat the remaining entries on the pool, yielding them in order."""
+        result.parallel_stat = True
+        pool = self._stat_pool()
+        limit = self.stat_workers * STATS_PER_WORKER
+        window = deque()
+        stat_started = time.perf_counter()
+        submit = self._entry_file_info
+        window.append((pool.submit(submit, first, first_is_dir), first_is_dir))
+        try:
+            for entry in entries:
+                if cancelled is not None and cancelled():
+                    return
+                is_dir = _count_entry(result, entry)
+                window.append((pool.submit(submit, entry, is_dir), is_dir))
+                # Keep listing while the oldest stats are still in flight
+                while len(window) >= limit or (window and window[0][0].done()):
+                    future, done_is_dir = window.popleft()
+                    yield future.result(), done_is_dir
+            while window:
+                if cancelled is not None and cancelled():
+                    return
+                future, done_is_dir = window.popleft()
+                yield future.result(), done_is_dir
+        finally:
+            for future, _ in window:
+                future.cancel()
+            result.stat_time += time.perf_counter() - stat_started
+
+    def _stat_pool(self) -> ThreadPoolExecutor:
+        """Return the stat thread pool, starting it if needed."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.stat_workers,
+                    thread_name_prefix="PathBrowserStat",
+                )
+            return self._pool
+
+    def _remember_entry(self, entry):
+        """Remember the identity of a listed directory (symlinks followed)."""
+        try:
+            identity = dir_identity(entry.stat())
+        except OSError:
+            return
+        if identity is not None:
+            self._remember(entry.path, identity)
+
+    def _entry_file_info(self, entry, is_dir: bool) -> FileInfo:
+        """Build a FileInfo from a DirEntry using its cached stat data."""
+        try:
+            stat_result = entry.stat()
+        except OSError as e:
+            logger.warning("Failed to get file info for %s: %s", entry.path, e)
+            return self.file_info_manager.create_error_file_info(entry.path)
+        if is_dir:
+            # Names-only scans skip this; the tree then stats on demand
+            identity = dir_identity(stat_result)
+            if identity is not None:
+                self._remember(entry.path, identity)
+        return self.file_info_manager.create_file_info(
+            entry.path, entry.name, is_dir, stat_result
+        )
+
+
+def _count_entry(result: ScanResult, entry) -> bool:
+    """Count an entry in the scan totals and return whether it is a folder."""
+    is_dir = _entry_is_dir(entry)
+    if is_dir:
+        result.folder_count += 1
+        result.subdirs.append((entry.name, entry.path))
+    else:
+        result.file_count += 1
+    return is_dir
+
+
+def _entry_is_dir(entry) -> bool:
+    """Return whether a DirEntry is a directory, treating errors as files."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
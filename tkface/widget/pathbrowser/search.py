@@ -0,0 +1,402 @@
+"""
+Recursive file search for PathBrowser widget.
+
+This module walks a directory subtree through the browser's filesystem
+provider (os.scandir locally) on a worker thread and streams the matching
+entries back to the Tk thread in batches, the same way DirectoryLoader
+delivers a listing. A new search supersedes the
+running one, so typing a query cancels the walk started for the previous
+keystroke. The names seen by a walk are kept in an optional in-memory
+index, so repeated searches in the same tree only revisit directories
+whose (device, inode, mtime) changed.
+"""
+
+import fnmatch
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .filesystem import FileSystem
+from .manager import FileInfoManager
+from .scanner import _entry_is_dir
+from .utils import directory_stamp, is_racy
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Delay between pump runs while a search is in progress (milliseconds)
+PUMP_INTERVAL_MS = 10
+# Maximum time spent delivering results per pump run (milliseconds)
+TIME_SLICE_MS = 20
+# Matches delivered per search before the walk stops
+DEFAULT_MAX_RESULTS = 1000
+# Names kept by the index; directories beyond this are searched unindexed
+DEFAULT_MAX_INDEX_ENTRIES = 500_000
+# Directories that are never descended into
+DEFAULT_SKIP_DIRS = frozenset({".git", ".hg", ".svn", "__pycache__", "node_modules"})
+
+# (name, is_dir, is_symlink) of one directory entry
+NameEntry = Tuple[str, bool, bool]
+
+
+@dataclass
+class SearchResult:
+    """Summary of a finished search."""
+
+    root: str
+    query: str
+    matches: int = 0
+    directories: int = 0
+    # The walk stopped at the result cap
+    truncated: bool = False
+
+
+def compile_query(query: str) -> Callable[[str], bool]:
+    """
+    Return a case-insensitive name matcher for a search query.
+
+    Queries containing glob characters (*, ?, [) must match the whole name;
+    other queries match any name containing them.
+
+    Args:
+        query: Search text typed by the user
+
+    Returns:
+        Predicate taking an entry name
+    """
+    query = query.strip().casefold()
+    if any(char in query for char in "*?["):
+        pattern = re.compile(fnmatch.translate(query))
+        return lambda name: pattern.match(name.casefold()) is not None
+    return lambda name: query in name.casefold()
+
+
+class NameIndex:
+    """
+    Entry names of a directory tree, stored per directory with its stamp.
+
+    A listing is reused while the directory's (device, inode, mtime) is
+    unchanged; otherwise that one directory is listed again. Only the
+    worker thread of a FileSearcher touches the index.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_entries: int = DEFAULT_MAX_INDEX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.root = root
+        self.max_entries = max_entries
+        # Wall clock compared with directory mtimes
+        self.clock = clock
+        self.entries = 0
+        self._directories: Dict[str, Tuple[tuple, List[NameEntry]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._directories)
+
+    def covers(self, path: str) -> bool:
+        """Return whether a directory lies inside the indexed tree."""
+        return path == self.root or path.startswith(
+            self.root.rstrip(os.sep) + os.sep
+        )
+
+    def lookup(
+        self, directory: str, stamp: Optional[tuple]
+    ) -> Optional[List[NameEntry]]:
+        """Return the stored names of a directory if its stamp still matches."""
+        entry = self._directories.get(directory)
+        if entry is None or stamp is None or entry[0] != stamp:
+            return None
+        return entry[1]
+
+    def store(self, directory: str, stamp: Optional[tuple], names: List[NameEntry]):
+        """Store the names of a directory listed with the given stamp."""
+        old = self._directories.pop(directory, None)
+        if old is not None:
+            self.entries -= len(old[1])
+        if stamp is None or is_racy(stamp, self.clock()):
+            # A change within the timestamp granularity would go unnoticed
+            return
+        if self.entries + len(names) > self.max_entries:
+            return
+        self._directories[directory] = (stamp, names)
+        self.entries += len(names)
+
+
+class FileSearcher:  # pylint: disable=too-many-instance-attributes
+    """
+    Searches a directory subtree on a worker thread.
+
+    Only the most recent search is kept: a new request supersedes the
+    pending one, and the running walk stops at its next entry once it is
+    stale. Callbacks always run on the Tk thread.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        widget,
+        file_info_manager: FileInfoManager,
+        batch_size: int = 100,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        use_index: bool = True,
+        skip_dirs=DEFAULT_SKIP_DIRS,
+        threaded: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the searcher.
+
+        Args:
+            widget: Tk widget used for after() scheduling
+            file_info_manager: Builds the FileInfo records of matches
+            batch_size: Number of matches per delivered batch
+            max_results: Matches delivered before a search stops
+            use_index: Keep the names seen by a walk for later searches
+            skip_dirs: Directory names that are not descended into
+            threaded: Search on a worker thread (False searches inline)
+            clock: Wall clock the index compares directory mtimes with
+        """
+        self._widget = widget
+        self.file_info_manager = file_info_manager
+        self.batch_size = batch_size
+        self.max_results = max_results
+        self.use_index = use_index
+        self.skip_dirs = frozenset(skip_dirs)
+        self.threaded = threaded
+        self.clock = clock
+        self.index: Optional[NameIndex] = None
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._pending = None
+        self._callbacks = None
+        self._active = False
+        self._closed = False
+        self._thread = None
+        self._pump_id = None
+
+    def is_searching(self) -> bool:
+        """Return whether a search is in progress."""
+        return self._active
+
+    def search(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        root: str,
+        query: str,
+        name_filter: Callable[[str, bool], bool],
+        on_batch: Callable,
+        on_complete: Callable,
+    ) -> int:
+        """
+        Start searching a subtree, superseding any earlier search.
+
+        Args:
+            root: Directory whose subtree is searched
+            query: Search text (substring, or glob pattern)
+            name_filter: File type filter, called with the name and the
+                directory flag of each match before it is stat-ed
+            on_batch: Called with each list of matching FileInfo records
+            on_complete: Called with the SearchResult
+
+        Returns:
+            Generation token of this search
+        """
+        with self._condition:
+            self._generation += 1
+            generation = self._generation
+            self._callbacks = (on_batch, on_complete)
+            self._active = True
+            request = (generation, root, query, name_filter)
+            self._pending = request if self.threaded else None
+            self._condition.notify()
+
+        if not self.threaded:
+            self._run_search(*request)
+            self._drain()
+            return generation
+
+        self._ensure_worker()
+        self._schedule_pump()
+        return generation
+
+    def cancel(self):
+        """Cancel the current search and drop any undelivered matches."""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            self._callbacks = None
+            self._active = False
+        if self._pump_id is not None:
+            try:
+                self._widget.after_cancel(self._pump_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to cancel search pump")
+            self._pump_id = None
+
+    def close(self):
+        """Cancel the current search and stop the worker."""
+        self.cancel()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _ensure_worker(self):
+        """Start the worker thread if it is not running yet."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._worker, name="PathBrowserSearch", daemon=True
+            )
+            self._thread.start()
+
+    def _worker(self):
+        """Worker loop: always run the most recent pending search."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                request = self._pending
+                self._pending = None
+            self._run_search(*request)
+
+    def _index_for(self, root: str) -> Optional[NameIndex]:
+        """Return the index covering root, starting a new one if needed."""
+        if not self.use_index:
+            return None
+        if self.index is None or not self.index.covers(root):
+            self.index = NameIndex(root, clock=self.clock)
+        return self.index
+
+    def _run_search(self, generation: int, root: str, query: str, name_filter):
+        """Walk the subtree and queue matches tagged with the generation."""
+
+        def is_stale():
+            return generation != self._generation
+
+        matches = compile_query(query)
+        result = SearchResult(root=root, query=query)
+        batch = []
+        for directory, names in self._walk(root, self._index_for(root), is_stale):
+            result.directories += 1
+            prefix = os.path.relpath(directory, root)
+            for name, is_dir, _ in names:
+                # Both tests need the listing only; stat the survivors
+                if not matches(name) or not name_filter(name, is_dir):
+                    continue
+                file_info = self._file_info(directory, name, is_dir, prefix)
+                batch.append(file_info)
+                result.matches += 1
+                if len(batch) >= self.batch_size:
+                    self._queue.put((generation, "batch", batch))
+                    batch = []
+                if result.matches >= self.max_results:
+                    result.truncated = True
+                    break
+            if result.truncated:
+                break
+
+        if batch:
+            self._queue.put((generation, "batch", batch))
+        if not is_stale():
+            self._queue.put((generation, "done", result))
+
+    def _walk(
+        self, root: str, index: Optional[NameIndex], cancelled: Callable[[], bool]
+    ) -> Iterator[Tuple[str, List[NameEntry]]]:
+        """Yield (directory, names) depth first, reusing indexed listings."""
+        filesystem = self.file_info_manager.filesystem
+        # (device, inode) of the directories walked; a bind mount of a
+        # directory above would otherwise be walked endlessly
+        seen = set()
+        stack = [root]
+        while stack and not cancelled():
+            directory = stack.pop()
+            stamp = directory_stamp(directory, filesystem)
+            if stamp is not None and stamp[1]:
+                if stamp[:2] in seen:
+                    continue
+                seen.add(stamp[:2])
+            names = index.lookup(directory, stamp) if index is not None else None
+            if names is None:
+                try:
+                    names = _list_names(directory, cancelled, filesystem)
+                except OSError as e:
+                    logger.debug("Cannot search %s: %s", directory, e)
+                    continue
+                if index is not None and not cancelled():
+                    index.store(directory, stamp, names)
+            yield directory, names
+            # Symlinked directories are not followed
+            stack.extend(
+                filesystem.join(directory, name)
+                for name, is_dir, is_link in reversed(names)
+                if is_dir and not is_link and name not in self.skip_dirs
+            )
+
+    def _file_info(self, directory: str, name: str, is_dir: bool, prefix: str):
+        """Build the FileInfo of a match, named by its path below the root."""
+        manager = self.file_info_manager
+        path = manager.filesystem.join(directory, name)
+        try:
+            stat_result = manager.filesystem.stat(path)
+        except OSError:
+            return manager.create_error_file_info(path)
+        display_name = name if prefix == os.curdir else os.path.join(prefix, name)
+        return manager.create_file_info(path, display_name, is_dir, stat_result)
+
+    def _schedule_pump(self):
+        """Schedule the next pump run if none is pending."""
+        if self._pump_id is None:
+            self._pump_id = self._widget.after(PUMP_INTERVAL_MS, self._pump)
+
+    def _pump(self):
+        """Deliver queued matches for at most one time slice."""
+        self._pump_id = None
+        self._drain(deadline=time.perf_counter() + TIME_SLICE_MS / 1000.0)
+        if self._active or not self._queue.empty():
+            self._schedule_pump()
+
+    def _drain(self, deadline: Optional[float] = None):
+        """Deliver queued matches on the Tk thread, dropping stale ones."""
+        while deadline is None or time.perf_counter() < deadline:
+            try:
+                generation, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if generation != self._generation or self._callbacks is None:
+                # Matches of a superseded search
+                continue
+
+            on_batch, on_complete = self._callbacks
+            if kind == "batch":
+                on_batch(payload)
+            else:
+                self._active = False
+                on_complete(payload)
+
+
+def _list_names(
+    directory: str, cancelled: Callable[[], bool], filesystem: FileSystem
+) -> List[NameEntry]:
+    """List (name, is_dir, is_symlink) of a directory's entries."""
+    names = []
+    with closing(filesystem.list(directory)) as it:
+        for entry in it:
+            if cancelled():
+                break
+            try:
+                is_link = entry.is_symlink()
+            except OSError:
+                is_link = False
+            names.append((entry.name, _entry_is_dir(entry), is_link))
+    return names
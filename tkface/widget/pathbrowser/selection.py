@@ -0,0 +1,113 @@
+"""
+Range-compressed selection for PathBrowser widget.
+
+This module stores a selection of file list rows as sorted, disjoint
+ranges of display positions. Selecting everything, or a Shift-extended
+block of rows, is a single range however many rows it covers, so mass
+selection costs no more than selecting one row.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class RangeSelection:
+    """
+    A set of row positions stored as half-open [start, stop) ranges.
+
+    The ranges are kept sorted, disjoint and non-adjacent, so the number
+    of ranges is the number of separate blocks of selected rows.
+    """
+
+    def __init__(self):
+        """Initialize an empty selection."""
+        self._starts: List[int] = []
+        self._stops: List[int] = []
+        self._count = 0
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int]) -> "RangeSelection":
+        """Build a selection from row positions in any order."""
+        selection = cls()
+        starts, stops = selection._starts, selection._stops
+        for index in sorted(set(indices)):
+            if stops and stops[-1] == index:
+                stops[-1] = index + 1
+            else:
+                starts.append(index)
+                stops.append(index + 1)
+        selection._count = sum(
+            stop - start for start, stop in zip(starts, stops)
+        )
+        return selection
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __contains__(self, index: int) -> bool:
+        position = bisect_right(self._starts, index) - 1
+        return position >= 0 and index < self._stops[position]
+
+    def __iter__(self) -> Iterator[int]:
+        for start, stop in zip(self._starts, self._stops):
+            yield from range(start, stop)
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        """Return the selected ranges as (start, stop) pairs in order."""
+        return list(zip(self._starts, self._stops))
+
+    def bounds(self) -> Optional[Tuple[int, int]]:
+        """Return the first and last selected positions, if any."""
+        if not self._starts:
+            return None
+        return self._starts[0], self._stops[-1] - 1
+
+    def clear(self):
+        """Deselect everything."""
+        self._starts.clear()
+        self._stops.clear()
+        self._count = 0
+
+    def add(self, start: int, stop: int):
+        """Select positions start (inclusive) to stop (exclusive)."""
+        if start >= stop:
+            return
+        # Ranges overlapping or touching [start, stop) are merged into it
+        low = bisect_left(self._stops, start)
+        high = bisect_right(self._starts, stop)
+        if low < high:
+            start = min(start, self._starts[low])
+            stop = max(stop, self._stops[high - 1])
+        merged = sum(
+            self._stops[i] - self._starts[i] for i in range(low, high)
+        )
+        self._starts[low:high] = [start]
+        self._stops[low:high] = [stop]
+        self._count += (stop - start) - merged
+
+    def remove(self, start: int, stop: int):
+        """Deselect positions start (inclusive) to stop (exclusive)."""
+        if start >= stop:
+            return
+        low = bisect_right(self._stops, start)
+        high = bisect_left(self._starts, stop)
+        if low >= high:
+            return
+        removed = sum(
+            min(self._stops[i], stop) - max(self._starts[i], start)
+            for i in range(low, high)
+        )
+        # Keep the parts of the first and last ranges outside [start, stop)
+        starts, stops = [], []
+        if self._starts[low] < start:
+            starts.append(self._starts[low])
+            stops.append(start)
+        if self._stops[high - 1] > stop:
+            starts.append(stop)
+            stops.append(self._stops[high - 1])
+        self._starts[low:high] = starts
+        self._stops[low:high] = stops
+        self._count -= removed
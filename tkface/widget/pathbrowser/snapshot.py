@@ -0,0 +1,101 @@
+"""
+Directory listing snapshots for PathBrowser widget.
+
+This module keeps the listings of recently left directories: the sorted
+model, the totals, the selection and the scroll position, and (for the
+plain Treeview) the file rows themselves, detached rather than deleted.
+Going back to such a directory repaints it from the snapshot at once; the
+directory is only rescanned when its (device, inode, mtime) changed.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Set, Tuple
+
+from .model import FileListModel
+from .scanner import ScanResult
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Number of directory listings kept
+DEFAULT_MAX_SNAPSHOTS = 4
+
+
+@dataclass
+class DirectorySnapshot:  # pylint: disable=too-many-instance-attributes
+    """A complete directory listing as it was displayed."""
+
+    path: str
+    # Directory stamp (device, inode, mtime_ns) the listing is valid for
+    stamp: tuple
+    model: FileListModel
+    scan_result: ScanResult
+    # File type filter and sort order the model was built with
+    filter_key: str = ""
+    sort: Tuple[str, bool] = ("#0", False)
+    selection: List[str] = field(default_factory=list)
+    # Scroll position: Treeview yview fraction, or virtual list top row
+    top: float = 0.0
+    # Detached Treeview items of the listing (None for the virtual list)
+    rows: Optional[Set[str]] = None
+
+
+class SnapshotCache:
+    """
+    Most recently left directory listings by path, with LRU eviction.
+
+    A snapshot is taken out of the cache while its listing is displayed,
+    so the cache only ever holds listings that are not on screen.
+    """
+
+    def __init__(
+        self,
+        max_snapshots: int = DEFAULT_MAX_SNAPSHOTS,
+        on_evict: Optional[Callable[[DirectorySnapshot], None]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_snapshots: Number of listings kept
+            on_evict: Called with each dropped snapshot, e.g. to delete
+                its detached Treeview items
+        """
+        self.max_snapshots = max_snapshots
+        self._on_evict = on_evict
+        self._snapshots: "OrderedDict[str, DirectorySnapshot]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._snapshots
+
+    def put(self, snapshot: DirectorySnapshot):
+        """Keep a listing, dropping the least recently left ones."""
+        old = self._snapshots.pop(snapshot.path, None)
+        if old is not None:
+            self._evict(old)
+        self._snapshots[snapshot.path] = snapshot
+        while len(self._snapshots) > self.max_snapshots:
+            _, oldest = self._snapshots.popitem(last=False)
+            self._evict(oldest)
+
+    def take(self, path: str) -> Optional[DirectorySnapshot]:
+        """Remove and return the listing of a directory, if kept."""
+        return self._snapshots.pop(path, None)
+
+    def clear(self):
+        """Drop every listing."""
+        while self._snapshots:
+            _, snapshot = self._snapshots.popitem(last=False)
+            self._evict(snapshot)
+
+    def _evict(self, snapshot: DirectorySnapshot):
+        if self._on_evict is not None:
+            try:
+                self._on_evict(snapshot)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to release snapshot of %s", snapshot.path)
@@ -0,0 +1,166 @@
+"""
+Navigation timing for PathBrowser widget.
+
+This module records where the time of each directory navigation goes:
+listing the directory, reading metadata, filtering, sorting, filling the
+Treeview and updating the status bar, together with the file information
+cache hits and misses. Finished navigations are handed to subscribers so
+the numbers can be logged or shipped to telemetry.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Phases of a navigation, in the order they first occur:
+# scan: listing the directory (os.scandir), excluding metadata reads
+# stat: reading metadata and building the FileInfo records
+# filter: adding rows to the file list model, applying the file type filter
+# sort: ordering the rows by the sort column
+# insert: creating and reordering Treeview items
+# status: updating the status bar
+PHASES = ("scan", "stat", "filter", "sort", "insert", "status")
+
+
+@dataclass
+class NavigationStats:
+    """Timings and cache counters of one directory navigation."""
+
+    path: str
+    # Seconds spent per phase (see PHASES)
+    phases: Dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(PHASES, 0.0)
+    )
+    # Seconds from the start of the navigation until the listing was complete
+    total: float = 0.0
+    entries: int = 0
+    # File information cache lookups during the navigation
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # The listing was first painted from the persistent listing cache
+    listing_cache_hit: bool = False
+    # The listing was repainted from a snapshot of an earlier visit
+    snapshot_hit: bool = False
+    # The directory could not be listed
+    failed: bool = False
+
+    def as_dict(self) -> dict:
+        """Return the stats as plain data, e.g. for JSON telemetry."""
+        return {
+            "path": self.path,
+            "phases": dict(self.phases),
+            "total": self.total,
+            "entries": self.entries,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "listing_cache_hit": self.listing_cache_hit,
+            "snapshot_hit": self.snapshot_hit,
+            "failed": self.failed,
+        }
+
+
+class StatsRecorder:
+    """
+    Records the phase timings of the navigation in progress.
+
+    Time added while no navigation is in progress (for example a re-sort
+    after the listing is complete) is not recorded. Subscribers are called
+    on the Tk thread with the NavigationStats of each finished navigation.
+    """
+
+    def __init__(
+        self,
+        cache_counters: Callable[[], Tuple[int, int]],
+        on_finish: Optional[Callable[[NavigationStats], None]] = None,
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            cache_counters: Returns the cache (hits, misses) counted so far
+            on_finish: Called with the stats of each finished navigation
+        """
+        self._cache_counters = cache_counters
+        self._on_finish = on_finish
+        self._subscribers: List[Callable[[NavigationStats], None]] = []
+        self._current: Optional[NavigationStats] = None
+        self._started = 0.0
+        self._counters_at_start = (0, 0)
+        self.last: Optional[NavigationStats] = None
+
+    @property
+    def current(self) -> Optional[NavigationStats]:
+        """Return the stats of the navigation in progress, if any."""
+        return self._current
+
+    def subscribe(self, callback: Callable[[NavigationStats], None]):
+        """Call callback with the stats of every finished navigation."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[NavigationStats], None]):
+        """Stop calling a subscribed callback."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def start(
+        self, path: str, listing_cache_hit: bool = False, snapshot_hit: bool = False
+    ):
+        """Start recording a navigation, dropping any unfinished one."""
+        self._current = NavigationStats(
+            path=path, listing_cache_hit=listing_cache_hit, snapshot_hit=snapshot_hit
+        )
+        self._started = time.perf_counter()
+        self._counters_at_start = self._cache_counters()
+
+    def cancel(self):
+        """Drop the navigation in progress without reporting it."""
+        self._current = None
+
+    def add(self, phase: str, seconds: float):
+        """Add time spent in a phase to the navigation in progress."""
+        if self._current is not None:
+            self._current.phases[phase] = (
+                self._current.phases.get(phase, 0.0) + seconds
+            )
+
+    def finish(self, scan_result=None, failed: bool = False, scanned: bool = True):
+        """
+        Complete the navigation in progress and report it.
+
+        Args:
+            scan_result: ScanResult of the listing, carrying the scan and
+                stat times measured on the worker thread
+            failed: The directory could not be listed
+            scanned: scan_result was produced during this navigation; a
+                listing restored from a snapshot only supplies its size
+        """
+        stats = self._current
+        if stats is None:
+            return
+        self._current = None
+        stats.total = time.perf_counter() - self._started
+        stats.failed = failed
+        if scan_result is not None:
+            stats.entries = len(scan_result.entries)
+        if scan_result is not None and scanned:
+            stats.phases["stat"] += scan_result.stat_time
+            stats.phases["scan"] += max(
+                0.0, scan_result.scan_time - scan_result.stat_time
+            )
+        hits, misses = self._cache_counters()
+        stats.cache_hits = hits - self._counters_at_start[0]
+        stats.cache_misses = misses - self._counters_at_start[1]
+        self.last = stats
+
+        for callback in list(self._subscribers):
+            try:
+                callback(stats)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Navigation stats subscriber failed")
+        if self._on_finish is not None:
+            self._on_finish(stats)
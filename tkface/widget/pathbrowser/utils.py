@@ -7,17 +7,23 @@ widget components.
 
 import fnmatch
 import os
+import re
 import shutil
 import subprocess
 import sys
-from pathlib import Path
-from typing import List, Tuple
+import time
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
 
 # OS detection constants
 IS_MACOS = sys.platform == "darwin"
 IS_WINDOWS = sys.platform.startswith("win")
 IS_LINUX = sys.platform.startswith("linux")
 
+# Stamps of directories modified this recently are not trusted, since a
+# change within the timestamp granularity would not alter the mtime
+RACY_WINDOW = 2.0
+
 
 def format_size(size_bytes: int) -> str:
     """
@@ -109,91 +115,173 @@ def add_extension_if_needed(
     return filename
 
 
-def matches_filter(
-    filename: str,
+def _match_all(filename: str) -> bool:  # pylint: disable=unused-argument
+    return True
+
+
+def _match_none(filename: str) -> bool:  # pylint: disable=unused-argument
+    return False
+
+
+def compile_filter(
     filetypes: List[Tuple[str, str]],
     current_filter: str,
     select_mode: str,
     all_files_text: str,
-) -> bool:
+) -> Callable[[str], bool]:
     """
-    Check if filename matches the current filter.
+    Compile the current filter into a filename matcher.
+
+    The filter is parsed once: simple "*.ext" patterns become a set of
+    lowercase extensions and all other patterns are combined into a single
+    case-insensitive regular expression.
 
     Args:
-        filename: The filename to check
         filetypes: List of file type filters [(description, pattern), ...]
         current_filter: Current filter selection
         select_mode: Selection mode ("file", "dir", or "both")
         all_files_text: Text for "All files" filter
 
     Returns:
-        True if filename matches the filter
+        Function that returns True if a filename matches the filter
     """
+    return _compile_filter(
+        tuple(tuple(filetype) for filetype in filetypes or ()),
+        current_filter,
+        select_mode,
+        all_files_text,
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_filter(filetypes, current_filter, select_mode, all_files_text):
+    """Build the matcher for compile_filter (filetypes as a hashable tuple)."""
     if select_mode == "dir":
-        return False
+        return _match_none
 
     if current_filter == all_files_text:
-        return True
+        return _match_all
 
     # If no filetypes specified, show all files
     if not filetypes:
-        return True
+        return _match_all
 
     # Find the pattern for the selected filter
     for desc, pattern in filetypes:
         if current_filter == f"{desc} ({pattern})":
-            # Check for patterns that match all files
-            if (pattern == "*.*" or 
-                pattern == "*" or 
-                pattern == "" or
-                desc.lower() == "all files"):
-                return True
-
-            # Handle multiple patterns separated by spaces
-            patterns = pattern.split()
-            for single_pattern in patterns:
-                if single_pattern.startswith("*."):
-                    ext = single_pattern[1:]
-                    if filename.lower().endswith(ext.lower()):
-                        return True
-                else:
-                    # Simple pattern matching for non-extension patterns
-                    if fnmatch.fnmatch(filename.lower(), single_pattern.lower()):
-                        return True
-
-            # If we get here, no pattern matched
-            return False
-
-    # If no filter was found, return True (show all files)
-    return True
+            break
+    else:
+        # If no filter was found, show all files
+        return _match_all
+
+    # Check for patterns that match all files
+    if pattern in ("*.*", "*", "") or desc.lower() == "all files":
+        return _match_all
+
+    # Handle multiple patterns separated by spaces
+    extensions = set()
+    expressions = []
+    for single_pattern in pattern.lower().split():
+        if single_pattern.startswith("*."):
+            ext = single_pattern[2:]
+            if "." in ext:
+                # Compound extensions such as "*.tar.gz" match as a suffix
+                expressions.append(".*" + re.escape(single_pattern[1:]) + r"\Z")
+            else:
+                extensions.add(ext)
+        else:
+            expressions.append(fnmatch.translate(single_pattern))
+
+    regex = re.compile("|".join(expressions), re.DOTALL) if expressions else None
+
+    def matcher(filename: str) -> bool:
+        name = filename.lower()
+        _, dot, ext = name.rpartition(".")
+        if dot and ext in extensions:
+            return True
+        return regex is not None and regex.match(name) is not None
 
+    return matcher
 
-def would_create_loop(path: str, real_path: str, tree_widget) -> bool:
+
+def matches_filter(
+    filename: str,
+    filetypes: List[Tuple[str, str]],
+    current_filter: str,
+    select_mode: str,
+    all_files_text: str,
+) -> bool:
     """
-    Check if adding this path would create a loop in the directory tree.
+    Check if filename matches the current filter.
+
+    Prefer compile_filter when checking many names against the same filter.
 
     Args:
-        path: The path to check
-        real_path: The real path (resolved symlink)
-        tree_widget: The tree widget to check against
+        filename: The filename to check
+        filetypes: List of file type filters [(description, pattern), ...]
+        current_filter: Current filter selection
+        select_mode: Selection mode ("file", "dir", or "both")
+        all_files_text: Text for "All files" filter
 
     Returns:
-        True if adding this path would create a loop
+        True if filename matches the filter
     """
-    # Check if the real path is already in the tree
-    if tree_widget.exists(real_path):
-        return True
+    return compile_filter(filetypes, current_filter, select_mode, all_files_text)(
+        filename
+    )
 
-    # Check if this would create a circular reference (macOS specific)
-    # For example: /Volumes/Macintosh HD/Volumes -> /
-    if IS_MACOS and real_path == "/" and Path(path).is_relative_to("/Volumes"):
-        return True
 
-    # Check if the path contains the real path (would create a loop)
-    if real_path != "/" and real_path in path:
-        return True
+def dir_identity(stat_result) -> Optional[Tuple[int, int]]:
+    """
+    Return the (st_dev, st_ino) identity of a directory from its stat data.
 
-    return False
+    Two paths name the same directory (through a symlink or a bind mount)
+    exactly when their identities are equal, so walks detect loops with a
+    set lookup.
+
+    Args:
+        stat_result: os.stat_result (or os.DirEntry.stat() data)
+
+    Returns:
+        (device, inode), or None if the inode is not known (0), as for
+        archive members and scandir data on Windows
+    """
+    if not stat_result.st_ino:
+        return None
+    return (stat_result.st_dev, stat_result.st_ino)
+
+
+def directory_stamp(path: str, filesystem=None) -> Optional[Tuple[int, int, int]]:
+    """
+    Return (device, inode, mtime_ns) of a directory, or None if missing.
+
+    Directories of a non-local filesystem provider are stat-ed through it.
+    """
+    try:
+        if filesystem is not None:
+            stat_result = filesystem.stat(path)
+        else:
+            stat_result = os.stat(path)
+    except OSError:
+        return None
+    return (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns)
+
+
+def is_racy(stamp: Tuple[int, int, int], now: Optional[float] = None) -> bool:
+    """
+    Return whether a directory_stamp() is too recent to trust.
+
+    A change within the timestamp granularity of the directory's last
+    change would leave its mtime as it is, so listings of such directories
+    must not be reused on the strength of their stamp.
+
+    Args:
+        stamp: (device, inode, mtime_ns) of the directory
+        now: Current wall-clock time (default time.time())
+    """
+    if now is None:
+        now = time.time()
+    return now - stamp[2] / 1e9 < RACY_WINDOW
 
 
 def get_performance_stats(
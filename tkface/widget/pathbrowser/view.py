@@ -5,12 +5,16 @@ This module provides UI creation, display updates, and user interaction
 handling for the PathBrowser widget.
 """
 
+import bisect
 import logging
+import math
+import os
+import stat
 import string
+import time
 import tkinter as tk
-from contextlib import suppress
+from functools import partial
 from itertools import islice
-from operator import itemgetter
 from pathlib import Path
 from tkinter import ttk
 
@@ -18,10 +22,25 @@ from tkface import lang
 from tkface.dialog import messagebox
 
 from . import utils
+from .bulkinsert import insert_items
+from .manager import FileInfo, PendingFileInfo
+from .model import FileListModel, SelectedPaths
+from .scanner import ScanResult
+from .snapshot import DirectorySnapshot
+from .virtuallist import VirtualFileList
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Pause in typing after which the search starts (milliseconds)
+SEARCH_DELAY_MS = 150
+# Pause in scrolling after which the visible folders are sized (milliseconds)
+FOLDER_SIZE_DELAY_MS = 100
+# Pause in scrolling after which the rows in view are stat-ed (milliseconds)
+METADATA_DELAY_MS = 30
+# Pause in selection changes after which the preview is read (milliseconds)
+PREVIEW_DELAY_MS = 150
+
 
 def _create_path_navigation(pathbrowser_instance):
     """Create path navigation widgets."""
@@ -71,11 +90,35 @@ def _create_path_navigation(pathbrowser_instance):
     )
     pathbrowser_instance.go_button.pack(side=tk.LEFT)
 
+    # Search below the current directory
+    pathbrowser_instance.search_label = ttk.Label(
+        pathbrowser_instance.path_frame,
+        text=lang.get("Search:", pathbrowser_instance),
+    )
+    pathbrowser_instance.search_label.pack(side=tk.LEFT, padx=(10, 5))
+    pathbrowser_instance.search_var = tk.StringVar()
+    pathbrowser_instance.search_entry = ttk.Entry(
+        pathbrowser_instance.path_frame,
+        textvariable=pathbrowser_instance.search_var,
+        width=20,
+    )
+    pathbrowser_instance.search_entry.pack(side=tk.LEFT)
+    pathbrowser_instance.search_var.trace_add(
+        "write", lambda *args: on_search_changed(pathbrowser_instance)
+    )
+
     # Bind Enter key to path entry for navigation
     pathbrowser_instance.path_entry.bind(
         "<Return>",
         lambda e: pathbrowser_instance._go_to_path(),  # pylint: disable=protected-access
     )
+    # Enter searches at once, Escape leaves the search
+    pathbrowser_instance.search_entry.bind(
+        "<Return>", lambda e: start_search(pathbrowser_instance) or "break"
+    )
+    pathbrowser_instance.search_entry.bind(
+        "<Escape>", lambda e: pathbrowser_instance.search_var.set("") or "break"
+    )
 
 
 def _create_main_paned_window(pathbrowser_instance):
@@ -227,12 +270,85 @@ def _create_file_list(pathbrowser_instance):
         command=pathbrowser_instance.file_tree.yview
     )
     pathbrowser_instance.file_tree.configure(yscrollcommand=file_v_scrollbar.set)
+
+    def schedule_row_work():
+        # Rows scrolled into view are sized and stat-ed first; folders
+        # scrolled out are dropped
+        schedule_folder_sizes(pathbrowser_instance)
+        schedule_metadata(pathbrowser_instance)
+
+    on_view_change = (
+        schedule_row_work
+        if pathbrowser_instance.folder_sizer is not None
+        or pathbrowser_instance.metadata_filler is not None
+        else None
+    )
+    if on_view_change is not None:
+
+        def on_file_scroll(first, last):
+            file_v_scrollbar.set(first, last)
+            on_view_change()
+
+        pathbrowser_instance.file_tree.configure(yscrollcommand=on_file_scroll)
+
+    if pathbrowser_instance.config.virtual_list:
+        # Selection lives in the model; rows are recycled while scrolling
+        pathbrowser_instance.file_tree.configure(selectmode="none")
+        pathbrowser_instance.file_list_view = VirtualFileList(
+            pathbrowser_instance.file_tree,
+            pathbrowser_instance.file_list,
+            format_file_row,
+            scrollbar=file_v_scrollbar,
+            overscan=pathbrowser_instance.config.virtual_overscan,
+            row_height=row_height,
+            selected_colors=(
+                pathbrowser_instance.theme.selected_background,
+                pathbrowser_instance.theme.selected_foreground,
+            ),
+            on_view_change=on_view_change,
+        )
     
     # Use grid instead of pack for better control (teratail solution)
     pathbrowser_instance.file_tree.grid(row=0, column=0, sticky="nsew", padx=2, pady=2)
     file_v_scrollbar.grid(row=0, column=1, sticky="ns")
 
 
+def _create_preview_pane(pathbrowser_instance):
+    """Create the read-only preview pane next to the file list."""
+    pathbrowser_instance.preview_frame = ttk.Frame(pathbrowser_instance.paned)
+    pathbrowser_instance.paned.add(pathbrowser_instance.preview_frame, weight=2)
+    pathbrowser_instance.preview_frame.grid_columnconfigure(0, weight=1)
+    pathbrowser_instance.preview_frame.grid_rowconfigure(0, weight=1)
+
+    pathbrowser_instance.preview_text = tk.Text(
+        pathbrowser_instance.preview_frame,
+        wrap="none",
+        width=40,
+        height=10,
+        font="TkFixedFont",
+        state="disabled",
+    )
+    preview_v_scrollbar = ttk.Scrollbar(
+        pathbrowser_instance.preview_frame,
+        orient=tk.VERTICAL,
+        command=pathbrowser_instance.preview_text.yview,
+    )
+    preview_h_scrollbar = ttk.Scrollbar(
+        pathbrowser_instance.preview_frame,
+        orient=tk.HORIZONTAL,
+        command=pathbrowser_instance.preview_text.xview,
+    )
+    pathbrowser_instance.preview_text.configure(
+        yscrollcommand=preview_v_scrollbar.set,
+        xscrollcommand=preview_h_scrollbar.set,
+    )
+    pathbrowser_instance.preview_text.grid(
+        row=0, column=0, sticky="nsew", padx=2, pady=2
+    )
+    preview_v_scrollbar.grid(row=0, column=1, sticky="ns")
+    preview_h_scrollbar.grid(row=1, column=0, sticky="ew")
+
+
 def _create_status_and_buttons(pathbrowser_instance):
     """Create status bar and bottom buttons in a horizontal layout."""
     # Bottom frame containing status bar and buttons
@@ -346,6 +462,8 @@ def create_pathbrowser_widgets(pathbrowser_instance):
     # Main content takes the remaining space
     _create_main_paned_window(pathbrowser_instance)
     _create_file_list(pathbrowser_instance)
+    if pathbrowser_instance.preview_cache is not None:
+        _create_preview_pane(pathbrowser_instance)
 
     # Initialize view mode
     pathbrowser_instance.view_mode = "details"
@@ -361,6 +479,10 @@ def setup_pathbrowser_bindings(pathbrowser_instance):
         "<<TreeviewOpen>>",
         pathbrowser_instance._on_tree_open,  # pylint: disable=protected-access
     )
+    pathbrowser_instance.tree.bind(
+        "<<TreeviewClose>>",
+        pathbrowser_instance._on_tree_close,  # pylint: disable=protected-access
+    )
     pathbrowser_instance.tree.bind(
         "<Button-3>",
         pathbrowser_instance._on_tree_right_click,  # pylint: disable=protected-access
@@ -387,7 +509,7 @@ def setup_pathbrowser_bindings(pathbrowser_instance):
         "<Return>", pathbrowser_instance._on_ok  # pylint: disable=protected-access
     )
     pathbrowser_instance.bind(
-        "<Escape>", pathbrowser_instance._on_cancel  # pylint: disable=protected-access
+        "<Escape>", pathbrowser_instance._on_escape  # pylint: disable=protected-access
     )
 
     # Global keyboard shortcuts for file navigation
@@ -428,6 +550,13 @@ def setup_pathbrowser_bindings(pathbrowser_instance):
         pathbrowser_instance._toggle_selected_node,  # pylint: disable=protected-access
     )
 
+    # Escape stops a running "Expand All" wherever the focus is
+    for widget in (pathbrowser_instance.tree, pathbrowser_instance.file_tree):
+        widget.bind(
+            "<Escape>",
+            pathbrowser_instance._cancel_expand_all,  # pylint: disable=protected-access
+        )
+
     # File list keyboard shortcuts
     pathbrowser_instance.file_tree.bind(
         "<Up>",
@@ -445,6 +574,19 @@ def setup_pathbrowser_bindings(pathbrowser_instance):
         "<End>", pathbrowser_instance._move_to_last  # pylint: disable=protected-access
     )
 
+    # Typing a name jumps to the first matching row
+    pathbrowser_instance.file_tree.bind(
+        "<KeyPress>",
+        pathbrowser_instance._type_ahead,  # pylint: disable=protected-access
+    )
+
+    # Select every row
+    for sequence in ("<Control-a>", "<Control-A>"):
+        pathbrowser_instance.file_tree.bind(
+            sequence,
+            pathbrowser_instance._select_all,  # pylint: disable=protected-access
+        )
+
     # Multi-selection with Shift key
     pathbrowser_instance.file_tree.bind(
         "<Shift-Up>",
@@ -467,10 +609,24 @@ def setup_pathbrowser_bindings(pathbrowser_instance):
         pathbrowser_instance._on_file_frame_click,  # pylint: disable=protected-access
     )
 
+    # The virtual list handles mouse selection itself
+    if pathbrowser_instance.file_list_view is not None:
+        pathbrowser_instance.file_tree.bind(
+            "<Control-Button-1>",
+            # pylint: disable=protected-access
+            lambda e: pathbrowser_instance._click_file_row(e, mode="toggle"),
+        )
+        pathbrowser_instance.file_tree.bind(
+            "<Shift-Button-1>",
+            # pylint: disable=protected-access
+            lambda e: pathbrowser_instance._click_file_row(e, mode="extend"),
+        )
+
 
 def load_directory_tree(pathbrowser_instance):
     """Load the directory tree."""
     pathbrowser_instance.tree.delete(*pathbrowser_instance.tree.get_children())
+    pathbrowser_instance.tree_ancestry = {}
     # Show parent directory and its siblings to provide one level up navigation
     try:
         current_path = Path(pathbrowser_instance.state.current_dir)
@@ -480,55 +636,45 @@ def load_directory_tree(pathbrowser_instance):
         if parent_path == current_path:
             # We're at root, show current directory's subdirectories
             base_path = current_path
-            dirs = []
-            for item in base_path.iterdir():
-                if item.is_dir():
-                    dirs.append((item.name, str(item)))
+            dirs = _list_tree_subdirs(pathbrowser_instance, str(base_path))
         else:
             # Show parent directory and its siblings
             base_path = parent_path
-            dirs = []
+            subdirs = _list_tree_subdirs(pathbrowser_instance, str(base_path))
             
             # Add siblings of current directory
-            for item in base_path.iterdir():
-                if item.is_dir() and item != current_path:
-                    dirs.append((item.name, str(item)))
+            dirs = [
+                (child_name, child_path)
+                for child_name, child_path in subdirs
+                if child_path != str(current_path)
+            ]
             
             # Add current directory
             dirs.append((current_path.name, str(current_path)))
 
+        # Directory listed by the top-level items, watched for changes
+        pathbrowser_instance.tree_base = str(base_path)
+
         # Sort and add directories
         dirs.sort(key=lambda x: x[0].lower())
 
+        # The tree was cleared above, so none of the items exists yet; insert
+        # them as top-level items (no ancestors, no extra left indent)
+        items = []
         for child_name, child_path in dirs:
-            if not pathbrowser_instance.tree.exists(child_path):
-                # Check if this is the current directory for highlighting
-                is_current_dir = str(child_path) == str(current_path)
-                
-                # Insert as top-level item (no ancestors, no extra left indent)
-                pathbrowser_instance.tree.insert(
-                    "", "end", child_path, text=child_name, open=False
-                )
-                
-                # Highlight current directory with different tags
-                if is_current_dir:
-                    pathbrowser_instance.tree.item(child_path, tags=("current",))
-                    # Also select the current directory to make it more visible
-                    pathbrowser_instance.tree.selection_set(child_path)
-                else:
-                    pathbrowser_instance.tree.item(child_path, tags=("normal",))
-
-                # Always add placeholder for directories to show expand button
-                # This ensures the expand/collapse button is always visible for directories
-                placeholder_id = f"{child_path}_placeholder"
-                if not pathbrowser_instance.tree.exists(placeholder_id):
-                    pathbrowser_instance.tree.insert(
-                        child_path,
-                        "end",
-                        placeholder_id,
-                        text=lang.get("Loading...", pathbrowser_instance),
-                        open=False,
-                    )
+            # Highlight current directory with different tags
+            is_current_dir = str(child_path) == str(current_path)
+            tags = ("current",) if is_current_dir else ("normal",)
+            items.append(("", child_path, child_name, (), tags))
+            items.extend(_tree_expander_items(pathbrowser_instance, child_path))
+        insert_items(pathbrowser_instance.tree, items)
+
+        # Also select the current directory to make it more visible
+        if any(child_path == str(current_path) for _, child_path in dirs):
+            pathbrowser_instance.tree.selection_set(str(current_path))
+
+        # Find out in the background which of them can be expanded
+        _prefetch_tree_children(pathbrowser_instance, [path for _, path in dirs])
         
         # Scroll to show the current directory after the tree is populated
         try:
@@ -557,25 +703,19 @@ def populate_tree_node(pathbrowser_instance, parent):
         if existing_children and not has_placeholders:
             return  # Already populated
 
-        # Get directories only, more efficiently
+        # Get directories only, from the prefetched listing or a scandir pass
         dirs = []
-        path_obj = Path(parent)
-
-        # Use contextlib.suppress for cleaner error handling
-        for item in path_obj.iterdir():
-            if item.is_dir():
-                # Check for symlink loops on macOS
-                if utils.IS_MACOS:
-                    with suppress(OSError, PermissionError):
-                        real_path = item.resolve()
-                        if real_path == Path("/") and "/Volumes/" in str(item):
-                            continue
-                        if real_path != item and utils.would_create_loop(
-                            str(item), str(real_path), pathbrowser_instance.tree
-                        ):
-                            continue
-
-                dirs.append((item.name, str(item)))
+
+        # A child that is the node itself or one of the directories above it
+        # (through a symlink or a bind mount) would nest the tree endlessly
+        scanner = pathbrowser_instance.scanner
+        ancestors = _tree_node_identities(pathbrowser_instance, parent)
+        for child_name, child_path in _list_tree_subdirs(pathbrowser_instance, parent):
+            identity = scanner.identity(child_path)
+            if identity is not None and identity in ancestors:
+                logger.debug("Skipping directory loop at %s", child_path)
+                continue
+            dirs.append((child_name, child_path))
 
         # Sort and add directories efficiently
         dirs.sort(key=lambda x: x[0].lower())
@@ -585,23 +725,16 @@ def populate_tree_node(pathbrowser_instance, parent):
             if child.endswith("_placeholder"):
                 pathbrowser_instance.tree.delete(child)
 
-        # Add directories with improved performance
+        # Item ids are paths, so a node without children (other than its
+        # placeholder) has none of these yet: add them all in one call
+        items = []
         for child_name, child_path in dirs:
-            if not pathbrowser_instance.tree.exists(child_path):
-                pathbrowser_instance.tree.insert(
-                    parent, "end", child_path, text=child_name, open=False
-                )
+            items.append((parent, child_path, child_name, (), ()))
+            items.extend(_tree_expander_items(pathbrowser_instance, child_path))
+        insert_items(pathbrowser_instance.tree, items)
 
-                # Always add placeholder for directories to show expand button
-                # This ensures the expand/collapse button is always visible for directories
-                placeholder_id = f"{child_path}_placeholder"
-                pathbrowser_instance.tree.insert(
-                    child_path,
-                    "end",
-                    placeholder_id,
-                    text=lang.get("Loading...", pathbrowser_instance),
-                    open=False,
-                )
+        # Pre-list the next level so that opening a child is instant
+        _prefetch_tree_children(pathbrowser_instance, [path for _, path in dirs])
 
     except (OSError, PermissionError) as e:
         logger.warning("Failed to populate tree node for %s: %s", parent, e)
@@ -612,6 +745,92 @@ def populate_tree_node(pathbrowser_instance, parent):
         )
 
 
+def _tree_node_identities(pathbrowser_instance, path):
+    """
+    Return the identities of a tree node's directory and of those above it.
+
+    The set is kept per populated node, so a node's set is its parent's set
+    plus its own identity; only the first node below the tree base walks up
+    to the root.
+    """
+    ancestry = pathbrowser_instance.tree_ancestry
+    identities = ancestry.get(path)
+    if identities is not None:
+        return identities
+    # Tree item ids are paths, so the parent node is the directory name
+    parent = os.path.dirname(path)
+    if parent == path:
+        above = frozenset()
+    else:
+        above = _tree_node_identities(pathbrowser_instance, parent)
+    identity = pathbrowser_instance.scanner.identity(path)
+    identities = above if identity is None else above | {identity}
+    ancestry[path] = identities
+    return identities
+
+
+def _forget_tree_identities(pathbrowser_instance, path):
+    """Drop the kept identities of a removed tree node and its descendants."""
+    ancestry = pathbrowser_instance.tree_ancestry
+    prefix = path.rstrip(os.sep) + os.sep
+    for key in [key for key in ancestry if key == path or key.startswith(prefix)]:
+        del ancestry[key]
+
+
+def _list_tree_subdirs(pathbrowser_instance, path):
+    """Return the sorted subdirectories of a directory, prefetched if possible."""
+    prefetcher = pathbrowser_instance.prefetcher
+    subdirs = prefetcher.get(path) if prefetcher is not None else None
+    if subdirs is None:
+        subdirs = pathbrowser_instance.scanner.scan(path, dirs_only=True).subdirs
+    return list(subdirs)
+
+
+def _add_tree_expander(pathbrowser_instance, path):
+    """Add the placeholder that shows an expand button, if it can expand."""
+    tree = pathbrowser_instance.tree
+    for parent, placeholder_id, text, _, _ in _tree_expander_items(
+        pathbrowser_instance, path
+    ):
+        if not tree.exists(placeholder_id):
+            tree.insert(parent, "end", placeholder_id, text=text, open=False)
+
+
+def _tree_expander_items(pathbrowser_instance, path):
+    """Return the placeholder item of a new tree node, if it can expand."""
+    prefetcher = pathbrowser_instance.prefetcher
+    if prefetcher is not None and not prefetcher.has_subdirs(path):
+        # Unknown nodes get their button once the prefetch finds subdirectories
+        return []
+    placeholder_id = f"{path}_placeholder"
+    text = lang.get("Loading...", pathbrowser_instance)
+    return [(path, placeholder_id, text, (), ())]
+
+
+def _prefetch_tree_children(pathbrowser_instance, paths):
+    """List the subdirectories of newly shown tree nodes in the background."""
+    if pathbrowser_instance.prefetcher is not None and paths:
+        pathbrowser_instance.prefetcher.request(paths)
+
+
+def on_subdirs_prefetched(pathbrowser_instance, path, subdirs):
+    """Show or hide the expand button of a tree node after a prefetch."""
+    tree = pathbrowser_instance.tree
+    try:
+        if not tree.exists(path) or tree.item(path, "open"):
+            # Open nodes are already populated and kept current by the watcher
+            return
+        placeholder_id = f"{path}_placeholder"
+        children = tree.get_children(path)
+        if subdirs:
+            if not children:
+                _add_tree_expander(pathbrowser_instance, path)
+        elif placeholder_id in children:
+            tree.delete(placeholder_id)
+    except tk.TclError as e:
+        logger.debug("Failed to update tree node %s: %s", path, e)
+
+
 def expand_path(pathbrowser_instance, path: str):
     """Expand the tree to show the specified path."""
     # Resolve symlinks to prevent loops on macOS
@@ -651,135 +870,955 @@ def expand_path(pathbrowser_instance, path: str):
         logger.debug("Failed to select path %s: %s", path, e)
 
 
+def format_file_row(file_info):
+    """Return the (text, values) of a file list row."""
+    icon = "📁" if file_info.is_dir else "📄"
+    return (
+        f"{icon} {file_info.name}",
+        (file_info.size_str, file_info.modified, file_info.file_type),
+    )
+
+
 def load_files(pathbrowser_instance):
-    """Load files in the current directory with improved performance using itertools."""
-    pathbrowser_instance.file_tree.delete(
-        *pathbrowser_instance.file_tree.get_children()
+    """Start loading the current directory through the background loader."""
+    searching = pathbrowser_instance.search_root is not None
+    _leave_search(pathbrowser_instance)
+    current_dir = pathbrowser_instance.state.current_dir
+    if searching or not _retain_listing(pathbrowser_instance, current_dir):
+        _clear_file_list(pathbrowser_instance)
+
+    # Resolve everything that needs Tcl on the Tk thread; the worker never does
+    pathbrowser_instance.file_info_manager.refresh_type_labels()
+    # Stamp before scanning so that a change during the scan is not cached
+    stamp = utils.directory_stamp(current_dir, pathbrowser_instance.filesystem)
+
+    snapshots = pathbrowser_instance.snapshots
+    snapshot = snapshots.take(current_dir) if snapshots is not None else None
+    if snapshot is not None:
+        _restore_listing(pathbrowser_instance, snapshot, stamp)
+        return
+
+    pathbrowser_instance.file_list.set_filter(make_file_filter(pathbrowser_instance))
+    listing_cache = pathbrowser_instance.listing_cache
+    cached = None
+    if listing_cache is not None:
+        cached = listing_cache.load(
+            current_dir, stamp, pathbrowser_instance.file_info_manager
+        )
+    pathbrowser_instance.stats_recorder.start(
+        current_dir, listing_cache_hit=cached is not None
     )
 
-    try:
-        # Use pathlib for more efficient directory scanning
-        path_obj = Path(pathbrowser_instance.state.current_dir)
-
-        # Use itertools for efficient processing
-        batch_size = pathbrowser_instance.config.batch_size
-
-        # Create iterator for directory items
-        def filtered_items():
-            for item in path_obj.iterdir():
-                if item.is_dir():
-                    # Always include directories
-                    yield item
-                elif utils.matches_filter(
-                    item.name,
-                    pathbrowser_instance.config.filetypes,
-                    pathbrowser_instance.filter_var.get(),
-                    pathbrowser_instance.config.select,
-                    lang.get("All files", pathbrowser_instance),
-                ):
-                    # Only include files that match filter
-                    yield item
-
-        # Process items in batches using itertools
-        all_items = []
-        processed_count = 0
-
-        # Use islice for efficient batching
-        item_iterator = filtered_items()
-        while True:
-            batch = list(islice(item_iterator, batch_size))
-            if not batch:
-                break
-
-            # Process batch
-            for item in batch:
-                file_info = pathbrowser_instance.file_info_manager.get_cached_file_info(
-                    str(item)
-                )
-                icon = "📁" if file_info.is_dir else "📄"
-                all_items.append(
-                    (
-                        file_info.name,
-                        file_info.path,
-                        icon,
-                        file_info.size_str,
-                        file_info.modified,
-                        file_info.file_type,
-                        file_info.size_bytes,
-                    )
-                )
-                processed_count += 1
+    # Two-phase listing paints names first; a cached listing already has
+    # metadata, so its revalidation compares complete records
+    names_only = cached is None and pathbrowser_instance.metadata_filler is not None
+    if cached is None:
+        on_batch = partial(_on_files_batch, pathbrowser_instance)
+        on_complete = partial(_on_files_loaded, pathbrowser_instance, stamp=stamp)
+    else:
+        # Paint the cached listing now; the scan only revalidates it
+        _on_files_batch(pathbrowser_instance, cached)
+        pathbrowser_instance.scan_result = ScanResult.from_entries(current_dir, cached)
+        sort_files(pathbrowser_instance)
+        on_batch = _ignore_batch
+        on_complete = partial(
+            _on_files_revalidated, pathbrowser_instance, stamp=stamp
+        )
+
+    pathbrowser_instance.loader.load(
+        current_dir,
+        on_batch=on_batch,
+        on_complete=on_complete,
+        on_error=lambda error: _on_files_error(pathbrowser_instance, error),
+        names_only=names_only,
+    )
+
+
+def _retain_listing(pathbrowser_instance, current_dir):
+    """
+    Keep the displayed listing as a snapshot instead of clearing it.
+
+    Only complete listings of another directory are kept. Returns whether
+    the listing was kept; the file list is empty afterwards either way.
+    """
+    snapshots = pathbrowser_instance.snapshots
+    scan_result = pathbrowser_instance.scan_result
+    stamp = pathbrowser_instance.listing_stamp
+    if (
+        snapshots is None
+        or stamp is None
+        or scan_result is None
+        or scan_result.path == current_dir
+    ):
+        return False
+
+    cancel_folder_sizes(pathbrowser_instance)
+    cancel_metadata(pathbrowser_instance)
+    clear_preview(pathbrowser_instance)
+    state = pathbrowser_instance.state
+    file_list_view = pathbrowser_instance.file_list_view
+    snapshot = DirectorySnapshot(
+        path=scan_result.path,
+        stamp=stamp,
+        model=pathbrowser_instance.file_list,
+        scan_result=scan_result,
+        filter_key=pathbrowser_instance.filter_var.get(),
+        sort=(state.sort_column, state.sort_reverse),
+        selection=pathbrowser_instance._file_selection(),  # pylint: disable=protected-access
+    )
+    if file_list_view is not None:
+        snapshot.top = file_list_view.top
+    else:
+        file_tree = pathbrowser_instance.file_tree
+        snapshot.top = file_tree.yview()[0]
+        snapshot.rows = pathbrowser_instance.file_tree_rows
+        # One Tcl call detaches the rows; they are deleted on eviction only
+        file_tree.selection_set(())
+        file_tree.set_children("")
+        pathbrowser_instance.file_tree_rows = set()
+
+    _use_model(pathbrowser_instance, FileListModel())
+    pathbrowser_instance.listing_stamp = None
+    if file_list_view is not None:
+        file_list_view.reset()
+    snapshots.put(snapshot)
+    return True
+
+
+def _restore_listing(pathbrowser_instance, snapshot, stamp):
+    """Repaint a retained listing and rescan only if the directory changed."""
+    stats_recorder = pathbrowser_instance.stats_recorder
+    stats_recorder.start(snapshot.path, snapshot_hit=True)
+    # A load still running for the directory that was left must not deliver
+    pathbrowser_instance.loader.cancel()
+
+    state = pathbrowser_instance.state
+    file_list_view = pathbrowser_instance.file_list_view
+    _use_model(pathbrowser_instance, snapshot.model)
+    pathbrowser_instance.scan_result = snapshot.scan_result
+    if snapshot.rows is not None:
+        pathbrowser_instance.file_tree_rows = snapshot.rows
+    if file_list_view is not None:
+        file_list_view.top = int(snapshot.top)
+
+    started = time.perf_counter()
+    if pathbrowser_instance.filter_var.get() != snapshot.filter_key:
+        snapshot.model.set_filter(make_file_filter(pathbrowser_instance))
+    stats_recorder.add("filter", time.perf_counter() - started)
+    if (state.sort_column, state.sort_reverse) != snapshot.sort:
+        sort_files(pathbrowser_instance)
+    else:
+        started = time.perf_counter()
+        _sync_file_tree(pathbrowser_instance)
+        stats_recorder.add("insert", time.perf_counter() - started)
+    if file_list_view is None:
+        pathbrowser_instance.file_tree.yview_moveto(snapshot.top)
+    selection = [path for path in snapshot.selection if snapshot.model.contains(path)]
+    if selection:
+        pathbrowser_instance._set_file_selection(  # pylint: disable=protected-access
+            selection
+        )
+
+    started = time.perf_counter()
+    pathbrowser_instance._update_status()  # pylint: disable=protected-access
+    stats_recorder.add("status", time.perf_counter() - started)
+    if stamp is not None and stamp == snapshot.stamp:
+        pathbrowser_instance.listing_stamp = stamp
+        stats_recorder.finish(snapshot.scan_result, scanned=False)
+        return
+
+    # The directory changed since it was left: rescan and apply the difference
+    pathbrowser_instance.loader.load(
+        snapshot.path,
+        on_batch=_ignore_batch,
+        on_complete=partial(_on_files_revalidated, pathbrowser_instance, stamp=stamp),
+        on_error=lambda error: _on_files_error(pathbrowser_instance, error),
+    )
+
+
+def _use_model(pathbrowser_instance, file_list):
+    """Make a FileListModel the displayed one."""
+    pathbrowser_instance.file_list = file_list
+    if pathbrowser_instance.file_list_view is not None:
+        pathbrowser_instance.file_list_view.model = file_list
+
+
+def drop_snapshot(pathbrowser_instance, snapshot):
+    """Delete the detached Treeview rows of an evicted snapshot."""
+    if snapshot.rows:
+        pathbrowser_instance.file_tree.delete(*snapshot.rows)
+        snapshot.rows.clear()
+
+
+def make_name_filter(pathbrowser_instance):
+    """Return a (name, is_dir) predicate for the current file type filter."""
+    matcher = utils.compile_filter(
+        pathbrowser_instance.config.filetypes,
+        pathbrowser_instance.filter_var.get(),
+        pathbrowser_instance.config.select,
+        lang.get("All files", pathbrowser_instance),
+    )
+    # Always include directories; only include files that match filter
+    return lambda name, is_dir: is_dir or matcher(name)
+
+
+def make_file_filter(pathbrowser_instance):
+    """Return a row predicate for the current file type filter."""
+    name_filter = make_name_filter(pathbrowser_instance)
+    return lambda file_info: name_filter(file_info.name, file_info.is_dir)
+
+
+def apply_filter(pathbrowser_instance):
+    """Re-filter the loaded listing after the file type filter changed."""
+    if pathbrowser_instance.search_root is not None:
+        # Matches are filtered while walking, so search again
+        start_search(pathbrowser_instance)
+        return
+    file_list = pathbrowser_instance.file_list
+    selection = pathbrowser_instance._file_selection()  # pylint: disable=protected-access
+    file_list.set_filter(make_file_filter(pathbrowser_instance))
+    _sync_file_tree(pathbrowser_instance)
+
+    # Drop selected rows that the new filter hides
+    _prune_file_selection(pathbrowser_instance, selection)
+    if not pathbrowser_instance.loader.is_loading(
+        pathbrowser_instance.state.current_dir
+    ):
+        pathbrowser_instance._update_status()  # pylint: disable=protected-access
+
+
+def _prune_file_selection(pathbrowser_instance, selection):
+    """Deselect the rows of a previous selection that are no longer listed."""
+    file_list = pathbrowser_instance.file_list
+    remaining = [path for path in selection if file_list.contains(path)]
+    if len(remaining) != len(selection):
+        pathbrowser_instance._set_file_selection(  # pylint: disable=protected-access
+            remaining
+        )
+
+
+def _sync_file_tree(pathbrowser_instance):
+    """Show the model's rows, in display order, in the file Treeview."""
+    file_list = pathbrowser_instance.file_list
+    schedule_folder_sizes(pathbrowser_instance)
+    schedule_metadata(pathbrowser_instance)
+    if pathbrowser_instance.file_list_view is not None:
+        pathbrowser_instance.file_list_view.refresh()
+        return
+
+    file_tree = pathbrowser_instance.file_tree
+    inserted = pathbrowser_instance.file_tree_rows
+    _insert_file_rows(
+        pathbrowser_instance,
+        [file_info for file_info in file_list if file_info.path not in inserted],
+    )
+    # One Tcl call reorders the rows; rows left out are detached, not deleted
+    file_tree.set_children("", *file_list.paths())
+
+
+def _on_files_batch(pathbrowser_instance, batch):
+    """Insert a batch of FileInfo records delivered by the loader."""
+    file_info_manager = pathbrowser_instance.file_info_manager
+    for file_info in batch:
+        # Cache on the Tk thread so lookups by path hit without a stat
+        file_info_manager.add_file_info(file_info)
+    _show_rows(pathbrowser_instance, batch)
+
+    # Update status while the directory is still loading
+    started = time.perf_counter()
+    pathbrowser_instance.status_var.set(
+        f"{lang.get('Loading files...', pathbrowser_instance)} "
+        f"({len(pathbrowser_instance.file_list)})"
+    )
+    pathbrowser_instance.stats_recorder.add("status", time.perf_counter() - started)
+
+
+def _show_rows(pathbrowser_instance, batch):
+    """Add delivered rows to the model and display the visible ones."""
+    file_list = pathbrowser_instance.file_list
+    file_list_view = pathbrowser_instance.file_list_view
+    stats_recorder = pathbrowser_instance.stats_recorder
+
+    # Every row is kept so a filter change can re-filter without a rescan
+    started = time.perf_counter()
+    rows = file_list.extend(batch)
+    filtered = time.perf_counter()
+    stats_recorder.add("filter", filtered - started)
+    schedule_folder_sizes(pathbrowser_instance)
+    schedule_metadata(pathbrowser_instance)
+    if file_list_view is not None:
+        # Only the visible window is rendered, however large the listing
+        file_list_view.refresh()
+    else:
+        _insert_file_rows(pathbrowser_instance, rows)
+    stats_recorder.add("insert", time.perf_counter() - filtered)
+
+
+def _insert_file_rows(pathbrowser_instance, rows):
+    """Append the file Treeview items of rows in one Tcl call."""
+    items = []
+    for file_info in rows:
+        text, values = format_file_row(file_info)
+        items.append(("", file_info.path, text, values, ()))
+    insert_items(pathbrowser_instance.file_tree, items)
+    pathbrowser_instance.file_tree_rows.update(file_info.path for file_info in rows)
+
+
+def _on_files_loaded(pathbrowser_instance, scan_result, stamp=None):
+    """Apply the sort order and totals once the whole directory is loaded."""
+    pathbrowser_instance.scan_result = scan_result
+    pathbrowser_instance.listing_stamp = stamp
+    sort_files(pathbrowser_instance)
+    started = time.perf_counter()
+    pathbrowser_instance._update_status()  # pylint: disable=protected-access
+    stats_recorder = pathbrowser_instance.stats_recorder
+    stats_recorder.add("status", time.perf_counter() - started)
+    stats_recorder.finish(scan_result)
+
+    listing_cache = pathbrowser_instance.listing_cache
+    if listing_cache is not None and not scan_result.names_only:
+        listing_cache.store(scan_result.path, stamp, scan_result.entries)
+
+
+def _ignore_batch(batch):  # pylint: disable=unused-argument
+    """Revalidation compares the complete scan instead of each batch."""
+
+
+def _on_files_revalidated(pathbrowser_instance, scan_result, stamp):
+    """Apply the differences between a cached listing and a fresh scan."""
+    file_list = pathbrowser_instance.file_list
+    fresh = {file_info.path: file_info for file_info in scan_result.entries}
+    resolved = {
+        row.path: None for row in file_list.all_rows() if row.path not in fresh
+    }
+    for path, file_info in fresh.items():
+        old_info = file_list.get(path)
+        if old_info is None or not _same_stat(old_info, file_info):
+            resolved[path] = file_info
+    if resolved:
+        _apply_file_changes(pathbrowser_instance, resolved)
+    _on_files_loaded(pathbrowser_instance, scan_result, stamp)
+
+
+def _same_stat(old_info, new_info):
+    """Return whether two records of a path carry the same stat data."""
+    return (
+        old_info.is_dir == new_info.is_dir
+        # Folder sizes are computed separately, not read from stat
+        and (old_info.is_dir or old_info.size_bytes == new_info.size_bytes)
+        and old_info.mtime == new_info.mtime
+        and old_info.mode == new_info.mode
+    )
+
+
+def _on_files_error(pathbrowser_instance, error):
+    """Report a directory that could not be listed."""
+    logger.error(
+        "Failed to load files for directory %s: %s",
+        pathbrowser_instance.state.current_dir,
+        error,
+    )
+    error_msg = (
+        f"{lang.get('Error loading files:', pathbrowser_instance)} " f"{str(error)}"
+    )
+    pathbrowser_instance.status_var.set(error_msg)
+    pathbrowser_instance.listing_stamp = None
+    pathbrowser_instance.stats_recorder.finish(failed=True)
+
+    # Show error dialog for permission issues
+    if isinstance(error, PermissionError):
+        messagebox.showerror(
+            master=pathbrowser_instance.winfo_toplevel(),
+            message=error_msg,
+            title=lang.get("Access Denied", pathbrowser_instance),
+        )
+
+
+def on_search_changed(pathbrowser_instance):
+    """Restart the search shortly after the query changed."""
+    if pathbrowser_instance.search_after_id is not None:
+        pathbrowser_instance.after_cancel(pathbrowser_instance.search_after_id)
+        pathbrowser_instance.search_after_id = None
+    if not pathbrowser_instance.search_var.get().strip():
+        if pathbrowser_instance.search_root is not None:
+            # Back to the directory listing
+            load_files(pathbrowser_instance)
+            pathbrowser_instance._update_status()  # pylint: disable=protected-access
+        return
+    # Stop the walk for the previous keystroke now; the new one starts
+    # once typing pauses
+    pathbrowser_instance.searcher.cancel()
+    pathbrowser_instance.search_after_id = pathbrowser_instance.after(
+        SEARCH_DELAY_MS, lambda: start_search(pathbrowser_instance)
+    )
+
+
+def start_search(pathbrowser_instance):
+    """Search below the current directory and stream matches into the list."""
+    if pathbrowser_instance.search_after_id is not None:
+        pathbrowser_instance.after_cancel(pathbrowser_instance.search_after_id)
+        pathbrowser_instance.search_after_id = None
+    query = pathbrowser_instance.search_var.get().strip()
+    if not query:
+        return
+
+    # The listing is replaced by the matches until the search is cleared
+    pathbrowser_instance.loader.cancel()
+    pathbrowser_instance.stats_recorder.cancel()
+    if pathbrowser_instance.snapshots is not None:
+        # Matches reuse path item ids, so no detached listing may keep them
+        pathbrowser_instance.snapshots.clear()
+    if pathbrowser_instance.search_root is None:
+        pathbrowser_instance.search_root = pathbrowser_instance.state.current_dir
+    _clear_file_list(pathbrowser_instance)
+    pathbrowser_instance._set_file_selection([])  # pylint: disable=protected-access
+
+    pathbrowser_instance.file_info_manager.refresh_type_labels()
+    name_filter = make_name_filter(pathbrowser_instance)
+    pathbrowser_instance.file_list.set_filter(
+        lambda file_info: name_filter(file_info.name, file_info.is_dir)
+    )
+    pathbrowser_instance.search_result = None
+    pathbrowser_instance.status_var.set(lang.get("Searching...", pathbrowser_instance))
+    pathbrowser_instance.searcher.search(
+        pathbrowser_instance.search_root,
+        query,
+        name_filter,
+        on_batch=partial(_on_search_batch, pathbrowser_instance),
+        on_complete=partial(_on_search_done, pathbrowser_instance),
+    )
+
+
+def get_search_status(pathbrowser_instance):
+    """Return the status bar text of the active search."""
+    result = pathbrowser_instance.search_result
+    if result is None:
+        return (
+            f"{lang.get('Searching...', pathbrowser_instance)} "
+            f"({len(pathbrowser_instance.file_list)})"
+        )
+    label = lang.get(
+        "match" if result.matches == 1 else "matches", pathbrowser_instance
+    )
+    status = f"{result.matches} {label}"
+    if result.truncated:
+        status += f" ({lang.get('result limit reached', pathbrowser_instance)})"
+    return status
+
+
+def _leave_search(pathbrowser_instance):
+    """End the active search, if any, without reloading."""
+    if pathbrowser_instance.search_root is None:
+        return
+    pathbrowser_instance.searcher.cancel()
+    pathbrowser_instance.search_root = None
+    pathbrowser_instance.search_result = None
+    if pathbrowser_instance.search_var.get():
+        # Clearing the box no longer refers to a search, so it is a no-op
+        pathbrowser_instance.search_var.set("")
+
+
+def _clear_file_list(pathbrowser_instance):
+    """Remove every row from the model and the file Treeview."""
+    cancel_folder_sizes(pathbrowser_instance)
+    cancel_metadata(pathbrowser_instance)
+    clear_preview(pathbrowser_instance)
+    pathbrowser_instance.listing_stamp = None
+    pathbrowser_instance.file_list.clear()
+    if pathbrowser_instance.file_list_view is not None:
+        pathbrowser_instance.file_list_view.reset()
+    else:
+        # Also drop the rows detached by the filter
+        pathbrowser_instance.file_tree.delete(*pathbrowser_instance.file_tree_rows)
+        pathbrowser_instance.file_tree_rows.clear()
+
+
+def _on_search_batch(pathbrowser_instance, batch):
+    """Show a batch of matches; they are not cached under their short names."""
+    _show_rows(pathbrowser_instance, batch)
+    pathbrowser_instance.status_var.set(get_search_status(pathbrowser_instance))
+
+
+def _on_search_done(pathbrowser_instance, result):
+    """Sort the matches and show the search summary."""
+    pathbrowser_instance.search_result = result
+    sort_files(pathbrowser_instance)
+    pathbrowser_instance._update_status()  # pylint: disable=protected-access
+
 
-            # Update status for large directories
-            if processed_count % (batch_size * 2) == 0:
-                pathbrowser_instance.status_var.set(
-                    f"{lang.get('Loading files...', pathbrowser_instance)} "
-                    f"({processed_count})"
+def get_watched_directories(pathbrowser_instance):
+    """Return the current directory, the tree root and the expanded tree nodes."""
+    tree = pathbrowser_instance.tree
+    paths = {pathbrowser_instance.state.current_dir}
+    if pathbrowser_instance.tree_base:
+        paths.add(pathbrowser_instance.tree_base)
+
+    stack = list(tree.get_children(""))
+    while stack:
+        item = stack.pop()
+        if not tree.item(item, "open"):
+            continue
+        children = tree.get_children(item)
+        if any(child.endswith("_placeholder") for child in children):
+            continue
+        paths.add(item)
+        stack.extend(children)
+    return paths
+
+
+def apply_directory_changes(pathbrowser_instance, changes):
+    """Apply the changes reported by the DirectoryWatcher incrementally."""
+    current_dir = pathbrowser_instance.state.current_dir
+    deferred = []
+    for change in changes:
+        if change.path == current_dir:
+            if pathbrowser_instance.loader.is_loading(current_dir):
+                # The running scan may still list these entries; retry later
+                deferred.append(change)
+                continue
+            if not os.path.isdir(current_dir):
+                # The reload falls back to the nearest existing parent
+                pathbrowser_instance._load_directory(  # pylint: disable=protected-access
+                    current_dir
                 )
-                pathbrowser_instance.update()  # Allow GUI to update
-
-        # Sort and add items efficiently
-        all_items = sort_items(pathbrowser_instance, all_items)
-
-        # Batch insert items for better performance
-        for i, (name, path, icon, size, modified, file_type, _) in enumerate(all_items):
-            pathbrowser_instance.file_tree.insert(
-                "",
-                "end",
-                path,
-                text=f"{icon} {name}",
-                values=(size, modified, file_type),
+                return
+
+        resolved = _resolve_change(pathbrowser_instance, change)
+        if change.path == current_dir and pathbrowser_instance.search_root is None:
+            _apply_file_changes(pathbrowser_instance, resolved)
+        _apply_tree_changes(pathbrowser_instance, change.path, resolved)
+
+    if deferred:
+        pathbrowser_instance.watcher.requeue(deferred)
+
+
+def _resolve_change(pathbrowser_instance, change):
+    """Return {path: FileInfo, or None if removed} for the changed entries."""
+    names = set(change.names)
+    if change.rescan:
+        names |= _listing_difference(pathbrowser_instance, change.path)
+
+    manager = pathbrowser_instance.file_info_manager
+    resolved = {}
+    for name in names:
+        path = os.path.join(change.path, name)
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            # Broken links stay listed, as they are in a full scan
+            resolved[path] = (
+                manager.create_error_file_info(path)
+                if os.path.lexists(path)
+                else None
             )
+            continue
+        resolved[path] = manager.create_file_info(
+            path, name, stat.S_ISDIR(stat_result.st_mode), stat_result
+        )
+    return resolved
 
-            # Update progress for very large directories
-            if i % batch_size == 0 and len(all_items) > batch_size * 2:
-                pathbrowser_instance.status_var.set(
-                    f"{lang.get('Displaying files...', pathbrowser_instance)} "
-                    f"({i + 1}/{len(all_items)})"
-                )
-                pathbrowser_instance.update()
 
-    except (OSError, PermissionError) as e:
-        logger.error(
-            "Failed to load files for directory %s: %s",
-            pathbrowser_instance.state.current_dir,
-            e,
+def _listing_difference(pathbrowser_instance, directory):
+    """Return the names added or removed since the directory was displayed."""
+    is_current = directory == pathbrowser_instance.state.current_dir
+    try:
+        with os.scandir(directory) as it:
+            if is_current:
+                listed = {entry.name for entry in it}
+            else:
+                listed = {
+                    entry.name for entry in it if _is_dir_entry(entry)
+                }
+    except OSError as e:
+        logger.debug("Failed to list changed directory %s: %s", directory, e)
+        listed = set()
+
+    if is_current:
+        known = {row.name for row in pathbrowser_instance.file_list.all_rows()}
+    else:
+        parent = _tree_parent_item(pathbrowser_instance, directory)
+        children = (
+            pathbrowser_instance.tree.get_children(parent)
+            if parent is not None
+            else ()
         )
-        error_msg = (
-            f"{lang.get('Error loading files:', pathbrowser_instance)} " f"{str(e)}"
+        known = {os.path.basename(child) for child in children}
+    return listed ^ known
+
+
+def _is_dir_entry(entry):
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _apply_file_changes(pathbrowser_instance, resolved):
+    """Update the file list, the file Treeview and the caches in place."""
+    file_list = pathbrowser_instance.file_list
+    manager = pathbrowser_instance.file_info_manager
+    scan_result = pathbrowser_instance.scan_result
+    if scan_result is not None and (
+        scan_result.path != pathbrowser_instance.state.current_dir
+    ):
+        scan_result = None
+    selection = pathbrowser_instance._file_selection()  # pylint: disable=protected-access
+
+    rows, removed = [], []
+    for path, file_info in resolved.items():
+        old_info = file_list.get(path)
+        if file_info is None:
+            manager.remove_from_cache(path)
+            if old_info is None:
+                continue
+            removed.append(path)
+        else:
+            manager.add_file_info(file_info)
+            rows.append(file_info)
+        _adjust_totals(scan_result, old_info, file_info)
+    if not rows and not removed:
+        return
+
+    if pathbrowser_instance.file_list_view is None:
+        file_tree = pathbrowser_instance.file_tree
+        inserted = pathbrowser_instance.file_tree_rows
+        gone = [path for path in removed if path in inserted]
+        if gone:
+            file_tree.delete(*gone)
+            inserted.difference_update(gone)
+        for file_info in rows:
+            if file_info.path in inserted:
+                text, values = format_file_row(file_info)
+                file_tree.item(file_info.path, text=text, values=values)
+
+    file_list.apply_changes(rows, removed)
+    # New rows are inserted and everything is reordered in one pass
+    _sync_file_tree(pathbrowser_instance)
+    _prune_file_selection(pathbrowser_instance, selection)
+    pathbrowser_instance._update_status()  # pylint: disable=protected-access
+
+
+def _adjust_totals(scan_result, old_info, new_info):
+    """Keep the status bar totals of the current scan up to date."""
+    if scan_result is None:
+        return
+    for file_info, sign in ((old_info, -1), (new_info, 1)):
+        if file_info is None:
+            continue
+        if file_info.is_dir:
+            scan_result.folder_count += sign
+        else:
+            scan_result.file_count += sign
+            scan_result.total_size += sign * file_info.size_bytes
+            if isinstance(file_info, PendingFileInfo):
+                scan_result.unsized += sign
+
+
+def _tree_parent_item(pathbrowser_instance, directory):
+    """Return the populated tree item listing a directory, or None."""
+    if directory == pathbrowser_instance.tree_base:
+        return ""
+    tree = pathbrowser_instance.tree
+    if not tree.exists(directory):
+        return None
+    children = tree.get_children(directory)
+    if not children or any(child.endswith("_placeholder") for child in children):
+        # Not populated yet; it is scanned when first expanded
+        return None
+    return directory
+
+
+def _apply_tree_changes(pathbrowser_instance, directory, resolved):
+    """Insert and delete the changed subdirectories of a directory tree node."""
+    parent = _tree_parent_item(pathbrowser_instance, directory)
+    if parent is None:
+        return
+    tree = pathbrowser_instance.tree
+
+    added = []
+    for path, file_info in resolved.items():
+        exists = tree.exists(path)
+        if file_info is not None and file_info.is_dir:
+            if not exists:
+                added.append((file_info.name, path))
+        elif exists and tree.parent(path) == parent:
+            tree.delete(path)
+            _forget_tree_identities(pathbrowser_instance, path)
+    if not added:
+        return
+
+    # Keep the children sorted by name like a fresh scan
+    names = [tree.item(child, "text").lower() for child in tree.get_children(parent)]
+    for name, path in sorted(added, key=lambda x: x[0].lower()):
+        index = bisect.bisect(names, name.lower())
+        names.insert(index, name.lower())
+        tree.insert(parent, index, path, text=name, open=False)
+        if parent == "":
+            tree.item(path, tags=("normal",))
+        _add_tree_expander(pathbrowser_instance, path)
+    _prefetch_tree_children(pathbrowser_instance, [path for _, path in added])
+
+
+def schedule_folder_sizes(pathbrowser_instance):
+    """Size the visible folders shortly after the rows in view changed."""
+    if (
+        pathbrowser_instance.folder_sizer is None
+        or pathbrowser_instance.folder_size_after_id is not None
+    ):
+        return
+    pathbrowser_instance.folder_size_after_id = pathbrowser_instance.after(
+        FOLDER_SIZE_DELAY_MS, lambda: request_folder_sizes(pathbrowser_instance)
+    )
+
+
+def request_folder_sizes(pathbrowser_instance):
+    """Ask for the sizes of the unsized folders in view, dropping all others."""
+    pathbrowser_instance.folder_size_after_id = None
+    file_list = pathbrowser_instance.file_list
+    start, stop = _visible_file_range(pathbrowser_instance)
+    paths = []
+    for index in range(start, stop):
+        row = file_list.row(index)
+        # Sized folders carry their formatted total; others show nothing.
+        # Folders listed by name only are sized once their metadata is in
+        if row.is_dir and not row.size_str and not isinstance(row, PendingFileInfo):
+            paths.append(row.path)
+    pathbrowser_instance.folder_sizer.request(paths)
+
+
+def cancel_folder_sizes(pathbrowser_instance):
+    """Stop sizing folders, e.g. because the listing is replaced."""
+    if pathbrowser_instance.folder_sizer is None:
+        return
+    if pathbrowser_instance.folder_size_after_id is not None:
+        pathbrowser_instance.after_cancel(pathbrowser_instance.folder_size_after_id)
+        pathbrowser_instance.folder_size_after_id = None
+    pathbrowser_instance.folder_sizer.cancel()
+
+
+def schedule_metadata(pathbrowser_instance):
+    """Stat the rows in view shortly after they changed (two-phase listing)."""
+    if (
+        pathbrowser_instance.metadata_filler is None
+        or pathbrowser_instance.metadata_after_id is not None
+    ):
+        return
+    pathbrowser_instance.metadata_after_id = pathbrowser_instance.after(
+        METADATA_DELAY_MS, lambda: request_metadata(pathbrowser_instance)
+    )
+
+
+def request_metadata(pathbrowser_instance):
+    """
+    Ask for the metadata of the rows listed by name only, rows in view first.
+
+    In names-only mode (lazy_loading) rows out of view are never stat-ed;
+    otherwise they follow in display order.
+    """
+    pathbrowser_instance.metadata_after_id = None
+    file_list = pathbrowser_instance.file_list
+    start, stop = _visible_file_range(pathbrowser_instance)
+    rows = [
+        row
+        for row in (file_list.row(index) for index in range(start, stop))
+        if isinstance(row, PendingFileInfo)
+    ]
+    if not pathbrowser_instance.config.lazy_loading:
+        rows.extend(
+            row
+            for index, row in enumerate(file_list)
+            if isinstance(row, PendingFileInfo) and not start <= index < stop
         )
-        pathbrowser_instance.status_var.set(error_msg)
-
-        # Show error dialog for permission issues
-        if isinstance(e, PermissionError):
-            messagebox.showerror(
-                master=pathbrowser_instance.winfo_toplevel(),
-                message=error_msg,
-                title=lang.get("Access Denied", pathbrowser_instance),
+    pathbrowser_instance.metadata_filler.request(rows)
+
+
+def cancel_metadata(pathbrowser_instance):
+    """Stop reading metadata, e.g. because the listing is replaced."""
+    if pathbrowser_instance.metadata_filler is None:
+        return
+    if pathbrowser_instance.metadata_after_id is not None:
+        pathbrowser_instance.after_cancel(pathbrowser_instance.metadata_after_id)
+        pathbrowser_instance.metadata_after_id = None
+    pathbrowser_instance.metadata_filler.cancel()
+
+
+def on_metadata(pathbrowser_instance, records):
+    """Fill in the size and date columns of rows listed by name only."""
+    file_list = pathbrowser_instance.file_list
+    scan_result = pathbrowser_instance.scan_result
+    rows = []
+    for file_info in records:
+        old_info = file_list.get(file_info.path)
+        # Rows of another listing, or already complete, are left alone
+        if not isinstance(old_info, PendingFileInfo):
+            continue
+        rows.append(file_info)
+        pathbrowser_instance.file_info_manager.add_file_info(file_info)
+        if scan_result is not None and scan_result.names_only:
+            _adjust_totals(scan_result, old_info, file_info)
+    if not rows:
+        return
+
+    file_list.update_rows(rows)
+    if pathbrowser_instance.file_list_view is not None:
+        pathbrowser_instance.file_list_view.refresh()
+    else:
+        inserted = pathbrowser_instance.file_tree_rows
+        for file_info in rows:
+            if file_info.path in inserted:
+                text, values = format_file_row(file_info)
+                pathbrowser_instance.file_tree.item(
+                    file_info.path, text=text, values=values
+                )
+    # Folders are sized once their own metadata is in
+    schedule_folder_sizes(pathbrowser_instance)
+
+
+def on_metadata_idle(pathbrowser_instance):
+    """Re-sort and update the totals once the requested rows are stat-ed."""
+    if pathbrowser_instance.state.sort_column in ("size", "modified"):
+        # Rows kept their places while their keys arrived
+        sort_files(pathbrowser_instance)
+    if not pathbrowser_instance.loader.is_loading(
+        pathbrowser_instance.state.current_dir
+    ):
+        pathbrowser_instance._update_status()  # pylint: disable=protected-access
+
+
+def _visible_file_range(pathbrowser_instance):
+    """Return the (start, stop) positions of the file list rows in view."""
+    total = len(pathbrowser_instance.file_list)
+    file_list_view = pathbrowser_instance.file_list_view
+    if file_list_view is not None:
+        top = file_list_view.top
+        return top, min(total, top + file_list_view.visible_rows)
+    first, last = pathbrowser_instance.file_tree.yview()
+    return int(first * total), min(total, math.ceil(last * total))
+
+
+def on_folder_sizes(pathbrowser_instance, sizes):
+    """Show folder totals in the Size column and re-sort if sorted by size."""
+    file_list = pathbrowser_instance.file_list
+    rows = []
+    for path, size in sizes.items():
+        row = file_list.get(path)
+        if row is None or not row.is_dir:
+            continue
+        rows.append(
+            FileInfo(
+                row.path,
+                row.name,
+                True,
+                size,
+                utils.format_size(size),
+                row.modified,
+                row.file_type,
+                mtime=row.mtime,
+                mode=row.mode,
             )
+        )
+    if not rows:
+        return
 
+    # Only the size keys change, so the rows keep their places unless the
+    # list is sorted by size
+    if file_list.update_rows(rows):
+        sort_files(pathbrowser_instance)
+    elif pathbrowser_instance.file_list_view is not None:
+        pathbrowser_instance.file_list_view.refresh()
+    if pathbrowser_instance.file_list_view is None:
+        inserted = pathbrowser_instance.file_tree_rows
+        for file_info in rows:
+            if file_info.path in inserted:
+                text, values = format_file_row(file_info)
+                pathbrowser_instance.file_tree.item(
+                    file_info.path, text=text, values=values
+                )
 
-def sort_items(pathbrowser_instance, items):
-    """Sort items based on current sort column and direction using operator module."""
-    if not items:
-        return items
-
-    # Define sort keys using operator module for efficiency
-    sort_keys = {
-        "#0": itemgetter(0),  # name
-        "size": lambda x: (
-            (0, 0) if x[5] == lang.get("Folder", pathbrowser_instance) else (1, x[6])
-        ),
-        "modified": lambda x: (
-            (0, "") if x[5] == lang.get("Folder", pathbrowser_instance) else (1, x[4])
-        ),
-        "type": itemgetter(5),  # file_type
-    }
 
-    sort_key = sort_keys.get(pathbrowser_instance.state.sort_column, itemgetter(0))
+def schedule_preview(pathbrowser_instance):
+    """Preview the selected file once the selection stops changing."""
+    if pathbrowser_instance.preview_cache is None:
+        return
+    if pathbrowser_instance.preview_after_id is not None:
+        pathbrowser_instance.after_cancel(pathbrowser_instance.preview_after_id)
+    pathbrowser_instance.preview_after_id = pathbrowser_instance.after(
+        PREVIEW_DELAY_MS, lambda: show_preview(pathbrowser_instance)
+    )
+
+
+def show_preview(pathbrowser_instance):
+    """Show the head (and tail) of the single selected file."""
+    pathbrowser_instance.preview_after_id = None
+    selection = pathbrowser_instance._file_selection()  # pylint: disable=protected-access
+    if len(selection) != 1:
+        _set_preview_text(pathbrowser_instance, "")
+        return
+    path = selection[0]
+    file_info = pathbrowser_instance.file_info_manager.get_cached_file_info(path)
+    if file_info.is_dir:
+        _set_preview_text(pathbrowser_instance, "")
+        return
+
+    try:
+        preview = pathbrowser_instance.preview_cache.get(path)
+    except OSError as e:
+        logger.debug("Cannot preview %s: %s", path, e)
+        _set_preview_text(
+            pathbrowser_instance,
+            lang.get("No preview available", pathbrowser_instance),
+        )
+        return
+
+    if preview.binary:
+        text = (
+            f"{lang.get('Binary file', pathbrowser_instance)} "
+            f"({utils.format_size(preview.size)})"
+        )
+    elif preview.tail:
+        text = f"{preview.head}\n…\n{preview.tail}"
+    elif preview.truncated:
+        text = f"{preview.head}\n…"
+    else:
+        text = preview.head
+    _set_preview_text(pathbrowser_instance, text)
+
+
+def clear_preview(pathbrowser_instance):
+    """Cancel a pending preview and empty the pane."""
+    if pathbrowser_instance.preview_cache is None:
+        return
+    if pathbrowser_instance.preview_after_id is not None:
+        pathbrowser_instance.after_cancel(pathbrowser_instance.preview_after_id)
+        pathbrowser_instance.preview_after_id = None
+    _set_preview_text(pathbrowser_instance, "")
+
+
+def _set_preview_text(pathbrowser_instance, text):
+    """Replace the contents of the read-only preview pane."""
+    preview_text = pathbrowser_instance.preview_text
+    preview_text.configure(state="normal")
+    preview_text.delete("1.0", tk.END)
+    preview_text.insert("1.0", text)
+    preview_text.configure(state="disabled")
+    preview_text.yview_moveto(0)
+
+
+def sort_files(pathbrowser_instance):
+    """Reorder the listed files by the current sort column without any I/O."""
+    file_list = pathbrowser_instance.file_list
+    stats_recorder = pathbrowser_instance.stats_recorder
+    started = time.perf_counter()
+    file_list.sort(
+        pathbrowser_instance.state.sort_column,
+        pathbrowser_instance.state.sort_reverse,
+    )
+    sorted_at = time.perf_counter()
+    stats_recorder.add("sort", sorted_at - started)
 
-    # Use sorted with key function for efficient sorting
-    return sorted(items, key=sort_key, reverse=pathbrowser_instance.state.sort_reverse)
+    # Reorder all rows with a single Tcl call instead of one move per row
+    _sync_file_tree(pathbrowser_instance)
+    stats_recorder.add("insert", time.perf_counter() - sorted_at)
 
 
 def update_selected_display(pathbrowser_instance):
@@ -794,35 +1833,37 @@ def update_selected_display(pathbrowser_instance):
         pathbrowser_instance._update_status()  # pylint: disable=protected-access
         return
 
-    # Get file names from selected items
-    files = []
-    for item_path in pathbrowser_instance.state.selected_items:
-        file_info = pathbrowser_instance.file_info_manager.get_cached_file_info(
-            item_path
+    # Count the selected files; only the names shown are looked up
+    _, file_count, _ = _selection_totals(pathbrowser_instance)
+    files = list(
+        islice(
+            (
+                file_info.name
+                for file_info in _selected_file_infos(pathbrowser_instance)
+                if not file_info.is_dir
+            ),
+            3,
         )
-        if not file_info.is_dir:
-            files.append(file_info.name)
-
-            # Set display text based on selection
-        if not files:
-            # Only directories selected
-            if pathbrowser_instance.config.save_mode and pathbrowser_instance.config.initialfile:
-                # In save mode, preserve initial filename when only directories are selected
-                pass
-            else:
-                # Keep filename entry empty
-                pathbrowser_instance.selected_var.set("")
-        elif len(files) == 1:
-            # Single file
-            pathbrowser_instance.selected_var.set(files[0])
-        elif len(files) <= 3:
-            # Show all file names if 3 or fewer
-            pathbrowser_instance.selected_var.set(", ".join(files))
+    )
+
+    # Set display text based on selection
+    if not files:
+        # Only directories selected
+        if pathbrowser_instance.config.save_mode and pathbrowser_instance.config.initialfile:
+            # In save mode, preserve initial filename when only directories are selected
+            pass
         else:
-            # Show first file name with count indication
-            pathbrowser_instance.selected_var.set(
-                f"{files[0]} (+{len(files) - 1} more)"
-            )
+            # Keep filename entry empty
+            pathbrowser_instance.selected_var.set("")
+    elif file_count == 1:
+        # Single file
+        pathbrowser_instance.selected_var.set(files[0])
+    elif file_count <= 3:
+        # Show all file names if 3 or fewer
+        pathbrowser_instance.selected_var.set(", ".join(files))
+    else:
+        # Show first file name with count indication
+        pathbrowser_instance.selected_var.set(f"{files[0]} (+{file_count - 1} more)")
 
     # Update status bar to reflect selection changes
     pathbrowser_instance._update_status()  # pylint: disable=protected-access
@@ -847,31 +1888,62 @@ def update_status(pathbrowser_instance):
         )
 
 
-def update_selection_status(pathbrowser_instance):
-    """Update status bar for selected items."""
-    selected_files = 0
-    selected_folders = 0
-    selected_size = 0
-    selected_items_info = []
-
-    # Get file information efficiently using cache
-    for item_path in pathbrowser_instance.state.selected_items:
-        file_info = pathbrowser_instance.file_info_manager.get_cached_file_info(
-            item_path
-        )
-        selected_items_info.append(file_info)
-
+def _selected_file_infos(pathbrowser_instance):
+    """Yield the FileInfo of each selected item, from the model when listed."""
+    items = pathbrowser_instance.state.selected_items
+    if isinstance(items, SelectedPaths):
+        yield from items.rows()
+        return
+    file_list = pathbrowser_instance.file_list
+    file_info_manager = pathbrowser_instance.file_info_manager
+    for item_path in items:
+        file_info = file_list.get(item_path)
+        if file_info is None:
+            file_info = file_info_manager.get_cached_file_info(item_path)
+        yield file_info
+
+
+def _selection_totals(pathbrowser_instance):
+    """
+    Return the (folders, files, file bytes) of the selected items.
+
+    A selection made in the file list is answered from the model's range
+    aggregates; anything else (e.g. a folder picked in the tree) is counted
+    item by item.
+    """
+    items = pathbrowser_instance.state.selected_items
+    if isinstance(items, SelectedPaths):
+        folders, files, size = items.model.selection_totals()
+        if items.dirs_only:
+            # Only the selected folders count in dir mode
+            files = size = 0
+        return folders, files, size
+
+    folders = files = size = 0
+    for file_info in _selected_file_infos(pathbrowser_instance):
         if file_info.is_dir:
-            selected_folders += 1
+            folders += 1
         else:
-            selected_files += 1
-            selected_size += file_info.size_bytes
+            files += 1
+            size += file_info.size_bytes
+    return folders, files, size
+
+
+def update_selection_status(pathbrowser_instance):
+    """Update status bar for selected items."""
+    selected_folders, selected_files, selected_size = _selection_totals(
+        pathbrowser_instance
+    )
 
     # Build selection text
     selection_parts = []
     if selected_folders > 0:
         if selected_folders == 1:
-            dir_info = next(info for info in selected_items_info if info.is_dir)
+            dir_info = next(
+                info
+                for info in _selected_file_infos(pathbrowser_instance)
+                if info.is_dir
+            )
             selection_parts.append(f"📁 {dir_info.name}")
         else:
             selection_parts.append(
@@ -880,7 +1952,11 @@ def update_selection_status(pathbrowser_instance):
 
     if selected_files > 0:
         if selected_files == 1:
-            file_info = next(info for info in selected_items_info if not info.is_dir)
+            file_info = next(
+                info
+                for info in _selected_file_infos(pathbrowser_instance)
+                if not info.is_dir
+            )
             selection_parts.append(file_info.name)
         else:
             selection_parts.append(
@@ -900,55 +1976,50 @@ def update_selection_status(pathbrowser_instance):
 
 def update_directory_status(pathbrowser_instance):
     """Update status bar for current directory."""
-    try:
-        path_obj = Path(pathbrowser_instance.state.current_dir)
-        file_count = 0
-        folder_count = 0
-        total_size = 0
-
-        for item in path_obj.iterdir():
-            if item.is_dir():
-                folder_count += 1
-            else:
-                file_count += 1
-                try:
-                    total_size += item.stat().st_size
-                except (OSError, PermissionError):
-                    pass
-
-        # Build status text
-        status_parts = []
-        if folder_count > 0:
-            folder_label = lang.get(
-                "folder" if folder_count == 1 else "folders", pathbrowser_instance
-            )
-            folder_text = f"{folder_count} {folder_label}"
-            status_parts.append(folder_text)
-
-        if file_count > 0:
-            file_label = lang.get(
-                "file" if file_count == 1 else "files", pathbrowser_instance
+    if pathbrowser_instance.search_root is not None:
+        pathbrowser_instance.status_var.set(get_search_status(pathbrowser_instance))
+        return
+    # Totals come from the same scan that produced the file list
+    scan_result = pathbrowser_instance.scan_result
+    current_dir = pathbrowser_instance.state.current_dir
+    if scan_result is None or scan_result.path != current_dir:
+        if pathbrowser_instance.loader.is_loading(current_dir):
+            # Totals arrive with the background scan
+            pathbrowser_instance.status_var.set(
+                lang.get("Loading files...", pathbrowser_instance)
             )
-            file_text = f"{file_count} {file_label}"
-            status_parts.append(file_text)
-
-        if status_parts:
-            status_text = ", ".join(status_parts)
-            if file_count > 0:
-                status_text += f" ({utils.format_size(total_size)})"
         else:
-            status_text = lang.get("Empty folder", pathbrowser_instance)
-
-        pathbrowser_instance.status_var.set(status_text)
-    except (OSError, PermissionError) as e:
-        logger.error(
-            "Access denied for directory %s: %s",
-            pathbrowser_instance.state.current_dir,
-            e,
+            # The listing failed or was abandoned; never scan on the Tk thread
+            pathbrowser_instance.status_var.set("")
+        return
+    file_count = scan_result.file_count
+    folder_count = scan_result.folder_count
+
+    # Build status text
+    status_parts = []
+    if folder_count > 0:
+        folder_label = lang.get(
+            "folder" if folder_count == 1 else "folders", pathbrowser_instance
         )
-        pathbrowser_instance.status_var.set(
-            f"Access denied: {Path(pathbrowser_instance.state.current_dir).name}"
+        folder_text = f"{folder_count} {folder_label}"
+        status_parts.append(folder_text)
+
+    if file_count > 0:
+        file_label = lang.get(
+            "file" if file_count == 1 else "files", pathbrowser_instance
         )
+        file_text = f"{file_count} {file_label}"
+        status_parts.append(file_text)
+
+    if status_parts:
+        status_text = ", ".join(status_parts)
+        # The total is left out while rows listed by name only lack a size
+        if file_count > 0 and not scan_result.unsized:
+            status_text += f" ({utils.format_size(scan_result.total_size)})"
+    else:
+        status_text = lang.get("Empty folder", pathbrowser_instance)
+
+    pathbrowser_instance.status_var.set(status_text)
 
 
 def show_context_menu(pathbrowser_instance, event, menu_type="file"):
@@ -986,7 +2057,8 @@ def show_context_menu(pathbrowser_instance, event, menu_type="file"):
                 )
                 menu.add_separator()
     else:  # file menu
-        selection = pathbrowser_instance.file_tree.selection()
+        # pylint: disable=protected-access
+        selection = pathbrowser_instance._file_selection()
         if selection:
             menu.add_command(
                 label=lang.get("Open", pathbrowser_instance),
@@ -994,6 +2066,12 @@ def show_context_menu(pathbrowser_instance, event, menu_type="file"):
                 command=pathbrowser_instance._open_selected,
             )
             menu.add_separator()
+        if pathbrowser_instance.config.multiple and pathbrowser_instance.file_list:
+            menu.add_command(
+                label=lang.get("Select All", pathbrowser_instance),
+                # pylint: disable=protected-access
+                command=pathbrowser_instance._select_all,
+            )
 
     menu.add_command(
         label=lang.get("Copy Path", pathbrowser_instance),
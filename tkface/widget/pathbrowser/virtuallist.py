@@ -0,0 +1,234 @@
+"""
+Virtual file list for PathBrowser widget.
+
+This module renders a FileListModel into a ttk.Treeview that only holds the
+visible rows plus a small overscan buffer. The Treeview rows are recycled as
+the user scrolls, so the widget cost stays constant regardless of how many
+entries the directory contains.
+"""
+
+import logging
+from typing import Callable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tag used to draw selected rows (the Treeview selection itself is unused)
+SELECTED_TAG = "selected"
+# Default overscan in rows above and below the visible area
+DEFAULT_OVERSCAN = 20
+
+
+class VirtualFileList:  # pylint: disable=too-many-instance-attributes
+    """
+    Windowed view of a FileListModel inside a ttk.Treeview.
+
+    The scrollbar and mouse wheel drive a model-based offset. Scrolling
+    inside the materialized window only moves the Treeview view; leaving it
+    re-renders the recycled rows around the new offset.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        tree,
+        model,
+        format_row: Callable,
+        scrollbar=None,
+        overscan: int = DEFAULT_OVERSCAN,
+        row_height: int = 20,
+        selected_colors: Optional[tuple] = None,
+        on_view_change: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize the virtual list.
+
+        Args:
+            tree: Treeview used for display
+            model: FileListModel holding all rows and the selection
+            format_row: Returns (text, values) for a FileInfo row
+            scrollbar: Vertical scrollbar driven by the model offset
+            overscan: Rows materialized above and below the visible area
+            row_height: Treeview row height in pixels
+            selected_colors: (background, foreground) for selected rows
+            on_view_change: Called after the rows in view changed
+        """
+        self.tree = tree
+        self.model = model
+        self.format_row = format_row
+        self.scrollbar = scrollbar
+        self.on_view_change = on_view_change
+        self.overscan = max(0, overscan)
+        self.row_height = max(1, row_height)
+        self.visible_rows = max(1, int(tree.cget("height")))
+        self.top = 0
+        self._start = 0
+        self._slots = []
+        self._slot_index = {}
+
+        if selected_colors:
+            background, foreground = selected_colors
+            tree.tag_configure(
+                SELECTED_TAG, background=background, foreground=foreground
+            )
+
+        # The Treeview only knows the window; the scrollbar follows the model
+        tree.configure(yscrollcommand="")
+        if scrollbar is not None:
+            scrollbar.configure(command=self.yview)
+
+        tree.bind("<Configure>", self._on_configure, add="+")
+        tree.bind("<MouseWheel>", self._on_mousewheel)
+        tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        tree.bind("<Prior>", lambda e: self._scroll_by(-self.visible_rows))
+        tree.bind("<Next>", lambda e: self._scroll_by(self.visible_rows))
+
+    @property
+    def window(self) -> tuple:
+        """Return the materialized model range as (start, end)."""
+        return self._start, self._start + len(self._slots)
+
+    def reset(self):
+        """Scroll back to the top and re-render (e.g. after a new listing)."""
+        self.top = 0
+        self._render(0)
+
+    def refresh(self):
+        """Re-render the current window after the model or selection changed."""
+        self.top = self._clamp(self.top)
+        start, end = self.window
+        if start <= self.top and self.top + self.visible_rows <= end:
+            self._render(start)
+        else:
+            self._render(self._window_start_for(self.top))
+
+    def see(self, index: int):
+        """Scroll so that the row at the given model index is visible."""
+        if index < self.top:
+            self._scroll_to(index)
+        elif index >= self.top + self.visible_rows:
+            self._scroll_to(index - self.visible_rows + 1)
+
+    def index_at(self, y: int) -> Optional[int]:
+        """Return the model index of the row at the given y coordinate."""
+        return self.index_of_item(self.tree.identify_row(y))
+
+    def index_of_item(self, item: str) -> Optional[int]:
+        """Return the model index displayed by a Treeview row."""
+        slot = self._slot_index.get(item)
+        if slot is None:
+            return None
+        return self._start + slot
+
+    def path_of_item(self, item: str) -> Optional[str]:
+        """Return the path displayed by a Treeview row."""
+        index = self.index_of_item(item)
+        if index is None:
+            return None
+        return self.model.path_at(index)
+
+    def yview(self, *args):
+        """Scrollbar command: handle 'moveto' and 'scroll' requests."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self.model)))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_rows
+            self._scroll_by(amount)
+
+    def _on_configure(self, event):
+        """Track the number of rows that fit into the widget."""
+        visible_rows = max(1, event.height // self.row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.refresh()
+
+    def _on_mousewheel(self, event):
+        """Scroll by three rows per wheel notch."""
+        delta = event.delta
+        if abs(delta) >= 120:
+            delta //= 120
+        self._scroll_by(-3 if delta > 0 else 3)
+        return "break"
+
+    def _scroll_by(self, rows: int):
+        self._scroll_to(self.top + rows)
+        return "break"
+
+    def _clamp(self, top: int) -> int:
+        return max(0, min(top, len(self.model) - self.visible_rows))
+
+    def _window_start_for(self, top: int) -> int:
+        return max(0, top - self.overscan)
+
+    def _scroll_to(self, top: int):
+        """Show the given model index at the top of the list."""
+        top = self._clamp(top)
+        if top == self.top and self._slots:
+            return
+        self.top = top
+        start, end = self.window
+        if start <= top and top + self.visible_rows <= end:
+            # Still inside the materialized rows: only move the view
+            self._place_view()
+            self._update_scrollbar()
+            self._notify_view_change()
+        else:
+            self._render(self._window_start_for(top))
+
+    def _render(self, start: int):
+        """Recycle the Treeview rows to display the model from start."""
+        total = len(self.model)
+        end = min(total, start + self.visible_rows + 2 * self.overscan)
+        count = max(0, end - start)
+        self._resize_pool(count)
+        self._start = start
+
+        model = self.model
+        for offset, slot in enumerate(self._slots):
+            row = model.row(start + offset)
+            text, values = self.format_row(row)
+            tags = (SELECTED_TAG,) if model.is_selected(row.path) else ()
+            self.tree.item(slot, text=text, values=values, tags=tags)
+
+        self._place_view()
+        self._update_scrollbar()
+        self._notify_view_change()
+
+    def _resize_pool(self, count: int):
+        """Grow or shrink the pool of recycled Treeview rows."""
+        while len(self._slots) < count:
+            slot = f"vrow{len(self._slots)}"
+            self.tree.insert("", "end", iid=slot)
+            self._slot_index[slot] = len(self._slots)
+            self._slots.append(slot)
+        if len(self._slots) > count:
+            extra = self._slots[count:]
+            self.tree.delete(*extra)
+            for slot in extra:
+                del self._slot_index[slot]
+            del self._slots[count:]
+
+    def _place_view(self):
+        """Scroll the Treeview so that the top row is the first visible one."""
+        self.tree.yview_moveto(0)
+        if self.top > self._start:
+            self.tree.yview_scroll(self.top - self._start, "units")
+
+    def _notify_view_change(self):
+        if self.on_view_change is not None:
+            self.on_view_change()
+
+    def _update_scrollbar(self):
+        if self.scrollbar is None:
+            return
+        total = len(self.model)
+        if total == 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self.top / total
+        last = min(1.0, (self.top + self.visible_rows) / total)
+        self.scrollbar.set(first, last)
@@ -0,0 +1,368 @@
+"""
+Directory change monitoring for PathBrowser widget.
+
+This module watches the displayed directories for changes so that the
+file list and the directory tree can be updated incrementally instead of
+being reloaded. On Linux it uses inotify through ctypes; elsewhere, or
+when a watch cannot be added, it falls back to polling the modification
+time of each directory inode.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .utils import directory_stamp, is_racy
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Delay between two polls of the watched directories (milliseconds)
+DEFAULT_INTERVAL_MS = 500
+
+# inotify event masks (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+# struct inotify_event: int wd; uint32 mask, cookie, len; char name[len]
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+@dataclass
+class DirectoryChange:
+    """Changes observed in one directory since the last poll."""
+
+    path: str
+    # Names of entries that were created, deleted, renamed or modified
+    names: Set[str] = field(default_factory=set)
+    # The backend cannot tell which entries changed; diff the listing
+    rescan: bool = False
+
+    def merge(self, other: "DirectoryChange"):
+        """Fold another change of the same directory into this one."""
+        self.names |= other.names
+        self.rescan = self.rescan or other.rescan
+
+
+class PollingBackend:
+    """
+    Detects changes by comparing the (device, inode, mtime) of directories.
+
+    A directory's mtime only changes when entries are added, removed or
+    renamed, so this backend reports whole-directory rescans and cannot see
+    files modified in place.
+    """
+
+    name = "polling"
+
+    def __init__(self):
+        self._stamps: Dict[str, Optional[tuple]] = {}
+
+    def add(self, path: str) -> bool:
+        """Start watching a directory."""
+        self._stamps[path] = _settled(directory_stamp(path), time.time())
+        return True
+
+    def remove(self, path: str):
+        """Stop watching a directory."""
+        self._stamps.pop(path, None)
+
+    def poll(self) -> List[DirectoryChange]:
+        """Return the directories whose stamp changed since the last poll."""
+        changes = []
+        now = time.time()
+        for path, previous in self._stamps.items():
+            current = directory_stamp(path)
+            if current != previous:
+                changes.append(DirectoryChange(path, rescan=True))
+            self._stamps[path] = _settled(current, now)
+        return changes
+
+    def close(self):
+        """Forget all watched directories."""
+        self._stamps.clear()
+
+
+class InotifyBackend:
+    """Linux inotify watches read without blocking from the Tk thread."""
+
+    name = "inotify"
+    _libc = None
+
+    def __init__(self):
+        libc = self.load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._paths: Dict[int, str] = {}
+        self._watches: Dict[str, int] = {}
+
+    @classmethod
+    def load_libc(cls):
+        """Return libc with the inotify functions, or None if unavailable."""
+        if not sys.platform.startswith("linux"):
+            return None
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(
+                    ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+                )
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [
+                    ctypes.c_int,
+                    ctypes.c_char_p,
+                    ctypes.c_uint32,
+                ]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            except (OSError, AttributeError) as e:
+                logger.debug("inotify is not available: %s", e)
+                return None
+            cls._libc = libc
+        return cls._libc
+
+    def add(self, path: str) -> bool:
+        """Start watching a directory; False if the kernel refused the watch."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            logger.debug("Cannot watch %s: %s", path, os.strerror(err))
+            return False
+        self._paths[wd] = path
+        self._watches[path] = wd
+        return True
+
+    def remove(self, path: str):
+        """Stop watching a directory."""
+        wd = self._watches.pop(path, None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def poll(self) -> List[DirectoryChange]:
+        """Read all pending events, grouped by directory."""
+        changes: Dict[str, DirectoryChange] = {}
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                logger.debug("Failed to read inotify events: %s", e)
+                break
+            if not data:
+                break
+            self._parse(data, changes)
+        return list(changes.values())
+
+    def _parse(self, data: bytes, changes: Dict[str, DirectoryChange]):
+        """Fold a buffer of raw inotify events into per-directory changes."""
+        offset = 0
+        header_size = _EVENT_HEADER.size
+        while offset + header_size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += header_size
+            raw_name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: every watched directory needs a rescan
+                for path in self._watches:
+                    changes.setdefault(path, DirectoryChange(path)).rescan = True
+                continue
+            path = self._paths.get(wd)
+            if path is None:
+                continue
+            change = changes.setdefault(path, DirectoryChange(path))
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                change.rescan = True
+                if mask & IN_IGNORED:
+                    # The kernel dropped the watch along with the directory
+                    self._paths.pop(wd, None)
+                    self._watches.pop(path, None)
+            elif raw_name:
+                change.names.add(os.fsdecode(raw_name))
+
+    def close(self):
+        """Close the inotify descriptor and all of its watches."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._paths.clear()
+        self._watches.clear()
+
+
+def create_backend():
+    """Return the best available backend for this platform."""
+    if InotifyBackend.load_libc() is not None:
+        try:
+            return InotifyBackend()
+        except OSError as e:
+            logger.debug("Falling back to polling: %s", e)
+    return PollingBackend()
+
+
+class DirectoryWatcher:
+    """
+    Polls a backend from the Tk event loop and reports coalesced changes.
+
+    Watches the kernel refuses (for example when the inotify limit is
+    reached) are served by a polling backend instead. Changes are grouped
+    per directory so that a burst of events costs one update per interval.
+    """
+
+    def __init__(
+        self,
+        widget,
+        on_change: Callable[[List[DirectoryChange]], None],
+        interval_ms: int = DEFAULT_INTERVAL_MS,
+        backend=None,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            widget: Tk widget used for after() scheduling
+            on_change: Called on the Tk thread with a list of DirectoryChange
+            interval_ms: Delay between polls in milliseconds
+            backend: Backend to use (defaults to create_backend())
+        """
+        self._widget = widget
+        self._on_change = on_change
+        self.interval_ms = max(1, interval_ms)
+        self.backend = backend if backend is not None else create_backend()
+        self._fallback = None
+        self._paths: Dict[str, object] = {}
+        self._deferred: Dict[str, DirectoryChange] = {}
+        self._after_id = None
+
+    @property
+    def paths(self) -> Set[str]:
+        """Return the watched directories."""
+        return set(self._paths)
+
+    def watch(self, paths: Iterable[str]):
+        """Replace the set of watched directories."""
+        wanted = set(paths)
+        for path in list(self._paths):
+            if path not in wanted:
+                self._paths.pop(path).remove(path)
+                self._deferred.pop(path, None)
+        for path in wanted:
+            if path in self._paths:
+                continue
+            backend = self.backend
+            if not backend.add(path):
+                backend = self._polling_fallback()
+                backend.add(path)
+            self._paths[path] = backend
+        self._schedule()
+
+    def requeue(self, changes: Iterable[DirectoryChange]):
+        """Report changes again with the next poll (e.g. while still loading)."""
+        for change in changes:
+            if change.path in self._paths:
+                _merge_into(self._deferred, change)
+        self._schedule()
+
+    def poll(self):
+        """Collect pending changes and report them, if any."""
+        changes = self._deferred
+        self._deferred = {}
+        for backend in (self.backend, self._fallback):
+            if backend is None:
+                continue
+            for change in backend.poll():
+                if change.path in self._paths:
+                    _merge_into(changes, change)
+        if changes:
+            self._on_change(list(changes.values()))
+
+    def close(self):
+        """Stop polling and release all watches."""
+        if self._after_id is not None:
+            try:
+                self._widget.after_cancel(self._after_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to cancel watcher poll")
+            self._after_id = None
+        self._paths.clear()
+        self._deferred.clear()
+        self.backend.close()
+        if self._fallback is not None:
+            self._fallback.close()
+
+    def _polling_fallback(self):
+        if self._fallback is None:
+            self._fallback = PollingBackend()
+        return self._fallback
+
+    def _schedule(self):
+        """Schedule the next poll while directories are watched."""
+        if self._after_id is None and self._paths:
+            self._after_id = self._widget.after(self.interval_ms, self._run)
+
+    def _run(self):
+        self._after_id = None
+        try:
+            self.poll()
+        finally:
+            self._schedule()
+
+
+def _merge_into(changes: Dict[str, DirectoryChange], change: DirectoryChange):
+    existing = changes.get(change.path)
+    if existing is None:
+        changes[change.path] = DirectoryChange(
+            change.path, set(change.names), change.rescan
+        )
+    else:
+        existing.merge(change)
+
+
+def _settled(stamp: Optional[tuple], now: float) -> Optional[tuple]:
+    """
+    Drop a stamp whose mtime is too recent to rule out a hidden change.
+
+    Such directories are then reported as changed on the next poll.
+    """
+    if stamp is not None and is_racy(stamp, now):
+        return None
+    return stamp